@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import hashlib
 import logging
 import os
 import re
@@ -19,6 +20,7 @@ from typing import Any
 from services.android_audit import get_android_audit_logger
 from services.android_client import get_android_client
 from services.android_thermostat import normalize_get_status, normalize_set_range
+from services.android_ui_tree import dominant_package as get_dominant_package
 
 logger = logging.getLogger(__name__)
 
@@ -199,23 +201,17 @@ async def get_screen_action(
     if not connect_result.success and "already connected" not in connect_result.output.lower():
         raise ValueError(f"Failed to connect to device: {connect_result.error}")
 
-    # Get screenshot as base64
-    screenshot_result = await client.take_screenshot()
+    # Screenshot and accessibility XML are streamed into memory concurrently.
+    capture = await client.capture_screen()
+    screenshot_result = capture.screenshot
     if not screenshot_result.success:
         raise ValueError(f"Failed to capture screenshot: {screenshot_result.error}")
 
-    # Read the screenshot file and encode as base64
-    screenshot_path = screenshot_result.output
-    try:
-        with open(screenshot_path, "rb") as f:
-            screenshot_bytes = f.read()
-        screenshot_base64 = base64.b64encode(screenshot_bytes).decode("utf-8")
-    except Exception as exc:
-        raise ValueError(f"Failed to read screenshot file: {exc}") from exc
+    screenshot_base64 = base64.b64encode(screenshot_result.data).decode("utf-8")
 
-    # Get accessibility XML. Some screens intermittently fail to produce a
-    # uiautomator dump; keep the screenshot path usable instead of failing hard.
-    xml_result = await client.get_screen_xml()
+    # Some screens intermittently fail to produce a uiautomator dump; keep the
+    # screenshot usable instead of failing hard.
+    xml_result = capture.xml
     xml_error: str | None = None
     raw_xml = ""
     elements = []
@@ -228,16 +224,8 @@ async def get_screen_action(
 
     # Best-effort: identify the dominant package on screen. Useful for debugging
     # "wrong screen" / "app didn't launch" failures.
-    dominant_package = None
     try:
-        pkg_counts: dict[str, int] = {}
-        for el in elements:
-            pkg = (el.package or "").strip()
-            if not pkg:
-                continue
-            pkg_counts[pkg] = pkg_counts.get(pkg, 0) + 1
-        if pkg_counts:
-            dominant_package = max(pkg_counts.items(), key=lambda kv: kv[1])[0]
+        dominant_package = get_dominant_package(elements)
     except Exception:
         dominant_package = None
 
@@ -299,6 +287,7 @@ async def get_screen_action(
         "clickable_elements": clickable_elements,
         "element_count": len(elements),
         "dominant_package": dominant_package,
+        "capture_ms": round(capture.elapsed_ms, 1),
         **lockscreen_state,
         "message": (
             f"Screen captured with {len(clickable_elements)} interactive elements"
@@ -1466,6 +1455,8 @@ def _select_task_prompt(goal: str, app: str | None) -> tuple[str, dict[str, Any]
 
 SCREENSHOTS_DIR = os.path.join(".", "data", "screenshots")
 SCREENSHOT_TTL_SECONDS = 24 * 60 * 60  # 24 hours
+# Total size budget for the screenshots directory; oldest files go first.
+SCREENSHOT_RETENTION_BYTES = int(os.getenv("ANDROID_SCREENSHOT_RETENTION_MB", "500")) * 1024 * 1024
 
 
 def _sanitize_task_id(task_id: str) -> str | None:
@@ -1520,51 +1511,63 @@ def _persist_screenshot(task_id: str, screenshot_base64: str) -> str | None:
         return None
 
 
-def _persist_step_screenshots(task_id: str, steps: list) -> list[str]:
-    """Persist intermediate step screenshots to disk.
+class _StepScreenshotWriter:
+    """Writes step screenshots to disk as the runner captures them.
 
-    Returns list of file paths for successfully saved screenshots.
+    Files are named {task_id}_step_{n}.png. A frame identical to the
+    previous step's (same screen signature and image hash) is not written
+    again; the step points at the earlier file instead.
     """
-    safe_id = _sanitize_task_id(task_id)
-    if safe_id is None:
-        return []
 
-    saved_paths: list[str] = []
-    for step in steps:
-        screenshot_b64 = getattr(step, "screenshot_base64", None)
-        if not screenshot_b64:
-            continue
+    def __init__(self, task_id: str):
+        self._task_id = _sanitize_task_id(task_id)
+        self._last: tuple[str, str, str] | None = None  # (signature, sha256, path)
 
-        step_num = getattr(step, "step_number", None)
-        if step_num is None:
-            continue
+    def write(
+        self, step_number: int, screenshot_base64: str, screen_signature: str
+    ) -> tuple[str | None, str | None]:
+        if self._task_id is None:
+            return None, None
 
         try:
-            png_bytes = base64.b64decode(screenshot_b64)
+            png_bytes = base64.b64decode(screenshot_base64)
         except Exception:
-            logger.warning("Failed to decode step %d screenshot for task %s", step_num, safe_id)
-            continue
+            logger.warning("Failed to decode step %d screenshot for task %s", step_number, self._task_id)
+            return None, None
 
-        os.makedirs(SCREENSHOTS_DIR, exist_ok=True)
-        file_path = os.path.join(SCREENSHOTS_DIR, f"{safe_id}_step_{step_num}.png")
+        digest = hashlib.sha256(png_bytes).hexdigest()
+        if self._last is not None and self._last[:2] == (screen_signature, digest):
+            return self._last[2], digest
 
+        os.makedirs(SCREENSHOTS_DIR, exist_ok=True)
+        file_path = os.path.join(SCREENSHOTS_DIR, f"{self._task_id}_step_{step_number}.png")
         try:
             fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
             try:
                 os.write(fd, png_bytes)
             finally:
                 os.close(fd)
-            saved_paths.append(file_path)
         except Exception:
-            logger.exception("Failed to write step %d screenshot for task %s", step_num, safe_id)
+            logger.exception("Failed to write step %d screenshot for task %s", step_number, self._task_id)
+            return None, digest
 
-    if saved_paths:
-        logger.info("Persisted %d step screenshots for task %s", len(saved_paths), safe_id)
-    return saved_paths
+        self._last = (screen_signature, digest, file_path)
+        return file_path, digest
+
+
+def _step_screenshot_paths(steps: list) -> list[str]:
+    """Distinct step screenshot paths, in step order."""
+    paths: list[str] = []
+    for step in steps:
+        path = getattr(step, "screenshot_path", None)
+        if path and path not in paths:
+            paths.append(path)
+    return paths
 
 
 def _cleanup_old_screenshots() -> int:
-    """Delete screenshot files older than SCREENSHOT_TTL_SECONDS.
+    """Delete screenshot files older than SCREENSHOT_TTL_SECONDS, then the
+    oldest remaining ones until the directory fits SCREENSHOT_RETENTION_BYTES.
 
     Returns the number of files deleted.
     """
@@ -1573,20 +1576,36 @@ def _cleanup_old_screenshots() -> int:
 
     cutoff = time.time() - SCREENSHOT_TTL_SECONDS
     deleted = 0
+    kept: list[tuple[float, int, str]] = []  # (mtime, size, path)
 
     try:
-        for filename in os.listdir(SCREENSHOTS_DIR):
-            if not filename.endswith(".png"):
-                continue
-            filepath = os.path.join(SCREENSHOTS_DIR, filename)
+        with os.scandir(SCREENSHOTS_DIR) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".png"):
+                    continue
+                try:
+                    st = entry.stat()
+                    if st.st_mtime < cutoff:
+                        os.unlink(entry.path)
+                        deleted += 1
+                    else:
+                        kept.append((st.st_mtime, st.st_size, entry.path))
+                except OSError:
+                    pass
+    except OSError:
+        logger.exception("Error during screenshot cleanup")
+
+    total = sum(size for _, size, _ in kept)
+    if total > SCREENSHOT_RETENTION_BYTES:
+        for _, size, filepath in sorted(kept):
+            if total <= SCREENSHOT_RETENTION_BYTES:
+                break
             try:
-                if os.path.getmtime(filepath) < cutoff:
-                    os.unlink(filepath)
-                    deleted += 1
+                os.unlink(filepath)
+                deleted += 1
+                total -= size
             except OSError:
                 pass
-    except OSError:
-        logger.exception("Error during screenshot cleanup")
 
     if deleted:
         logger.info("Cleaned up %d old screenshot files", deleted)
@@ -1688,6 +1707,7 @@ async def _execute_task_background(
             task_prompt=task_prompt,
             parameters=parameters,
             max_steps=25,
+            screenshot_writer=_StepScreenshotWriter(task_id),
         )
 
         # Persist final screenshot to disk if present
@@ -1695,8 +1715,8 @@ async def _execute_task_background(
         if result.final_screenshot_base64:
             final_screenshot_path = _persist_screenshot(task_id, result.final_screenshot_base64)
 
-        # Persist intermediate step screenshots
-        step_screenshot_paths = _persist_step_screenshots(task_id, result.steps)
+        # Step screenshots were written as each step ran
+        step_screenshot_paths = _step_screenshot_paths(result.steps)
         step_actions: list[dict[str, Any]] = []
         for step in result.steps:
             action_obj = getattr(step, "action", None)
@@ -1812,6 +1832,7 @@ async def _execute_task_background(
                 metadata={
                     "task_prompt": task_prompt,
                     "lockscreen_detected": bool((result.extracted_data or {}).get("lockscreen_detected")),
+                    "run_metrics": result.metrics,
                 },
             )
             logger.info("Task %s: Completed successfully", task_id)
@@ -1851,6 +1872,7 @@ async def _execute_task_background(
                     "focused_app": extracted.get("focused_app"),
                     "focused_window": extracted.get("focused_window"),
                     "status_reason": extracted.get("status_reason"),
+                    "run_metrics": result.metrics,
                 },
             )
             logger.info("Task %s: Failed - %s", task_id, result.error)
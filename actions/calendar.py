@@ -17,8 +17,8 @@ from actions.helpers import (
     resolve_timezone,
 )
 from config import get_settings
-from services.google_calendar import GoogleCalendarService
-from services.google_contacts import GoogleContactsService
+from services.google_calendar import get_calendar_service
+from services.google_contacts import get_contacts_service
 
 logger = logging.getLogger(__name__)
 
@@ -90,7 +90,7 @@ async def get_events_action(
 
     def fetch_events():
         nonlocal resolved_calendar_id
-        service = GoogleCalendarService()
+        service = get_calendar_service()
         resolved_calendar_id = service.resolve_calendar_id(
             calendar_id=calendar_id_arg,
             calendar_name=calendar_name,
@@ -189,7 +189,7 @@ async def create_event_action(
     def validate_attendees():
         missing: list[str] = []
         if attendees_clean:
-            contacts_service = GoogleContactsService()
+            contacts_service = get_contacts_service()
             for email in attendees_clean:
                 if not contacts_service.contact_exists(email):
                     missing.append(email)
@@ -205,7 +205,7 @@ async def create_event_action(
 
     def create_event():
         nonlocal resolved_calendar_id
-        service = GoogleCalendarService()
+        service = get_calendar_service()
         resolved_calendar_id = service.resolve_calendar_id(
             calendar_id=calendar_id_arg,
             calendar_name=calendar_name,
@@ -271,7 +271,7 @@ async def get_calendars_action(
     primary_only = coerce_bool(args.get("primary_only"))
 
     def fetch_calendars():
-        service = GoogleCalendarService()
+        service = get_calendar_service()
         calendars = service.list_calendars()
         if primary_only:
             calendars = [
@@ -343,7 +343,7 @@ async def update_event_action(
     calendar_name = args.get("calendar_name")
 
     def do_update():
-        service = GoogleCalendarService()
+        service = get_calendar_service()
         cal_id = service.resolve_calendar_id(
             calendar_id=calendar_id_arg,
             calendar_name=calendar_name,
@@ -426,7 +426,7 @@ async def delete_event_action(
     calendar_name = args.get("calendar_name")
 
     def do_delete():
-        service = GoogleCalendarService()
+        service = get_calendar_service()
         cal_id = service.resolve_calendar_id(
             calendar_id=calendar_id_arg,
             calendar_name=calendar_name,
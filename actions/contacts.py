@@ -9,7 +9,7 @@ import logging
 from typing import Any
 
 from actions.helpers import coerce_int
-from services.google_contacts import GoogleContactsService
+from services.google_contacts import get_contacts_service
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +30,7 @@ async def search_contacts_action(
     )
 
     def fetch_contacts():
-        service = GoogleContactsService()
+        service = get_contacts_service()
         results = service.search_contacts(query=query)
         return results[:max_results]
 
@@ -228,28 +228,7 @@ async def list_jorbs_action(
     storage = JorbStorage()
     jorbs = await storage.list_jorbs(status_filter=status_filter)
 
-    result_jorbs = []
-    for jorb in jorbs:
-        jorb_data = {
-            "jorb_id": jorb.id,
-            "name": jorb.name,
-            "status": jorb.status,
-            "personality": jorb.personality,
-            "created_at": jorb.created_at,
-            "updated_at": jorb.updated_at,
-            "metrics": jorb.metrics,
-        }
-        if jorb.progress_summary:
-            jorb_data["progress"] = jorb.progress_summary
-        if jorb.awaiting:
-            jorb_data["awaiting"] = jorb.awaiting
-        if jorb.paused_reason:
-            jorb_data["paused_reason"] = jorb.paused_reason
-        # Include outcome for completed/failed jorbs
-        if jorb.outcome:
-            jorb_data["outcome"] = jorb.outcome
-
-        result_jorbs.append(jorb_data)
+    result_jorbs = [jorb.to_summary() for jorb in jorbs]
 
     # Get aggregate metrics for this filter
     aggregate_metrics = await storage.get_aggregate_metrics(status_filter=status_filter)
@@ -401,10 +380,7 @@ async def get_jorb_messages_action(
     if not jorb:
         raise ValueError(f"Jorb not found: {jorb_id}")
 
-    # Fetch messages with offset+limit to allow pagination
-    # Note: JorbStorage.get_messages doesn't have offset, so we fetch more and slice
-    all_messages = await storage.get_messages(jorb_id, limit=offset + limit)
-    messages = all_messages[offset:offset + limit]
+    messages = await storage.get_message_page(jorb_id, offset=offset, limit=limit)
 
     return {
         "jorb_id": jorb_id,
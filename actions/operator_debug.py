@@ -122,7 +122,7 @@ async def get_operator_debug_action(
                     jorb.task_class,
                 )
             )
-        for result in (jorb.script_results or [])[-10:]:
+        for result in await storage.get_script_results(jorb.id, limit=10):
             recent_script_results.append(
                 {
                     "jorb_id": jorb.id,
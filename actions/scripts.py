@@ -4,7 +4,7 @@ Script management and execution actions for Frank Bot.
 Provides a clean API for ChatGPT:
 - frankScriptApiLearn - Learn what scripts can do (FrankAPI capabilities)
 - frankScriptList/Create/Get/Update/Delete - CRUD on scripts
-- frankScriptTaskStart/Status/Cancel - Async execution
+- frankScriptTaskStart/Status/Output/Cancel - Async execution
 """
 
 from __future__ import annotations
@@ -27,7 +27,14 @@ from meta.api import (
     UPSNamespace,
 )
 from meta.executor import execute_script_async, execute_new_script
-from meta.jobs import JobStatus, get_job, list_jobs, update_job
+from meta.jobs import (
+    DEFAULT_OUTPUT_TAIL_BYTES,
+    JobStatus,
+    get_job,
+    list_jobs,
+    read_job_output,
+    update_job,
+)
 from meta.scripts import (
     DEFAULT_SCRIPTS_DIR,
     get_script,
@@ -607,6 +614,45 @@ async def task_status_action(
     return data
 
 
+async def task_output_action(
+    arguments: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Tail a script task's live stdout/stderr.
+
+    Reads the task's output log directly, so it is cheap to poll while the
+    task runs.
+
+    Args:
+        task_id: The task ID from frankScriptTaskStart
+        stream: "stdout" (default) or "stderr"
+        offset: Byte offset to continue from (the previous `next_offset`).
+            When omitted, returns the tail of the output.
+        max_bytes: Maximum bytes to return (default: 4000)
+
+    Returns:
+        task_id, stream, text, offset, next_offset, size
+    """
+    args = arguments or {}
+
+    task_id = (args.get("task_id") or "").strip()
+    if not task_id:
+        task_id = (args.get("job_id") or "").strip()
+    if not task_id:
+        raise ValueError("'task_id' is required")
+
+    stream = (args.get("stream") or "stdout").strip()
+    offset = args.get("offset")
+    offset = int(offset) if offset not in (None, "") else None
+    max_bytes = int(args.get("max_bytes") or DEFAULT_OUTPUT_TAIL_BYTES)
+
+    output = read_job_output(task_id, stream, offset=offset, max_bytes=max_bytes)
+    if output["size"] == 0 and get_job(task_id) is None:
+        raise ValueError(f"Task not found: {task_id}")
+
+    return {"task_id": task_id, "stream": stream, **output}
+
+
 async def task_list_action(
     arguments: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
@@ -716,6 +762,7 @@ __all__ = [
     "script_delete_action",
     "task_start_action",
     "task_status_action",
+    "task_output_action",
     "task_list_action",
     "task_cancel_action",
 ]
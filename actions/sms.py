@@ -9,7 +9,7 @@ import logging
 import re
 from typing import Any, Literal
 
-from services.google_contacts import GoogleContactsService
+from services.google_contacts import get_contacts_service
 from services.sms_storage import SMSMessage, SMSStorage
 from services.telnyx_sms import TelnyxSMSService
 
@@ -86,7 +86,7 @@ async def send_sms_action(
         logger.info("Looking up contact: %s", recipient)
 
         def fetch_contact():
-            service = GoogleContactsService()
+            service = get_contacts_service()
             results = service.search_contacts(recipient)
             return results
 
@@ -203,15 +203,12 @@ async def get_sms_messages_action(
         return storage.get_recent_messages(
             remote_number=phone,
             contact_name=contact_name,
-            limit=limit * 2 if direction_filter else limit,  # Fetch more if filtering by direction
+            direction=direction_filter,
+            limit=limit,
         )
 
     messages = await asyncio.to_thread(fetch_messages)
 
-    # Apply direction filter if specified
-    if direction_filter:
-        messages = [m for m in messages if m.direction == direction_filter][:limit]
-
     # Format messages for response
     result_messages = []
     for msg in messages:
@@ -17,9 +17,10 @@ from typing import Any, Coroutine, TypeVar
 T = TypeVar("T")
 
 # Reference to the main event loop (set during app startup).
-# Scripts run in a ThreadPoolExecutor, so they cannot just asyncio.run()
-# because that creates a *new* loop -- which conflicts with services like
-# Telethon that bind to the loop they were initialised on.
+# FrankAPI methods are called from worker threads (script pool RPC calls),
+# so they cannot just asyncio.run() because that creates a *new* loop --
+# which conflicts with services like Telethon that bind to the loop they
+# were initialised on.
 _main_loop: asyncio.AbstractEventLoop | None = None
 
 
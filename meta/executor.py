@@ -3,24 +3,21 @@ Script executor for Frank Bot meta module.
 
 Provides script execution with timeout and output capture.
 Scripts define a main(frank, **params) function that receives
-a FrankAPI instance and keyword parameters.
+a FrankAPI instance and keyword parameters. Scripts run in isolated
+worker processes from meta/script_pool.py.
 """
 
 from __future__ import annotations
 
-import io
-import sys
 import threading
-import traceback
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable
 
-from meta.api import FrankAPI
 from meta.jobs import (
     DEFAULT_JOBS_DIR,
     Job,
+    JobOutputWriter,
     JobStatus,
     create_job,
     get_job,
@@ -32,6 +29,7 @@ from meta.scripts import (
     parse_script_filename,
     save_script,
 )
+from meta.script_pool import MODE_MAIN, get_script_pool
 
 # Default timeout: 10 minutes in seconds
 DEFAULT_TIMEOUT_SECONDS = 600
@@ -48,38 +46,11 @@ class ExecutionResult:
     error: str | None
 
 
-def _capture_output(func: Callable[[], Any]) -> tuple[Any, str, str]:
-    """
-    Execute a function and capture its stdout and stderr.
-
-    Args:
-        func: The function to execute
-
-    Returns:
-        Tuple of (return_value, stdout, stderr)
-    """
-    old_stdout = sys.stdout
-    old_stderr = sys.stderr
-
-    captured_stdout = io.StringIO()
-    captured_stderr = io.StringIO()
-
-    try:
-        sys.stdout = captured_stdout
-        sys.stderr = captured_stderr
-
-        result = func()
-
-        return result, captured_stdout.getvalue(), captured_stderr.getvalue()
-    finally:
-        sys.stdout = old_stdout
-        sys.stderr = old_stderr
-
-
 def execute_script(
     code: str,
     params: dict[str, Any] | None = None,
     timeout_seconds: int = DEFAULT_TIMEOUT_SECONDS,
+    on_output: Callable[[str, str], None] | None = None,
 ) -> ExecutionResult:
     """
     Execute a script's main() function with timeout and output capture.
@@ -87,72 +58,44 @@ def execute_script(
     The script must define a main(frank, **kwargs) function.
     FrankAPI is passed as the first argument, and params as keyword args.
 
+    The script runs in a worker process from the script pool (see
+    meta/script_pool.py); on timeout the worker is killed.
+
     Args:
         code: The Python source code to execute
         params: Parameters to pass as keyword arguments to main()
         timeout_seconds: Maximum execution time (default: 600 = 10 minutes)
+        on_output: Optional callback receiving (stream, text) chunks of
+            stdout/stderr while the script runs
 
     Returns:
         ExecutionResult with status, stdout, stderr, result, and error
     """
-    if params is None:
-        params = {}
-
-    # Prepare execution context
-    frank = FrankAPI()
-    global_namespace: dict[str, Any] = {"__name__": "__main__"}
-
-    def _execute() -> Any:
-        # Execute the script code to define main()
-        exec(code, global_namespace)
-
-        # Get the main function
-        main_func = global_namespace.get("main")
-        if main_func is None:
-            raise ValueError("Script must define a main(frank, **params) function")
-
-        if not callable(main_func):
-            raise ValueError("main must be a callable function")
-
-        # Call main with FrankAPI and params
-        return main_func(frank, **params)
-
-    # Execute with timeout in a thread pool
-    executor = ThreadPoolExecutor(max_workers=1)
-
-    try:
-        future = executor.submit(_capture_output, _execute)
-        try:
-            result, stdout, stderr = future.result(timeout=timeout_seconds)
-            return ExecutionResult(
-                status=JobStatus.COMPLETED,
-                stdout=stdout,
-                stderr=stderr,
-                result=result,
-                error=None,
-            )
-        except FuturesTimeoutError:
-            # Cancel the future (may not interrupt running code)
-            future.cancel()
-            return ExecutionResult(
-                status=JobStatus.TIMEOUT,
-                stdout="",
-                stderr="",
-                result=None,
-                error=f"Script execution timed out after {timeout_seconds} seconds",
-            )
-        except Exception as exc:
-            # Get the traceback
-            tb_str = traceback.format_exc()
-            return ExecutionResult(
-                status=JobStatus.FAILED,
-                stdout="",
-                stderr=tb_str,
-                result=None,
-                error=str(exc),
-            )
-    finally:
-        executor.shutdown(wait=False)
+    outcome = get_script_pool().run(MODE_MAIN, code, params, timeout_seconds, on_output)
+
+    if outcome.timed_out:
+        return ExecutionResult(
+            status=JobStatus.TIMEOUT,
+            stdout="",
+            stderr="",
+            result=None,
+            error=outcome.error,
+        )
+    if not outcome.ok:
+        return ExecutionResult(
+            status=JobStatus.FAILED,
+            stdout=outcome.stdout,
+            stderr=outcome.stderr + outcome.traceback,
+            result=None,
+            error=outcome.error,
+        )
+    return ExecutionResult(
+        status=JobStatus.COMPLETED,
+        stdout=outcome.stdout,
+        stderr=outcome.stderr,
+        result=outcome.value,
+        error=None,
+    )
 
 
 def execute_script_async(
@@ -165,8 +108,10 @@ def execute_script_async(
     """
     Execute an existing script asynchronously in a background thread.
 
-    Creates a job record and starts execution immediately. The job is
-    updated with results when execution completes, fails, or times out.
+    Creates a job record and starts execution immediately. Output is
+    streamed to the job's sidecar logs while it runs (see read_job_output),
+    and the job is updated with results when execution completes, fails, or
+    times out.
 
     Args:
         script_id: The ID of the script to execute
@@ -217,7 +162,8 @@ def execute_script_async(
     # Start background execution
     def _run_in_background():
         try:
-            result = execute_script(code, params, timeout_seconds)
+            with JobOutputWriter(job.job_id, jobs_dir) as output:
+                result = execute_script(code, params, timeout_seconds, on_output=output.write)
             update_job(
                 job.job_id,
                 status=result.status,
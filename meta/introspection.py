@@ -226,6 +226,10 @@ def generate_meta_documentation() -> str:
     doc_parts.append("- All methods are synchronous and safe to use in scripts")
     doc_parts.append("- Scripts have a 10-minute timeout")
     doc_parts.append("- Use `print()` for debugging; output is captured in `stdout`")
+    doc_parts.append(
+        "- Tail live output with `/frank/script/task/output?task_id=...&stream=stdout` "
+        "(pass the returned `next_offset` as `offset` to continue)"
+    )
     doc_parts.append("- Return a dict from `main()` for structured results")
     doc_parts.append("- Check `/frank/script/list` for existing reusable scripts")
     doc_parts.append("- List tasks with `/frank/script/task/list` and poll with `/frank/script/task/status`")
@@ -5,6 +5,10 @@ Jobs are stored as .json files in ./data/jobs/ directory with filenames
 following the pattern: {ISO8601-timestamp}-{slug}-run.json
 
 Job status values: pending, running, completed, failed, timeout
+
+While a job runs, its stdout/stderr are streamed into sidecar logs
+({job_id}.stdout.log / {job_id}.stderr.log) so live output can be tailed
+without loading the job record.
 """
 
 from __future__ import annotations
@@ -17,11 +21,18 @@ from enum import Enum
 from pathlib import Path
 from typing import Any
 
+from services.change_feed import change_feed
+
 # Default jobs directory - uses DATA_DIR env var if set (for Docker),
 # otherwise falls back to relative path from project root
 _data_dir = os.getenv("DATA_DIR", str(Path(__file__).parent.parent / "data"))
 DEFAULT_JOBS_DIR = Path(_data_dir) / "jobs"
 
+OUTPUT_STREAMS = ("stdout", "stderr")
+
+# Default amount of output returned by read_job_output()
+DEFAULT_OUTPUT_TAIL_BYTES = 4000
+
 
 class JobStatus(str, Enum):
     """Job execution status."""
@@ -163,6 +174,7 @@ def create_job(
     filename = f"{job_id}.json"
     filepath = jobs_dir / filename
     filepath.write_text(json.dumps(job.to_dict(), indent=2), encoding="utf-8")
+    change_feed.publish("job.updated", lambda: {"job": job_to_summary_dict(job)})
 
     return job
 
@@ -234,6 +246,7 @@ def update_job(
 
     # Save updated job
     filepath.write_text(json.dumps(job.to_dict(), indent=2), encoding="utf-8")
+    change_feed.publish("job.updated", lambda: {"job": job_to_summary_dict(job)})
 
     return job
 
@@ -316,6 +329,87 @@ def list_jobs(
     return jobs
 
 
+def job_output_path(job_id: str, stream: str, jobs_dir: Path | str | None = None) -> Path:
+    """Path of a job's sidecar output log for `stream` ("stdout" or "stderr")."""
+    if stream not in OUTPUT_STREAMS:
+        raise ValueError(f"Invalid stream '{stream}'. Valid: stdout, stderr")
+    jobs_dir = DEFAULT_JOBS_DIR if jobs_dir is None else Path(jobs_dir)
+    return jobs_dir / f"{job_id}.{stream}.log"
+
+
+class JobOutputWriter:
+    """
+    Appends a running job's output chunks to its sidecar logs.
+
+    Each chunk is flushed as it is written, so readers see output live.
+    """
+
+    def __init__(self, job_id: str, jobs_dir: Path | str | None = None):
+        self._job_id = job_id
+        self._jobs_dir = jobs_dir
+        self._files: dict[str, Any] = {}
+
+    def write(self, stream: str, text: str) -> None:
+        f = self._files.get(stream)
+        if f is None:
+            f = open(job_output_path(self._job_id, stream, self._jobs_dir), "a", encoding="utf-8")
+            self._files[stream] = f
+        f.write(text)
+        f.flush()
+
+    def close(self) -> None:
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+    def __enter__(self) -> JobOutputWriter:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def read_job_output(
+    job_id: str,
+    stream: str = "stdout",
+    offset: int | None = None,
+    max_bytes: int = DEFAULT_OUTPUT_TAIL_BYTES,
+    jobs_dir: Path | str | None = None,
+) -> dict[str, Any]:
+    """
+    Read a job's output from its sidecar log without loading the job record.
+
+    Args:
+        job_id: The job ID
+        stream: "stdout" or "stderr"
+        offset: Byte offset to read from (as returned by a previous call in
+            `next_offset`). When omitted, returns the last `max_bytes`.
+        max_bytes: Maximum number of bytes to return
+        jobs_dir: Directory containing jobs (defaults to ./data/jobs/)
+
+    Returns:
+        Dict with text, offset (where text starts), next_offset and size
+    """
+    path = job_output_path(job_id, stream, jobs_dir)
+    max_bytes = max(1, max_bytes)
+    try:
+        with open(path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            start = max(0, size - max_bytes) if offset is None else min(max(0, offset), size)
+            f.seek(start)
+            data = f.read(max_bytes)
+    except FileNotFoundError:
+        return {"text": "", "offset": 0, "next_offset": 0, "size": 0}
+
+    # A byte window can split a multi-byte character at either end.
+    return {
+        "text": data.decode("utf-8", errors="ignore"),
+        "offset": start,
+        "next_offset": start + len(data),
+        "size": size,
+    }
+
+
 def job_to_summary_dict(job: Job) -> dict[str, Any]:
     """Convert a job to a summary dict (for listing)."""
     return {
@@ -337,5 +431,10 @@ __all__ = [
     "get_job",
     "list_jobs",
     "job_to_summary_dict",
+    "job_output_path",
+    "read_job_output",
+    "JobOutputWriter",
     "DEFAULT_JOBS_DIR",
+    "DEFAULT_OUTPUT_TAIL_BYTES",
+    "OUTPUT_STREAMS",
 ]
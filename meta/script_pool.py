@@ -0,0 +1,718 @@
+"""
+Process-isolated script execution pool for Frank Bot scripts.
+
+Scripts (saved FrankAPI scripts and the snippets jorbs run) execute in a warm
+pool of worker processes instead of threads inside the server:
+
+- A script that overruns its timeout is killed with its worker (a thread could
+  only be abandoned, leaving it burning CPU in the server process), and a
+  replacement worker is started.
+- Workers run with an address-space limit (`SCRIPT_MEMORY_LIMIT_MB`) and a
+  per-run CPU-time limit (`SCRIPT_CPU_LIMIT_SECONDS`).
+- `frank.<namespace>.<method>(...)` calls inside a worker are forwarded over
+  the worker's pipe and executed by the real `FrankAPI` in the server process,
+  which submits them to the main event loop as before (see `meta/api.py`).
+- stdout/stderr are captured per run inside the worker (nothing in the server
+  is redirected) and can be streamed back in chunks while the script runs.
+
+The pool holds `SCRIPT_POOL_SIZE` workers; a worker is recycled after
+`SCRIPT_POOL_MAX_RUNS_PER_WORKER` runs or `SCRIPT_POOL_MAX_WORKER_AGE_SECONDS`
+of life, whichever comes first.
+"""
+
+from __future__ import annotations
+
+import ast
+import asyncio
+import io
+import logging
+import math
+import os
+import pickle
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from typing import Any, Callable
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    resource = None  # type: ignore
+
+from services.stats import stats
+
+logger = logging.getLogger(__name__)
+
+SCRIPT_POOL_SIZE = int(os.getenv("SCRIPT_POOL_SIZE", "2"))
+SCRIPT_POOL_MAX_RUNS_PER_WORKER = int(os.getenv("SCRIPT_POOL_MAX_RUNS_PER_WORKER", "100"))
+SCRIPT_POOL_MAX_WORKER_AGE_SECONDS = float(os.getenv("SCRIPT_POOL_MAX_WORKER_AGE_SECONDS", "3600"))
+SCRIPT_MEMORY_LIMIT_MB = int(os.getenv("SCRIPT_MEMORY_LIMIT_MB", "1024"))
+SCRIPT_CPU_LIMIT_SECONDS = int(os.getenv("SCRIPT_CPU_LIMIT_SECONDS", "600"))
+
+# Streamed output is sent once a line completes or this much is buffered.
+OUTPUT_CHUNK_BYTES = 4096
+
+# Script shapes a worker understands.
+MODE_MAIN = "main"  # saved scripts: define main(frank, **params)
+MODE_SNIPPET = "snippet"  # jorb scripts: an expression or a few statements
+
+_PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class ScriptOutcome:
+    """What happened to one script run."""
+
+    ok: bool
+    value: Any = None
+    stdout: str = ""
+    stderr: str = ""
+    error_type: str | None = None
+    error: str | None = None
+    traceback: str = ""
+    timed_out: bool = False
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+
+class RemoteCallError(Exception):
+    """A FrankAPI call forwarded to the server process raised."""
+
+    def __init__(self, remote_type: str, message: str):
+        super().__init__(message)
+        self.remote_type = remote_type
+
+
+class _RemoteNamespace:
+    def __init__(self, api: "_RemoteFrankAPI", name: str):
+        self._api = api
+        self._name = name
+
+    def __getattr__(self, method: str) -> Any:
+        if method.startswith("_"):
+            raise AttributeError(method)
+
+        def _call(*args: Any, **kwargs: Any) -> Any:
+            return self._api._call(self._name, method, args, kwargs)
+
+        _call.__name__ = method
+        return _call
+
+
+class _RemoteFrankAPI:
+    """FrankAPI stand-in inside a worker; every call runs in the server process."""
+
+    def __init__(self, conn: Connection, namespaces: list[str], lock: threading.Lock):
+        self._conn = conn
+        self._namespaces = {name: _RemoteNamespace(self, name) for name in namespaces}
+        self._lock = lock
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self.__dict__["_namespaces"][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __dir__(self) -> list[str]:
+        return sorted(self._namespaces)
+
+    def _call(self, namespace: str, method: str, args: tuple, kwargs: dict) -> Any:
+        with self._lock:
+            self._conn.send(("call", namespace, method, args, kwargs))
+            reply = self._conn.recv()
+        if reply[0] == "ok":
+            return reply[1]
+        raise RemoteCallError(reply[1], reply[2])
+
+
+class _CapturedOutput(io.TextIOBase):
+    """
+    One run's stdout or stderr inside a worker.
+
+    Keeps the full text for the outcome and, when streaming, sends chunks to
+    the server as lines complete.
+    """
+
+    def __init__(self, name: str, conn: Connection | None, lock: threading.Lock):
+        self._name = name
+        self._conn = conn
+        self._lock = lock
+        self._buffer = io.StringIO()
+        self._pending: list[str] = []
+        self._pending_len = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self._buffer.write(text)
+        if self._conn is not None and text:
+            self._pending.append(text)
+            self._pending_len += len(text)
+            if "\n" in text or self._pending_len >= OUTPUT_CHUNK_BYTES:
+                self.flush()
+        return len(text)
+
+    def flush(self) -> None:
+        if self._conn is None or not self._pending:
+            return
+        chunk = "".join(self._pending)
+        self._pending.clear()
+        self._pending_len = 0
+        with self._lock:
+            self._conn.send(("output", self._name, chunk))
+
+    def getvalue(self) -> str:
+        return self._buffer.getvalue()
+
+
+def run_main(code: str, params: dict[str, Any], frank: Any) -> Any:
+    """Run a saved script: exec it, then call main(frank, **params)."""
+    global_namespace: dict[str, Any] = {"__name__": "__main__"}
+    exec(code, global_namespace)
+
+    main_func = global_namespace.get("main")
+    if main_func is None:
+        raise ValueError("Script must define a main(frank, **params) function")
+    if not callable(main_func):
+        raise ValueError("main must be a callable function")
+
+    return main_func(frank, **params)
+
+
+def run_snippet(script_str: str, frank: Any) -> Any:
+    """
+    Run a jorb script snippet and return its value.
+
+    The snippet is a Python expression like 'frank.calendar.events(day="2026-02-05")'
+    or a multi-line snippet using the 'frank' object.
+    """
+    namespace: dict[str, Any] = {"frank": frank, "__builtins__": __builtins__}
+    # Try as expression first (e.g. frank.calendar.events(...))
+    try:
+        return eval(script_str, namespace)
+    except SyntaxError:
+        pass
+
+    # Fall back to exec for multi-line scripts.
+    #
+    # Critical: many model-generated scripts end with a bare expression like:
+    #   d = frank.diagnostics.full()
+    #   {'diagnostics': d, ...}
+    # In that case, `exec()` discards the final value, so the agent "can't see"
+    # the output and may retry in a tight loop. We capture a trailing expression
+    # by rewriting the final AST node into an assignment.
+    try:
+        tree = ast.parse(script_str, mode="exec")
+    except SyntaxError:
+        tree = None
+
+    if tree and tree.body and isinstance(tree.body[-1], ast.Expr):
+        tree.body[-1] = ast.Assign(  # type: ignore[assignment]
+            targets=[ast.Name(id="__frank_last_expr__", ctx=ast.Store())],
+            value=tree.body[-1].value,  # type: ignore[attr-defined]
+        )
+        ast.fix_missing_locations(tree)
+        code = compile(tree, "<jorb_script>", "exec")
+        exec(code, namespace)
+    else:
+        exec(script_str, namespace)
+
+    # Convention: scripts should assign their final payload to `result`.
+    #
+    # In practice, models often use `res = {...}` (or `out`/`output`).
+    # Returning a best-effort fallback here avoids "successful-but-None"
+    # loops where the agent keeps retrying because it can't see output.
+    if "result" in namespace:
+        return namespace.get("result")
+    if "__frank_last_expr__" in namespace:
+        return namespace.get("__frank_last_expr__")
+    for key in ("res", "out", "output", "data"):
+        if key in namespace:
+            return namespace.get(key)
+    return None
+
+
+def _apply_memory_limit(memory_limit_mb: int) -> None:
+    if resource is None or memory_limit_mb <= 0:
+        return
+    limit = memory_limit_mb * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError) as exc:
+        print(f"script worker: could not set memory limit: {exc}", file=sys.stderr)
+
+
+def _apply_cpu_limit(cpu_limit_seconds: int) -> None:
+    """Allow this run `cpu_limit_seconds` more CPU time (SIGXCPU kills the worker)."""
+    if resource is None or cpu_limit_seconds <= 0:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = math.ceil(usage.ru_utime + usage.ru_stime) + cpu_limit_seconds
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    except (ValueError, OSError):
+        pass
+
+
+def _send_outcome(conn: Connection, outcome: ScriptOutcome) -> None:
+    try:
+        conn.send(("done", outcome))
+    except (pickle.PicklingError, TypeError, AttributeError):
+        # Results must cross the process boundary; fall back to their repr.
+        outcome.value = repr(outcome.value)
+        conn.send(("done", outcome))
+
+
+def _worker_entrypoint(argv: list[str]) -> None:
+    fd, memory_limit_mb, cpu_limit_seconds = (int(arg) for arg in argv)
+    _worker_main(Connection(fd), memory_limit_mb, cpu_limit_seconds)
+
+
+def _worker_main(conn: Connection, memory_limit_mb: int, cpu_limit_seconds: int) -> None:
+    """Worker process loop: run scripts until told to stop or the pipe closes."""
+    _apply_memory_limit(memory_limit_mb)
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            return
+        if message[0] == "stop":
+            return
+
+        _, mode, source, params, namespaces, stream_output = message
+        lock = threading.Lock()
+        frank = _RemoteFrankAPI(conn, namespaces, lock)
+        output_conn = conn if stream_output else None
+        captured_stdout = _CapturedOutput("stdout", output_conn, lock)
+        captured_stderr = _CapturedOutput("stderr", output_conn, lock)
+        old_stdout, old_stderr = sys.stdout, sys.stderr
+        _apply_cpu_limit(cpu_limit_seconds)
+        try:
+            sys.stdout, sys.stderr = captured_stdout, captured_stderr
+            if mode == MODE_MAIN:
+                value = run_main(source, params, frank)
+            else:
+                value = run_snippet(source, frank)
+            outcome = ScriptOutcome(ok=True, value=value)
+        except Exception as exc:
+            outcome = ScriptOutcome(
+                ok=False,
+                error_type=getattr(exc, "remote_type", type(exc).__name__),
+                error=str(exc),
+                traceback=traceback.format_exc(),
+            )
+        finally:
+            sys.stdout, sys.stderr = old_stdout, old_stderr
+            captured_stdout.flush()
+            captured_stderr.flush()
+        outcome.stdout = captured_stdout.getvalue()
+        outcome.stderr = captured_stderr.getvalue()
+        _send_outcome(conn, outcome)
+
+
+# ---------------------------------------------------------------------------
+# Server side
+# ---------------------------------------------------------------------------
+
+
+def _frank_namespaces() -> list[str]:
+    from meta.api import FrankAPI
+
+    return sorted(name for name, attr in vars(FrankAPI).items() if isinstance(attr, property))
+
+
+# Namespaces scripts may call (the FrankAPI properties), resolved once.
+FRANK_NAMESPACES = _frank_namespaces()
+
+
+def _call_frank(frank: Any, namespaces: list[str], namespace: str, method: str, args: tuple, kwargs: dict) -> Any:
+    if namespace not in namespaces or method.startswith("_"):
+        raise AttributeError(f"frank.{namespace}.{method} is not available to scripts")
+    return getattr(getattr(frank, namespace), method)(*args, **kwargs)
+
+
+class _Worker:
+    """
+    One worker process.
+
+    Workers are started as fresh interpreters (`python -m meta.script_pool`)
+    rather than forked, so they never inherit the server's threads, sockets or
+    event loop, and never re-run the server's entry module.
+    """
+
+    def __init__(self, memory_limit_mb: int, cpu_limit_seconds: int):
+        parent_sock, child_sock = socket.socketpair()
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            path for path in (_PACKAGE_ROOT, env.get("PYTHONPATH")) if path
+        )
+        try:
+            self.process = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "meta.script_pool",
+                    str(child_sock.fileno()),
+                    str(memory_limit_mb),
+                    str(cpu_limit_seconds),
+                ],
+                pass_fds=(child_sock.fileno(),),
+                stdin=subprocess.DEVNULL,
+                env=env,
+            )
+        except BaseException:
+            parent_sock.close()
+            raise
+        finally:
+            child_sock.close()
+        self.conn = Connection(parent_sock.detach())
+        self.started_at = time.monotonic()
+        self.runs = 0
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(("stop",))
+        except (OSError, ValueError):
+            pass
+        self.conn.close()
+        try:
+            self.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self.kill()
+
+    def kill(self) -> None:
+        self.process.kill()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            logger.error("Script worker %d did not exit after SIGKILL", self.process.pid)
+        self.conn.close()
+
+
+class ScriptPool:
+    """Warm pool of script worker processes."""
+
+    def __init__(
+        self,
+        size: int = SCRIPT_POOL_SIZE,
+        max_runs_per_worker: int = SCRIPT_POOL_MAX_RUNS_PER_WORKER,
+        max_worker_age_seconds: float = SCRIPT_POOL_MAX_WORKER_AGE_SECONDS,
+        memory_limit_mb: int = SCRIPT_MEMORY_LIMIT_MB,
+        cpu_limit_seconds: int = SCRIPT_CPU_LIMIT_SECONDS,
+    ) -> None:
+        self._size = max(1, size)
+        self._max_runs = max_runs_per_worker
+        self._max_age = max_worker_age_seconds
+        self._memory_limit_mb = memory_limit_mb
+        self._cpu_limit_seconds = cpu_limit_seconds
+        self._idle: list[_Worker] = []
+        self._live = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        # Blocking waits for runs, so they never occupy the loop's default executor.
+        # Larger than the pool so a run waiting for a worker is bounded by its own
+        # timeout (in `_acquire`) rather than queued behind other runs here.
+        self._dispatcher = ThreadPoolExecutor(
+            max_workers=max(32, self._size * 4), thread_name_prefix="frank-script-run"
+        )
+        # FrankAPI calls coming back from workers.
+        self._rpc = ThreadPoolExecutor(
+            max_workers=self._size * 2, thread_name_prefix="frank-script-rpc"
+        )
+        self.recycled = 0
+        self.killed = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def start(self) -> None:
+        """Start any missing workers so the first scripts do not pay for startup."""
+        with self._cond:
+            while not self._closed and self._live < self._size:
+                self._idle.append(self._spawn())
+
+    def shutdown(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for worker in idle:
+            worker.stop()
+        self._dispatcher.shutdown(wait=False)
+        self._rpc.shutdown(wait=False)
+
+    def get_status(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                "size": self._size,
+                "live": self._live,
+                "idle": len(self._idle),
+                "recycled": self.recycled,
+                "killed": self.killed,
+            }
+
+    def _spawn(self) -> _Worker:
+        # Caller holds self._cond.
+        self._live += 1
+        try:
+            return _Worker(self._memory_limit_mb, self._cpu_limit_seconds)
+        except BaseException:
+            self._live -= 1
+            raise
+
+    def _acquire(self, deadline: float) -> _Worker | None:
+        """Take an idle worker, waiting until `deadline` at most (None on timeout)."""
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Script pool is shut down")
+                while self._idle:
+                    worker = self._idle.pop()
+                    if worker.is_alive():
+                        return worker
+                    self._live -= 1
+                if self._live < self._size:
+                    return self._spawn()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    def _release(self, worker: _Worker) -> None:
+        worker.runs += 1
+        expired = (
+            (self._max_runs > 0 and worker.runs >= self._max_runs)
+            or (self._max_age > 0 and time.monotonic() - worker.started_at >= self._max_age)
+        )
+        if expired:
+            self.recycled += 1
+            worker.stop()
+            self._discard(worker)
+            return
+        with self._cond:
+            if self._closed:
+                worker.stop()
+                self._live -= 1
+                return
+            self._idle.append(worker)
+            self._cond.notify()
+
+    def _discard(self, worker: _Worker) -> None:
+        """Forget a dead worker and start its replacement to keep the pool warm."""
+        with self._cond:
+            self._live -= 1
+            if not self._closed:
+                try:
+                    self._idle.append(self._spawn())
+                except Exception:
+                    logger.exception("Failed to start replacement script worker")
+            self._cond.notify()
+
+    def run(
+        self,
+        mode: str,
+        source: str,
+        params: dict[str, Any] | None = None,
+        timeout_seconds: float = 600,
+        on_output: Callable[[str, str], None] | None = None,
+    ) -> ScriptOutcome:
+        """
+        Run a script in a worker, blocking until it finishes or is killed.
+
+        `timeout_seconds` covers waiting for a free worker as well as the run
+        itself, so long jobs holding every worker can't stall other callers.
+        `on_output(stream, text)` receives stdout/stderr chunks while the
+        script runs; the outcome still carries the complete output.
+        """
+        return self._run(mode, source, params, timeout_seconds, on_output, time.monotonic())
+
+    def _run(
+        self,
+        mode: str,
+        source: str,
+        params: dict[str, Any] | None,
+        timeout_seconds: float,
+        on_output: Callable[[str, str], None] | None,
+        started: float,
+    ) -> ScriptOutcome:
+        from meta import api as frank_api
+
+        deadline = started + timeout_seconds
+        namespaces = FRANK_NAMESPACES
+        # Looked up at call time so tests can patch meta.api.FrankAPI.
+        frank = frank_api.FrankAPI()
+        worker = self._acquire(deadline)
+        if worker is None:
+            waited = ScriptOutcome(
+                ok=False,
+                error_type="TimeoutError",
+                error=(
+                    f"Script execution timed out after {timeout_seconds} seconds "
+                    "waiting for a free script worker"
+                ),
+                timed_out=True,
+            )
+            self._record(started, waited)
+            return waited
+        outcome: ScriptOutcome | None = None
+        pending_call: Future | None = None
+        try:
+            worker.conn.send(("run", mode, source, params or {}, namespaces, on_output is not None))
+            while outcome is None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                if pending_call is not None:
+                    try:
+                        value = pending_call.result(timeout=remaining)
+                        reply: tuple = ("ok", value)
+                    except FuturesTimeoutError:
+                        break
+                    except Exception as exc:
+                        reply = ("error", type(exc).__name__, str(exc))
+                    pending_call = None
+                    try:
+                        worker.conn.send(reply)
+                    except (pickle.PicklingError, TypeError, AttributeError):
+                        worker.conn.send(("ok", repr(reply[1])))
+                    continue
+                if not worker.conn.poll(remaining):
+                    break
+                message = worker.conn.recv()
+                if message[0] == "call":
+                    _, namespace, method, args, kwargs = message
+                    pending_call = self._rpc.submit(
+                        _call_frank, frank, namespaces, namespace, method, args, kwargs
+                    )
+                elif message[0] == "output":
+                    if on_output is not None:
+                        try:
+                            on_output(message[1], message[2])
+                        except Exception:
+                            logger.exception("Script output callback failed")
+                elif message[0] == "done":
+                    outcome = message[1]
+        except (EOFError, OSError):
+            outcome = self._worker_died(worker)
+            self._discard(worker)
+            self._record(started, outcome)
+            return outcome
+
+        if outcome is None:
+            # Timed out: the only way to stop arbitrary code is to kill its process.
+            self.killed += 1
+            worker.kill()
+            self._discard(worker)
+            outcome = ScriptOutcome(
+                ok=False,
+                error_type="TimeoutError",
+                error=f"Script execution timed out after {timeout_seconds} seconds",
+                timed_out=True,
+            )
+        else:
+            self._release(worker)
+        self._record(started, outcome)
+        return outcome
+
+    async def run_async(
+        self,
+        mode: str,
+        source: str,
+        params: dict[str, Any] | None = None,
+        timeout_seconds: float = 600,
+        on_output: Callable[[str, str], None] | None = None,
+    ) -> ScriptOutcome:
+        """`run` without blocking the event loop (FrankAPI calls need it free)."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._dispatcher,
+            self._run,
+            mode,
+            source,
+            params,
+            timeout_seconds,
+            on_output,
+            time.monotonic(),
+        )
+
+    def _worker_died(self, worker: _Worker) -> ScriptOutcome:
+        try:
+            exitcode: int | None = worker.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            worker.kill()
+            exitcode = worker.process.returncode
+        worker.conn.close()
+        if exitcode is not None and hasattr(signal, "SIGXCPU") and exitcode == -signal.SIGXCPU:
+            message = f"Script exceeded the CPU limit of {self._cpu_limit_seconds} seconds"
+        else:
+            message = f"Script worker exited unexpectedly (exit code {exitcode})"
+        return ScriptOutcome(ok=False, error_type="WorkerCrashed", error=message)
+
+    @staticmethod
+    def _record(started: float, outcome: ScriptOutcome) -> None:
+        stats.get_service_stats("scripts").record_request(
+            latency_ms=(time.monotonic() - started) * 1000,
+            success=outcome.ok,
+            error=outcome.error if not outcome.ok else None,
+        )
+
+
+_script_pool: ScriptPool | None = None
+_script_pool_lock = threading.Lock()
+
+
+def get_script_pool() -> ScriptPool:
+    """Get the process-wide script pool, creating it on first use."""
+    global _script_pool
+    with _script_pool_lock:
+        if _script_pool is None:
+            _script_pool = ScriptPool()
+        return _script_pool
+
+
+def shutdown_script_pool() -> None:
+    global _script_pool
+    with _script_pool_lock:
+        pool, _script_pool = _script_pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+__all__ = [
+    "MODE_MAIN",
+    "MODE_SNIPPET",
+    "RemoteCallError",
+    "ScriptOutcome",
+    "ScriptPool",
+    "get_script_pool",
+    "run_main",
+    "run_snippet",
+    "shutdown_script_pool",
+]
+
+
+if __name__ == "__main__":
+    # Run through the importable module so pickled outcomes resolve to
+    # meta.script_pool classes in the server process.
+    from meta.script_pool import _worker_entrypoint as _entrypoint
+
+    _entrypoint(sys.argv[1:])
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Benchmark Android automation against a replayed device.
+
+Replays an ADB recording (made with ANDROID_ADB_RECORD_DIR set during a real
+run) through a fake device, with the recorded latencies scaled by
+`--latency-scale`, and times:
+
+- `get_screen_action` (capture + parse + lockscreen checks);
+- the runner's capture -> LLM -> act loop, with a stub LLM that repeats the
+  taps/typing/swipes/key presses found in the recording, then says done;
+- the maintenance checks (battery, storage, security patch).
+
+Without `--recording`, a synthetic recording of `--steps` screens is used.
+Each round replays from the start, so results are deterministic.
+
+Usage:
+  poetry run python scripts/bench_android_replay.py [--recording adb-....jsonl] [--rounds 5] \\
+      [--latency-scale 1.0] [--llm-ms 0] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+from typing import Any
+
+# Add project root to path for imports
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import services.android_audit as android_audit  # noqa: E402
+import services.android_client as android_client  # noqa: E402
+from actions.android_phone import get_screen_action  # noqa: E402
+from services.android_client import AndroidClient  # noqa: E402
+from services.android_maintenance import AndroidMaintenanceService  # noqa: E402
+from services.android_phone_runner import AndroidPhoneRunner, PhoneAction  # noqa: E402
+from services.android_recording import AdbReplay, RecordedCommand, load_recording  # noqa: E402
+
+KEY_NAMES = {
+    "KEYCODE_HOME": "home",
+    "KEYCODE_BACK": "back",
+    "KEYCODE_ENTER": "enter",
+    "KEYCODE_APP_SWITCH": "recent",
+    "KEYCODE_TAB": "tab",
+    "KEYCODE_DEL": "delete",
+    "KEYCODE_SEARCH": "search",
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recording", type=Path, help="ADB recording to replay")
+    parser.add_argument("--steps", type=int, default=8, help="Screens in the synthetic recording")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds per measurement")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiplier for recorded ADB latencies")
+    parser.add_argument("--llm-ms", type=float, default=0.0, help="Simulated latency of each stub LLM call")
+    parser.add_argument("--settle-timeout", type=float, default=3.0, help="Runner settle timeout (0 disables)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    return parser.parse_args()
+
+
+def _png(seed: int, width: int = 108, height: int = 240) -> bytes:
+    rows = b"".join(b"\x00" + bytes((x * seed + y) % 256 for x in range(width * 3)) for y in range(height))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(rows))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _screen_xml(step: int) -> str:
+    nodes = "".join(
+        f'<node index="{i}" text="Row {step}.{i}" resource-id="com.example:id/row" class="android.widget.TextView" '
+        f'package="com.example" content-desc="" clickable="{"true" if i % 3 == 0 else "false"}" enabled="true" '
+        f'focused="false" scrollable="false" bounds="[0,{i * 90}][1080,{i * 90 + 90}]"/>'
+        for i in range(120)
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><hierarchy rotation="0">{nodes}</hierarchy>'
+
+
+def synthetic_recording(steps: int) -> list[RecordedCommand]:
+    """What a settled run over `steps` screens records (each screen is captured twice)."""
+
+    def cmd(args: tuple[str, ...], ms: float, output: str = "", data: bytes = b"") -> RecordedCommand:
+        return RecordedCommand(
+            args=args, global_cmd=False, binary=bool(data), success=True,
+            output=output, error=None, data=data, elapsed_ms=ms,
+        )
+
+    commands = [
+        cmd(("shell", "wm", "size"), 60, "Physical size: 1080x2400\n"),
+        cmd(("shell", "dumpsys", "battery"), 140, "Current Battery Service state:\n  level: 81\n  status: 2\n  health: 2\n  temperature: 291\n"),
+        cmd(("shell", "df", "/data"), 110, "Filesystem 1K-blocks Used Available Use% Mounted on\n/dev/block/dm-5 236810240 98123456 138686784 42% /data\n"),
+        cmd(("shell", "getprop", "ro.build.version.security_patch"), 45, "2026-09-05\n"),
+        cmd(("shell", "getprop", "ro.build.version.release"), 45, "16\n"),
+        cmd(("shell", "getprop", "ro.build.date"), 45, "Tue Sep  2 12:00:00 UTC 2026\n"),
+    ]
+    for step in range(steps):
+        png, xml = _png(step + 3), _screen_xml(step)
+        for _ in range(2):
+            commands.append(cmd(("exec-out", "screencap", "-p"), 350, data=png))
+            commands.append(cmd(("exec-out", "uiautomator", "dump", "/dev/tty"), 900, xml))
+            commands.append(cmd(("shell", "dumpsys", "window"), 120, "mCurrentFocus=Window{1 u0 com.example/.Main}\n"))
+        if step < steps - 1:
+            commands.append(cmd(("shell", "input", "tap", "540", str(45 + step * 90)), 80))
+    return commands
+
+
+def recorded_decisions(commands: list[RecordedCommand]) -> list[PhoneAction]:
+    """Turn the recording's input commands back into runner decisions."""
+    decisions: list[PhoneAction] = []
+    for command in commands:
+        args = command.args
+        if command.global_cmd or args[:2] != ("shell", "input") or len(args) < 4:
+            continue
+        verb = args[2]
+        if verb == "tap" and len(args) >= 5:
+            decisions.append(PhoneAction(action="tap", params={"x": int(args[3]), "y": int(args[4])}))
+        elif verb == "text":
+            decisions.append(PhoneAction(action="type", params={"text": args[3].replace("%s", " ").replace("\\", "")}))
+        elif verb == "swipe" and len(args) >= 7:
+            x1, y1, x2, y2 = (int(v) for v in args[3:7])
+            if abs(y2 - y1) >= abs(x2 - x1):
+                direction = "up" if y2 < y1 else "down"
+            else:
+                direction = "left" if x2 < x1 else "right"
+            decisions.append(PhoneAction(action="swipe", params={"direction": direction}))
+        elif verb == "keyevent" and args[3] in KEY_NAMES:
+            decisions.append(PhoneAction(action="press_key", params={"key": KEY_NAMES[args[3]]}))
+    decisions.append(PhoneAction(action="done", done=True, params={"result": "replayed"}))
+    return decisions
+
+
+class StubLLMRunner(AndroidPhoneRunner):
+    """Runner whose LLM replays a fixed list of decisions."""
+
+    def __init__(self, decisions: list[PhoneAction], llm_ms: float, **kwargs: Any):
+        super().__init__(model="replay-stub", api_key="replay-stub", **kwargs)
+        self._decisions = list(decisions)
+        self._llm_ms = llm_ms
+
+    async def _call_llm(self, system_prompt, screen_state, task_context):
+        if self._llm_ms > 0:
+            await asyncio.sleep(self._llm_ms / 1000)
+        action = self._decisions.pop(0) if len(self._decisions) > 1 else self._decisions[0]
+        return action, 0, 0
+
+
+def install_replay(commands: list[RecordedCommand], serial: str, latency_scale: float) -> AdbReplay:
+    replay = AdbReplay(commands, serial=serial, latency_scale=latency_scale)
+    android_client._client = AndroidClient(replay=replay)
+    return replay
+
+
+async def timed(label: str, rounds: int, make_run, results: dict[str, Any]) -> Any:
+    samples = []
+    outcome = None
+    for _ in range(rounds):
+        run = make_run()
+        start = time.perf_counter()
+        outcome = await run()
+        samples.append((time.perf_counter() - start) * 1000)
+    results[label] = {"median_ms": round(statistics.median(samples), 2), "min_ms": round(min(samples), 2)}
+    return outcome
+
+
+async def main() -> None:
+    args = parse_args()
+    if args.recording:
+        header, commands = load_recording(str(args.recording))
+        serial = str(header.get("serial") or "replay")
+        source = str(args.recording)
+    else:
+        commands, serial, source = synthetic_recording(args.steps), "replay", f"synthetic ({args.steps} screens)"
+    decisions = recorded_decisions(commands)
+    results: dict[str, Any] = {}
+
+    # Keep audit writes out of the real data directory.
+    audit_dir = tempfile.TemporaryDirectory()
+    android_audit._audit_logger = android_audit.AndroidAuditLogger(str(Path(audit_dir.name) / "audit.log"))
+
+    def screen_run():
+        install_replay(commands, serial, args.latency_scale)
+        return lambda: get_screen_action({})
+
+    await timed("get_screen_action", args.rounds, screen_run, results)
+
+    runner_stats: dict[str, Any] = {}
+
+    def runner_run():
+        replay = install_replay(commands, serial, args.latency_scale)
+        runner = StubLLMRunner(decisions, args.llm_ms, step_delay=0, settle_timeout=args.settle_timeout)
+
+        async def run():
+            result = await runner.run_task("Replay benchmark", max_steps=len(decisions) + 5)
+            runner_stats.update(
+                success=result.success,
+                steps=result.steps_taken,
+                served=replay.served,
+                unmatched=len(replay.unmatched),
+                **result.metrics,
+            )
+            return result
+
+        return run
+
+    await timed("runner_loop", args.rounds, runner_run, results)
+    results["runner_loop"].update(runner_stats)
+
+    def maintenance_run():
+        install_replay(commands, serial, args.latency_scale)
+        service = AndroidMaintenanceService(android_client._client)
+
+        async def run():
+            return [
+                await service.get_battery_health(),
+                await service.get_storage_info(),
+                await service.check_security_patch(),
+            ]
+
+        return run
+
+    await timed("maintenance_checks", args.rounds, maintenance_run, results)
+    audit_dir.cleanup()
+
+    if args.json:
+        print(json.dumps({"source": source, "latency_scale": args.latency_scale, "results": results}, indent=2))
+        return
+    print(f"\n{source}: {len(commands)} commands, {len(decisions)} decisions, latency x{args.latency_scale}")
+    for label, row in results.items():
+        extra = {k: v for k, v in row.items() if k not in ("median_ms", "min_ms")}
+        suffix = f"  {extra}" if extra else ""
+        print(f"  {label:<20} {row['median_ms']:10.1f} ms median  {row['min_ms']:10.1f} ms min{suffix}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-call overhead of getting a Google Calendar/Contacts service.
+
+Compares, in ms per call:
+
+- legacy: what every action used to do (load the token file, then
+  `googleapiclient.discovery.build`), i.e. a new service per call;
+- shared: `get_calendar_service()` / `get_contacts_service()` plus the
+  thread-local `_service` lookup that each API call now goes through.
+
+Uses a throwaway token file with a future expiry; no network calls are made
+(the time a fresh service spends opening a new HTTPS connection is not
+counted, so the real saving is larger).
+
+Usage:
+  poetry run python scripts/bench_google_services.py [--calls 200] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+# Add project root to path for imports
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+CALENDAR_SCOPES = ["https://www.googleapis.com/auth/calendar"]
+CONTACTS_SCOPES = ["https://www.googleapis.com/auth/contacts"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200, help="Calls per measurement")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    return parser.parse_args()
+
+
+def write_token(path: str) -> None:
+    expiry = datetime.now(timezone.utc) + timedelta(hours=1)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "token": "bench-token",
+                "refresh_token": "bench-refresh",
+                "client_id": "bench-client",
+                "client_secret": "bench-secret",
+                "scopes": CALENDAR_SCOPES + CONTACTS_SCOPES,
+                "expiry": expiry.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            },
+            f,
+        )
+
+
+def per_call_ms(calls: int, fn: Callable[[], Any]) -> float:
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) * 1000 / calls
+
+
+def main() -> None:
+    args = parse_args()
+    workdir = tempfile.TemporaryDirectory()
+    token_file = os.path.join(workdir.name, "token.json")
+    write_token(token_file)
+    os.environ["GOOGLE_TOKEN_FILE"] = token_file
+    os.environ["GOOGLE_CALENDAR_SCOPES"] = ",".join(CALENDAR_SCOPES)
+    os.environ["GOOGLE_CONTACTS_SCOPES"] = ",".join(CONTACTS_SCOPES)
+
+    from google.oauth2.credentials import Credentials
+    from googleapiclient.discovery import build
+
+    from services.google_calendar import get_calendar_service
+    from services.google_contacts import get_contacts_service
+
+    def legacy(api: str, version: str, scopes: list[str]) -> Callable[[], Any]:
+        def call() -> Any:
+            creds = Credentials.from_authorized_user_file(token_file, scopes)
+            return build(api, version, credentials=creds)
+
+        return call
+
+    results = {
+        "calendar": {
+            "legacy_ms": per_call_ms(args.calls, legacy("calendar", "v3", CALENDAR_SCOPES)),
+            "shared_ms": per_call_ms(args.calls, lambda: get_calendar_service()._service),
+        },
+        "contacts": {
+            "legacy_ms": per_call_ms(args.calls, legacy("people", "v1", CONTACTS_SCOPES)),
+            "shared_ms": per_call_ms(args.calls, lambda: get_contacts_service()._service),
+        },
+    }
+    for row in results.values():
+        row["speedup"] = round(row["legacy_ms"] / row["shared_ms"], 1) if row["shared_ms"] else None
+        row["legacy_ms"] = round(row["legacy_ms"], 4)
+        row["shared_ms"] = round(row["shared_ms"], 4)
+    workdir.cleanup()
+
+    if args.json:
+        print(json.dumps({"calls": args.calls, "results": results}, indent=2))
+        return
+    print(f"\nService acquisition overhead ({args.calls} calls each)")
+    for label, row in results.items():
+        print(f"  {label:<10} legacy {row['legacy_ms']:9.3f} ms/call   shared {row['shared_ms']:9.4f} ms/call   x{row['speedup']}")
+
+
+if __name__ == "__main__":
+    main()
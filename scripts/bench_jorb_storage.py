@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark jorb listing against a large synthetic store.
+
+Seeds a temporary data directory with N jorb records (default 10,000, each
+carrying a small message history) and compares the legacy full-directory scan
+with the in-memory `JorbCatalog` for `list_jorbs`, `list_due_jorbs` and
+`get_aggregate_metrics`.
+
+Usage:
+  poetry run python scripts/bench_jorb_storage.py [--jorbs 10000] [--messages 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add project root to path for imports
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from services.file_store import read_json_file, write_json_atomic  # noqa: E402
+from services.jorb_storage import (  # noqa: E402
+    Jorb,
+    JorbStorage,
+    _jorb_to_payload,
+    _payload_to_jorb,
+)
+
+STATUSES = ("running", "paused", "complete", "complete", "failed", "cancelled", "complete")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jorbs", type=int, default=10_000, help="Number of jorb records to seed")
+    parser.add_argument("--messages", type=int, default=20, help="Messages per jorb record")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds per measurement")
+    return parser.parse_args()
+
+
+def seed(data_dir: Path, jorb_count: int, message_count: int) -> None:
+    now = datetime.now(timezone.utc)
+    for index in range(jorb_count):
+        jorb_id = f"jorb_{index:08x}"
+        jorb = Jorb(
+            id=jorb_id,
+            name=f"Benchmark jorb {index}",
+            status=STATUSES[index % len(STATUSES)],
+            original_plan="Benchmark plan " * 20,
+            contacts_json=f'[{{"identifier": "+1555{index:07d}", "channel": "sms"}}]',
+            messages_in=message_count // 2,
+            messages_out=message_count - message_count // 2,
+            tokens_used=1000 + index,
+            wake_at=(now - timedelta(seconds=index % 120)).isoformat(),
+        )
+        messages = [
+            {
+                "id": f"msg_{index:06x}{offset:06x}",
+                "jorb_id": jorb_id,
+                "timestamp": (now + timedelta(seconds=offset)).isoformat(),
+                "direction": "inbound" if offset % 2 else "outbound",
+                "channel": "sms",
+                "content": "A typical message body that says something useful. " * 4,
+            }
+            for offset in range(message_count)
+        ]
+        # Seed the legacy single-file layout (history inline) as the worst case.
+        write_json_atomic(
+            data_dir / f"{jorb_id}.json",
+            {
+                "schema_version": 2,
+                "jorb": _jorb_to_payload(jorb),
+                "messages": messages,
+                "checkpoints": [],
+            },
+        )
+
+
+def legacy_list_open(data_dir: Path) -> list[Jorb]:
+    """The pre-catalog implementation: parse every record to read its header."""
+    records = []
+    for path in sorted(data_dir.glob("jorb_*.json"), key=lambda p: p.name, reverse=True):
+        payload = read_json_file(path, None)
+        if isinstance(payload, dict) and isinstance(payload.get("jorb"), dict):
+            records.append(_payload_to_jorb(payload["jorb"]))
+    records = [j for j in records if j.status in ("planning", "running", "paused")]
+    records.sort(key=lambda j: j.updated_at, reverse=True)
+    return records
+
+
+async def timed(label: str, rounds: int, func) -> None:
+    durations = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        result = func()
+        if asyncio.iscoroutine(result):
+            result = await result
+        durations.append(time.perf_counter() - started)
+    best = min(durations) * 1000
+    median = sorted(durations)[len(durations) // 2] * 1000
+    print(f"  {label:<40} best {best:9.2f} ms   median {median:9.2f} ms")
+
+
+async def main() -> None:
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp) / "jorbs"
+        data_dir.mkdir()
+        print(f"Seeding {args.jorbs} jorbs x {args.messages} messages in {data_dir} ...")
+        seed(data_dir, args.jorbs, args.messages)
+
+        storage = JorbStorage(db_path=str(data_dir))
+
+        print("Legacy full scan:")
+        await timed("list_jorbs(open)", max(1, args.rounds // 2), lambda: legacy_list_open(data_dir))
+
+        print("Catalog:")
+        await timed("cold start (catalog rebuild)", 1, lambda: storage.list_jorbs(status_filter="open"))
+        await timed("list_jorbs(open)", args.rounds, lambda: storage.list_jorbs(status_filter="open"))
+        await timed("list_due_jorbs(limit=25)", args.rounds, lambda: storage.list_due_jorbs(limit=25))
+        await timed(
+            "get_aggregate_metrics(all)",
+            args.rounds,
+            lambda: storage.get_aggregate_metrics(status_filter="all"),
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
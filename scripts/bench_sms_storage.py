@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark SMS listings and id lookups against a large synthetic store.
+
+Seeds a temporary data directory with N stored messages (default 100,000)
+spread over a few hundred remote numbers, then compares the legacy
+glob-stat-parse scan with the manifest index for the queries `sms.messages`
+and the webhook path make: unfiltered, by remote number, by contact, by
+direction and by message id.
+
+Usage:
+  poetry run python scripts/bench_sms_storage.py [--messages 100000] [--numbers 500]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add project root to path for imports
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from services.sms_storage import Contact, SMSMessage, SMSStorage  # noqa: E402
+
+LOCAL_NUMBER = "+12148170664"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=100_000, help="Number of messages to seed")
+    parser.add_argument("--numbers", type=int, default=500, help="Distinct remote numbers")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds per measurement")
+    return parser.parse_args()
+
+
+def seed(storage: SMSStorage, message_count: int, number_count: int) -> None:
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for index in range(message_count):
+        remote_index = index % number_count
+        storage.store_message(
+            SMSMessage(
+                id=f"sms_{index}_+1555{remote_index:07d}",
+                timestamp=(start + timedelta(seconds=index * 37)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                direction="inbound" if index % 3 else "outbound",
+                localNumber=LOCAL_NUMBER,
+                remoteNumber=f"+1555{remote_index:07d}",
+                content="A typical text message body. " * 3,
+                contact=Contact(name=f"Contact {remote_index}") if remote_index % 4 == 0 else None,
+            )
+        )
+
+
+def legacy_recent(
+    sms_dir: Path,
+    remote_number: str | None = None,
+    contact_name: str | None = None,
+    limit: int = 50,
+) -> list[SMSMessage]:
+    """The pre-index implementation: stat every file, parse newest first until `limit` match."""
+    files = [(path, path.stat().st_mtime) for path in sms_dir.glob("*/*.json")]
+    files.sort(key=lambda item: item[1], reverse=True)
+    messages: list[SMSMessage] = []
+    for path, _ in files:
+        if len(messages) >= limit:
+            break
+        message = SMSMessage.model_validate(json.loads(path.read_text(encoding="utf-8")))
+        if remote_number and message.remoteNumber != remote_number:
+            continue
+        if contact_name and (not message.contact or contact_name.lower() not in message.contact.name.lower()):
+            continue
+        messages.append(message)
+    messages.sort(key=lambda m: m.timestamp, reverse=True)
+    return messages
+
+
+def legacy_by_id(sms_dir: Path, message_id: str) -> SMSMessage | None:
+    for path in sms_dir.glob("*/*.json"):
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        if payload.get("id") == message_id:
+            return SMSMessage.model_validate(payload)
+    return None
+
+
+def timed(label: str, rounds: int, func) -> None:
+    durations = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - started)
+    best = min(durations) * 1000
+    median = sorted(durations)[len(durations) // 2] * 1000
+    print(f"  {label:<40} best {best:9.2f} ms   median {median:9.2f} ms")
+
+
+def main() -> None:
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Seeding {args.messages} messages over {args.numbers} numbers in {tmp} ...")
+        seed(SMSStorage(data_dir=tmp), args.messages, args.numbers)
+        sms_dir = Path(tmp) / "sms"
+        remote = "+1555" + f"{args.numbers - 1:07d}"
+        oldest_id = "sms_0_+15550000000"
+        legacy_rounds = max(1, args.rounds // 2)
+
+        print("Legacy full scan:")
+        timed("recent(limit=50)", legacy_rounds, lambda: legacy_recent(sms_dir))
+        timed("recent(remote_number)", legacy_rounds, lambda: legacy_recent(sms_dir, remote_number=remote))
+        timed("recent(contact='contact 12')", legacy_rounds, lambda: legacy_recent(sms_dir, contact_name="contact 12"))
+        timed("get_message_by_id(oldest)", legacy_rounds, lambda: legacy_by_id(sms_dir, oldest_id))
+
+        print("Manifest index:")
+        SMSStorage._indexes.clear()
+        storage = SMSStorage(data_dir=tmp)
+        timed("cold start (manifest load)", 1, lambda: storage.get_recent_messages(limit=1))
+        timed("recent(limit=50)", args.rounds, lambda: storage.get_recent_messages())
+        timed("recent(remote_number)", args.rounds, lambda: storage.get_recent_messages(remote_number=remote))
+        timed(
+            "recent(contact='contact 12')",
+            args.rounds,
+            lambda: storage.get_recent_messages(contact_name="contact 12"),
+        )
+        timed(
+            "recent(direction='outbound')",
+            args.rounds,
+            lambda: storage.get_recent_messages(direction="outbound"),
+        )
+        timed("get_message_by_id(oldest)", args.rounds, lambda: storage.get_message_by_id(oldest_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Benchmark UI-tree parsing and element lookup.
+
+Compares the legacy regex parser plus a linear `find_element` scan with the
+single-pass `parse_ui_tree` and its indexed lookups. Pass recorded
+uiautomator dumps with `--xml` (e.g. from `adb exec-out uiautomator dump
+/dev/tty` on a Google Home or Settings screen). Without them, the benchmark
+generates Google Home- and Settings-shaped hierarchies of `--nodes` nodes.
+
+Usage:
+  poetry run python scripts/bench_ui_tree.py [--xml dump.xml ...] [--nodes 3000] [--rounds 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from services.android_ui_tree import UIElement, parse_ui_tree  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--xml", type=Path, nargs="*", default=[], help="Recorded uiautomator dumps")
+    parser.add_argument("--nodes", type=int, default=3000, help="Nodes per generated screen")
+    parser.add_argument("--rounds", type=int, default=20, help="Timed rounds per measurement")
+    parser.add_argument("--lookups", type=int, default=50, help="find_element calls per screen")
+    return parser.parse_args()
+
+
+def _node(rng: random.Random, package: str, index: int, text: str, desc: str, rid: str, clickable: bool) -> str:
+    left, top = rng.randrange(0, 900), rng.randrange(0, 2200)
+    return (
+        f'<node index="{index}" text="{text}" resource-id="{package}:id/{rid}" '
+        f'class="android.widget.{"Button" if clickable else "TextView"}" package="{package}" '
+        f'content-desc="{desc}" checkable="false" checked="false" clickable="{str(clickable).lower()}" '
+        f'enabled="true" focusable="{str(clickable).lower()}" focused="false" scrollable="false" '
+        f'long-clickable="false" password="false" selected="false" '
+        f'bounds="[{left},{top}][{left + 180},{top + 96}]">'
+    )
+
+
+def generate_screen(kind: str, nodes: int, seed: int = 7) -> str:
+    """A deep, wide hierarchy shaped like the Google Home or Settings apps."""
+    rng = random.Random(seed)
+    if kind == "home":
+        package = "com.google.android.apps.chromecast.app"
+        labels = ["Thermostat", "Living Room", "Kitchen light", "Front door", "Hallway", "Heat · Cool"]
+    else:
+        package = "com.android.settings"
+        labels = ["Network & internet", "Connected devices", "Apps", "Battery", "Display", "Sound & vibration"]
+
+    parts = ['<?xml version="1.0" encoding="UTF-8"?><hierarchy rotation="0">']
+    depth = 0
+    for index in range(nodes):
+        label = f"{rng.choice(labels)} {index}"
+        clickable = index % 3 == 0
+        desc = f"{label} tile" if index % 4 == 0 else ""
+        parts.append(_node(rng, package, index, label.replace("&", "&amp;"), desc.replace("&", "&amp;"), f"item_{index % 40}", clickable))
+        if depth < 12 and rng.random() < 0.6:
+            depth += 1
+        else:
+            parts.append("</node>")
+            while depth and rng.random() < 0.3:
+                parts.append("</node>")
+                depth -= 1
+    parts.extend("</node>" for _ in range(depth))
+    parts.append("</hierarchy>")
+    return "".join(parts)
+
+
+# The regex parser and linear scan `AndroidClient` used before the UI-tree index.
+_NODE = re.compile(r"<node\s+([^>]+?)(?:/?>)")
+_ATTR = re.compile(r'(\w+(?:-\w+)?)="([^"]*)"')
+_BOUNDS = re.compile(r"\[(\d+),(\d+)\]\[(\d+),(\d+)\]")
+
+
+def legacy_parse(xml_content: str) -> list[UIElement]:
+    elements = []
+    for node_match in _NODE.finditer(xml_content):
+        attrs_str = (node_match.group(1) or "").strip()
+        if attrs_str.endswith("/"):
+            attrs_str = attrs_str[:-1].strip()
+        attrs = dict(_ATTR.findall(attrs_str))
+        bounds_match = _BOUNDS.search(attrs.get("bounds", "[0,0][0,0]"))
+        bounds = tuple(int(x) for x in bounds_match.groups()) if bounds_match else (0, 0, 0, 0)
+        elements.append(
+            UIElement(
+                text=attrs.get("text", ""),
+                content_desc=attrs.get("content-desc", ""),
+                resource_id=attrs.get("resource-id", ""),
+                class_name=attrs.get("class", ""),
+                package=attrs.get("package", ""),
+                bounds=bounds,
+                clickable=attrs.get("clickable", "false").lower() == "true",
+                scrollable=attrs.get("scrollable", "false").lower() == "true",
+                focused=attrs.get("focused", "false").lower() == "true",
+                enabled=attrs.get("enabled", "true").lower() == "true",
+            )
+        )
+    return elements
+
+
+def legacy_find(elements: list[UIElement], *, text: str | None = None, clickable: bool | None = None) -> UIElement | None:
+    for el in elements:
+        if text and text.lower() not in el.text.lower():
+            continue
+        if clickable is not None and el.clickable != clickable:
+            continue
+        return el
+    return None
+
+
+def timed(fn, rounds: int) -> float:
+    """Median wall time in milliseconds."""
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def bench(name: str, xml_content: str, rounds: int, lookups: int) -> None:
+    legacy = legacy_parse(xml_content)
+    tree = parse_ui_tree(xml_content)
+    assert [e.bounds for e in legacy] == [e.bounds for e in tree], "parsers disagree"
+
+    # Look up labels from the back half of the screen, like a runner hunting
+    # for a control further down the page.
+    queries = [el.text for el in legacy[len(legacy) // 2 :: max(1, len(legacy) // (2 * lookups))] if el.text][:lookups]
+    for query in queries:
+        # The regex parser leaves entities like &amp; undecoded; expat decodes them.
+        if "&" not in query:
+            assert legacy_find(legacy, text=query) == tree.find(text=query), query
+
+    parse_legacy = timed(lambda: legacy_parse(xml_content), rounds)
+    parse_tree = timed(lambda: parse_ui_tree(xml_content), rounds)
+    find_legacy = timed(lambda: [legacy_find(legacy, text=q, clickable=True) for q in queries], rounds)
+    find_cold = timed(lambda: [parse_ui_tree(xml_content).find(text=q, clickable=True) for q in queries[:1]], rounds)
+    find_tree = timed(lambda: [tree.find(text=q, clickable=True) for q in queries], rounds)
+    exact_tree = timed(lambda: [tree.by_text(q) for q in queries], rounds)
+
+    print(f"\n{name}: {len(xml_content) / 1024:.0f} KiB, {len(tree)} nodes, {len(queries)} lookups")
+    print(f"  parse    legacy regex   {parse_legacy:8.2f} ms")
+    print(f"  parse    parse_ui_tree  {parse_tree:8.2f} ms  ({parse_legacy / parse_tree:.1f}x)")
+    print(f"  find     legacy linear  {find_legacy:8.3f} ms")
+    print(f"  find     indexed, warm  {find_tree:8.3f} ms  ({find_legacy / max(find_tree, 1e-6):.0f}x)")
+    print(f"  by_text  exact index    {exact_tree:8.3f} ms")
+    print(f"  parse + first find      {find_cold:8.2f} ms")
+
+
+def main() -> None:
+    args = parse_args()
+    screens: list[tuple[str, str]] = [(str(path), path.read_text(encoding="utf-8")) for path in args.xml]
+    if not screens:
+        screens = [
+            (f"generated google-home ({args.nodes} nodes)", generate_screen("home", args.nodes)),
+            (f"generated settings ({args.nodes} nodes)", generate_screen("settings", args.nodes)),
+        ]
+    for name, xml_content in screens:
+        bench(name, xml_content, args.rounds, args.lookups)
+
+
+if __name__ == "__main__":
+    main()
@@ -40,6 +40,7 @@ from services.background_loop import (
     start_background_loop,
     stop_background_loop,
 )
+from services.jorb_storage import JorbStorage
 
 logger = logging.getLogger(__name__)
 
@@ -214,12 +215,34 @@ def create_starlette_app() -> Starlette:
         logger.info("Starlette app started - Actions endpoints configured")
 
         # Store main event loop for FrankAPI script threads.
-        # Scripts run in a ThreadPoolExecutor and need to submit coroutines
-        # back to this loop (required for Telethon and other loop-bound clients).
+        # FrankAPI calls from script workers are served on threads that need to
+        # submit coroutines back to this loop (required for Telethon and other
+        # loop-bound clients).
         import asyncio
         from meta.api import set_main_loop
         set_main_loop(asyncio.get_running_loop())
 
+        # Warm the script worker processes so the first script doesn't wait.
+        try:
+            from meta.script_pool import get_script_pool
+            get_script_pool().start()
+        except Exception as e:
+            logger.error("Failed to start script pool: %s", e)
+
+        # Keep the shared phone -> contact index synced with Google
+        try:
+            from services.contact_lookup import start_contact_directory
+            start_contact_directory()
+        except Exception as e:
+            logger.error("Failed to start contacts directory sync: %s", e)
+
+        # Start the inbound SMS ingest workers (replays spooled webhooks)
+        try:
+            from server.sms_webhook import start_sms_ingest
+            await start_sms_ingest()
+        except Exception as e:
+            logger.error("Failed to start SMS ingest: %s", e)
+
         # Start the background event loop for jorb system
         try:
             await start_background_loop()
@@ -232,12 +255,38 @@ def create_starlette_app() -> Starlette:
     @app.on_event("shutdown")
     async def shutdown_event():
         logger.info("Shutdown signal received - terminating HTTP server")
+        # Finish in-flight inbound SMS; the rest stay spooled for next start
+        try:
+            from server.sms_webhook import stop_sms_ingest
+            await stop_sms_ingest()
+        except Exception as e:
+            logger.error("Error stopping SMS ingest: %s", e)
         # Stop the background event loop
         try:
             await stop_background_loop()
             logger.info("Background loop stopped")
         except Exception as e:
             logger.error("Error stopping background loop: %s", e)
+        try:
+            from services.contact_lookup import stop_contact_directory
+            await stop_contact_directory()
+        except Exception as e:
+            logger.error("Error stopping contacts directory sync: %s", e)
+        try:
+            from services.telegram_bot import close_bot_client
+            await close_bot_client()
+        except Exception as e:
+            logger.error("Error closing Telegram bot client: %s", e)
+        # Persist any jorb header updates still sitting in the write-behind buffer
+        try:
+            await JorbStorage.flush_all()
+        except Exception as e:
+            logger.error("Error flushing jorb storage: %s", e)
+        try:
+            from meta.script_pool import shutdown_script_pool
+            shutdown_script_pool()
+        except Exception as e:
+            logger.error("Error stopping script pool: %s", e)
 
     @app.exception_handler(404)
     async def not_found_handler(request, _exc):
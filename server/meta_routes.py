@@ -4,7 +4,7 @@ Starlette routes for Frank Bot script API.
 Clean API structure:
 - frankScriptApiLearn - Learn FrankAPI capabilities
 - frankScript{List,Create,Get,Update,Delete} - CRUD on scripts
-- frankScriptTask{Start,Status,List,Cancel} - Async execution
+- frankScriptTask{Start,Status,Output,List,Cancel} - Async execution
 """
 
 from __future__ import annotations
@@ -24,6 +24,7 @@ from actions.scripts import (
     script_delete_action,
     task_start_action,
     task_status_action,
+    task_output_action,
     task_list_action,
     task_cancel_action,
 )
@@ -128,6 +129,10 @@ def build_meta_routes(settings: Settings) -> list[Route]:
     async def task_status_handler(request: Request):
         return await _build_responder(task_status_action, request)
 
+    # frankScriptTaskOutput - Tail live task output
+    async def task_output_handler(request: Request):
+        return await _build_responder(task_output_action, request)
+
     # frankScriptTaskList - List tasks
     async def task_list_handler(request: Request):
         return await _build_responder(task_list_action, request)
@@ -156,6 +161,7 @@ def build_meta_routes(settings: Settings) -> list[Route]:
         Route(f"{api}/delete", script_delete_handler, methods=["GET"]),
         Route(f"{task}/start", task_start_handler, methods=["POST"]),
         Route(f"{task}/status", task_status_handler, methods=["GET"]),
+        Route(f"{task}/output", task_output_handler, methods=["GET"]),
         Route(f"{task}/list", task_list_handler, methods=["GET"]),
         Route(f"{task}/cancel", task_cancel_handler, methods=["GET"]),
         # Legacy endpoint for markdown docs
@@ -93,6 +93,7 @@ from actions.scripts import (
     script_update_action,
     task_cancel_action as script_task_cancel_action,
     task_list_action as script_task_list_action,
+    task_output_action as script_task_output_action,
     task_start_action as script_task_start_action,
     task_status_action as script_task_status_action,
 )
@@ -359,6 +360,7 @@ _SCRIPT_DISPATCH: dict[str, ActionFn] = {
     "run": _script_run,
     "runInline": _script_run_inline,
     "taskGet": script_task_status_action,
+    "taskOutput": script_task_output_action,
     "taskList": script_task_list_action,
 }
 
@@ -11,7 +11,7 @@ from typing import Any, Awaitable, Callable
 
 from starlette.exceptions import HTTPException
 from starlette.requests import Request
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, StreamingResponse
 from starlette.routing import Route
 
 from actions import (
@@ -106,6 +106,7 @@ from actions.claudia import (
 from server.sms_webhook import sms_webhook_handler
 from server.stytch_middleware import require_stytch_session, get_stytch_session
 from config import Settings
+from services.change_feed import change_feed
 from services.stats import stats
 from services.rate_limiter import get_android_rate_limiter
 
@@ -481,6 +482,17 @@ def build_action_routes(settings: Settings) -> list[Route]:
         responder = _build_responder(get_system_status_action)
         return await responder(payload)
 
+    async def dashboard_events_handler(request: Request):
+        """Server-sent events with jorb, job and Android task changes (see services/change_feed.py)."""
+        await _require_api_key_or_stytch_session(request)
+        stats.get_endpoint_stats("dashboardEvents").record_call()
+        last_event_id = request.headers.get("last-event-id") or request.query_params.get("last_event_id")
+        return StreamingResponse(
+            change_feed.stream(last_event_id),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
     async def operator_debug_handler(request: Request):
         await _require_api_key_or_stytch_session(request)
         stats.get_endpoint_stats("operatorDebugGet").record_call()
@@ -995,6 +1007,7 @@ def build_action_routes(settings: Settings) -> list[Route]:
         Route("/actions/style/generate", style_generate_handler, methods=["GET"]),
         # System status endpoint (orchestration machinery health)
         Route("/system/status", system_status_handler, methods=["GET"]),
+        Route("/dashboard/events", dashboard_events_handler, methods=["GET"]),
         Route("/actions/operator/debug", operator_debug_handler, methods=["GET"]),
         # Claudia integration endpoints
         Route("/actions/claudia/api/learn", claudia_api_learn_handler, methods=["GET"]),
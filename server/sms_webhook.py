@@ -1,7 +1,10 @@
 """
 SMS Webhook Handler for inbound Telnyx messages.
 
-Handles POST /webhook/sms from Telnyx when SMS/MMS messages arrive.
+Handles POST /webhook/sms from Telnyx when SMS/MMS messages arrive. The
+handler only validates and spools the payload (see `services.sms_ingest`);
+contact lookup, attachment downloads, storage and routing run in the
+background ingest stage, `ingest_inbound_sms`.
 Includes compliance keyword handling for unknown contacts (STOP/HELP/START).
 """
 
@@ -9,7 +12,9 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any
 
 from starlette.requests import Request
@@ -19,7 +24,7 @@ from services.agent_runner import AgentRunner
 from services.incoming_events import create_incoming_event
 from services.contact_lookup import ContactLookup
 from services.jorb_storage import JorbStorage
-from services.message_buffer import BufferedEvent, MessageBuffer
+from services.message_buffer import BufferedEvent, MessageBuffer, message_buffer_wal_path
 from services.sms_compliance import (
     HELP_RESPONSE,
     OPT_IN_RESPONSE,
@@ -28,6 +33,7 @@ from services.sms_compliance import (
     detect_compliance_keyword,
     get_keyword_type,
 )
+from services.sms_ingest import SMSIngestQueue
 from services.sms_storage import (
     Attachment,
     Contact,
@@ -39,9 +45,10 @@ from services.telnyx_sms import TelnyxSMSService
 
 logger = logging.getLogger(__name__)
 
-# Module-level message buffer and agent runner for SMS processing
+# Module-level message buffer, agent runner and ingest queue for SMS processing
 _sms_message_buffer: MessageBuffer | None = None
 _agent_runner: AgentRunner | None = None
+_sms_ingest_queue: SMSIngestQueue | None = None
 
 
 async def _on_sms_buffer_flush(event: BufferedEvent) -> None:
@@ -97,11 +104,46 @@ def _get_message_buffer() -> MessageBuffer:
     global _sms_message_buffer
 
     if _sms_message_buffer is None:
-        _sms_message_buffer = MessageBuffer(on_flush=_on_sms_buffer_flush)
+        _sms_message_buffer = MessageBuffer(
+            on_flush=_on_sms_buffer_flush,
+            wal_path=message_buffer_wal_path("sms"),
+        )
 
     return _sms_message_buffer
 
 
+def get_sms_ingest_queue() -> SMSIngestQueue:
+    """Get or create the module-level inbound SMS ingest queue."""
+    global _sms_ingest_queue
+
+    if _sms_ingest_queue is None:
+        data_dir = Path(os.getenv("DATA_DIR", "./data"))
+        # Kept outside data/sms so the message index never scans spool records.
+        spool_dir = data_dir / "sms_inbox"
+        legacy_spool_dir = data_dir / "sms" / "inbox"
+        if legacy_spool_dir.is_dir() and not spool_dir.exists():
+            os.replace(legacy_spool_dir, spool_dir)
+        _sms_ingest_queue = SMSIngestQueue(spool_dir, ingest_inbound_sms)
+
+    return _sms_ingest_queue
+
+
+async def start_sms_ingest() -> None:
+    """Start the background ingest workers (replays any spooled webhooks and buffered SMS)."""
+    await _get_message_buffer().start()
+    await get_sms_ingest_queue().start()
+
+
+async def stop_sms_ingest() -> int:
+    """Drain and stop the ingest workers, then flush the SMS buffer; returns records left spooled."""
+    remaining = 0
+    if _sms_ingest_queue is not None:
+        remaining = await _sms_ingest_queue.stop()
+    if _sms_message_buffer is not None:
+        await _sms_message_buffer.flush_all()
+    return remaining
+
+
 async def _is_jorb_contact(phone_number: str) -> bool:
     """
     Check if a phone number belongs to a contact in any active jorb.
@@ -252,6 +294,18 @@ def _generate_message_id(timestamp: datetime, remote_number: str) -> str:
     return f"sms_{ts}_{remote_number}"
 
 
+def _message_timestamp(parsed: dict[str, Any], fallback: str | None = None) -> datetime:
+    """Telnyx `received_at`, else the fallback (when the webhook arrived), else now."""
+    for candidate in (parsed.get("received_at"), fallback):
+        if not candidate:
+            continue
+        try:
+            return datetime.fromisoformat(candidate.replace("Z", "+00:00"))
+        except (ValueError, AttributeError):
+            continue
+    return datetime.now(timezone.utc)
+
+
 def _parse_telnyx_payload(data: dict[str, Any]) -> dict[str, Any] | None:
     """
     Extract message data from Telnyx webhook payload.
@@ -322,12 +376,14 @@ async def sms_webhook_handler(request: Request) -> JSONResponse:
 
     This endpoint is called by Telnyx when a message is received.
     It does NOT require API key authentication (Telnyx sends webhooks directly).
+    The payload is spooled to disk and acknowledged right away; it is
+    ingested by the background workers started with `start_sms_ingest`.
 
     Args:
         request: Starlette request with JSON body
 
     Returns:
-        JSON response with status: 'processed' or 'skipped'
+        JSON response with status: 'accepted' or 'skipped'
     """
     try:
         body = await request.json()
@@ -339,13 +395,51 @@ async def sms_webhook_handler(request: Request) -> JSONResponse:
         )
 
     # Parse Telnyx payload
-    parsed = _parse_telnyx_payload(body)
+    parsed = _parse_telnyx_payload(body) if isinstance(body, dict) else None
 
     if parsed is None:
         # Not an inbound message we should process
         logger.debug("Skipping non-inbound SMS webhook event")
         return JSONResponse({"status": "skipped", "reason": "not inbound message"})
 
+    try:
+        ingest_id = await get_sms_ingest_queue().enqueue(body, key=parsed["from_number"])
+    except Exception as exc:
+        # Not spooled, so let Telnyx retry.
+        logger.error("Failed to spool inbound SMS: %s", exc)
+        return JSONResponse(
+            {"status": "error", "reason": str(exc)},
+            status_code=500,
+        )
+
+    logger.info(
+        "Accepted inbound SMS from %s to %s (ingest %s)",
+        parsed["from_number"],
+        parsed["to_number"],
+        ingest_id,
+    )
+    return JSONResponse({"status": "accepted", "ingest_id": ingest_id})
+
+
+async def ingest_inbound_sms(record: dict[str, Any]) -> dict[str, Any]:
+    """
+    Ingest one spooled Telnyx webhook.
+
+    Looks up the contact, handles compliance keywords, stores the message
+    (downloading attachments) and routes it to the jorb buffer or a Telegram
+    notification. Raises if the message could not be stored, so the ingest
+    queue retries it.
+
+    Args:
+        record: Spool record with the raw webhook `payload` and `spooled_at`
+
+    Returns:
+        Summary with status 'processed' or 'skipped'
+    """
+    parsed = _parse_telnyx_payload(record.get("payload") or {})
+    if parsed is None:
+        return {"status": "skipped", "reason": "not inbound message"}
+
     logger.info(
         "Processing inbound SMS from %s to %s",
         parsed["from_number"],
@@ -355,21 +449,13 @@ async def sms_webhook_handler(request: Request) -> JSONResponse:
     # Look up contact for the sender
     contact_lookup = ContactLookup()
     try:
-        contact_info = contact_lookup.lookup(parsed["from_number"])
+        contact_info = await asyncio.to_thread(contact_lookup.lookup, parsed["from_number"])
     except Exception as exc:
         logger.warning("Contact lookup failed: %s", exc)
         contact_info = None
 
     # Determine timestamp
-    if parsed.get("received_at"):
-        try:
-            timestamp = datetime.fromisoformat(
-                parsed["received_at"].replace("Z", "+00:00")
-            )
-        except (ValueError, AttributeError):
-            timestamp = datetime.now(timezone.utc)
-    else:
-        timestamp = datetime.now(timezone.utc)
+    timestamp = _message_timestamp(parsed, record.get("spooled_at"))
 
     # Create contact object if found
     contact = None
@@ -438,10 +524,7 @@ async def sms_webhook_handler(request: Request) -> JSONResponse:
         logger.info("Stored SMS message at %s", filepath)
     except Exception as exc:
         logger.error("Failed to store SMS message: %s", exc)
-        return JSONResponse(
-            {"status": "error", "reason": str(exc)},
-            status_code=500,
-        )
+        raise
 
     # Check if sender is in any active jorb's contacts
     is_jorb_participant = await _is_jorb_contact(parsed["from_number"])
@@ -475,7 +558,7 @@ async def sms_webhook_handler(request: Request) -> JSONResponse:
             attachment_count=len(parsed["attachments"]),
         )
 
-    response_data = {
+    response_data: dict[str, Any] = {
         "status": "processed",
         "message_id": message_id,
         "contact": contact.name if contact else None,
@@ -488,7 +571,15 @@ async def sms_webhook_handler(request: Request) -> JSONResponse:
     if jorb_routed:
         response_data["jorb_routed"] = True
 
-    return JSONResponse(response_data)
+    return response_data
 
 
-__all__ = ["sms_webhook_handler", "_get_message_buffer", "_is_jorb_contact"]
+__all__ = [
+    "sms_webhook_handler",
+    "ingest_inbound_sms",
+    "get_sms_ingest_queue",
+    "start_sms_ingest",
+    "stop_sms_ingest",
+    "_get_message_buffer",
+    "_is_jorb_contact",
+]
@@ -3,6 +3,22 @@ Stytch session validation middleware for protected routes.
 
 Validates the stytch_session_token cookie by calling the Stytch API.
 
+Every dashboard API call authenticates, so validators are shared per
+project and reuse one pooled HTTP client, and validated sessions are cached
+by token hash:
+
+- a valid session is reused until its `expires_at`, and for at most
+  `STYTCH_SESSION_CACHE_SECONDS` (which bounds how long a revoked session
+  keeps working);
+- a token Stytch rejects (4xx) is remembered for
+  `STYTCH_NEGATIVE_CACHE_SECONDS`, so a stale cookie polling the dashboard
+  does not hit Stytch on every request;
+- network errors and 5xx/429 responses are never cached;
+- at most `STYTCH_SESSION_CACHE_SIZE` tokens are kept (least recently used
+  are evicted), and concurrent checks of one token share a single call.
+
+The email-domain check runs on every request, cached or not.
+
 Credentials are loaded from:
 1. Vault (if configured) - secret/frank-bot/stytch
 2. Environment variables (fallback) - STYTCH_PROJECT_ID, STYTCH_SECRET
@@ -10,8 +26,12 @@ Credentials are loaded from:
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
 import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from typing import Callable, Awaitable
 
 import httpx
@@ -20,9 +40,14 @@ from starlette.requests import Request
 from starlette.responses import JSONResponse
 
 from config import get_settings
+from services.routing_cache import RoutingCache
 
 logger = logging.getLogger(__name__)
 
+STYTCH_SESSION_CACHE_SECONDS = float(os.getenv("STYTCH_SESSION_CACHE_SECONDS", "60"))
+STYTCH_NEGATIVE_CACHE_SECONDS = float(os.getenv("STYTCH_NEGATIVE_CACHE_SECONDS", "5"))
+STYTCH_SESSION_CACHE_SIZE = int(os.getenv("STYTCH_SESSION_CACHE_SIZE", "1024"))
+
 
 def _load_stytch_credentials() -> tuple[str | None, str | None]:
     """
@@ -80,20 +105,67 @@ STYTCH_API_BASE = "https://api.stytch.com"
 STYTCH_TEST_API_BASE = "https://test.stytch.com"
 
 
+@dataclass(frozen=True, slots=True)
+class _SessionLookup:
+    """Outcome of one Stytch authenticate call and how long it may be reused."""
+
+    session: dict | None
+    ttl_seconds: float = 0.0
+
+
+def _seconds_until(timestamp: object) -> float | None:
+    """Seconds from now until an ISO-8601 timestamp, or None if unparseable."""
+    if not isinstance(timestamp, str) or not timestamp:
+        return None
+    try:
+        when = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return (when - datetime.now(timezone.utc)).total_seconds()
+
+
 class StytchSessionValidator:
     """
     Validates Stytch session tokens.
 
     Uses the Stytch API to verify session validity. Supports both
-    test and live environments based on project ID prefix.
+    test and live environments based on project ID prefix. Results are
+    cached by token hash (see the module docstring).
     """
 
-    def __init__(self, project_id: str, secret: str):
+    def __init__(
+        self,
+        project_id: str,
+        secret: str,
+        *,
+        cache_seconds: float = STYTCH_SESSION_CACHE_SECONDS,
+        negative_cache_seconds: float = STYTCH_NEGATIVE_CACHE_SECONDS,
+        cache_size: int = STYTCH_SESSION_CACHE_SIZE,
+    ):
         self._project_id = project_id
         self._secret = secret
         # Test projects start with "project-test-"
         self._is_test = project_id.startswith("project-test-")
         self._api_base = STYTCH_TEST_API_BASE if self._is_test else STYTCH_API_BASE
+        self._cache_seconds = cache_seconds
+        self._negative_cache_seconds = negative_cache_seconds
+        self._sessions: RoutingCache[_SessionLookup] = RoutingCache(
+            ttl_seconds=cache_seconds,
+            max_entries=cache_size,
+            stats_name="stytch_sessions",
+        )
+        self._client: httpx.AsyncClient | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+
+    def _http_client(self) -> httpx.AsyncClient:
+        """The pooled client, recreated if closed or owned by another event loop."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(timeout=10.0)
+            self._client_loop = loop
+        return self._client
 
     async def validate_session(self, session_token: str) -> dict | None:
         """
@@ -105,45 +177,72 @@ class StytchSessionValidator:
         Returns:
             Session data dict if valid, None if invalid.
         """
+        key = hashlib.sha256(session_token.encode("utf-8")).hexdigest()
+
+        async def load() -> tuple[_SessionLookup, bool]:
+            lookup = await self._authenticate(session_token)
+            return lookup, lookup.ttl_seconds > 0
+
+        lookup, _ = await self._sessions.get_or_load(key, load, ttl=lambda cached: cached.ttl_seconds)
+        # Callers get their own copy; cached entries are shared.
+        return dict(lookup.session) if lookup.session is not None else None
+
+    async def _authenticate(self, session_token: str) -> _SessionLookup:
         # Use B2B endpoint for organization-based auth
         url = f"{self._api_base}/v1/b2b/sessions/authenticate"
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    url,
-                    json={"session_token": session_token},
-                    auth=(self._project_id, self._secret),
-                    timeout=10.0,
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    session = data.get("session") or {}
-                    member = data.get("member") or {}
-                    organization = data.get("organization") or {}
-                    return {
-                        "session_id": session.get("session_id"),
-                        "user_id": session.get("user_id"),
-                        "started_at": session.get("started_at"),
-                        "expires_at": session.get("expires_at"),
-                        "member_id": member.get("member_id") or session.get("member_id"),
-                        "member_email": member.get("email_address") or member.get("email"),
-                        "organization_id": organization.get("organization_id")
-                        or session.get("organization_id"),
-                        "organization_slug": organization.get("organization_slug"),
-                    }
-                else:
-                    logger.warning(
-                        "Stytch session validation failed: %s %s",
-                        response.status_code,
-                        response.text[:200],
-                    )
-                    return None
-
-            except httpx.RequestError as exc:
-                logger.error("Stytch API request failed: %s", exc)
-                return None
+        try:
+            response = await self._http_client().post(
+                url,
+                json={"session_token": session_token},
+                auth=(self._project_id, self._secret),
+                timeout=10.0,
+            )
+        except httpx.RequestError as exc:
+            logger.error("Stytch API request failed: %s", exc)
+            return _SessionLookup(None)
+
+        if response.status_code == 200:
+            data = response.json()
+            session = data.get("session") or {}
+            member = data.get("member") or {}
+            organization = data.get("organization") or {}
+            session_data = {
+                "session_id": session.get("session_id"),
+                "user_id": session.get("user_id"),
+                "started_at": session.get("started_at"),
+                "expires_at": session.get("expires_at"),
+                "member_id": member.get("member_id") or session.get("member_id"),
+                "member_email": member.get("email_address") or member.get("email"),
+                "organization_id": organization.get("organization_id")
+                or session.get("organization_id"),
+                "organization_slug": organization.get("organization_slug"),
+            }
+            remaining = _seconds_until(session_data["expires_at"])
+            # Cached until the session expires (the cache caps this at `cache_seconds`).
+            ttl = self._cache_seconds if remaining is None else remaining
+            return _SessionLookup(session_data, ttl)
+
+        logger.warning(
+            "Stytch session validation failed: %s %s",
+            response.status_code,
+            response.text[:200],
+        )
+        # Only a definitive rejection is remembered; outages and rate limits are retried.
+        definitive = 400 <= response.status_code < 500 and response.status_code != 429
+        return _SessionLookup(None, self._negative_cache_seconds if definitive else 0.0)
+
+
+_validators: dict[tuple[str, str], StytchSessionValidator] = {}
+
+
+def get_session_validator(project_id: str, secret: str) -> StytchSessionValidator:
+    """Shared validator (and session cache) for a Stytch project."""
+    key = (project_id, secret)
+    validator = _validators.get(key)
+    if validator is None:
+        validator = _validators[key] = StytchSessionValidator(project_id, secret)
+    return validator
 
 
 async def get_stytch_session(
@@ -170,7 +269,7 @@ async def get_stytch_session(
     if not session_token:
         raise HTTPException(status_code=401, detail="Missing Stytch session token")
 
-    validator = StytchSessionValidator(project_id, secret)
+    validator = get_session_validator(project_id, secret)
     session_data = await validator.validate_session(session_token)
     if not session_data:
         raise HTTPException(status_code=401, detail="Invalid or expired Stytch session")
@@ -208,6 +307,7 @@ def require_stytch_session(
 
 __all__ = [
     "StytchSessionValidator",
+    "get_session_validator",
     "get_stytch_session",
     "require_stytch_session",
 ]
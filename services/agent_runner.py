@@ -12,12 +12,12 @@ Each jorb has its own dedicated LLM session with personality and full history.
 from __future__ import annotations
 
 import asyncio
-import ast
 import hashlib
 import json
 import logging
 import os
 import re
+import time
 import traceback
 from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
@@ -36,6 +36,14 @@ from services.jorb_storage import (
 # Import new switchboard and session components
 from services.switchboard import Switchboard, RoutingDecision, get_switchboard
 from services.event_traces import get_event_trace_store
+from services.llm_client import chat_completion
+from meta.script_pool import MODE_SNIPPET, get_script_pool
+from services.prompt_context import (
+    get_section_cache,
+    jorb_version,
+    messages_version,
+    record_prompt_build,
+)
 from services.jorb_session import (
     JorbSession,
     JorbSessionResponse,
@@ -310,6 +318,18 @@ def _format_jorb_for_context(jorb: Jorb, messages: list[JorbMessage]) -> dict:
     }
 
 
+def _cached_jorb_context(jorb: Jorb, messages: list[JorbMessage]) -> dict:
+    """`_format_jorb_for_context`, reused while the jorb and its recent messages are unchanged."""
+    recent = messages[-10:]
+    key = (
+        "agent_task",
+        jorb_version(jorb),
+        messages_version(recent),
+    )
+    # Shallow copy so callers can annotate the dict without touching the cache.
+    return dict(get_section_cache().get_or_render(key, lambda: _format_jorb_for_context(jorb, messages)))
+
+
 def _humanize_android_terminal_update(task_id: str, status: str, task: dict[str, Any]) -> str:
     """
     Build a human-friendly terminal summary for Android task polling.
@@ -524,7 +544,7 @@ class AgentRunner:
 
         # Active tasks section
         context["active_tasks"] = [
-            _format_jorb_for_context(jwm.jorb, jwm.messages)
+            _cached_jorb_context(jwm.jorb, jwm.messages)
             for jwm in open_jorbs
         ]
 
@@ -559,18 +579,22 @@ class AgentRunner:
                 "openai package not installed. Run: poetry add openai"
             )
 
-        client = openai.OpenAI(api_key=self._api_key)
-
+        build_started = time.perf_counter()
+        # Compact JSON: indentation only costs tokens.
+        user_content = json.dumps(context, separators=(",", ":"))
+        record_prompt_build("agent_runner", build_started, self._system_prompt, user_content)
         messages = [
             {"role": "system", "content": self._system_prompt},
-            {"role": "user", "content": json.dumps(context, indent=2)},
+            {"role": "user", "content": user_content},
         ]
 
         try:
             logger.info("Calling %s agent with context for %d active tasks",
                        AGENT_MODEL, len(context.get("active_tasks", [])))
 
-            response = client.chat.completions.create(
+            response = await chat_completion(
+                openai.OpenAI,
+                self._api_key,
                 model=AGENT_MODEL,
                 messages=messages,
                 response_format={"type": "json_object"},
@@ -1335,73 +1359,35 @@ class AgentRunner:
         Returns:
             Dict with keys: script, result, success, error, timestamp
         """
-        from meta.api import FrankAPI
-
         timestamp = datetime.now(timezone.utc).isoformat()
 
-        def _run_script() -> Any:
-            frank = FrankAPI()
-            namespace: dict[str, Any] = {"frank": frank, "__builtins__": __builtins__}
-            # Try as expression first (e.g. frank.calendar.events(...))
-            try:
-                return eval(script_str, namespace)
-            except SyntaxError:
-                # Fall back to exec for multi-line scripts.
-                #
-                # Critical: many model-generated scripts end with a bare expression like:
-                #   d = frank.diagnostics.full()
-                #   {'diagnostics': d, ...}
-                # In that case, `exec()` discards the final value, so the agent "can't see"
-                # the output and may retry in a tight loop. We capture a trailing expression
-                # by rewriting the final AST node into an assignment.
-                try:
-                    tree = ast.parse(script_str, mode="exec")
-                except SyntaxError:
-                    tree = None
-
-                if tree and tree.body and isinstance(tree.body[-1], ast.Expr):
-                    tree.body[-1] = ast.Assign(  # type: ignore[assignment]
-                        targets=[ast.Name(id="__frank_last_expr__", ctx=ast.Store())],
-                        value=tree.body[-1].value,  # type: ignore[attr-defined]
-                    )
-                    ast.fix_missing_locations(tree)
-                    code = compile(tree, "<jorb_script>", "exec")
-                    exec(code, namespace)
-                else:
-                    exec(script_str, namespace)
-
-                # Convention: scripts should assign their final payload to `result`.
-                #
-                # In practice, models often use `res = {...}` (or `out`/`output`).
-                # Returning a best-effort fallback here avoids "successful-but-None"
-                # loops where the agent keeps retrying because it can't see output.
-                if "result" in namespace:
-                    return namespace.get("result")
-                if "__frank_last_expr__" in namespace:
-                    return namespace.get("__frank_last_expr__")
-                for key in ("res", "out", "output", "data"):
-                    if key in namespace:
-                        return namespace.get(key)
-                return None
-
+        # Scripts run in a pool worker process (killed on timeout). FrankAPI
+        # calls made by the script come back to this process and are submitted
+        # to the main loop via run_coroutine_threadsafe() (see meta/api.py), so
+        # the loop must stay free while we wait.
         try:
-            try:
-                # IMPORTANT: Do NOT block the main asyncio event loop while
-                # running scripts. Scripts frequently call FrankAPI methods
-                # which submit coroutines back to the main loop via
-                # run_coroutine_threadsafe() (see meta/api.py). If we block the
-                # main loop waiting for the script thread, we deadlock.
-                result_value = await asyncio.wait_for(
-                    asyncio.to_thread(_run_script),
-                    timeout=timeout,
-                )
+            outcome = await get_script_pool().run_async(
+                MODE_SNIPPET, script_str, timeout_seconds=timeout
+            )
+        except Exception as exc:
+            tb_str = traceback.format_exc()
+            result_dict = {
+                "script": script_str[:500],
+                "result": None,
+                "success": False,
+                "error": f"{type(exc).__name__}: {exc}",
+                "traceback": tb_str[:1000],
+                "timestamp": timestamp,
+            }
+        else:
+            if outcome.ok:
                 result_dict = {
                     "script": script_str[:500],
-                    "result": result_value,
+                    "result": outcome.value,
                     "success": True,
                     "timestamp": timestamp,
                 }
-            except asyncio.TimeoutError:
+            elif outcome.timed_out:
                 result_dict = {
                     "script": script_str[:500],
                     "result": None,
@@ -1409,20 +1395,15 @@ class AgentRunner:
                     "error": f"Script timed out after {timeout} seconds",
                     "timestamp": timestamp,
                 }
-            except Exception as exc:
-                tb_str = traceback.format_exc()
+            else:
                 result_dict = {
                     "script": script_str[:500],
                     "result": None,
                     "success": False,
-                    "error": f"{type(exc).__name__}: {exc}",
-                    "traceback": tb_str[:1000],
+                    "error": f"{outcome.error_type}: {outcome.error}",
+                    "traceback": outcome.traceback[:1000],
                     "timestamp": timestamp,
                 }
-        finally:
-            # No explicit executor lifecycle; asyncio.to_thread uses the loop's
-            # default executor.
-            pass
 
         # Store the result
         try:
@@ -2,23 +2,32 @@
 Audit logging for Android phone actions.
 
 Provides JSON lines logging for Android phone automation actions with:
-- Rotating daily log files (30 day retention)
+- Rotation at UTC midnight or when the log reaches `AUDIT_LOG_MAX_BYTES`,
+  into gzip archives kept for 30 days
 - Structured JSON format for easy parsing
 - Sensitive data sanitization (screenshots truncated)
+- Aggregate stats kept as running counters in a sidecar file
+  (``android_audit.stats.json``), so neither recent entries nor stats
+  re-read the whole log
 """
 
 from __future__ import annotations
 
+import gzip
 import json
 import logging
 import os
+import shutil
+import threading
 import time
 from dataclasses import dataclass, field, asdict
-from datetime import datetime
-from logging.handlers import TimedRotatingFileHandler
+from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
+from services.file_store import iter_jsonl_reverse, read_json_file, write_json_atomic
+
 logger = logging.getLogger(__name__)
 
 # Default audit log location
@@ -27,6 +36,13 @@ DEFAULT_AUDIT_LOG_PATH = "./data/android_audit.log"
 # How many days of logs to keep
 AUDIT_LOG_RETENTION_DAYS = 30
 
+# Rotate the live log once it reaches this size (it also rotates daily).
+AUDIT_LOG_MAX_BYTES = int(float(os.getenv("ANDROID_AUDIT_LOG_MAX_MB", "20")) * 1024 * 1024)
+
+# Persist the stats sidecar at most this often (and on every rotation). After
+# a crash, entries past the sidecar's recorded offset are re-counted on load.
+STATS_FLUSH_INTERVAL_SECONDS = 5.0
+
 
 @dataclass
 class AuditEntry:
@@ -53,55 +69,161 @@ class AuditEntry:
         return json.dumps(data, default=str)
 
 
+def _empty_stats() -> dict[str, Any]:
+    return {
+        "total_actions": 0,
+        "successful_actions": 0,
+        "failed_actions": 0,
+        "total_tokens_used": 0,
+        "actions_by_type": {},
+    }
+
+
+def _count_entry(stats: dict[str, Any], entry: dict[str, Any]) -> None:
+    stats["total_actions"] += 1
+    if entry.get("success", True):
+        stats["successful_actions"] += 1
+    else:
+        stats["failed_actions"] += 1
+    stats["total_tokens_used"] += entry.get("tokens_used", 0) or 0
+    action = entry.get("action", "unknown")
+    stats["actions_by_type"][action] = stats["actions_by_type"].get(action, 0) + 1
+
+
+def _compress_archive(path: Path) -> None:
+    """Gzip a rotated log next to itself, then remove the original."""
+    target = path.with_name(path.name + ".gz")
+    temp = path.with_name(path.name + ".gz.tmp")
+    try:
+        with path.open("rb") as src, gzip.open(temp, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(temp, target)
+        path.unlink()
+    except OSError as e:
+        logger.warning("Failed to compress audit archive %s: %s", path, e)
+
+
 class AndroidAuditLogger:
     """
     Audit logger for Android phone actions.
 
-    Uses rotating daily log files with JSON lines format.
+    Writes JSON lines to a live log that rotates into gzip archives, and
+    keeps aggregate stats as counters updated on every write.
     """
 
-    def __init__(self, log_path: str | None = None):
+    def __init__(self, log_path: str | None = None, max_bytes: int | None = None):
         """
         Initialize the audit logger.
 
         Args:
             log_path: Path to the audit log file. Defaults to ./data/android_audit.log
+            max_bytes: Rotate the live log at this size. Defaults to AUDIT_LOG_MAX_BYTES
         """
         self._log_path = log_path or DEFAULT_AUDIT_LOG_PATH
-        self._file_handler: TimedRotatingFileHandler | None = None
-        self._audit_logger: logging.Logger | None = None
-        self._initialized = False
+        self._path = Path(self._log_path)
+        self._stats_path = self._path.with_name(self._path.stem + ".stats.json")
+        self._max_bytes = max_bytes or AUDIT_LOG_MAX_BYTES
+        self._lock = threading.RLock()
+        self._handle = None
+        self._day: str | None = None
+        self._stats: dict[str, Any] | None = None
+        self._stats_dirty = False
+        self._stats_flushed_at = 0.0
+        self._rotation_thread: threading.Thread | None = None
+        self._prune_lock = threading.Lock()
+
+    def _load_stats(self) -> dict[str, Any]:
+        """Load counters from the sidecar, counting any entries it missed."""
+        if self._stats is not None:
+            return self._stats
+
+        stats = _empty_stats()
+        offset = 0
+        try:
+            saved = read_json_file(self._stats_path)
+        except (OSError, ValueError):
+            saved = None
+        if isinstance(saved, dict) and isinstance(saved.get("stats"), dict):
+            stats.update(saved["stats"])
+            stats["actions_by_type"] = dict(stats.get("actions_by_type") or {})
+            offset = int(saved.get("log_offset") or 0)
+
+        size = self._path.stat().st_size if self._path.exists() else 0
+        if offset > size:
+            # The live log was replaced under the sidecar; count it afresh.
+            offset = 0
+        if size > offset:
+            with self._path.open("rb") as f:
+                f.seek(offset)
+                for raw in f:
+                    try:
+                        _count_entry(stats, json.loads(raw))
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        continue
+            self._stats_dirty = True
 
-    def _ensure_initialized(self) -> None:
-        """Lazy initialization of the file handler."""
-        if self._initialized:
-            return
+        self._stats = stats
+        return stats
 
-        # Ensure data directory exists
-        log_dir = Path(self._log_path).parent
-        log_dir.mkdir(parents=True, exist_ok=True)
-
-        # Create a separate logger for audit entries
-        self._audit_logger = logging.getLogger("android_audit")
-        self._audit_logger.setLevel(logging.INFO)
-        self._audit_logger.propagate = False  # Don't propagate to root logger
-
-        # Rotating file handler - daily rotation, keep 30 days
-        self._file_handler = TimedRotatingFileHandler(
-            self._log_path,
-            when="midnight",
-            interval=1,
-            backupCount=AUDIT_LOG_RETENTION_DAYS,
-            encoding="utf-8",
+    def _flush_stats(self, force: bool = False) -> None:
+        if self._stats is None or not self._stats_dirty:
+            return
+        now = time.monotonic()
+        if not force and now - self._stats_flushed_at < STATS_FLUSH_INTERVAL_SECONDS:
+            return
+        offset = self._path.stat().st_size if self._path.exists() else 0
+        try:
+            write_json_atomic(self._stats_path, {"log_offset": offset, "stats": self._stats})
+        except OSError as e:
+            logger.warning("Failed to write audit stats: %s", e)
+            return
+        self._stats_dirty = False
+        self._stats_flushed_at = now
+
+    def _open_log(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._load_stats()
+        if self._path.exists() and self._path.stat().st_size > 0:
+            mtime = self._path.stat().st_mtime
+            self._day = datetime.fromtimestamp(mtime, timezone.utc).strftime("%Y-%m-%d")
+        else:
+            self._day = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        self._handle = self._path.open("a", encoding="utf-8")
+
+    def _rotate(self) -> None:
+        """Move the live log to an archive, compress it in the background, prune old ones."""
+        self._handle.close()
+        self._handle = None
+        archive = self._path.with_name(f"{self._path.name}.{self._day}")
+        n = 1
+        while archive.exists() or archive.with_name(archive.name + ".gz").exists():
+            archive = self._path.with_name(f"{self._path.name}.{self._day}.{n}")
+            n += 1
+        os.replace(self._path, archive)
+        # The counters now cover the whole (empty) live log.
+        self._stats_dirty = True
+        self._flush_stats(force=True)
+        self._rotation_thread = threading.Thread(
+            target=self._compress_and_prune, name="android-audit-rotate", daemon=True
         )
-        # Custom suffix for rotated files
-        self._file_handler.suffix = "%Y-%m-%d"
-
-        # No formatter - we output raw JSON lines
-        self._file_handler.setFormatter(logging.Formatter("%(message)s"))
-        self._audit_logger.addHandler(self._file_handler)
-
-        self._initialized = True
+        self._rotation_thread.start()
+        self._open_log()
+
+    def _compress_and_prune(self) -> None:
+        cutoff = time.time() - AUDIT_LOG_RETENTION_DAYS * 86400
+        prefix = self._path.name + "."
+        with self._prune_lock:
+            for path in sorted(self._path.parent.glob(prefix + "*")):
+                if path.name.endswith(".tmp") or path == self._stats_path:
+                    continue
+                try:
+                    if path.stat().st_mtime < cutoff:
+                        path.unlink()
+                    elif not path.name.endswith(".gz"):
+                        # This rotation's archive, or one left by an interrupted run.
+                        _compress_archive(path)
+                except OSError:
+                    continue
 
     def log_action(
         self,
@@ -127,8 +249,6 @@ class AndroidAuditLogger:
             duration_ms: Action duration in milliseconds
             api_key: API key used (only first 8 chars logged)
         """
-        self._ensure_initialized()
-
         # Sanitize parameters - remove any sensitive data
         safe_params = self._sanitize_params(parameters or {})
 
@@ -142,8 +262,9 @@ class AndroidAuditLogger:
             element_count = result.get("element_count")
 
         # Create audit entry
+        now = datetime.now(timezone.utc)
         entry = AuditEntry(
-            timestamp=datetime.utcnow().isoformat() + "Z",
+            timestamp=now.replace(tzinfo=None).isoformat() + "Z",
             action=action,
             parameters=safe_params,
             result="success" if success else "failure",
@@ -155,10 +276,24 @@ class AndroidAuditLogger:
             screenshot_size_bytes=screenshot_size,
             element_count=element_count,
         )
+        line = entry.to_json_line() + "\n"
 
         # Write to log
-        if self._audit_logger:
-            self._audit_logger.info(entry.to_json_line())
+        with self._lock:
+            try:
+                if self._handle is None:
+                    self._open_log()
+                size = self._handle.tell()
+                if size > 0 and (now.strftime("%Y-%m-%d") != self._day or size >= self._max_bytes):
+                    self._rotate()
+                self._handle.write(line)
+                self._handle.flush()
+            except OSError as e:
+                logger.warning("Failed to write audit log: %s", e)
+                return
+            _count_entry(self._load_stats(), {"action": action, "success": success, "tokens_used": tokens_used})
+            self._stats_dirty = True
+            self._flush_stats()
 
     def _sanitize_params(self, params: dict[str, Any]) -> dict[str, Any]:
         """
@@ -187,7 +322,10 @@ class AndroidAuditLogger:
         action_filter: str | None = None,
     ) -> list[dict[str, Any]]:
         """
-        Get recent audit log entries.
+        Get recent audit log entries from the live log.
+
+        Reads backwards from the end of the file, so only the blocks holding
+        the returned entries are read.
 
         Args:
             limit: Maximum number of entries to return
@@ -196,90 +334,39 @@ class AndroidAuditLogger:
         Returns:
             List of audit entries (most recent first)
         """
-        entries: list[dict[str, Any]] = []
-
-        if not os.path.exists(self._log_path):
-            return entries
-
         try:
-            with open(self._log_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-
-            # Parse from the end (most recent)
-            for line in reversed(lines):
-                line = line.strip()
-                if not line:
-                    continue
-
-                try:
-                    entry = json.loads(line)
-
-                    # Apply filter if specified
-                    if action_filter and entry.get("action") != action_filter:
-                        continue
-
-                    entries.append(entry)
-
-                    if len(entries) >= limit:
-                        break
-
-                except json.JSONDecodeError:
-                    # Skip malformed entries
-                    continue
-
+            entries = (
+                entry
+                for entry in iter_jsonl_reverse(self._path)
+                if isinstance(entry, dict) and (not action_filter or entry.get("action") == action_filter)
+            )
+            return list(islice(entries, max(limit, 0)))
         except IOError as e:
             logger.warning("Failed to read audit log: %s", e)
-
-        return entries
+            return []
 
     def get_stats(self) -> dict[str, Any]:
         """
-        Get aggregate stats from the audit log.
+        Get aggregate stats over every entry logged (including rotated ones).
 
         Returns:
             Dict with action counts, total tokens, error counts, etc.
         """
-        stats: dict[str, Any] = {
-            "total_actions": 0,
-            "successful_actions": 0,
-            "failed_actions": 0,
-            "total_tokens_used": 0,
-            "actions_by_type": {},
-        }
-
-        if not os.path.exists(self._log_path):
-            return stats
-
-        try:
-            with open(self._log_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    try:
-                        entry = json.loads(line)
-                        stats["total_actions"] += 1
-
-                        if entry.get("success", True):
-                            stats["successful_actions"] += 1
-                        else:
-                            stats["failed_actions"] += 1
-
-                        stats["total_tokens_used"] += entry.get("tokens_used", 0)
-
-                        action = entry.get("action", "unknown")
-                        if action not in stats["actions_by_type"]:
-                            stats["actions_by_type"][action] = 0
-                        stats["actions_by_type"][action] += 1
-
-                    except json.JSONDecodeError:
-                        continue
-
-        except IOError as e:
-            logger.warning("Failed to read audit log for stats: %s", e)
-
-        return stats
+        with self._lock:
+            try:
+                stats = self._load_stats()
+            except IOError as e:
+                logger.warning("Failed to read audit log for stats: %s", e)
+                return _empty_stats()
+            return {**stats, "actions_by_type": dict(stats["actions_by_type"])}
+
+    def close(self) -> None:
+        """Close the live log and persist the stats sidecar."""
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+            self._flush_stats(force=True)
 
 
 # Module-level singleton
@@ -302,4 +389,6 @@ def get_android_audit_logger() -> AndroidAuditLogger:
 def reset_audit_logger() -> None:
     """Reset the audit logger (for testing)."""
     global _audit_logger
+    if _audit_logger is not None:
+        _audit_logger.close()
     _audit_logger = None
@@ -22,8 +22,12 @@ import logging
 import os
 import re
 import time
+from collections.abc import Sequence
 from dataclasses import dataclass
 
+from services.android_recording import AdbRecorder, AdbReplay
+from services.android_shell import AdbShellSession, ShellSessionLost, ShellSessionUnavailable
+from services.android_ui_tree import UIElement, UITree, parse_ui_tree
 from services.stats import stats
 
 logger = logging.getLogger(__name__)
@@ -33,6 +37,20 @@ logger = logging.getLogger(__name__)
 DEFAULT_ADB_PORT = 5555
 DEFAULT_ADB_TIMEOUT = 30  # seconds
 
+# Run `adb shell` commands over one long-lived shell per device instead of
+# spawning `adb` for each command (falls back to one-shot commands).
+ADB_PERSISTENT_SHELL = os.getenv("ANDROID_ADB_PERSISTENT_SHELL", "true").lower() in ("true", "1", "yes")
+
+# Record every ADB command and response to a new file in this directory
+# (see `services.android_recording`).
+ADB_RECORD_DIR = os.getenv("ANDROID_ADB_RECORD_DIR", "").strip()
+
+# Replay this recording instead of talking to a device (fake ADB backend).
+ADB_REPLAY_PATH = os.getenv("ANDROID_ADB_REPLAY_PATH", "").strip()
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+UI_DUMP_DEVICE_PATH = "/sdcard/ui_dump.xml"
+
 
 @dataclass
 class ADBResult:
@@ -42,28 +60,33 @@ class ADBResult:
     output: str
     error: str | None = None
     elapsed_ms: float = 0
+    # Raw stdout for binary commands (see `_run_adb(..., binary=True)`).
+    data: bytes = b""
 
 
 @dataclass
-class UIElement:
-    """Represents a UI element from the accessibility tree."""
-
-    text: str
-    content_desc: str
-    resource_id: str
-    class_name: str
-    package: str
-    bounds: tuple[int, int, int, int]  # left, top, right, bottom
-    clickable: bool
-    scrollable: bool
-    focused: bool
-    enabled: bool
+class ScreenCapture:
+    """A screenshot and UI XML captured together."""
 
-    @property
-    def center(self) -> tuple[int, int]:
-        """Calculate center coordinates for tapping."""
-        left, top, right, bottom = self.bounds
-        return ((left + right) // 2, (top + bottom) // 2)
+    screenshot: ADBResult  # PNG bytes in `data`
+    xml: ADBResult  # XML text in `output`
+    elapsed_ms: float = 0
+
+
+def _extract_hierarchy_xml(output: str) -> str | None:
+    """
+    Pull the `<hierarchy>` document out of uiautomator output.
+
+    `uiautomator dump /dev/tty` appends a status line ("UI hierchary dumped
+    to: /dev/tty") after the XML. Returns None when there is no hierarchy.
+    """
+    start = output.find("<?xml")
+    if start < 0:
+        start = output.find("<hierarchy")
+    end = output.rfind("</hierarchy>")
+    if start < 0 or end < 0:
+        return None
+    return output[start : end + len("</hierarchy>")]
 
 
 class AndroidClient:
@@ -80,7 +103,17 @@ class AndroidClient:
         port: int | None = None,
         serial: str | None = None,
         timeout: int = DEFAULT_ADB_TIMEOUT,
+        persistent_shell: bool | None = None,
+        recorder: AdbRecorder | None = None,
+        replay: AdbReplay | None = None,
     ):
+        if replay is None and ADB_REPLAY_PATH:
+            replay = AdbReplay.from_file(ADB_REPLAY_PATH)
+        self._replay = replay
+        if replay is not None and not serial:
+            # Replays answer as the recorded device.
+            serial = replay.serial or "replay"
+
         def _env_str(name: str) -> str:
             raw = os.getenv(name)
             return (raw or "").strip()
@@ -144,6 +177,17 @@ class AndroidClient:
 
         self._timeout = timeout
         self._connected = False
+        use_shell = ADB_PERSISTENT_SHELL if persistent_shell is None else persistent_shell
+        if replay is not None:
+            use_shell = False
+        if recorder is None and ADB_RECORD_DIR and replay is None:
+            recorder = AdbRecorder.in_directory(ADB_RECORD_DIR, self._device_serial)
+        self._recorder = recorder
+        self._shell: AdbShellSession | None = (
+            AdbShellSession(["adb", "-s", self._device_serial, "shell"])
+            if use_shell and self._device_serial
+            else None
+        )
         # Cache the screen size to avoid repeated `wm size` calls.
         self._screen_size_cache: tuple[int, int] | None = None
         self._screen_size_cache_time: float = 0.0
@@ -165,17 +209,35 @@ class AndroidClient:
             return bool(self._usb_serial)
         return bool(self._host and self._port)
 
-    async def _run_adb(self, *args: str, timeout: int | None = None) -> ADBResult:
+    async def _run_adb(
+        self, *args: str, timeout: int | None = None, binary: bool = False
+    ) -> ADBResult:
         """
         Run an ADB command and return the result.
-        
+
+        Commands are answered by the replay when one is attached, and
+        recorded when a recorder is attached.
+
         Args:
             *args: ADB command arguments (without 'adb' prefix)
             timeout: Optional timeout override
+            binary: Keep stdout as raw bytes in `data` instead of decoding it
+                into `output` (for `exec-out` streams like screencap)
             
         Returns:
             ADBResult with success status and output
         """
+        if self._replay is not None:
+            return await self._replay.run(args, binary=binary)
+        result = await self._exec_adb(*args, timeout=timeout, binary=binary)
+        if self._recorder is not None:
+            self._recorder.record(args, result, binary=binary)
+        return result
+
+    async def _exec_adb(
+        self, *args: str, timeout: int | None = None, binary: bool = False
+    ) -> ADBResult:
+        """Run an ADB command against the device (see `_run_adb`)."""
         if not self._device_serial:
             return ADBResult(
                 success=False,
@@ -184,6 +246,11 @@ class AndroidClient:
             )
 
         cmd_timeout = timeout or self._timeout
+        if self._shell is not None and len(args) > 1 and args[0] == "shell" and not binary:
+            result = await self._run_shell_session(args[1:], cmd_timeout)
+            if result is not None:
+                return result
+
         cmd = ["adb", "-s", self._device_serial, *args]
         
         adb_stats = stats.get_service_stats("android_adb")
@@ -216,15 +283,17 @@ class AndroidClient:
                 )
             
             elapsed_ms = (time.time() - start) * 1000
-            output = stdout.decode("utf-8", errors="replace")
+            data = stdout if binary else b""
+            output = "" if binary else stdout.decode("utf-8", errors="replace")
             error_output = stderr.decode("utf-8", errors="replace")
             
             if proc.returncode == 0:
-                adb_stats.record_request(elapsed_ms, success=True)
+                adb_stats.record_request(elapsed_ms, success=True, bytes_received=len(stdout))
                 return ADBResult(
                     success=True,
                     output=output,
                     elapsed_ms=elapsed_ms,
+                    data=data,
                 )
             else:
                 adb_stats.record_request(elapsed_ms, success=False, error=error_output)
@@ -233,6 +302,7 @@ class AndroidClient:
                     output=output,
                     error=error_output or f"ADB command failed with code {proc.returncode}",
                     elapsed_ms=elapsed_ms,
+                    data=data,
                 )
                 
         except Exception as exc:
@@ -247,6 +317,48 @@ class AndroidClient:
                 elapsed_ms=elapsed_ms,
             )
 
+    async def _run_shell_session(self, args: tuple[str, ...], timeout: int) -> ADBResult | None:
+        """
+        Run an `adb shell` command over the persistent shell session.
+
+        Returns None when the session can't take the command (it was not
+        sent), so the caller falls back to a one-shot `adb shell`.
+        """
+        # `adb shell a b c` joins its arguments with spaces for the device
+        # shell; do the same so commands behave identically.
+        command = " ".join(args)
+        adb_stats = stats.get_service_stats("android_adb")
+        start = time.time()
+
+        try:
+            exit_code, output = await self._shell.run(command, timeout)
+        except ShellSessionUnavailable as exc:
+            logger.debug("ADB shell session unavailable, using one-shot adb: %s", exc)
+            return None
+        except asyncio.TimeoutError:
+            elapsed_ms = (time.time() - start) * 1000
+            adb_stats.record_request(elapsed_ms, success=False, error="Timeout")
+            return ADBResult(
+                success=False,
+                output="",
+                error=f"ADB command timed out after {timeout}s",
+                elapsed_ms=elapsed_ms,
+            )
+        except ShellSessionLost as exc:
+            elapsed_ms = (time.time() - start) * 1000
+            adb_stats.record_request(elapsed_ms, success=False, error=str(exc))
+            return ADBResult(success=False, output="", error=str(exc), elapsed_ms=elapsed_ms)
+
+        elapsed_ms = (time.time() - start) * 1000
+        if exit_code == 0:
+            adb_stats.record_request(elapsed_ms, success=True, bytes_received=len(output))
+            return ADBResult(success=True, output=output, elapsed_ms=elapsed_ms)
+
+        # stderr is folded into the session output.
+        error_output = output.strip() or f"ADB command failed with code {exit_code}"
+        adb_stats.record_request(elapsed_ms, success=False, error=error_output)
+        return ADBResult(success=False, output=output, error=error_output, elapsed_ms=elapsed_ms)
+
     async def _run_adb_global(self, *args: str, timeout: int | None = None) -> ADBResult:
         """
         Run an ADB command WITHOUT selecting a device (no `-s`).
@@ -254,6 +366,15 @@ class AndroidClient:
         This is required for commands like `adb connect` / `adb disconnect` which
         establish the device entry in the first place.
         """
+        if self._replay is not None:
+            return await self._replay.run(args, global_cmd=True)
+        result = await self._exec_adb_global(*args, timeout=timeout)
+        if self._recorder is not None:
+            self._recorder.record(args, result, global_cmd=True)
+        return result
+
+    async def _exec_adb_global(self, *args: str, timeout: int | None = None) -> ADBResult:
+        """Run a device-less ADB command (see `_run_adb_global`)."""
         cmd_timeout = timeout or self._timeout
         cmd = ["adb", *args]
 
@@ -375,6 +496,8 @@ class AndroidClient:
 
         result = await self._run_adb_global("disconnect", self._device_serial)
         self._connected = False
+        if self._shell is not None:
+            await self._shell.close()
         return result
 
     async def check_connection(self) -> bool:
@@ -441,29 +564,85 @@ class AndroidClient:
         """
         Dump the UI accessibility tree as XML.
         
-        This is the primary way to understand what's on screen.
+        This is the primary way to understand what's on screen. The dump is
+        streamed straight back over `exec-out`; devices whose uiautomator
+        can't write to /dev/tty fall back to a dump file that is read and
+        removed in the same shell invocation.
         
         Returns:
             ADBResult with XML content in output field
         """
-        # Dump UI hierarchy to device
-        dump_result = await self._run_adb(
-            "shell", "uiautomator", "dump", "/sdcard/ui_dump.xml"
+        result = await self._run_adb("exec-out", "uiautomator", "dump", "/dev/tty")
+        xml = _extract_hierarchy_xml(result.output) if result.success else None
+        if xml is not None:
+            result.output = xml
+            return result
+
+        # adb joins exec-out arguments with spaces and hands the line to the
+        # device shell unquoted, so the pipeline goes over as one argument.
+        result = await self._run_adb(
+            "exec-out",
+            f"uiautomator dump {UI_DUMP_DEVICE_PATH} >/dev/null"
+            f" && cat {UI_DUMP_DEVICE_PATH}; rm -f {UI_DUMP_DEVICE_PATH}",
         )
-        if not dump_result.success:
-            return dump_result
-        
-        # Read the XML content
-        result = await self._run_adb("shell", "cat", "/sdcard/ui_dump.xml")
-        
-        # Clean up
-        await self._run_adb("shell", "rm", "-f", "/sdcard/ui_dump.xml")
-        
+        if not result.success:
+            return result
+
+        xml = _extract_hierarchy_xml(result.output)
+        if xml is None:
+            return ADBResult(
+                success=False,
+                output="",
+                error=result.output.strip() or "uiautomator dump returned no XML",
+                elapsed_ms=result.elapsed_ms,
+            )
+        result.output = xml
         return result
 
+    async def capture_screenshot(self) -> ADBResult:
+        """
+        Capture the screen as PNG bytes, streamed over `exec-out`.
+
+        Nothing is written on the device or locally.
+
+        Returns:
+            ADBResult with PNG bytes in the data field
+        """
+        result = await self._run_adb("exec-out", "screencap", "-p", binary=True)
+        if result.success and not result.data.startswith(PNG_SIGNATURE):
+            return ADBResult(
+                success=False,
+                output="",
+                error="screencap did not return a PNG image",
+                elapsed_ms=result.elapsed_ms,
+            )
+        return result
+
+    async def capture_screen(self) -> ScreenCapture:
+        """
+        Capture the screenshot and the UI XML concurrently.
+
+        Capture latency is recorded under the `android_screen_capture`
+        service stats. The capture counts as successful when the screenshot
+        succeeds (the XML can legitimately be unavailable on some screens).
+        """
+        start = time.perf_counter()
+        screenshot, xml = await asyncio.gather(
+            self.capture_screenshot(),
+            self.get_screen_xml(),
+        )
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        stats.get_service_stats("android_screen_capture").record_request(
+            elapsed_ms,
+            success=screenshot.success,
+            bytes_received=len(screenshot.data) + len(xml.output),
+            error=None if screenshot.success else screenshot.error,
+        )
+        return ScreenCapture(screenshot=screenshot, xml=xml, elapsed_ms=elapsed_ms)
+
     async def take_screenshot(self, local_path: str | None = None) -> ADBResult:
         """
-        Take a screenshot of the device screen.
+        Take a screenshot of the device screen and save it locally.
         
         Args:
             local_path: Optional local path to save the screenshot
@@ -471,24 +650,21 @@ class AndroidClient:
         Returns:
             ADBResult with local file path in output field
         """
-        device_path = "/sdcard/screenshot.png"
-        
-        # Take screenshot on device
-        result = await self._run_adb("shell", "screencap", "-p", device_path)
+        result = await self.capture_screenshot()
         if not result.success:
             return result
         
-        # Pull to local if path specified, otherwise use temp
         if not local_path:
             local_path = f"/tmp/android_screenshot_{int(time.time())}.png"
         
-        result = await self._run_adb("pull", device_path, local_path)
-        if result.success:
-            result.output = local_path
-        
-        # Clean up device file
-        await self._run_adb("shell", "rm", "-f", device_path)
+        try:
+            with open(local_path, "wb") as f:
+                f.write(result.data)
+        except OSError as exc:
+            return ADBResult(success=False, output="", error=str(exc), elapsed_ms=result.elapsed_ms)
         
+        result.output = local_path
+        result.data = b""
         return result
 
     async def tap(self, x: int, y: int) -> ADBResult:
@@ -839,7 +1015,7 @@ class AndroidClient:
                         pass
         return None
 
-    def parse_ui_elements(self, xml_content: str) -> list[UIElement]:
+    def parse_ui_elements(self, xml_content: str) -> UITree:
         """
         Parse UI elements from accessibility XML.
         
@@ -847,50 +1023,13 @@ class AndroidClient:
             xml_content: XML string from get_screen_xml()
             
         Returns:
-            List of UIElement objects
+            UITree of UIElement objects in document order, indexed for lookups
         """
-        elements = []
-        
-        # Simple regex-based parsing (avoids XML library overhead)
-        # uiautomator dumps usually use self-closing nodes, but some builds emit
-        # `<node ...></node>`; we only need the attributes from the opening tag.
-        node_pattern = re.compile(r"<node\s+([^>]+?)(?:/?>)")
-        attr_pattern = re.compile(r'(\w+(?:-\w+)?)="([^"]*)"')
-        bounds_pattern = re.compile(r'\[(\d+),(\d+)\]\[(\d+),(\d+)\]')
-        
-        for node_match in node_pattern.finditer(xml_content):
-            attrs_str = (node_match.group(1) or "").strip()
-            if attrs_str.endswith("/"):
-                attrs_str = attrs_str[:-1].strip()
-            attrs = dict(attr_pattern.findall(attrs_str))
-            
-            # Parse bounds
-            bounds_str = attrs.get("bounds", "[0,0][0,0]")
-            bounds_match = bounds_pattern.search(bounds_str)
-            if bounds_match:
-                bounds = tuple(int(x) for x in bounds_match.groups())
-            else:
-                bounds = (0, 0, 0, 0)
-            
-            element = UIElement(
-                text=attrs.get("text", ""),
-                content_desc=attrs.get("content-desc", ""),
-                resource_id=attrs.get("resource-id", ""),
-                class_name=attrs.get("class", ""),
-                package=attrs.get("package", ""),
-                bounds=bounds,
-                clickable=attrs.get("clickable", "false").lower() == "true",
-                scrollable=attrs.get("scrollable", "false").lower() == "true",
-                focused=attrs.get("focused", "false").lower() == "true",
-                enabled=attrs.get("enabled", "true").lower() == "true",
-            )
-            elements.append(element)
-        
-        return elements
+        return parse_ui_tree(xml_content)
 
     def find_element(
         self,
-        elements: list[UIElement],
+        elements: Sequence[UIElement],
         *,
         text: str | None = None,
         content_desc: str | None = None,
@@ -902,7 +1041,7 @@ class AndroidClient:
         Find a UI element matching the criteria.
         
         Args:
-            elements: List of UIElement to search
+            elements: UITree (indexed lookup) or list of UIElement to search
             text: Match by text (case-insensitive partial match)
             content_desc: Match by content description
             resource_id: Match by resource ID (partial match)
@@ -912,6 +1051,14 @@ class AndroidClient:
         Returns:
             First matching UIElement or None
         """
+        if isinstance(elements, UITree):
+            return elements.find(
+                text=text,
+                content_desc=content_desc,
+                resource_id=resource_id,
+                class_name=class_name,
+                clickable=clickable,
+            )
         for el in elements:
             if text and text.lower() not in el.text.lower():
                 continue
@@ -939,4 +1086,4 @@ def get_android_client() -> AndroidClient:
     return _client
 
 
-__all__ = ["AndroidClient", "ADBResult", "UIElement", "get_android_client"]
+__all__ = ["AndroidClient", "ADBResult", "ScreenCapture", "UIElement", "UITree", "get_android_client"]
@@ -17,10 +17,12 @@ import logging
 import os
 import time
 from dataclasses import dataclass, field
-from typing import Any, Literal
+from typing import Any, Literal, Protocol
 
 from config import get_settings
 from services.android_audit import get_android_audit_logger
+from services.android_screen_diff import ScreenFingerprint
+from services.llm_client import chat_completion
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +30,18 @@ logger = logging.getLogger(__name__)
 DEFAULT_MAX_STEPS = 20
 DEFAULT_STEP_DELAY = 0.5  # seconds between steps
 
+# Before asking the LLM, re-capture (every step_delay) until two successive
+# captures match, for at most this many seconds. 0 disables settling.
+DEFAULT_SETTLE_TIMEOUT = float(os.getenv("ANDROID_RUNNER_SETTLE_TIMEOUT", "3"))
+
+# Consecutive steps that may repeat the previous decision, without an LLM
+# call, while the screen is unchanged. 0 disables reuse.
+DEFAULT_MAX_REUSED_DECISIONS = int(os.getenv("ANDROID_RUNNER_MAX_REUSED_DECISIONS", "2"))
+
+# Decisions that are safe to repeat on an unchanged screen. Taps, typing and
+# key presses are not: repeating them can toggle or submit something twice.
+REUSABLE_ACTIONS = frozenset({"wait"})
+
 # Token pricing (USD per 1K tokens) - approximations for vision models
 # These should be updated based on actual pricing
 TOKEN_PRICE_INPUT = 0.005  # $0.005 per 1K input tokens (vision is cheaper)
@@ -90,6 +104,15 @@ def _action_signature(action: "PhoneAction") -> str:
     return action.action
 
 
+async def _fingerprint_screen(screen_state: dict[str, Any]) -> ScreenFingerprint:
+    """Fingerprint a capture off the event loop (inflating the screenshot takes ~30ms)."""
+    return await asyncio.to_thread(
+        ScreenFingerprint.from_capture,
+        _screen_signature(screen_state),
+        screen_state.get("screenshot_base64"),
+    )
+
+
 # Action types the LLM can decide
 ActionType = Literal["tap", "type", "swipe", "press_key", "wait", "done", "error"]
 
@@ -112,10 +135,16 @@ class StepResult:
     action: PhoneAction
     success: bool
     error: str | None = None
-    screenshot_base64: str | None = None
+    # Screenshots are written to disk as the step runs (see `StepScreenshotWriter`);
+    # only the path and a content hash are kept in memory.
+    screenshot_path: str | None = None
+    screenshot_sha256: str | None = None
     input_tokens: int = 0
     output_tokens: int = 0
     elapsed_ms: float = 0
+    # True when the previous decision was repeated because the screen had not
+    # changed, instead of calling the LLM.
+    reused_decision: bool = False
 
 
 @dataclass
@@ -131,6 +160,33 @@ class RunResult:
     error: str | None = None
     final_screenshot_base64: str | None = None
     extracted_data: dict[str, Any] | None = None
+    # Change-detection metrics: LLM calls made and avoided, the estimated time
+    # the avoided calls would have taken, and time spent waiting for the
+    # screen to settle.
+    llm_calls: int = 0
+    llm_calls_avoided: int = 0
+    time_saved_ms: float = 0
+    settle_wait_ms: float = 0
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Per-run change-detection metrics."""
+        return {
+            "llm_calls": self.llm_calls,
+            "llm_calls_avoided": self.llm_calls_avoided,
+            "time_saved_ms": round(self.time_saved_ms),
+            "settle_wait_ms": round(self.settle_wait_ms),
+        }
+
+
+class StepScreenshotWriter(Protocol):
+    """Persists a step's screenshot as soon as it is captured."""
+
+    def write(
+        self, step_number: int, screenshot_base64: str, screen_signature: str
+    ) -> tuple[str | None, str | None]:
+        """Write the screenshot; return (path, sha256) or (None, None)."""
+        ...
 
 
 def _load_base_prompt() -> str:
@@ -177,6 +233,10 @@ class AndroidPhoneRunner:
     2. Send to LLM with task prompt
     3. Execute returned action
     4. Repeat until done or max_steps reached
+
+    Before each decision the screen is re-captured until it settles, and
+    while it is unchanged since a `wait` decision, that decision is repeated
+    without calling the LLM (see `services.android_screen_diff`).
     """
 
     def __init__(
@@ -185,6 +245,8 @@ class AndroidPhoneRunner:
         api_key: str | None = None,
         max_steps: int = DEFAULT_MAX_STEPS,
         step_delay: float = DEFAULT_STEP_DELAY,
+        settle_timeout: float = DEFAULT_SETTLE_TIMEOUT,
+        max_reused_decisions: int = DEFAULT_MAX_REUSED_DECISIONS,
     ):
         """
         Initialize the phone runner.
@@ -193,13 +255,20 @@ class AndroidPhoneRunner:
             model: LLM model to use. Defaults to ANDROID_LLM_MODEL setting.
             api_key: API key for LLM. Defaults to ANDROID_LLM_API_KEY setting.
             max_steps: Maximum steps before stopping.
-            step_delay: Delay between steps in seconds.
+            step_delay: Delay between steps in seconds (also the poll
+                interval while waiting for the screen to settle).
+            settle_timeout: Max seconds to wait for the screen to settle
+                before each LLM call (0 disables).
+            max_reused_decisions: Max consecutive steps that repeat a `wait`
+                decision on an unchanged screen (0 disables).
         """
         settings = get_settings()
         self._model = model or settings.android_llm_model
         self._api_key = api_key or settings.android_llm_api_key or settings.openai_api_key
         self._max_steps = max_steps
         self._step_delay = step_delay
+        self._settle_timeout = settle_timeout
+        self._max_reused_decisions = max_reused_decisions
         self._base_prompt = _load_base_prompt()
 
     @property
@@ -223,6 +292,34 @@ class AndroidPhoneRunner:
 
         return await get_screen_action({})
 
+    async def _await_settled_screen(
+        self,
+        screen_state: dict[str, Any],
+    ) -> tuple[dict[str, Any], ScreenFingerprint, float]:
+        """
+        Re-capture until two successive captures match or the settle timeout passes.
+
+        Returns:
+            Tuple of (latest screen_state, its fingerprint, ms spent settling)
+        """
+        fingerprint = await _fingerprint_screen(screen_state)
+        if self._settle_timeout <= 0 or screen_state.get("lockscreen_detected"):
+            return screen_state, fingerprint, 0.0
+
+        started = time.monotonic()
+        deadline = started + self._settle_timeout
+        while True:
+            await asyncio.sleep(self._step_delay)
+            next_state = await self._capture_screen_state()
+            next_fingerprint = await _fingerprint_screen(next_state)
+            settled = next_fingerprint.matches(fingerprint)
+            screen_state, fingerprint = next_state, next_fingerprint
+            if settled or screen_state.get("lockscreen_detected") or time.monotonic() >= deadline:
+                break
+        if not settled:
+            logger.debug("Screen still changing after %.1fs; continuing", self._settle_timeout)
+        return screen_state, fingerprint, (time.monotonic() - started) * 1000
+
     async def _execute_action(self, action: PhoneAction) -> tuple[bool, str | None]:
         """
         Execute a phone action via AndroidClient.
@@ -434,10 +531,10 @@ class AndroidPhoneRunner:
         except ImportError:
             raise ValueError("openai package not installed")
 
-        client = openai.OpenAI(api_key=self._api_key)
-
         try:
-            response = client.chat.completions.create(
+            response = await chat_completion(
+                openai.OpenAI,
+                self._api_key,
                 model=self._model,
                 messages=messages,
                 response_format={"type": "json_object"},
@@ -567,6 +664,7 @@ class AndroidPhoneRunner:
         task_prompt: str,
         parameters: dict[str, Any] | None = None,
         max_steps: int | None = None,
+        screenshot_writer: StepScreenshotWriter | None = None,
     ) -> RunResult:
         """
         Run an automation task on the phone.
@@ -580,6 +678,8 @@ class AndroidPhoneRunner:
             task_prompt: The task-specific prompt or prompt template name
             parameters: Parameters to pass to the task (e.g., temperatures)
             max_steps: Override max steps for this run
+            screenshot_writer: Persists each step's screenshot as it is
+                captured, so only the latest frame is held in memory
 
         Returns:
             RunResult with success status, steps taken, and token usage
@@ -626,6 +726,24 @@ class AndroidPhoneRunner:
         max_screen_streak = 0
         max_action_streak = 0
         max_action_sig = ""
+        # Change detection: the last LLM decision and the screen it was made on
+        last_decision: PhoneAction | None = None
+        last_decision_fingerprint: ScreenFingerprint | None = None
+        last_step_success = False
+        reused_streak = 0
+        llm_calls = 0
+        llm_time_ms = 0.0
+        llm_calls_avoided = 0
+        time_saved_ms = 0.0
+        settle_wait_ms = 0.0
+
+        def run_metrics() -> dict[str, Any]:
+            return {
+                "llm_calls": llm_calls,
+                "llm_calls_avoided": llm_calls_avoided,
+                "time_saved_ms": time_saved_ms,
+                "settle_wait_ms": settle_wait_ms,
+            }
 
         logger.info(
             "Starting phone automation task with max_steps=%d, model=%s",
@@ -646,6 +764,8 @@ class AndroidPhoneRunner:
                 # Step 1: Capture screen state
                 logger.debug("Step %d: Capturing screen state", step_num)
                 screen_state = await self._capture_screen_state()
+                screen_state, fingerprint, settle_ms = await self._await_settled_screen(screen_state)
+                settle_wait_ms += settle_ms
                 final_screenshot = screen_state.get("screenshot_base64")
                 if screen_state.get("lockscreen_detected"):
                     screen_status = str(
@@ -686,6 +806,7 @@ class AndroidPhoneRunner:
                         steps=steps,
                         error=error,
                         final_screenshot_base64=final_screenshot,
+                        **run_metrics(),
                         extracted_data={
                             "lockscreen_detected": True,
                             "screen_status": screen_status,
@@ -699,7 +820,7 @@ class AndroidPhoneRunner:
                             "lockscreen_reason": screen_state.get("lockscreen_reason"),
                         },
                     )
-                screen_sig = _screen_signature(screen_state)
+                screen_sig = fingerprint.signature
                 if screen_sig == last_screen_sig:
                     current_screen_streak += 1
                 else:
@@ -707,6 +828,16 @@ class AndroidPhoneRunner:
                     last_screen_sig = screen_sig
                 max_screen_streak = max(max_screen_streak, current_screen_streak)
 
+                screenshot_path: str | None = None
+                screenshot_sha256: str | None = None
+                if screenshot_writer is not None and final_screenshot:
+                    try:
+                        screenshot_path, screenshot_sha256 = await asyncio.to_thread(
+                            screenshot_writer.write, step_num, final_screenshot, screen_sig
+                        )
+                    except Exception:
+                        logger.exception("Failed to persist step %d screenshot", step_num)
+
                 # Step 2: Build task context
                 task_context = {
                     "task_description": task_prompt,
@@ -715,13 +846,39 @@ class AndroidPhoneRunner:
                     "max_steps": effective_max_steps,
                 }
 
-                # Step 3: Call LLM for decision
-                logger.debug("Step %d: Calling LLM for action decision", step_num)
-                action, input_tokens, output_tokens = await self._call_llm(
-                    system_prompt,
-                    screen_state,
-                    task_context,
+                # Step 3: Reuse the previous decision if it is safe to repeat
+                # and the screen hasn't changed since; otherwise ask the LLM.
+                reuse_decision = (
+                    last_decision is not None
+                    and last_decision.action in REUSABLE_ACTIONS
+                    and last_step_success
+                    and reused_streak < self._max_reused_decisions
+                    and fingerprint.matches(last_decision_fingerprint)
                 )
+                if reuse_decision:
+                    logger.debug("Step %d: Screen unchanged, repeating %s", step_num, last_decision.action)
+                    action = PhoneAction(
+                        action=last_decision.action,
+                        params=dict(last_decision.params),
+                        reasoning=f"Screen unchanged; repeating previous decision: {last_decision.reasoning}",
+                    )
+                    input_tokens = output_tokens = 0
+                    reused_streak += 1
+                    llm_calls_avoided += 1
+                    time_saved_ms += llm_time_ms / llm_calls if llm_calls else 0.0
+                else:
+                    logger.debug("Step %d: Calling LLM for action decision", step_num)
+                    llm_started = time.monotonic()
+                    action, input_tokens, output_tokens = await self._call_llm(
+                        system_prompt,
+                        screen_state,
+                        task_context,
+                    )
+                    llm_calls += 1
+                    llm_time_ms += (time.monotonic() - llm_started) * 1000
+                    last_decision = action
+                    last_decision_fingerprint = fingerprint
+                    reused_streak = 0
 
                 total_input_tokens += input_tokens
                 total_output_tokens += output_tokens
@@ -776,6 +933,7 @@ class AndroidPhoneRunner:
                                 "action": action.action,
                                 "done": action.done,
                                 "params": action.params,
+                                "reused_decision": reuse_decision,
                             },
                             result={
                                 "screenshot_base64": final_screenshot or "",
@@ -804,16 +962,20 @@ class AndroidPhoneRunner:
                     action=action,
                     success=success,
                     error=error,
-                    screenshot_base64=final_screenshot,
+                    screenshot_path=screenshot_path,
+                    screenshot_sha256=screenshot_sha256,
                     input_tokens=input_tokens,
                     output_tokens=output_tokens,
                     elapsed_ms=elapsed_ms,
+                    reused_decision=reuse_decision,
                 )
                 steps.append(step_result)
+                last_step_success = success
 
                 # Step 5: Check if done
                 if action.done:
                     logger.info("Task completed at step %d", step_num)
+                    self._log_run_metrics(run_metrics())
                     total_tokens = total_input_tokens + total_output_tokens
                     total_cost = _calculate_token_cost(total_input_tokens, total_output_tokens)
 
@@ -821,7 +983,7 @@ class AndroidPhoneRunner:
                         try:
                             audit_logger.log_action(
                                 action="runner_complete",
-                                parameters={"task": task_prompt},
+                                parameters={"task": task_prompt, **run_metrics()},
                                 result={
                                     "element_count": screen_state.get("element_count"),
                                 },
@@ -842,6 +1004,7 @@ class AndroidPhoneRunner:
                         steps=steps,
                         final_screenshot_base64=final_screenshot,
                         extracted_data=extracted_data,
+                        **run_metrics(),
                     )
 
                 # Step 6: Check for execution error
@@ -909,6 +1072,7 @@ class AndroidPhoneRunner:
                     steps=steps,
                     error=str(e),
                     final_screenshot_base64=final_screenshot,
+                    **run_metrics(),
                 )
 
         # Reached max steps without completion
@@ -923,6 +1087,7 @@ class AndroidPhoneRunner:
             effective_max_steps,
             loop_hint,
         )
+        self._log_run_metrics(run_metrics())
         total_tokens = total_input_tokens + total_output_tokens
         total_cost = _calculate_token_cost(total_input_tokens, total_output_tokens)
         max_steps_error = f"Task did not complete within {effective_max_steps} steps.{loop_hint}"
@@ -937,6 +1102,7 @@ class AndroidPhoneRunner:
                         "max_action_streak": max_action_streak,
                         "max_action_signature": max_action_sig,
                         "max_screen_streak": max_screen_streak,
+                        **run_metrics(),
                     },
                     success=False,
                     error=max_steps_error,
@@ -955,6 +1121,17 @@ class AndroidPhoneRunner:
             steps=steps,
             error=max_steps_error,
             final_screenshot_base64=final_screenshot,
+            **run_metrics(),
+        )
+
+    @staticmethod
+    def _log_run_metrics(metrics: dict[str, Any]) -> None:
+        logger.info(
+            "Run metrics: llm_calls=%d avoided=%d time_saved_ms=%.0f settle_wait_ms=%.0f",
+            metrics["llm_calls"],
+            metrics["llm_calls_avoided"],
+            metrics["time_saved_ms"],
+            metrics["settle_wait_ms"],
         )
 
 
@@ -975,5 +1152,6 @@ __all__ = [
     "PhoneAction",
     "RunResult",
     "StepResult",
+    "StepScreenshotWriter",
     "get_android_phone_runner",
 ]
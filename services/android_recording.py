@@ -0,0 +1,259 @@
+"""
+Record and replay ADB traffic.
+
+`AdbRecorder` captures every command `AndroidClient` sends and the device's
+response (UI dumps, screencaps, dumpsys output) while a real run happens.
+`AdbReplay` is a fake device: it serves those responses back, in order and
+with the recorded latencies, so the runner, `get_screen_action` and the
+maintenance checks can be exercised and benchmarked without a phone.
+
+Recordings are JSONL (one record per line, flushed as it is written, so a
+crashed run still leaves a readable file):
+
+    {"kind": "header", "version": 1, "serial": "...", "started_at": ...}
+    {"kind": "blob", "id": "<sha256 prefix>", "data": "<base64 of zlib>"}
+    {"kind": "cmd", "t": 12.5, "args": [...], "global": false, "binary": false,
+     "success": true, "ms": 84.2, "out": "...", "error": null}
+
+Outputs over `INLINE_LIMIT` bytes and all binary stdout are stored once as
+zlib-compressed blobs and referenced by id (`out_blob` / `data_blob`), so a
+screen that is dumped on every step costs its size once.
+
+Recordings contain screenshots and typed text; they are written 0o600.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from services.android_client import ADBResult
+
+logger = logging.getLogger(__name__)
+
+RECORDING_VERSION = 1
+
+# Outputs up to this many bytes are stored inline rather than as blobs.
+INLINE_LIMIT = 512
+
+# Commands with no exact match in a replay fall back to the first
+# `PREFIX_MATCH_ARGS` arguments (e.g. `shell input tap` at other coordinates).
+PREFIX_MATCH_ARGS = 3
+
+
+class ReplayMismatch(LookupError):
+    """A strict replay received a command that is not in the recording."""
+
+
+class AdbRecorder:
+    """
+    Appends ADB commands and their results to a recording file.
+
+    Args:
+        path: Recording file (created, or appended to)
+        serial: Device serial, stored in the header
+    """
+
+    def __init__(self, path: str, serial: str = ""):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        self._file = os.fdopen(fd, "a", encoding="utf-8")
+        self._blobs: set[str] = set()
+        self._started = time.monotonic()
+        self.commands = 0
+        self._write({"kind": "header", "version": RECORDING_VERSION, "serial": serial, "started_at": time.time()})
+
+    @classmethod
+    def in_directory(cls, directory: str, serial: str = "") -> AdbRecorder:
+        """Start a new recording file in `directory`, named by time and pid."""
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        return cls(os.path.join(directory, f"adb-{stamp}-{os.getpid()}.jsonl"), serial)
+
+    def record(self, args: tuple[str, ...], result: ADBResult, *, binary: bool = False, global_cmd: bool = False) -> None:
+        """Append one command and its result."""
+        if self._file.closed:
+            return
+        entry: dict[str, Any] = {
+            "kind": "cmd",
+            "t": round((time.monotonic() - self._started) * 1000, 1),
+            "args": list(args),
+            "global": global_cmd,
+            "binary": binary,
+            "success": result.success,
+            "ms": round(result.elapsed_ms, 1),
+            "error": result.error,
+        }
+        output = result.output or ""
+        if len(output) > INLINE_LIMIT:
+            entry["out_blob"] = self._blob(output.encode("utf-8"))
+        else:
+            entry["out"] = output
+        if result.data:
+            entry["data_blob"] = self._blob(result.data)
+        self._write(entry)
+        self.commands += 1
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def _blob(self, payload: bytes) -> str:
+        blob_id = hashlib.sha256(payload).hexdigest()[:20]
+        if blob_id not in self._blobs:
+            self._blobs.add(blob_id)
+            data = base64.b64encode(zlib.compress(payload, 6)).decode("ascii")
+            self._write({"kind": "blob", "id": blob_id, "data": data})
+        return blob_id
+
+    def _write(self, record: dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+
+@dataclass
+class RecordedCommand:
+    """One recorded command and the response to replay for it."""
+
+    args: tuple[str, ...]
+    global_cmd: bool
+    binary: bool
+    success: bool
+    output: str
+    error: str | None
+    data: bytes
+    elapsed_ms: float
+    offset_ms: float = 0
+
+
+def load_recording(path: str) -> tuple[dict[str, Any], list[RecordedCommand]]:
+    """Read a recording; returns (header, commands in recorded order)."""
+    header: dict[str, Any] = {}
+    blobs: dict[str, bytes] = {}
+    commands: list[RecordedCommand] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A run killed mid-write leaves a partial last line.
+                logger.warning("Skipping unreadable line %d in %s", line_no, path)
+                continue
+            kind = record.get("kind")
+            if kind == "header":
+                header = record
+            elif kind == "blob":
+                blobs[record["id"]] = zlib.decompress(base64.b64decode(record["data"]))
+            elif kind == "cmd":
+                if "out_blob" in record:
+                    output = blobs[record["out_blob"]].decode("utf-8", errors="replace")
+                else:
+                    output = record.get("out") or ""
+                commands.append(
+                    RecordedCommand(
+                        args=tuple(record["args"]),
+                        global_cmd=bool(record.get("global")),
+                        binary=bool(record.get("binary")),
+                        success=bool(record.get("success")),
+                        output=output,
+                        error=record.get("error"),
+                        data=blobs[record["data_blob"]] if "data_blob" in record else b"",
+                        elapsed_ms=float(record.get("ms") or 0),
+                        offset_ms=float(record.get("t") or 0),
+                    )
+                )
+    return header, commands
+
+
+class AdbReplay:
+    """
+    A fake ADB device that answers commands from a recording.
+
+    Each distinct command replays its recorded responses in order; once they
+    run out, the last response repeats (so a run that polls the screen a few
+    more times than the recorded one still sees the final screen). Commands
+    that were never recorded fall back to a recorded command sharing their
+    first `PREFIX_MATCH_ARGS` arguments, then to an empty success, or raise
+    `ReplayMismatch` when `strict`.
+
+    Args:
+        commands: Recorded commands, in order
+        serial: Device serial the recording was made against
+        latency_scale: Multiplier for recorded latencies (0 replays instantly)
+        strict: Raise on commands missing from the recording
+    """
+
+    def __init__(
+        self,
+        commands: list[RecordedCommand],
+        serial: str = "",
+        latency_scale: float = 1.0,
+        strict: bool = False,
+    ):
+        self.serial = serial
+        self.latency_scale = latency_scale
+        self.strict = strict
+        self._queues: dict[tuple[bool, tuple[str, ...]], deque[RecordedCommand]] = {}
+        self._prefixes: dict[tuple[bool, tuple[str, ...]], tuple[bool, tuple[str, ...]]] = {}
+        for command in commands:
+            key = (command.global_cmd, command.args)
+            self._queues.setdefault(key, deque()).append(command)
+            self._prefixes.setdefault((command.global_cmd, command.args[:PREFIX_MATCH_ARGS]), key)
+        self.served = 0
+        self.unmatched: list[tuple[str, ...]] = []
+
+    @classmethod
+    def from_file(cls, path: str, latency_scale: float = 1.0, strict: bool = False) -> AdbReplay:
+        header, commands = load_recording(path)
+        return cls(commands, serial=str(header.get("serial") or ""), latency_scale=latency_scale, strict=strict)
+
+    async def run(self, args: tuple[str, ...], *, binary: bool = False, global_cmd: bool = False) -> ADBResult:
+        """Answer one command as the recorded device did."""
+        from services.android_client import ADBResult
+
+        queue = self._queues.get((global_cmd, args))
+        if queue is None:
+            key = self._prefixes.get((global_cmd, args[:PREFIX_MATCH_ARGS]))
+            queue = self._queues.get(key) if key else None
+        if queue is None:
+            self.unmatched.append(args)
+            if self.strict:
+                raise ReplayMismatch(f"Command not in recording: adb {' '.join(args)}")
+            logger.debug("Replay has no response for: adb %s", " ".join(args))
+            return ADBResult(success=True, output="")
+
+        command = queue.popleft() if len(queue) > 1 else queue[0]
+        if self.latency_scale > 0 and command.elapsed_ms > 0:
+            await asyncio.sleep(command.elapsed_ms / 1000 * self.latency_scale)
+        self.served += 1
+        return ADBResult(
+            success=command.success,
+            output="" if binary else command.output,
+            error=command.error,
+            elapsed_ms=command.elapsed_ms * self.latency_scale,
+            data=command.data,
+        )
+
+
+__all__ = [
+    "AdbRecorder",
+    "AdbReplay",
+    "RecordedCommand",
+    "ReplayMismatch",
+    "load_recording",
+]
@@ -0,0 +1,134 @@
+"""
+Cheap change detection between successive Android screen captures.
+
+A `ScreenFingerprint` pairs the runner's structural signature (package,
+element count, leading clickable elements) with a band hash of the
+screenshot. The band hash splits the decoded PNG scanlines into horizontal
+bands and CRCs a sample of the rows in each, so two captures can be compared
+by how many bands differ:
+
+- identical frames have identical hashes;
+- a small local change (status-bar clock, loading spinner) only flips the
+  bands it covers, so it stays within `DEFAULT_TOLERANCE_BANDS`;
+- a navigation or a redrawn list flips most bands.
+
+Bands are horizontal because PNG filters predict from the row above and
+encoders pick a filter per row: a change can alter residuals across its
+whole row (and the row below it) but never the rest of the image.
+
+The hash works on the filtered scanlines (zlib-inflated, not unfiltered),
+so it needs no imaging library (about 30ms for a 1080x2400 frame, mostly
+inflating the image data). Like
+a difference hash, it responds to edges and texture rather than absolute
+colour: a flat region that changes colour only flips the bands at its edges.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import struct
+import zlib
+from dataclasses import dataclass
+
+from services.android_client import PNG_SIGNATURE
+
+# Horizontal bands per screenshot (~38px each on a 2400px-tall screen).
+HASH_BANDS = 64
+
+# Hash every Nth scanline; changes rarely span fewer rows than this.
+SAMPLE_ROW_STEP = 2
+
+# Bands that may differ while two frames still count as the same screen
+# (covers the status bar plus a spinner-sized region).
+DEFAULT_TOLERANCE_BANDS = 3
+
+# Bytes per pixel for each PNG color type, at 8 bits per sample.
+_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+
+def png_band_hash(png: bytes, bands: int = HASH_BANDS) -> tuple[int, ...] | None:
+    """
+    Hash a PNG's scanlines in `bands` horizontal bands.
+
+    Returns None for data that is not a non-interlaced PNG (callers then
+    fall back to the structural signature alone).
+    """
+    if not png.startswith(PNG_SIGNATURE):
+        return None
+
+    header: tuple[int, ...] | None = None
+    idat: list[bytes] = []
+    pos = len(PNG_SIGNATURE)
+    try:
+        while pos + 8 <= len(png):
+            length, chunk_type = struct.unpack(">I4s", png[pos : pos + 8])
+            data = png[pos + 8 : pos + 8 + length]
+            if chunk_type == b"IHDR":
+                header = struct.unpack(">IIBBBBB", data)
+            elif chunk_type == b"IDAT":
+                idat.append(data)
+            elif chunk_type == b"IEND":
+                break
+            pos += 12 + length
+        if header is None or not idat:
+            return None
+        width, height, bit_depth, color_type, _, _, interlace = header
+        if interlace or color_type not in _CHANNELS or height == 0:
+            return None
+        raw = zlib.decompress(b"".join(idat))
+    except (struct.error, zlib.error):
+        return None
+
+    row_len = 1 + (width * _CHANNELS[color_type] * bit_depth + 7) // 8
+    if len(raw) < row_len * height:
+        return None
+
+    view = memoryview(raw)
+    hashes = [0] * bands
+    for y in range(0, height, SAMPLE_ROW_STEP):
+        band = y * bands // height
+        start = y * row_len + 1  # skip the filter-type byte
+        hashes[band] = zlib.crc32(view[start : start + row_len - 1], hashes[band])
+    return tuple(hashes)
+
+
+def band_distance(a: tuple[int, ...], b: tuple[int, ...]) -> int:
+    """Number of bands that differ between two hashes of the same shape."""
+    if len(a) != len(b):
+        return max(len(a), len(b))
+    return sum(1 for x, y in zip(a, b) if x != y)
+
+
+@dataclass(frozen=True, slots=True)
+class ScreenFingerprint:
+    """Structural signature plus screenshot band hash for one capture."""
+
+    signature: str
+    image_hash: tuple[int, ...] | None = None
+
+    @classmethod
+    def from_capture(cls, signature: str, screenshot_base64: str | None) -> ScreenFingerprint:
+        image_hash = None
+        if screenshot_base64:
+            try:
+                image_hash = png_band_hash(base64.b64decode(screenshot_base64, validate=False))
+            except (binascii.Error, ValueError):
+                image_hash = None
+        return cls(signature=signature, image_hash=image_hash)
+
+    def matches(self, other: ScreenFingerprint | None, tolerance: int = DEFAULT_TOLERANCE_BANDS) -> bool:
+        """Same structure and (when both have one) a near-identical screenshot."""
+        if other is None or self.signature != other.signature:
+            return False
+        if self.image_hash is None or other.image_hash is None:
+            return self.image_hash is None and other.image_hash is None
+        return band_distance(self.image_hash, other.image_hash) <= tolerance
+
+
+__all__ = [
+    "DEFAULT_TOLERANCE_BANDS",
+    "ScreenFingerprint",
+    "band_distance",
+    "png_band_hash",
+]
@@ -0,0 +1,202 @@
+"""
+Persistent ADB shell sessions.
+
+Every one-shot ``adb -s <serial> shell ...`` call pays for a process spawn
+plus the ADB transport handshake. `AdbShellSession` keeps a single
+``adb shell`` process open per device and runs commands over its stdin,
+framing each command's output with a unique end marker that carries the
+exit code:
+
+    {
+    <command>
+    } </dev/null 2>&1; printf '%s %d\\n' <marker> "$?"
+
+Commands are serialized on the session (one channel, one command in flight).
+stderr is folded into the output, and stdin is detached so a command can
+never swallow the commands queued behind it.
+
+The session starts lazily and restarts on the next command after it dies or
+a command times out. `ShellSessionUnavailable` means the command was never
+sent, so callers can safely fall back to a one-shot ``adb shell``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import os
+import secrets
+import signal
+import time
+
+logger = logging.getLogger(__name__)
+
+# How long to wait before trying to restart a session that failed to start.
+RESTART_BACKOFF_SECONDS = 5.0
+
+# How long a freshly started session has to answer its first command.
+HANDSHAKE_TIMEOUT_SECONDS = 10.0
+
+# Per-line read limit for the session's stdout (dumpsys output has long lines).
+STREAM_LIMIT_BYTES = 16 * 1024 * 1024
+
+
+class ShellSessionUnavailable(Exception):
+    """The session could not run the command; it was not sent to the device."""
+
+
+class ShellSessionLost(Exception):
+    """The session died while a command was running."""
+
+
+class AdbShellSession:
+    """
+    A long-lived ``adb shell`` process that runs framed commands.
+
+    Args:
+        argv: Command that opens the shell (e.g. ``["adb", "-s", serial, "shell"]``)
+    """
+
+    def __init__(self, argv: list[str]):
+        self._argv = list(argv)
+        self._proc: asyncio.subprocess.Process | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock: asyncio.Lock | None = None
+        self._marker = f"__FRANK_SHELL_{secrets.token_hex(8)}"
+        self._sequence = itertools.count(1)
+        self._start_failed_at = 0.0
+        self.starts = 0
+        self.commands = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._proc is not None and self._proc.returncode is None
+
+    async def run(self, command: str, timeout: float) -> tuple[int, str]:
+        """
+        Run a shell command in the session.
+
+        Returns:
+            (exit_code, output) with stderr folded into output
+
+        Raises:
+            ShellSessionUnavailable: The command was not sent (safe to retry elsewhere)
+            ShellSessionLost: The session died mid-command
+            asyncio.TimeoutError: The command did not finish in time (the
+                session is closed and restarted on the next command)
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Subprocess transports and locks are bound to the loop that
+            # created them; start over on a new loop.
+            await self._reset_for_loop(loop)
+
+        async with self._lock:
+            proc = await self._ensure_started()
+            marker = f"{self._marker}_{next(self._sequence)}__"
+            script = f"{{\n{command}\n}} </dev/null 2>&1; printf '%s %d\\n' {marker} \"$?\"\n"
+            try:
+                proc.stdin.write(script.encode("utf-8"))
+                await proc.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError, RuntimeError) as exc:
+                await self._close_locked()
+                raise ShellSessionUnavailable(f"ADB shell session closed: {exc}") from exc
+
+            self.commands += 1
+            try:
+                return await asyncio.wait_for(self._read_until(proc, marker), timeout=timeout)
+            except asyncio.TimeoutError:
+                await self._close_locked()
+                raise
+            except ShellSessionLost:
+                await self._close_locked()
+                raise
+
+    async def close(self) -> None:
+        """Terminate the shell process (a later command restarts it)."""
+        if self._lock is None or self._loop is not asyncio.get_running_loop():
+            self._proc = None
+            return
+        async with self._lock:
+            await self._close_locked()
+
+    async def _reset_for_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        proc = self._proc
+        if proc is not None and proc.returncode is None:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+        self._proc = None
+        self._loop = loop
+        self._lock = asyncio.Lock()
+
+    async def _ensure_started(self) -> asyncio.subprocess.Process:
+        if self.is_running:
+            return self._proc
+
+        if time.monotonic() - self._start_failed_at < RESTART_BACKOFF_SECONDS:
+            raise ShellSessionUnavailable("ADB shell session recently failed to start")
+
+        try:
+            self._proc = await asyncio.create_subprocess_exec(
+                *self._argv,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                limit=STREAM_LIMIT_BYTES,
+                # Own process group, so closing also stops anything it spawned.
+                start_new_session=True,
+            )
+        except OSError as exc:
+            self._start_failed_at = time.monotonic()
+            raise ShellSessionUnavailable(f"Failed to start ADB shell session: {exc}") from exc
+
+        # Handshake so a shell that can't reach the device (offline,
+        # unauthorized) is reported as unavailable rather than lost.
+        marker = f"{self._marker}_0__"
+        try:
+            self._proc.stdin.write(f"printf '%s %d\\n' {marker} 0\n".encode("utf-8"))
+            await self._proc.stdin.drain()
+            await asyncio.wait_for(self._read_until(self._proc, marker), timeout=HANDSHAKE_TIMEOUT_SECONDS)
+        except (OSError, RuntimeError, ShellSessionLost, asyncio.TimeoutError) as exc:
+            await self._close_locked()
+            self._start_failed_at = time.monotonic()
+            raise ShellSessionUnavailable(f"ADB shell session did not respond: {exc!r}") from exc
+
+        self.starts += 1
+        logger.debug("Started ADB shell session: %s", " ".join(self._argv))
+        return self._proc
+
+    async def _read_until(self, proc: asyncio.subprocess.Process, marker: str) -> tuple[int, str]:
+        chunks: list[str] = []
+        while True:
+            line = await proc.stdout.readline()
+            if not line:
+                raise ShellSessionLost("ADB shell session ended unexpectedly")
+            text = line.decode("utf-8", errors="replace")
+            index = text.find(marker)
+            if index < 0:
+                chunks.append(text)
+                continue
+            # Output without a trailing newline shares the marker's line.
+            chunks.append(text[:index])
+            try:
+                exit_code = int(text[index + len(marker) :].strip())
+            except ValueError:
+                exit_code = 1
+            return exit_code, "".join(chunks)
+
+    async def _close_locked(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None or proc.returncode is not None:
+            return
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            return
+        await proc.wait()
+
+
+__all__ = ["AdbShellSession", "ShellSessionLost", "ShellSessionUnavailable"]
@@ -16,6 +16,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Literal
 
+from services.change_feed import change_feed
 from services.file_store import ensure_directory, newest_first, read_json_file, to_thread, write_json_atomic
 from services.task_classes import classify_task_class
 
@@ -176,6 +177,7 @@ class AndroidTaskStorage:
 
     async def _write_task(self, task: AndroidTask) -> None:
         await to_thread(write_json_atomic, self._task_path(task.id), _task_to_payload(task))
+        change_feed.publish("android_task.updated", lambda: {"task": task.to_summary()})
 
     async def _iter_tasks(self) -> list[AndroidTask]:
         await self._ensure_initialized()
@@ -0,0 +1,274 @@
+"""
+Single-pass parser and element index for uiautomator XML dumps.
+
+`parse_ui_tree` streams the dump through expat once, building compact
+`UIElement` rows (``__slots__`` dataclasses) and, in the same pass, the
+indexes lookups need:
+
+- exact-match indexes by text, content-desc, resource-id (full and short
+  id) and package, so `UITree.by_text(...)` etc. are O(1);
+- per-package counts, so the dominant package is precomputed.
+
+`UITree.find` keeps `AndroidClient.find_element`'s partial-match semantics.
+It scans the distinct values of each field rather than every element, and
+caches the matches per query, so repeated lookups on the same screen are
+O(1).
+
+Truncated or malformed dumps fall back to the tolerant regex parser.
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from typing import overload
+from xml.parsers import expat
+
+
+@dataclass(slots=True)
+class UIElement:
+    """Represents a UI element from the accessibility tree."""
+
+    text: str
+    content_desc: str
+    resource_id: str
+    class_name: str
+    package: str
+    bounds: tuple[int, int, int, int]  # left, top, right, bottom
+    clickable: bool
+    scrollable: bool
+    focused: bool
+    enabled: bool
+
+    @property
+    def center(self) -> tuple[int, int]:
+        """Calculate center coordinates for tapping."""
+        left, top, right, bottom = self.bounds
+        return ((left + right) // 2, (top + bottom) // 2)
+
+
+# Fields searchable with `UITree.find`, and whether matching ignores case
+# (mirrors `AndroidClient.find_element`).
+_FIELDS = {
+    "text": True,
+    "content_desc": True,
+    "resource_id": False,
+    "class_name": False,
+    "package": False,
+}
+
+
+class UITree(Sequence[UIElement]):
+    """Parsed UI elements in document order, with lookup indexes."""
+
+    __slots__ = ("_elements", "_index", "_query_cache", "package_counts")
+
+    def __init__(self, elements: list[UIElement] | None = None):
+        self._elements: list[UIElement] = []
+        # field -> {value: [element positions]}
+        self._index: dict[str, dict[str, list[int]]] = {name: {} for name in _FIELDS}
+        self._query_cache: dict[tuple[str, str], list[int]] = {}
+        self.package_counts: dict[str, int] = {}
+        for element in elements or ():
+            self._add(element)
+
+    def _add(self, element: UIElement) -> None:
+        position = len(self._elements)
+        self._elements.append(element)
+        for name, fold_case in _FIELDS.items():
+            value = getattr(element, name)
+            if fold_case:
+                value = value.lower()
+            self._index[name].setdefault(value, []).append(position)
+        package = element.package.strip()
+        if package:
+            self.package_counts[package] = self.package_counts.get(package, 0) + 1
+
+    @overload
+    def __getitem__(self, index: int) -> UIElement: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[UIElement]: ...
+
+    def __getitem__(self, index):
+        return self._elements[index]
+
+    def __len__(self) -> int:
+        return len(self._elements)
+
+    def __iter__(self) -> Iterator[UIElement]:
+        return iter(self._elements)
+
+    def __repr__(self) -> str:
+        return f"UITree({len(self._elements)} elements)"
+
+    @property
+    def dominant_package(self) -> str | None:
+        """The package owning the most elements (first seen wins ties)."""
+        if not self.package_counts:
+            return None
+        return max(self.package_counts.items(), key=lambda kv: kv[1])[0]
+
+    def _exact(self, name: str, value: str) -> list[UIElement]:
+        if _FIELDS[name]:
+            value = value.lower()
+        return [self._elements[i] for i in self._index[name].get(value, ())]
+
+    def by_text(self, text: str) -> list[UIElement]:
+        """Elements whose text equals `text` (case-insensitive)."""
+        return self._exact("text", text)
+
+    def by_content_desc(self, content_desc: str) -> list[UIElement]:
+        """Elements whose content-desc equals `content_desc` (case-insensitive)."""
+        return self._exact("content_desc", content_desc)
+
+    def by_package(self, package: str) -> list[UIElement]:
+        """Elements belonging to `package`."""
+        return self._exact("package", package)
+
+    def by_resource_id(self, resource_id: str) -> list[UIElement]:
+        """Elements with this resource-id, full (`pkg:id/name`) or short (`name`)."""
+        if "/" in resource_id:
+            return self._exact("resource_id", resource_id)
+        suffix = "/" + resource_id
+        positions = sorted(
+            i
+            for value, indexes in self._index["resource_id"].items()
+            if value == resource_id or value.endswith(suffix)
+            for i in indexes
+        )
+        return [self._elements[i] for i in positions]
+
+    def _containing(self, name: str, needle: str) -> list[int]:
+        """Sorted positions of elements whose `name` field contains `needle`."""
+        if _FIELDS[name]:
+            needle = needle.lower()
+        key = (name, needle)
+        positions = self._query_cache.get(key)
+        if positions is None:
+            positions = sorted(
+                i for value, indexes in self._index[name].items() if needle in value for i in indexes
+            )
+            self._query_cache[key] = positions
+        return positions
+
+    def find(
+        self,
+        *,
+        text: str | None = None,
+        content_desc: str | None = None,
+        resource_id: str | None = None,
+        class_name: str | None = None,
+        clickable: bool | None = None,
+    ) -> UIElement | None:
+        """First element (document order) matching all criteria; see `AndroidClient.find_element`."""
+        criteria = [
+            (name, needle)
+            for name, needle in (
+                ("text", text),
+                ("content_desc", content_desc),
+                ("resource_id", resource_id),
+                ("class_name", class_name),
+            )
+            if needle
+        ]
+        candidates: Sequence[int]
+        others: list[list[int]] = []
+        if criteria:
+            matches = sorted((self._containing(name, needle) for name, needle in criteria), key=len)
+            candidates, others = matches[0], matches[1:]
+        else:
+            candidates = range(len(self._elements))
+
+        for position in candidates:
+            if any(not _contains_sorted(other, position) for other in others):
+                continue
+            element = self._elements[position]
+            if clickable is not None and element.clickable != clickable:
+                continue
+            return element
+        return None
+
+
+def _contains_sorted(positions: list[int], position: int) -> bool:
+    i = bisect_left(positions, position)
+    return i < len(positions) and positions[i] == position
+
+
+def _parse_bounds(raw: str) -> tuple[int, int, int, int]:
+    # "[left,top][right,bottom]"
+    try:
+        left, top, right, bottom = raw[1:-1].replace("][", ",").split(",")
+        return (int(left), int(top), int(right), int(bottom))
+    except (ValueError, AttributeError):
+        return (0, 0, 0, 0)
+
+
+def _element_from_attrs(attrs: dict[str, str]) -> UIElement:
+    get = attrs.get
+    return UIElement(
+        text=get("text", ""),
+        content_desc=get("content-desc", ""),
+        resource_id=get("resource-id", ""),
+        class_name=get("class", ""),
+        package=get("package", ""),
+        bounds=_parse_bounds(get("bounds", "[0,0][0,0]")),
+        clickable=get("clickable", "false").lower() == "true",
+        scrollable=get("scrollable", "false").lower() == "true",
+        focused=get("focused", "false").lower() == "true",
+        enabled=get("enabled", "true").lower() == "true",
+    )
+
+
+# Tolerant fallback for dumps expat rejects (truncated output, stray text).
+# uiautomator dumps usually use self-closing nodes, but some builds emit
+# `<node ...></node>`; we only need the attributes from the opening tag.
+_NODE_PATTERN = re.compile(r"<node\s+([^>]+?)(?:/?>)")
+_ATTR_PATTERN = re.compile(r'(\w+(?:-\w+)?)="([^"]*)"')
+
+
+def _parse_with_regex(xml_content: str) -> UITree:
+    tree = UITree()
+    for node_match in _NODE_PATTERN.finditer(xml_content):
+        attrs_str = (node_match.group(1) or "").strip()
+        if attrs_str.endswith("/"):
+            attrs_str = attrs_str[:-1].strip()
+        tree._add(_element_from_attrs(dict(_ATTR_PATTERN.findall(attrs_str))))
+    return tree
+
+
+def parse_ui_tree(xml_content: str) -> UITree:
+    """Parse a uiautomator XML dump into an indexed `UITree` in one pass."""
+    tree = UITree()
+    add = tree._add
+
+    def start_element(name: str, attrs: dict[str, str]) -> None:
+        if name == "node":
+            add(_element_from_attrs(attrs))
+
+    parser = expat.ParserCreate()
+    parser.StartElementHandler = start_element
+    try:
+        parser.Parse(xml_content, True)
+    except expat.ExpatError:
+        return _parse_with_regex(xml_content)
+    return tree
+
+
+def dominant_package(elements: Sequence[UIElement]) -> str | None:
+    """The package owning the most elements, or None."""
+    if isinstance(elements, UITree):
+        return elements.dominant_package
+    counts: dict[str, int] = {}
+    for el in elements:
+        pkg = (el.package or "").strip()
+        if pkg:
+            counts[pkg] = counts.get(pkg, 0) + 1
+    if not counts:
+        return None
+    return max(counts.items(), key=lambda kv: kv[1])[0]
+
+
+__all__ = ["UIElement", "UITree", "dominant_package", "parse_ui_tree"]
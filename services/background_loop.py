@@ -4,6 +4,7 @@ Background Event Loop for Jorb System.
 Orchestrates jorb event processing including:
 - Telegram message listening via Telethon callback
 - Processing debounced messages when timers fire
+- Waking running jorbs exactly at their scheduled `wake_at`
 - Hourly heartbeat for stale jorb detection and scheduled actions
 - Daily digest email at configured time
 - Monthly Android device maintenance
@@ -24,6 +25,7 @@ from services.agent_runner import AgentRunner
 from services.context_reset import ContextResetService
 from services.email_service import EmailService
 from services.jorb_storage import JorbStorage
+from services.jorb_worker_pool import JorbWorkerPool, worker_concurrency_from_env
 from services.telegram_jorb_router import (
     get_router_status,
     initialize_telegram_jorb_router,
@@ -46,8 +48,13 @@ DIGEST_CHECK_INTERVAL_SECONDS = 60
 # How often to check scheduled maintenance tasks (in seconds)
 MAINTENANCE_CHECK_INTERVAL_SECONDS = 3600  # Check hourly
 
-# How often to tick due jorbs (in seconds)
-WORKER_TICK_INTERVAL_SECONDS = 2
+# Longest the worker sleeps with nothing due (in seconds). The worker normally
+# wakes exactly at the next `wake_at` or when an earlier wake is scheduled; this
+# cap only bounds how late it notices wakes written by another process.
+WORKER_MAX_IDLE_SECONDS = 60
+
+# Back-off while OpenAI is not configured (in seconds)
+WORKER_UNCONFIGURED_SLEEP_SECONDS = 5
 
 
 class BackgroundLoopService:
@@ -62,6 +69,8 @@ class BackgroundLoopService:
         storage: JorbStorage | None = None,
         email_service: EmailService | None = None,
         context_reset_service: ContextResetService | None = None,
+        worker_concurrency: int | None = None,
+        worker_poll_concurrency: int | None = None,
     ):
         """
         Initialize the background loop service.
@@ -70,6 +79,10 @@ class BackgroundLoopService:
             storage: JorbStorage instance. Creates one if not provided.
             email_service: EmailService instance. Creates one if not provided.
             context_reset_service: ContextResetService instance. Creates one if not provided.
+            worker_concurrency: Max concurrent LLM turns in the worker loop.
+                Defaults to JORB_WORKER_CONCURRENCY.
+            worker_poll_concurrency: Max concurrent android/meta task polls.
+                Defaults to JORB_WORKER_POLL_CONCURRENCY.
         """
         self._storage = storage or JorbStorage()
         self._email_service = email_service or EmailService()
@@ -88,8 +101,14 @@ class BackgroundLoopService:
         self._last_weekly_health_check: str | None = None
         self._started_at: str | None = None
         self._last_tick_at: str | None = None
+        self._worker_next_wake_at: str | None = None
         self._crash_error: str | None = None  # Set if a critical loop crashes
 
+        env_concurrency, env_poll_concurrency = worker_concurrency_from_env()
+        self._worker_concurrency = worker_concurrency or env_concurrency
+        self._worker_poll_concurrency = worker_poll_concurrency or env_poll_concurrency
+        self._worker_pool: JorbWorkerPool | None = None
+
     @property
     def is_running(self) -> bool:
         """Check if the background loop is running."""
@@ -122,6 +141,8 @@ class BackgroundLoopService:
             "worker_task_running": (
                 self._worker_task is not None and not self._worker_task.done()
             ),
+            "worker_next_wake_at": self._worker_next_wake_at,
+            "worker_pool": self._worker_pool.get_status() if self._worker_pool is not None else None,
             "last_digest_date": self._last_digest_date,
             "last_monthly_maintenance": self._last_monthly_maintenance,
             "last_weekly_health_check": self._last_weekly_health_check,
@@ -290,15 +311,21 @@ class BackgroundLoopService:
     async def _worker_loop_inner(self) -> None:
         """Inner worker loop implementation."""
         runner = AgentRunner(storage=self._storage)
+        pool = JorbWorkerPool(self._worker_concurrency, self._worker_poll_concurrency)
+        self._worker_pool = pool
+
+        async def _process(jorb) -> None:
+            async with pool.llm_slot():
+                await runner.process_jorb_event(jorb, event=None)
 
-        async def _poll_android_task_if_awaiting(jorb) -> bool:
+        async def _poll_android_task_if_awaiting(jorb) -> tuple[bool, bool]:
             awaiting = str(getattr(jorb, "awaiting", "") or "").strip()
             if not awaiting.startswith("android_task:"):
-                return False
+                return False, False
 
             task_id = awaiting.split(":", 1)[1].strip()
             if not task_id:
-                return False
+                return False, False
 
             meta = getattr(jorb, "metadata", {}) or {}
             try:
@@ -337,7 +364,7 @@ class BackgroundLoopService:
                     awaiting=f"android_task:{task_id}",
                     wake_at=wake_at_iso,
                 )
-                return True
+                return True, False
 
             # Terminal/error: for failures, proactively notify the human once with
             # the exact error, then clear awaiting. For success, let the LLM
@@ -402,12 +429,12 @@ class BackgroundLoopService:
                                 await self._storage.update_jorb(
                                     jorb.id, metadata_json=json.dumps(meta), awaiting=None, wake_at=None
                                 )
-                                return True
+                                return True, False
                 except Exception:
                     logger.exception("Failed to auto-notify android task failure for jorb %s", jorb.id)
 
                 await self._storage.update_jorb(jorb.id, awaiting=None, wake_at=None)
-                return True
+                return True, False
 
             # Mark terminal observation so downstream POLL handlers can avoid
             # writing duplicate terminal android.task_get entries.
@@ -419,18 +446,16 @@ class BackgroundLoopService:
                 logger.exception("Failed to persist terminal android task marker for %s", jorb.id)
 
             await self._storage.update_jorb(jorb.id, awaiting=None, wake_at=None)
-            refreshed = await self._storage.get_jorb(jorb.id) or jorb
-            await runner.process_jorb_event(refreshed, event=None)
-            return True
+            return True, True
 
-        async def _poll_meta_task_if_awaiting(jorb) -> bool:
+        async def _poll_meta_task_if_awaiting(jorb) -> tuple[bool, bool]:
             awaiting = str(getattr(jorb, "awaiting", "") or "").strip()
             if not awaiting.startswith("meta_task:"):
-                return False
+                return False, False
 
             task_id = awaiting.split(":", 1)[1].strip()
             if not task_id:
-                return False
+                return False, False
 
             meta = getattr(jorb, "metadata", {}) or {}
             try:
@@ -439,18 +464,22 @@ class BackgroundLoopService:
                 poll_seconds = 5
             poll_seconds = max(1, min(60, poll_seconds))
 
-            from meta.jobs import JobStatus, get_job
+            from meta.jobs import JobStatus, get_job, read_job_output
 
             job = await asyncio.to_thread(get_job, task_id)
             job_dict = job.to_dict() if job else {"job_id": task_id, "status": "not_found"}
 
-            # Add stdout/stderr tail (TTY-like)
-            stdout = str(job_dict.get("stdout") or "")
-            stderr = str(job_dict.get("stderr") or "")
-            job_dict["stdout_tail"] = stdout[-2000:]
-            job_dict["stderr_tail"] = stderr[-2000:]
-            job_dict["stdout_len"] = len(stdout)
-            job_dict["stderr_len"] = len(stderr)
+            # Add stdout/stderr tail (TTY-like). Running jobs stream their output
+            # to sidecar logs, so tail those rather than waiting for the record.
+            for stream in ("stdout", "stderr"):
+                output = await asyncio.to_thread(read_job_output, task_id, stream, None, 2000)
+                if output["size"]:
+                    job_dict[f"{stream}_tail"] = output["text"]
+                    job_dict[f"{stream}_len"] = output["size"]
+                else:
+                    text = str(job_dict.get(stream) or "")
+                    job_dict[f"{stream}_tail"] = text[-2000:]
+                    job_dict[f"{stream}_len"] = len(text)
 
             await self._storage.add_script_result(
                 jorb.id,
@@ -469,54 +498,98 @@ class BackgroundLoopService:
                     awaiting=f"meta_task:{task_id}",
                     wake_at=wake_at_iso,
                 )
-                return True
+                return True, False
 
             await self._storage.update_jorb(jorb.id, awaiting=None, wake_at=None)
-            refreshed = await self._storage.get_jorb(jorb.id) or jorb
-            await runner.process_jorb_event(refreshed, event=None)
-            return True
-
-        while self._running and self._shutdown_event and not self._shutdown_event.is_set():
-            self._last_tick_at = datetime.now(timezone.utc).isoformat()
-
-            if not runner.is_configured:
-                # If OpenAI isn't configured, there's nothing meaningful to do.
-                await asyncio.sleep(max(5, WORKER_TICK_INTERVAL_SECONDS))
-                continue
+            return True, True
 
+        async def _handle(jorb) -> None:
             try:
-                due = await self._storage.list_due_jorbs(limit=25)
-            except Exception as exc:
-                logger.error("Worker loop failed to list due jorbs: %s", exc)
-                await asyncio.sleep(5)
-                continue
+                # Fast-path: poll awaited long-running tasks without invoking the LLM
+                # on every poll tick. Only invoke the LLM once when the task reaches
+                # a terminal state so it can interpret results and message the human.
+                # The LLM turn for a finished task runs after the poll slot is
+                # released, so slow turns never hold up other jorbs' polls.
+                async with pool.poll_slot():
+                    handled, needs_turn = await _poll_android_task_if_awaiting(jorb)
+                    if not handled:
+                        handled, needs_turn = await _poll_meta_task_if_awaiting(jorb)
+                if handled and not needs_turn:
+                    return
+                if needs_turn:
+                    jorb = await self._storage.get_jorb(jorb.id) or jorb
+
+                await _process(jorb)
+            except Exception:
+                logger.exception("Worker loop error processing jorb %s", jorb.id)
 
-            if not due:
-                await asyncio.sleep(WORKER_TICK_INTERVAL_SECONDS)
-                continue
+        try:
+            while self._running and self._shutdown_event and not self._shutdown_event.is_set():
+                self._last_tick_at = datetime.now(timezone.utc).isoformat()
 
-            for jorb in due:
-                # Clear wake_at immediately to prevent duplicate processing
-                try:
-                    await self._storage.update_jorb(jorb.id, wake_at=None)
-                except Exception:
-                    logger.exception("Failed to clear wake_at for jorb %s", jorb.id)
+                if not runner.is_configured:
+                    # If OpenAI isn't configured, there's nothing meaningful to do.
+                    await asyncio.sleep(WORKER_UNCONFIGURED_SLEEP_SECONDS)
+                    continue
 
                 try:
-                    # Fast-path: poll awaited long-running tasks without invoking the LLM
-                    # on every poll tick. Only invoke the LLM once when the task reaches
-                    # a terminal state so it can interpret results and message the human.
-                    if await _poll_android_task_if_awaiting(jorb):
-                        continue
-                    if await _poll_meta_task_if_awaiting(jorb):
-                        continue
-
-                    await runner.process_jorb_event(jorb, event=None)
-                except Exception:
-                    logger.exception("Worker loop error processing jorb %s", jorb.id)
+                    due = await self._storage.list_due_jorbs(limit=25)
+                except Exception as exc:
+                    logger.error("Worker loop failed to list due jorbs: %s", exc)
+                    await asyncio.sleep(5)
+                    continue
+
+                # Jorbs already in flight keep their wake_at; they are picked up
+                # again once their current task finishes.
+                ready = pool.select(due)
+                if not ready:
+                    await self._wait_for_worker_capacity(pool)
+                    continue
+
+                for jorb in ready:
+                    # Clear wake_at immediately to prevent duplicate processing
+                    try:
+                        await self._storage.update_jorb(jorb.id, wake_at=None)
+                    except Exception:
+                        logger.exception("Failed to clear wake_at for jorb %s", jorb.id)
+                    pool.dispatch(jorb.id, lambda jorb=jorb: _handle(jorb))
+
+                # Yield between batches
+                await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            await pool.cancel_all()
+            raise
+
+        await pool.drain()
+
+    async def _wait_for_worker_capacity(self, pool: JorbWorkerPool) -> None:
+        """
+        Block until there is something new to dispatch.
 
-            # Yield between batches
-            await asyncio.sleep(0)
+        That is either an in-flight jorb finishing (freeing a slot, or making a
+        busy due jorb dispatchable) or, while slots are free, the next wake of a
+        jorb that is not already in flight.
+        """
+        if not self._running or (self._shutdown_event and self._shutdown_event.is_set()):
+            return
+        if not len(pool):
+            await self._sleep_until_next_wake()
+            return
+        waits = []
+        if len(pool) < pool.capacity:
+            waits.append(self._sleep_until_next_wake(exclude=pool.in_flight_ids))
+        await pool.wait_any(waits)
+
+    async def _sleep_until_next_wake(self, exclude: frozenset[str] = frozenset()) -> None:
+        """Block until the next scheduled jorb wake (no polling of storage)."""
+        if not self._running or (self._shutdown_event and self._shutdown_event.is_set()):
+            return
+        self._worker_next_wake_at = self._storage.next_wake_at()
+        try:
+            await self._storage.wait_for_due_jorbs(WORKER_MAX_IDLE_SECONDS, exclude=exclude)
+        except Exception as exc:
+            logger.error("Worker loop failed waiting for due jorbs: %s", exc)
+            await asyncio.sleep(5)
 
     async def _heartbeat_loop(self) -> None:
         """
@@ -0,0 +1,213 @@
+"""
+In-process change feed for live dashboard updates.
+
+Storage layers publish small deltas as they write (`JorbStorage`,
+`meta/jobs`, `AndroidTaskStorage`); the dashboard's server-sent event
+stream (`/dashboard/events`) forwards them, so the web components patch
+their state instead of re-fetching whole lists on a timer.
+
+Event kinds:
+
+- `jorb.created` / `jorb.updated`: `{"jorb": <list_jorbs entry>}`
+- `jorb.message`: `{"jorb_id": ..., "message": <message>}`
+- `job.updated`: `{"job": <job summary>}`
+- `android_task.updated`: `{"task": <task summary>}`
+- `resync`: the client missed events and should re-fetch
+
+Each event has an id of `<epoch>-<seq>`. The last `CHANGE_FEED_BUFFER_SIZE`
+events are kept, so a client that reconnects with `Last-Event-ID` is sent
+what it missed. If the gap is no longer buffered (or the server restarted,
+which changes the epoch), it gets a `resync` event instead.
+
+Publishing is thread-safe (FrankAPI calls and job updates run on worker
+threads) and nearly free while nobody is subscribed: payloads can be passed
+as callables, which are only evaluated when there is a subscriber.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable
+
+logger = logging.getLogger(__name__)
+
+CHANGE_FEED_BUFFER_SIZE = int(os.getenv("CHANGE_FEED_BUFFER_SIZE", "1000"))
+# Events queued for one slow client before it is told to resync instead.
+SUBSCRIBER_QUEUE_SIZE = 256
+# Comment lines sent on an idle stream; must beat proxy read timeouts (nginx: 30s).
+DASHBOARD_EVENTS_HEARTBEAT_SECONDS = float(os.getenv("DASHBOARD_EVENTS_HEARTBEAT_SECONDS", "15"))
+
+RESYNC = "resync"
+
+
+@dataclass(frozen=True, slots=True)
+class ChangeEvent:
+    """One published change."""
+
+    id: str
+    seq: int
+    kind: str
+    data: dict[str, Any]
+    at: float
+
+    def to_sse(self) -> str:
+        payload = json.dumps(self.data, separators=(",", ":"), default=str)
+        return f"id: {self.id}\nevent: {self.kind}\ndata: {payload}\n\n"
+
+
+class ChangeSubscription:
+    """A subscriber's queue of events, bound to the event loop that subscribed."""
+
+    def __init__(self, feed: ChangeFeed):
+        self._feed = feed
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue[ChangeEvent] = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+        self.dropped = 0
+
+    def deliver(self, event: ChangeEvent) -> None:
+        """Queue an event from any thread."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._put(event)
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # The subscriber's loop is closed; it will never read again.
+            self._feed.unsubscribe(self)
+
+    def _put(self, event: ChangeEvent) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too far behind to catch up event by event: replace the backlog
+            # with a resync so the client re-fetches once.
+            self.dropped += self._queue.qsize() + 1
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(self._feed.resync_event())
+
+    async def get(self, timeout: float | None = None) -> ChangeEvent | None:
+        """Next event, or None after `timeout` seconds without one."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class ChangeFeed:
+    """Sequenced, bounded buffer of change events with live subscribers."""
+
+    def __init__(self, buffer_size: int = CHANGE_FEED_BUFFER_SIZE):
+        self.epoch = uuid.uuid4().hex[:8]
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._buffer: deque[ChangeEvent] = deque(maxlen=max(1, buffer_size))
+        self._subscribers: set[ChangeSubscription] = set()
+
+    @property
+    def active(self) -> bool:
+        """Whether anyone is subscribed."""
+        return bool(self._subscribers)
+
+    @property
+    def last_id(self) -> str:
+        return f"{self.epoch}-{self._seq}"
+
+    def publish(self, kind: str, data: dict[str, Any] | Callable[[], dict[str, Any]]) -> None:
+        """Publish a change; `data` may be a callable, evaluated only if someone is listening."""
+        if not self._subscribers:
+            with self._lock:
+                self._seq += 1
+                # Nobody will see these; a reconnecting client must resync.
+                self._buffer.clear()
+            return
+        try:
+            payload = data() if callable(data) else data
+        except Exception:
+            logger.exception("Failed to build %s change event", kind)
+            return
+        with self._lock:
+            self._seq += 1
+            event = ChangeEvent(f"{self.epoch}-{self._seq}", self._seq, kind, payload, time.time())
+            self._buffer.append(event)
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.deliver(event)
+
+    def resync_event(self) -> ChangeEvent:
+        with self._lock:
+            return ChangeEvent(self.last_id, self._seq, RESYNC, {}, time.time())
+
+    def subscribe(self, last_event_id: str | None = None) -> tuple[ChangeSubscription, list[ChangeEvent]]:
+        """
+        Register a subscriber (must be called from its event loop).
+
+        Returns the subscription and the events to send first: those after
+        `last_event_id` when they are still buffered, otherwise a resync.
+        """
+        subscription = ChangeSubscription(self)
+        with self._lock:
+            self._subscribers.add(subscription)
+            backlog = self._backlog(last_event_id)
+        return subscription, backlog
+
+    def unsubscribe(self, subscription: ChangeSubscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def _backlog(self, last_event_id: str | None) -> list[ChangeEvent]:
+        """Events after `last_event_id`. Caller holds the lock."""
+        if not last_event_id:
+            return []
+        epoch, _, seq_text = last_event_id.partition("-")
+        try:
+            seq = int(seq_text)
+        except ValueError:
+            seq = -1
+        if epoch == self.epoch and 0 <= seq <= self._seq:
+            if seq == self._seq:
+                return []
+            if self._buffer and self._buffer[0].seq <= seq + 1:
+                return [event for event in self._buffer if event.seq > seq]
+        return [ChangeEvent(self.last_id, self._seq, RESYNC, {}, time.time())]
+
+    async def stream(
+        self,
+        last_event_id: str | None = None,
+        heartbeat_seconds: float = DASHBOARD_EVENTS_HEARTBEAT_SECONDS,
+    ) -> AsyncIterator[str]:
+        """Server-sent event stream of changes, with keep-alive comments."""
+        subscription, backlog = self.subscribe(last_event_id)
+        try:
+            yield "retry: 3000\n\n"
+            for event in backlog:
+                yield event.to_sse()
+            while True:
+                event = await subscription.get(heartbeat_seconds)
+                yield event.to_sse() if event is not None else ": keep-alive\n\n"
+        finally:
+            self.unsubscribe(subscription)
+
+
+change_feed = ChangeFeed()
+
+
+__all__ = [
+    "ChangeEvent",
+    "ChangeFeed",
+    "ChangeSubscription",
+    "RESYNC",
+    "change_feed",
+]
@@ -1,23 +1,43 @@
 """
 Contact Lookup Service for phone-to-contact reverse lookup.
 
-Provides efficient phone number to Google Contact resolution with caching.
+`ContactDirectory` keeps a process-wide hash index from normalized phone
+digits to contacts, so lookups never touch the network. It is loaded from a
+snapshot on disk (`data/contacts_index.json`) for fast cold starts and kept
+current by a background task that syncs with the People API using sync
+tokens, fetching only contacts changed since the last sync. `ContactLookup`
+is the per-caller facade over the shared directory.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
 import re
+import threading
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
 
-from services.google_contacts import GoogleContactsService
+from googleapiclient.errors import HttpError
 
-if TYPE_CHECKING:
-    pass
+from services.file_store import read_json_file, write_json_atomic
+from services.google_contacts import GoogleContactsService, get_contacts_service
 
 logger = logging.getLogger(__name__)
 
+# How often the background task syncs the directory with Google (seconds)
+CONTACT_DIRECTORY_REFRESH_SECONDS = float(os.getenv("CONTACT_DIRECTORY_REFRESH_SECONDS", "300"))
+
+SNAPSHOT_VERSION = 1
+
+# "metadata" makes incremental syncs report deleted contacts.
+PERSON_FIELDS = ("names", "phoneNumbers", "metadata")
+
+SYNC_PAGE_SIZE = 1000
+
 
 @dataclass
 class Contact:
@@ -85,65 +105,78 @@ def _phones_match(phone1: str, phone2: str) -> bool:
     return False
 
 
-class ContactLookup:
+def _display_name(person: dict[str, Any]) -> str | None:
+    for name in person.get("names", []):
+        display_name = name.get("displayName") or name.get("unstructuredName")
+        if display_name:
+            return display_name
+    return None
+
+
+def _index_keys(digits: str) -> list[str]:
     """
-    Service for looking up contacts by phone number.
+    Keys under which a contact phone is indexed.
 
-    Uses Google Contacts for data and caches results to prevent
-    repeated API calls for the same number.
+    Adds the 10/11-digit US variant so a single dict probe matches exactly
+    the pairs `_phones_match` accepts.
     """
+    keys = [digits]
+    if len(digits) == 10:
+        keys.append("1" + digits)
+    elif len(digits) == 11 and digits.startswith("1"):
+        keys.append(digits[1:])
+    return keys
 
-    def __init__(self, contacts_service: GoogleContactsService | None = None):
+
+class ContactDirectory:
+    """
+    Phone-number index over all Google contacts. Thread-safe.
+
+    Lookups read an immutable dict that syncs swap out whole. Only the first
+    lookup in a process with no snapshot waits for a full sync.
+    """
+
+    def __init__(
+        self,
+        contacts_service: GoogleContactsService | None = None,
+        snapshot_path: Path | None = None,
+    ):
         """
-        Initialize the contact lookup service.
+        Initialize the directory.
 
         Args:
             contacts_service: GoogleContactsService instance.
-                            If None, creates a new one.
+                            If None, uses the shared one.
+            snapshot_path: Where to persist the index between runs (optional).
         """
         self._contacts_service = contacts_service
-        self._cache: dict[str, Contact | None] = {}
-        self._all_contacts_loaded = False
-        self._all_contacts: list[dict] = []
+        self._snapshot_path = snapshot_path
+        self._sync_lock = threading.Lock()
+        # resourceName -> {"name": ..., "phones": [digits, ...]}, in Google's order.
+        self._people: dict[str, dict[str, Any]] = {}
+        self._index: dict[str, Contact] = {}
+        self._sync_token: str | None = None
+        self._synced_at: str | None = None
+        self._loaded = False
+        self._use_snapshot = snapshot_path is not None
 
     def _get_service(self) -> GoogleContactsService:
-        """Get or create the contacts service."""
+        """Get the contacts service (the process-wide one by default)."""
         if self._contacts_service is None:
-            self._contacts_service = GoogleContactsService()
+            self._contacts_service = get_contacts_service()
         return self._contacts_service
 
-    def _load_all_contacts(self) -> None:
-        """
-        Load all contacts from Google Contacts.
-
-        This is done once and cached for efficient lookups.
-        """
-        if self._all_contacts_loaded:
-            return
+    def __len__(self) -> int:
+        return len(self._people)
 
-        try:
-            service = self._get_service()
-            all_contacts = []
-            page_token = None
-
-            while True:
-                result = service.list_contacts(
-                    page_size=100,
-                    person_fields=("names", "phoneNumbers"),
-                    page_token=page_token,
-                )
-                all_contacts.extend(result.get("connections", []))
-                page_token = result.get("nextPageToken")
-                if not page_token:
-                    break
-
-            self._all_contacts = all_contacts
-            self._all_contacts_loaded = True
-            logger.info("Loaded %d contacts for phone lookup", len(all_contacts))
-        except Exception as exc:
-            logger.error("Failed to load contacts: %s", exc)
-            self._all_contacts = []
-            self._all_contacts_loaded = True  # Don't retry on every lookup
+    def status(self) -> dict[str, Any]:
+        return {
+            "loaded": self._loaded,
+            "contacts": len(self._people),
+            "phone_keys": len(self._index),
+            "synced_at": self._synced_at,
+            "incremental": self._sync_token is not None,
+        }
 
     def lookup(self, phone_number: str) -> Contact | None:
         """
@@ -155,60 +188,270 @@ class ContactLookup:
         Returns:
             Contact with name and googleContactId, or None if not found
         """
-        if not phone_number:
+        digits = _extract_digits(phone_number or "")
+        if not digits:
             return None
+        if not self._loaded:
+            self._ensure_loaded()
+        contact = self._index.get(digits)
+        if contact is None:
+            logger.debug("No contact found for phone %s", phone_number)
+        return contact
+
+    def refresh(self) -> None:
+        """Sync with Google (incrementally when possible) and save a snapshot. Blocking."""
+        with self._sync_lock:
+            if not self._loaded and self._use_snapshot:
+                self._load_snapshot()
+            self._sync()
+
+    def invalidate(self) -> None:
+        """Forget everything; the next lookup does a full sync from Google."""
+        with self._sync_lock:
+            self._people = {}
+            self._index = {}
+            self._sync_token = None
+            self._synced_at = None
+            self._loaded = False
+            self._use_snapshot = False
+
+    def _ensure_loaded(self) -> None:
+        with self._sync_lock:
+            if self._loaded:
+                return
+            if self._use_snapshot and self._load_snapshot():
+                return
+            self._sync()
+
+    def _sync(self) -> None:
+        """Run one sync. Caller holds `_sync_lock`."""
+        incremental = self._sync_token is not None
+        try:
+            try:
+                changed, sync_token = self._fetch(self._sync_token)
+            except HttpError as exc:
+                if not incremental:
+                    raise
+                # An expired token comes back as 400 EXPIRED_SYNC_TOKEN; whatever
+                # the cause, don't keep retrying (and snapshotting) the same token.
+                logger.info(
+                    "Incremental contacts sync failed (HTTP %s); doing a full sync",
+                    exc.resp.status,
+                )
+                self._sync_token = None
+                incremental = False
+                changed, sync_token = self._fetch(None)
+        except Exception as exc:
+            logger.error("Failed to load contacts: %s", exc)
+            # Don't retry on every lookup; the background refresh retries.
+            self._loaded = True
+            return
+
+        people = dict(self._people) if incremental else {}
+        for person in changed:
+            resource_name = person.get("resourceName")
+            if not resource_name:
+                continue
+            if (person.get("metadata") or {}).get("deleted"):
+                people.pop(resource_name, None)
+                continue
+            people[resource_name] = {
+                "name": _display_name(person),
+                "phones": [
+                    digits
+                    for entry in person.get("phoneNumbers", [])
+                    if (digits := _extract_digits(entry.get("value", "")))
+                ],
+            }
+
+        self._install(people, sync_token, datetime.now(timezone.utc).isoformat())
+        logger.info(
+            "%s contacts directory: %d contacts (%d changed)",
+            "Updated" if incremental else "Loaded",
+            len(people),
+            len(changed),
+        )
+        self._save_snapshot()
+
+    def _fetch(self, sync_token: str | None) -> tuple[list[dict[str, Any]], str | None]:
+        service = self._get_service()
+        people: list[dict[str, Any]] = []
+        page_token = None
+        next_sync_token = None
+        while True:
+            result = service.list_contacts(
+                page_size=SYNC_PAGE_SIZE,
+                person_fields=PERSON_FIELDS,
+                page_token=page_token,
+                sync_token=sync_token,
+                request_sync_token=True,
+            )
+            people.extend(result.get("connections", []))
+            next_sync_token = result.get("nextSyncToken") or next_sync_token
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                break
+        return people, next_sync_token
+
+    def _install(
+        self,
+        people: dict[str, dict[str, Any]],
+        sync_token: str | None,
+        synced_at: str | None,
+    ) -> None:
+        index: dict[str, Contact] = {}
+        for resource_name, entry in people.items():
+            if not entry.get("name"):
+                continue
+            contact = Contact(name=entry["name"], googleContactId=resource_name)
+            for digits in entry.get("phones", []):
+                for key in _index_keys(digits):
+                    # First contact in Google's order wins, as with a linear scan.
+                    index.setdefault(key, contact)
+        self._people = people
+        self._index = index
+        self._sync_token = sync_token
+        self._synced_at = synced_at
+        self._loaded = True
+
+    def _load_snapshot(self) -> bool:
+        assert self._snapshot_path is not None
+        try:
+            payload = read_json_file(self._snapshot_path, None)
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable contacts snapshot %s: %s", self._snapshot_path, exc)
+            return False
+        if not isinstance(payload, dict) or payload.get("version") != SNAPSHOT_VERSION:
+            return False
+        people = {
+            entry["resourceName"]: {"name": entry.get("name"), "phones": list(entry.get("phones") or [])}
+            for entry in payload.get("people", [])
+            if isinstance(entry, dict) and entry.get("resourceName")
+        }
+        self._install(people, payload.get("sync_token"), payload.get("synced_at"))
+        logger.info(
+            "Loaded contacts directory snapshot (%d contacts, synced %s)",
+            len(people),
+            self._synced_at,
+        )
+        return True
+
+    def _save_snapshot(self) -> None:
+        if self._snapshot_path is None:
+            return
+        payload = {
+            "version": SNAPSHOT_VERSION,
+            "sync_token": self._sync_token,
+            "synced_at": self._synced_at,
+            "people": [
+                {"resourceName": resource_name, **entry}
+                for resource_name, entry in self._people.items()
+            ],
+        }
+        try:
+            write_json_atomic(self._snapshot_path, payload)
+        except OSError as exc:
+            logger.warning("Failed to save contacts snapshot: %s", exc)
+        else:
+            self._use_snapshot = True
 
-        normalized = _normalize_phone(phone_number)
 
-        # Check cache first
-        if normalized in self._cache:
-            return self._cache[normalized]
+_directory: ContactDirectory | None = None
+_directory_lock = threading.Lock()
+_refresh_task: asyncio.Task | None = None
 
-        # Load all contacts if not already loaded
-        self._load_all_contacts()
 
-        # Search through contacts
-        for person in self._all_contacts:
-            resource_name = person.get("resourceName")
-            names = person.get("names", [])
-            phone_numbers = person.get("phoneNumbers", [])
+def get_contact_directory() -> ContactDirectory:
+    """Process-wide ContactDirectory, snapshotted under DATA_DIR."""
+    global _directory
+    if _directory is None:
+        with _directory_lock:
+            if _directory is None:
+                data_dir = Path(os.getenv("DATA_DIR", "./data"))
+                _directory = ContactDirectory(snapshot_path=data_dir / "contacts_index.json")
+    return _directory
 
-            # Get display name
-            display_name = None
-            for name in names:
-                display_name = name.get("displayName") or name.get("unstructuredName")
-                if display_name:
-                    break
 
-            if not display_name:
-                continue
+async def _refresh_loop(directory: ContactDirectory, interval: float) -> None:
+    while True:
+        try:
+            await asyncio.to_thread(directory.refresh)
+        except Exception as exc:
+            logger.warning("Contacts directory refresh failed: %s", exc)
+        await asyncio.sleep(interval)
 
-            # Check each phone number
-            for phone_entry in phone_numbers:
-                contact_phone = phone_entry.get("value", "")
-                if _phones_match(phone_number, contact_phone):
-                    contact = Contact(
-                        name=display_name,
-                        googleContactId=resource_name,
-                    )
-                    self._cache[normalized] = contact
-                    logger.debug(
-                        "Found contact %s for phone %s",
-                        display_name,
-                        phone_number,
-                    )
-                    return contact
-
-        # Not found - cache the miss
-        self._cache[normalized] = None
-        logger.debug("No contact found for phone %s", phone_number)
-        return None
 
-    def clear_cache(self) -> None:
-        """Clear the lookup cache."""
-        self._cache.clear()
-        self._all_contacts_loaded = False
-        self._all_contacts = []
+def start_contact_directory(interval: float = CONTACT_DIRECTORY_REFRESH_SECONDS) -> None:
+    """Start syncing the shared directory in the background (idempotent)."""
+    global _refresh_task
+    if _refresh_task is not None and not _refresh_task.done():
+        return
+    _refresh_task = asyncio.create_task(
+        _refresh_loop(get_contact_directory(), interval),
+        name="contact-directory-refresh",
+    )
+
+
+async def stop_contact_directory() -> None:
+    global _refresh_task
+    task, _refresh_task = _refresh_task, None
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+class ContactLookup:
+    """
+    Service for looking up contacts by phone number.
+
+    A thin handle on the shared `ContactDirectory`, so it is cheap to create
+    per call and every caller shares one index.
+    """
+
+    def __init__(self, contacts_service: GoogleContactsService | None = None):
+        """
+        Initialize the contact lookup service.
+
+        Args:
+            contacts_service: GoogleContactsService instance. If given, the
+                            lookup gets its own directory over that service
+                            instead of the shared one.
+        """
+        if contacts_service is None:
+            self._directory = get_contact_directory()
+        else:
+            self._directory = ContactDirectory(contacts_service)
+
+    def _get_service(self) -> GoogleContactsService:
+        """Get the contacts service (the process-wide one by default)."""
+        return self._directory._get_service()
+
+    def lookup(self, phone_number: str) -> Contact | None:
+        """
+        Look up a contact by phone number.
 
+        Args:
+            phone_number: The phone number to search for (any format)
 
-__all__ = ["ContactLookup", "Contact"]
+        Returns:
+            Contact with name and googleContactId, or None if not found
+        """
+        return self._directory.lookup(phone_number)
+
+    def clear_cache(self) -> None:
+        """Drop the directory so the next lookup reloads it from Google."""
+        self._directory.invalidate()
+
+
+__all__ = [
+    "ContactLookup",
+    "Contact",
+    "ContactDirectory",
+    "get_contact_directory",
+    "start_contact_directory",
+    "stop_contact_directory",
+]
@@ -4,8 +4,9 @@ import asyncio
 import json
 import os
 import tempfile
+from itertools import islice
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Iterable, Iterator
 
 
 def derive_json_storage_dir(path_hint: str | None, default_dir: str) -> Path:
@@ -30,7 +31,21 @@ def read_json_file(path: Path, default: Any = None) -> Any:
         return json.load(handle)
 
 
-def write_json_atomic(path: Path, payload: Any) -> None:
+def fsync_directory(path: Path) -> None:
+    """Persist directory entries (renames, new files) on POSIX filesystems."""
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_json_atomic(path: Path, payload: Any, fsync: bool = False) -> None:
     ensure_directory(path.parent)
     with tempfile.NamedTemporaryFile(
         "w",
@@ -40,8 +55,13 @@ def write_json_atomic(path: Path, payload: Any) -> None:
     ) as handle:
         json.dump(payload, handle, indent=2, ensure_ascii=False)
         handle.write("\n")
+        if fsync:
+            handle.flush()
+            os.fsync(handle.fileno())
         temp_name = handle.name
     os.replace(temp_name, path)
+    if fsync:
+        fsync_directory(path.parent)
 
 
 def list_json_files(path: Path) -> list[Path]:
@@ -59,3 +79,116 @@ async def to_thread(func, /, *args, **kwargs):
 
 def newest_first(paths: Iterable[Path]) -> list[Path]:
     return sorted(paths, key=lambda path: path.name, reverse=True)
+
+
+def append_jsonl(path: Path, payloads: Iterable[Any], fsync: bool = False) -> None:
+    """Append one JSON document per line, repairing a torn trailing line first."""
+    ensure_directory(path.parent)
+    lines = [json.dumps(payload, ensure_ascii=False) + "\n" for payload in payloads]
+    if not lines:
+        return
+    created = not path.exists()
+    with path.open("a+b") as handle:
+        if handle.tell() > 0:
+            handle.seek(-1, os.SEEK_END)
+            if handle.read(1) != b"\n":
+                handle.write(b"\n")
+        handle.write("".join(lines).encode("utf-8"))
+        if fsync:
+            handle.flush()
+            os.fsync(handle.fileno())
+    if fsync and created:
+        fsync_directory(path.parent)
+
+
+def write_jsonl_atomic(path: Path, payloads: Iterable[Any], fsync: bool = False) -> None:
+    ensure_directory(path.parent)
+    with tempfile.NamedTemporaryFile(
+        "w",
+        encoding="utf-8",
+        dir=str(path.parent),
+        delete=False,
+    ) as handle:
+        for payload in payloads:
+            handle.write(json.dumps(payload, ensure_ascii=False))
+            handle.write("\n")
+        if fsync:
+            handle.flush()
+            os.fsync(handle.fileno())
+        temp_name = handle.name
+    os.replace(temp_name, path)
+    if fsync:
+        fsync_directory(path.parent)
+
+
+def _parse_jsonl_line(raw: bytes) -> Any:
+    raw = raw.strip()
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        # A torn write from a crash mid-append; skip it.
+        return None
+
+
+def read_jsonl(path: Path, offset: int = 0, limit: int | None = None) -> list[Any]:
+    """Read documents from the head of a JSONL file, skipping `offset` entries."""
+    if not path.exists():
+        return []
+    results: list[Any] = []
+    skipped = 0
+    with path.open("rb") as handle:
+        for raw in handle:
+            payload = _parse_jsonl_line(raw)
+            if payload is None:
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            results.append(payload)
+            if limit is not None and len(results) >= limit:
+                break
+    return results
+
+
+def iter_jsonl_reverse(path: Path, block_size: int = 64 * 1024) -> Iterator[Any]:
+    """
+    Yield the documents of a JSONL file from the last to the first.
+
+    Seeks backwards from the end a block at a time, so stopping early only
+    costs the blocks actually read.
+    """
+    if not path.exists():
+        return
+    with path.open("rb") as handle:
+        handle.seek(0, os.SEEK_END)
+        position = handle.tell()
+        buffer = b""
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            handle.seek(position)
+            buffer = handle.read(read_size) + buffer
+            parts = buffer.split(b"\n")
+            # The first part may be a partial line unless we reached the start.
+            buffer = parts[0] if position > 0 else b""
+            complete = parts[1:] if position > 0 else parts
+            for raw in reversed(complete):
+                payload = _parse_jsonl_line(raw)
+                if payload is not None:
+                    yield payload
+
+
+def read_jsonl_tail(path: Path, limit: int, block_size: int = 64 * 1024) -> list[Any]:
+    """
+    Read the last `limit` documents of a JSONL file in file order.
+
+    Seeks backwards from the end a block at a time, so the cost depends on the
+    size of the tail rather than the size of the file.
+    """
+    if limit <= 0:
+        return []
+    results = list(islice(iter_jsonl_reverse(path, block_size), limit))
+    results.reverse()
+    return results
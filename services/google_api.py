@@ -0,0 +1,175 @@
+"""
+Shared Google API plumbing for the Calendar and Contacts services.
+
+Building a googleapiclient service reads and parses a bundled discovery
+document (100KB+ of JSON), loading credentials reads the token file, and
+each new service opens its own HTTPS connection; doing all of that on every
+call dominated short requests. Per process, this module keeps:
+
+- one `Credentials` object per token file and scope set, refreshed under a
+  lock `GOOGLE_TOKEN_REFRESH_MARGIN_SECONDS` before it expires (so calls never
+  stall on an expired token, and concurrent callers never race to refresh).
+  The token file is re-read if it changes on disk (e.g. after re-running
+  `setup_google_credentials.py`);
+- each API's discovery document, read once;
+- one service object per thread per API. httplib2 connections are not
+  thread-safe, so services are thread-local; within a thread, the service
+  and its keep-alive connection are reused.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build, build_from_document
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_TOKEN_REFRESH_MARGIN_SECONDS = float(os.getenv("GOOGLE_TOKEN_REFRESH_MARGIN_SECONDS", "300"))
+
+_credentials_lock = threading.Lock()
+# (token file, scopes) -> (token file mtime, credentials)
+_credentials: dict[tuple[str, tuple[str, ...]], tuple[float, Credentials]] = {}
+
+_discovery_lock = threading.Lock()
+_discovery_documents: dict[tuple[str, str], str | None] = {}
+
+
+def _utcnow() -> datetime:
+    # google-auth keeps `expiry` as a naive UTC datetime.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _needs_refresh(creds: Credentials, margin_seconds: float) -> bool:
+    if not creds.token:
+        return True
+    if creds.expiry is None:
+        return False
+    return creds.expiry - _utcnow() <= timedelta(seconds=margin_seconds)
+
+
+def get_credentials(
+    scopes: tuple[str, ...] | list[str],
+    *,
+    token_file: str | None = None,
+    label: str = "Google",
+) -> Credentials:
+    """
+    Process-wide OAuth credentials for `scopes`, refreshed before they expire.
+
+    Raises:
+        FileNotFoundError: The token file does not exist.
+        RuntimeError: The credentials are invalid and cannot be refreshed.
+    """
+    token_file = token_file or get_settings().google_token_file
+    key = (token_file, tuple(scopes))
+
+    if not os.path.exists(token_file):
+        raise FileNotFoundError(
+            f"Token file not found: {token_file}. "
+            "Run setup_google_credentials.py to generate it."
+        )
+    mtime = os.path.getmtime(token_file)
+
+    with _credentials_lock:
+        cached = _credentials.get(key)
+        if cached is None or cached[0] != mtime:
+            creds = Credentials.from_authorized_user_file(token_file, list(scopes))
+            _credentials[key] = (mtime, creds)
+        else:
+            creds = cached[1]
+
+        if _needs_refresh(creds, GOOGLE_TOKEN_REFRESH_MARGIN_SECONDS):
+            if not creds.refresh_token:
+                if creds.valid:
+                    return creds
+                del _credentials[key]
+                raise RuntimeError(
+                    f"Invalid {label} credentials. "
+                    "Please re-run the OAuth setup."
+                )
+            logger.info("Refreshing %s credentials", label)
+            creds.refresh(Request())
+
+    return creds
+
+
+def discovery_document(api: str, version: str) -> str | None:
+    """The bundled discovery document for an API, read once (None if not bundled)."""
+    key = (api, version)
+    with _discovery_lock:
+        if key not in _discovery_documents:
+            _discovery_documents[key] = discovery_cache.get_static_doc(api, version)
+        return _discovery_documents[key]
+
+
+class GoogleApiClient:
+    """
+    Thread-local googleapiclient services for one API.
+
+    Args:
+        api: API name, e.g. "calendar"
+        version: API version, e.g. "v3"
+        scopes: OAuth scopes for the shared credentials
+        credentials: Fixed credentials to use instead of the shared ones
+        label: Name used in log and error messages
+    """
+
+    def __init__(
+        self,
+        api: str,
+        version: str,
+        scopes: tuple[str, ...] | list[str],
+        *,
+        credentials: Credentials | None = None,
+        label: str = "Google",
+    ):
+        self.api = api
+        self.version = version
+        self._scopes = tuple(scopes)
+        self._fixed_credentials = credentials
+        self._label = label
+        self._local = threading.local()
+
+    def credentials(self) -> Credentials:
+        if self._fixed_credentials is not None:
+            return self._fixed_credentials
+        return get_credentials(self._scopes, label=self._label)
+
+    def service(self) -> Any:
+        """This thread's service, rebuilt only if the credentials object changed."""
+        creds = self.credentials()
+        local = self._local
+        if getattr(local, "service", None) is None or local.credentials is not creds:
+            document = discovery_document(self.api, self.version)
+            if document is not None:
+                local.service = build_from_document(document, credentials=creds)
+            else:
+                local.service = build(self.api, self.version, credentials=creds)
+            local.credentials = creds
+        return local.service
+
+
+def reset_google_api_state() -> None:
+    """Forget cached credentials and discovery documents (for tests)."""
+    with _credentials_lock:
+        _credentials.clear()
+    with _discovery_lock:
+        _discovery_documents.clear()
+
+
+__all__ = [
+    "GoogleApiClient",
+    "discovery_document",
+    "get_credentials",
+    "reset_google_api_state",
+]
@@ -5,59 +5,41 @@ High-level helper for interacting with the Google Calendar API.
 from __future__ import annotations
 
 import logging
-import os
+import threading
 import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 from config import get_settings
+from services.google_api import GoogleApiClient
 from services.stats import stats
 
 logger = logging.getLogger(__name__)
 
 
-def _load_credentials(scopes: tuple[str, ...]) -> Credentials:
-    """Load OAuth credentials from disk and refresh them if needed."""
-    settings = get_settings()
-    token_file = settings.google_token_file
-
-    if not os.path.exists(token_file):
-        raise FileNotFoundError(
-            f"Token file not found: {token_file}. "
-            "Run setup_google_credentials.py to generate it."
-        )
-
-    creds = Credentials.from_authorized_user_file(token_file, list(scopes))
-
-    if not creds.valid:
-        if creds.expired and creds.refresh_token:
-            logger.info("Refreshing expired Google Calendar credentials")
-            creds.refresh(Request())
-        else:
-            raise RuntimeError(
-                "Invalid Google Calendar credentials. "
-                "Please re-run the OAuth setup."
-            )
-
-    return creds
-
-
 class GoogleCalendarService:
     """Wrapper with convenience methods for reading/writing calendars."""
 
     def __init__(self, credentials: Credentials | None = None):
-        settings = get_settings()
-        self._credentials = credentials or _load_credentials(
-            settings.google_calendar_scopes
+        self._client = GoogleApiClient(
+            "calendar",
+            "v3",
+            get_settings().google_calendar_scopes,
+            credentials=credentials,
+            label="Google Calendar",
         )
-        self._service = build("calendar", "v3", credentials=self._credentials)
+        # Fail fast on missing or unusable credentials, as callers expect.
+        self._client.credentials()
         self._calendar_id = "primary"
 
+    @property
+    def _service(self) -> Any:
+        """This thread's API service (googleapiclient objects are not thread-safe)."""
+        return self._client.service()
+
     def resolve_calendar_id(
         self,
         calendar_id: Optional[str] = None,
@@ -306,3 +288,19 @@ class GoogleCalendarService:
             stats.record_error("google_calendar", str(exc), {"method": "list_calendars"})
             raise
 
+
+_calendar_service: GoogleCalendarService | None = None
+_calendar_service_lock = threading.Lock()
+
+
+def get_calendar_service() -> GoogleCalendarService:
+    """Process-wide GoogleCalendarService (safe to share across threads)."""
+    global _calendar_service
+    if _calendar_service is None:
+        with _calendar_service_lock:
+            if _calendar_service is None:
+                _calendar_service = GoogleCalendarService()
+    return _calendar_service
+
+
+__all__ = ["GoogleCalendarService", "get_calendar_service"]
@@ -5,56 +5,38 @@ High-level helper for interacting with the Google Contacts (People) API.
 from __future__ import annotations
 
 import logging
-import os
+import threading
 import time
 from typing import Any, Dict, List, Optional, Sequence
 
-from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 from config import get_settings
+from services.google_api import GoogleApiClient
 from services.stats import stats
 
 logger = logging.getLogger(__name__)
 
 
-def _load_credentials(scopes: tuple[str, ...]) -> Credentials:
-    """Load OAuth credentials from disk and refresh them if needed."""
-    settings = get_settings()
-    token_file = settings.google_token_file
-
-    if not os.path.exists(token_file):
-        raise FileNotFoundError(
-            f"Token file not found: {token_file}. "
-            "Run setup_google_credentials.py to generate it."
-        )
-
-    creds = Credentials.from_authorized_user_file(token_file, list(scopes))
-
-    if not creds.valid:
-        if creds.expired and creds.refresh_token:
-            logger.info("Refreshing expired Google Contacts credentials")
-            creds.refresh(Request())
-        else:
-            raise RuntimeError(
-                "Invalid Google Contacts credentials. "
-                "Please re-run the OAuth setup."
-            )
-
-    return creds
-
-
 class GoogleContactsService:
     """Wrapper with convenience methods for reading/writing contacts."""
 
     def __init__(self, credentials: Credentials | None = None):
-        settings = get_settings()
-        self._credentials = credentials or _load_credentials(
-            settings.google_contacts_scopes
+        self._client = GoogleApiClient(
+            "people",
+            "v1",
+            get_settings().google_contacts_scopes,
+            credentials=credentials,
+            label="Google Contacts",
         )
-        self._service = build("people", "v1", credentials=self._credentials)
+        # Fail fast on missing or unusable credentials, as callers expect.
+        self._client.credentials()
+
+    @property
+    def _service(self) -> Any:
+        """This thread's API service (googleapiclient objects are not thread-safe)."""
+        return self._client.service()
 
     def list_contacts(
         self,
@@ -66,23 +48,33 @@ class GoogleContactsService:
             "phoneNumbers",
         ),
         page_token: str | None = None,
+        sync_token: str | None = None,
+        request_sync_token: bool = False,
     ) -> Dict[str, Any]:
-        """Return contacts plus pagination token."""
+        """
+        Return contacts plus pagination token.
+
+        With `request_sync_token`, the last page carries a `nextSyncToken`;
+        passing it back as `sync_token` returns only contacts changed since
+        (deleted ones have `metadata.deleted` set when "metadata" is requested).
+        An expired sync token raises HttpError 410.
+        """
         logger.debug("Fetching contacts page (size=%s)", page_size)
-        response = (
-            self._service.people()
-            .connections()
-            .list(
-                resourceName="people/me",
-                pageSize=page_size,
-                personFields=",".join(person_fields),
-                pageToken=page_token,
-            )
-            .execute()
-        )
+        params: Dict[str, Any] = {
+            "resourceName": "people/me",
+            "pageSize": page_size,
+            "personFields": ",".join(person_fields),
+            "pageToken": page_token,
+        }
+        if sync_token:
+            params["syncToken"] = sync_token
+        if request_sync_token:
+            params["requestSyncToken"] = True
+        response = self._service.people().connections().list(**params).execute()
         return {
             "connections": response.get("connections", []),
             "nextPageToken": response.get("nextPageToken"),
+            "nextSyncToken": response.get("nextSyncToken"),
         }
 
     def search_contacts(
@@ -195,3 +187,19 @@ class GoogleContactsService:
                 return
             raise
 
+
+_contacts_service: GoogleContactsService | None = None
+_contacts_service_lock = threading.Lock()
+
+
+def get_contacts_service() -> GoogleContactsService:
+    """Process-wide GoogleContactsService (safe to share across threads)."""
+    global _contacts_service
+    if _contacts_service is None:
+        with _contacts_service_lock:
+            if _contacts_service is None:
+                _contacts_service = GoogleContactsService()
+    return _contacts_service
+
+
+__all__ = ["GoogleContactsService", "get_contacts_service"]
@@ -0,0 +1,223 @@
+"""
+In-memory catalog of jorb header records.
+
+`JorbStorage` keeps one catalog per data directory so listing, due-jorb
+selection, contact lookups and aggregate metrics never have to glob and parse
+every `jorb_*.json` file. The catalog is rebuilt from disk the first time a
+process touches the store, updated on every write, and rebuilt again if the
+directory is modified by another process. It also feeds the wake-time
+scheduler that the background worker sleeps on.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Iterable
+
+from services.file_store import read_json_file
+from services.jorb_scheduler import JorbWakeScheduler
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATUSES = frozenset({"planning", "running", "paused"})
+CLOSED_STATUSES = frozenset({"complete", "failed", "cancelled"})
+ALL_STATUSES = ("planning", "running", "paused", "complete", "failed", "cancelled")
+METRIC_FIELDS = ("messages_in", "messages_out", "tokens_used", "estimated_cost", "context_resets")
+
+
+def _dir_token(path: Path) -> int | None:
+    """Return the directory mtime used to detect writes from other processes."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _metric_values(header: dict[str, Any]) -> dict[str, float]:
+    return {
+        "messages_in": int(header.get("messages_in") or 0),
+        "messages_out": int(header.get("messages_out") or 0),
+        "tokens_used": int(header.get("tokens_used") or 0),
+        "estimated_cost": float(header.get("estimated_cost") or 0.0),
+        "context_resets": int(header.get("context_resets") or 0),
+    }
+
+
+class JorbCatalog:
+    """Header index for a single jorb data directory."""
+
+    def __init__(self, data_dir: Path) -> None:
+        self._data_dir = data_dir
+        self._headers: dict[str, dict[str, Any]] = {}
+        self._open_ids: set[str] = set()
+        self._totals: dict[str, dict[str, float]] = {}
+        self._counts: dict[str, int] = {}
+        self._dir_token: int | None = None
+        self._loaded = False
+        self.scheduler = JorbWakeScheduler()
+        # Headers indexed while a reload is reading the disk; re-applied on top.
+        self._reload_writes: dict[str, dict[str, Any]] | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._headers)
+
+    def is_stale(self) -> bool:
+        """True when the catalog has not been built or the directory changed underneath it."""
+        return not self._loaded or _dir_token(self._data_dir) != self._dir_token
+
+    def load_from_disk(self) -> tuple[list[dict[str, Any]], int | None]:
+        """Read every jorb header from disk. Blocking; call via `to_thread`."""
+        token = _dir_token(self._data_dir)
+        headers: list[dict[str, Any]] = []
+        for path in self._data_dir.glob("jorb_*.json"):
+            try:
+                payload = read_json_file(path, None)
+            except (OSError, ValueError):
+                logger.warning("Skipping unreadable jorb record %s", path)
+                continue
+            if isinstance(payload, dict) and isinstance(payload.get("jorb"), dict):
+                headers.append(payload["jorb"])
+        return headers, token
+
+    def begin_reload(self) -> None:
+        """Start tracking writes that race with `load_from_disk`."""
+        self._reload_writes = {}
+
+    def replace(self, headers: list[dict[str, Any]], token: int | None) -> None:
+        """Swap in a freshly loaded set of headers."""
+        raced = self._reload_writes or {}
+        self._reload_writes = None
+        self._headers = {}
+        self._open_ids = set()
+        self._totals = {}
+        self._counts = {}
+        self.scheduler.clear()
+        for header in headers:
+            self._index(header)
+        for header in raced.values():
+            self._index(header)
+        self._dir_token = token
+        self._loaded = True
+        logger.debug("Rebuilt jorb catalog for %s (%d jorbs)", self._data_dir, len(self._headers))
+
+    def stat_directory(self) -> int | None:
+        return _dir_token(self._data_dir)
+
+    def record_write(
+        self,
+        header: dict[str, Any] | None,
+        token_before: int | None,
+        token_after: int | None,
+    ) -> None:
+        """
+        Index a header we just wrote (or only sync the token for log writes).
+
+        The directory token only advances when nothing else touched the
+        directory since our last sync, so a concurrent external write still
+        forces a rebuild on the next read.
+        """
+        if header is not None:
+            self.put(header)
+        if self._loaded and token_before == self._dir_token:
+            self._dir_token = token_after
+
+    def put(self, header: dict[str, Any]) -> None:
+        """Index a header that is newer than what is on disk."""
+        if self._reload_writes is not None and header.get("id"):
+            self._reload_writes[str(header["id"])] = dict(header)
+        self._index(header)
+
+    def get(self, jorb_id: str) -> dict[str, Any] | None:
+        return self._headers.get(jorb_id)
+
+    def headers(self, status_filter: str = "all") -> list[dict[str, Any]]:
+        if status_filter == "open":
+            return [self._headers[jorb_id] for jorb_id in self._open_ids]
+        if status_filter == "closed":
+            return [
+                header for jorb_id, header in self._headers.items()
+                if jorb_id not in self._open_ids
+            ]
+        return list(self._headers.values())
+
+    def due(self, now_iso: str, limit: int) -> list[dict[str, Any]]:
+        """Return running headers whose `wake_at` has passed, oldest first."""
+        return [self._headers[jorb_id] for jorb_id in self.scheduler.due(now_iso, limit)]
+
+    def contact_identifiers(self) -> list[str]:
+        identifiers: list[str] = []
+        for header in self._headers.values():
+            identifiers.extend(_header_contact_identifiers(header))
+        return identifiers
+
+    def aggregate(self, status_filter: str = "all") -> tuple[dict[str, int], dict[str, float]]:
+        """Return (counts_by_status, metric_totals) from the running totals."""
+        if status_filter == "open":
+            statuses: Iterable[str] = OPEN_STATUSES
+        elif status_filter == "closed":
+            statuses = CLOSED_STATUSES
+        else:
+            statuses = list(self._counts)
+        counts = {status: 0 for status in ALL_STATUSES}
+        totals = {metric: 0.0 for metric in METRIC_FIELDS}
+        for status in statuses:
+            if self._counts.get(status, 0) <= 0:
+                continue
+            counts[status] = self._counts[status]
+            for metric, value in self._totals[status].items():
+                totals[metric] += value
+        return counts, totals
+
+    def _index(self, header: dict[str, Any]) -> None:
+        jorb_id = str(header.get("id") or "")
+        if not jorb_id:
+            return
+        previous = self._headers.get(jorb_id)
+        if previous is not None:
+            self._adjust_totals(previous, -1)
+        header = dict(header)
+        # Legacy single-file records inline script results; keep the index lean.
+        header.pop("script_results", None)
+        self._headers[jorb_id] = header
+        self._adjust_totals(header, 1)
+        if header.get("status") in OPEN_STATUSES:
+            self._open_ids.add(jorb_id)
+        else:
+            self._open_ids.discard(jorb_id)
+        self.scheduler.update(jorb_id, header.get("status"), header.get("wake_at"))
+
+    def _adjust_totals(self, header: dict[str, Any], sign: int) -> None:
+        status = str(header.get("status") or "")
+        self._counts[status] = self._counts.get(status, 0) + sign
+        totals = self._totals.setdefault(status, {metric: 0 for metric in METRIC_FIELDS})
+        for metric, value in _metric_values(header).items():
+            totals[metric] += sign * value
+
+
+def _header_contact_identifiers(header: dict[str, Any]) -> list[str]:
+    try:
+        contacts = json.loads(header.get("contacts_json") or "[]")
+    except (json.JSONDecodeError, TypeError):
+        return []
+    if not isinstance(contacts, list):
+        return []
+    return [
+        str(contact["identifier"])
+        for contact in contacts
+        if isinstance(contact, dict) and contact.get("identifier")
+    ]
+
+
+__all__ = [
+    "ALL_STATUSES",
+    "CLOSED_STATUSES",
+    "JorbCatalog",
+    "OPEN_STATUSES",
+]
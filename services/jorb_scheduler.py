@@ -0,0 +1,129 @@
+"""
+Wake-time scheduler for running jorbs.
+
+A min-heap of `(wake_at, jorb_id)` fed by the jorb catalog whenever a header
+is indexed, so `update_jorb(wake_at=...)` schedules a wake without any
+polling. The background worker sleeps until the earliest `wake_at`, or until
+`wait()` is signalled because an earlier wake was scheduled.
+
+Entries are invalidated lazily: the heap may hold superseded `(wake_at, id)`
+pairs, which are discarded when they reach the top.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+from datetime import datetime, timezone
+
+
+def _seconds_until(wake_at: str) -> float:
+    try:
+        when = datetime.fromisoformat(wake_at.replace("Z", "+00:00"))
+    except ValueError:
+        return 0.0
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return (when - datetime.now(timezone.utc)).total_seconds()
+
+
+class JorbWakeScheduler:
+    """Heap of scheduled wakes for one jorb data directory."""
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[str, str]] = []
+        self._scheduled: dict[str, str] = {}
+        self._event: asyncio.Event | None = None
+        self._event_loop: asyncio.AbstractEventLoop | None = None
+
+    def __len__(self) -> int:
+        return len(self._scheduled)
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._scheduled.clear()
+        self._signal()
+
+    def update(self, jorb_id: str, status: str | None, wake_at: str | None) -> None:
+        """Reflect a jorb's current status/wake_at in the schedule."""
+        if status != "running" or not wake_at:
+            self._scheduled.pop(jorb_id, None)
+            return
+        if self._scheduled.get(jorb_id) == wake_at:
+            return
+        earliest = self.next_wake_at()
+        self._scheduled[jorb_id] = wake_at
+        heapq.heappush(self._heap, (wake_at, jorb_id))
+        if earliest is None or wake_at < earliest:
+            self._signal()
+
+    def next_wake_at(self) -> str | None:
+        """Earliest scheduled wake, discarding superseded heap entries."""
+        while self._heap:
+            wake_at, jorb_id = self._heap[0]
+            if self._scheduled.get(jorb_id) == wake_at:
+                return wake_at
+            heapq.heappop(self._heap)
+        return None
+
+    def due(self, now_iso: str, limit: int) -> list[str]:
+        """Jorb IDs whose wake time has passed, earliest first. Does not unschedule them."""
+        popped: list[tuple[str, str]] = []
+        due: list[str] = []
+        while self._heap and len(due) < limit:
+            wake_at, jorb_id = heapq.heappop(self._heap)
+            if self._scheduled.get(jorb_id) != wake_at:
+                continue
+            popped.append((wake_at, jorb_id))
+            if wake_at > now_iso:
+                break
+            due.append(jorb_id)
+        for entry in popped:
+            heapq.heappush(self._heap, entry)
+        return due
+
+    def next_wake_excluding(self, exclude: set[str] | frozenset[str]) -> str | None:
+        """Earliest scheduled wake among jorbs not in `exclude` (e.g. already running)."""
+        if not exclude:
+            return self.next_wake_at()
+        popped: list[tuple[str, str]] = []
+        found: str | None = None
+        while self._heap:
+            wake_at, jorb_id = heapq.heappop(self._heap)
+            if self._scheduled.get(jorb_id) != wake_at:
+                continue
+            popped.append((wake_at, jorb_id))
+            if jorb_id not in exclude:
+                found = wake_at
+                break
+        for entry in popped:
+            heapq.heappush(self._heap, entry)
+        return found
+
+    async def wait(self, max_seconds: float, exclude: set[str] | frozenset[str] = frozenset()) -> None:
+        """
+        Sleep until the earliest wake is due, a sooner wake is scheduled, or
+        `max_seconds` elapse. Jorbs in `exclude` are ignored when picking the
+        earliest wake.
+        """
+        loop = asyncio.get_running_loop()
+        if self._event is None or self._event_loop is not loop:
+            self._event = asyncio.Event()
+            self._event_loop = loop
+        self._event.clear()
+
+        next_wake = self.next_wake_excluding(exclude)
+        delay = max_seconds if next_wake is None else min(max_seconds, _seconds_until(next_wake))
+        if delay <= 0:
+            return
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+    def _signal(self) -> None:
+        if self._event is not None and self._event_loop is not None and not self._event_loop.is_closed():
+            self._event.set()
+
+
+__all__ = ["JorbWakeScheduler"]
@@ -9,11 +9,11 @@ This is the second stage of the two-stage pattern:
 
 from __future__ import annotations
 
-import base64
 import json
 import logging
 import mimetypes
 import os
+import time
 from dataclasses import dataclass, field
 from datetime import datetime  # noqa: F401 - used by format functions
 from typing import Any, Literal
@@ -22,6 +22,16 @@ from services.jorb_storage import Jorb, JorbMessage, JorbWithMessages, Channel
 from services.personality_loader import Personality, get_personality_loader
 from services.progress_log import get_progress_log
 from services.jorb_capabilities import generate_capabilities_reference
+from services.llm_client import chat_completion
+from services.prompt_context import (
+    JORB_HISTORY_TOKEN_BUDGET,
+    encode_image_data_url,
+    fit_to_token_budget,
+    get_section_cache,
+    jorb_version,
+    messages_version,
+    record_prompt_build,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -157,6 +167,22 @@ class JorbSessionResponse:
     result: dict | None = None
 
 
+# Everything in the template before this heading is identical for every jorb
+# sharing a personality, so it is rendered once and kept as a stable prefix
+# (which also lets provider-side prompt caching hit across jorbs).
+JORB_SECTION_MARKER = "## Your Jorb"
+
+_capabilities_reference: str | None = None
+
+
+def _get_capabilities_reference() -> str:
+    """Capabilities reference, generated once per process (it only introspects code)."""
+    global _capabilities_reference
+    if _capabilities_reference is None:
+        _capabilities_reference = generate_capabilities_reference()
+    return _capabilities_reference
+
+
 def _load_jorb_session_template() -> str:
     """Load the jorb session system prompt template."""
     prompt_path = os.path.join(
@@ -259,8 +285,7 @@ def _build_user_content(
             mime_type = guessed or "image/png"
 
         try:
-            with open(path, "rb") as f:
-                data = base64.b64encode(f.read()).decode("utf-8")
+            data_url = encode_image_data_url(path, mime_type)
         except Exception as exc:
             logger.warning("Failed to read event image attachment %s: %s", path, exc)
             continue
@@ -268,7 +293,7 @@ def _build_user_content(
         blocks.append({
             "type": "image_url",
             "image_url": {
-                "url": f"data:{mime_type};base64,{data}",
+                "url": data_url,
                 "detail": "high",
             },
         })
@@ -276,6 +301,107 @@ def _build_user_content(
     return blocks
 
 
+def _format_message_history(messages: list[JorbMessage], token_budget: int) -> tuple[str, bool]:
+    """
+    Render the conversation history section.
+
+    Uses the last 50 messages, trimmed further (oldest first) to
+    `token_budget` estimated tokens. Returns (text, has_sean_direct).
+    """
+    if not messages:
+        return "(No messages yet)", False
+
+    history_lines = []
+    has_sean_direct = False
+    for msg in messages[-50:]:  # Last 50 messages
+        formatted = _format_message_for_history(msg)
+        direction = "→" if msg.direction == "outbound" else "←"
+
+        # Special formatting for sean_direct messages
+        if _is_sean_direct_message(msg):
+            history_lines.append(
+                f"★ [GUIDANCE FROM PRINCIPAL - {formatted['timestamp'][:16]}] "
+                f"Sean: {formatted['content'][:200]}"
+            )
+            has_sean_direct = True
+        else:
+            history_lines.append(
+                f"{direction} [{formatted['timestamp'][:16]}] "
+                f"{formatted['sender']}: {formatted['content'][:200]}"
+            )
+
+    kept, dropped = fit_to_token_budget(history_lines, token_budget)
+    if dropped:
+        kept.insert(0, f"({dropped} earlier messages omitted)")
+    return "\n".join(kept), has_sean_direct
+
+
+def _format_script_results(script_results: list[dict]) -> str:
+    """Render the last 10 script results for the prompt."""
+    if not script_results:
+        return "(No scripts executed yet)"
+
+    script_results_lines = []
+    for i, result in enumerate(script_results[-10:]):  # Last 10 results
+        script_results_lines.append(f"Step {i + 1}:")
+        script = str(result.get("script", "N/A"))
+        success = bool(result.get("success", False))
+        payload = result.get("result", {})
+
+        script_results_lines.append(f"  Script: {script[:100]}...")
+        script_results_lines.append(f"  Success: {success}")
+
+        # Guardrail: always surface critical fields (status/id/error) even
+        # when payloads contain long strings (e.g. Android task goal) that
+        # would otherwise push `status` past the truncation window.
+        if isinstance(payload, dict):
+            task_id = (
+                payload.get("task_id")
+                or payload.get("id")
+                or payload.get("job_id")
+                or payload.get("task")
+            )
+            status = payload.get("status") or payload.get("state")
+            current_step = (
+                payload.get("current_step")
+                or payload.get("step")
+                or payload.get("phase")
+            )
+            error = payload.get("error") or payload.get("failure_reason")
+
+            if task_id:
+                script_results_lines.append(f"  Task/ID: {str(task_id)[:64]}")
+            if status:
+                script_results_lines.append(f"  Status: {str(status)[:64]}")
+            if current_step:
+                script_results_lines.append(
+                    f"  Current step: {str(current_step)[:160]}"
+                )
+            if error:
+                err_one_line = " ".join(str(error).split())
+                if len(err_one_line) > 300:
+                    err_one_line = err_one_line[:300] + "..."
+                script_results_lines.append(f"  Error: {err_one_line}")
+
+            # Keep a compact JSON preview but avoid letting very long
+            # fields drown out important keys.
+            compact = dict(payload)
+            if isinstance(compact.get("goal"), str) and len(compact["goal"]) > 180:
+                compact["goal"] = compact["goal"][:180] + "..."
+            if isinstance(compact.get("stdout"), str) and len(compact["stdout"]) > 500:
+                compact["stdout"] = compact["stdout"][-500:]
+            if isinstance(compact.get("stderr"), str) and len(compact["stderr"]) > 500:
+                compact["stderr"] = compact["stderr"][-500:]
+
+            preview = json.dumps(compact, ensure_ascii=False)[:400]
+        else:
+            preview = json.dumps(payload, ensure_ascii=False)[:400]
+
+        script_results_lines.append(f"  Result: {preview}")
+        script_results_lines.append("")
+    return "\n".join(script_results_lines)
+
+
 def _format_policy_context(policy: dict[str, Any]) -> str:
     """Format policy constraints for the prompt."""
     lines = [
@@ -496,115 +622,54 @@ class JorbSession:
         )
 
     def _build_system_prompt(self) -> str:
-        """Build the complete system prompt for this session."""
-        # Start with template
-        prompt = self._template
+        """
+        Build the complete system prompt for this session.
 
-        # Replace personality section
-        personality_section = self._personality.format_for_prompt()
-        prompt = prompt.replace("{{PERSONALITY_SECTION}}", personality_section)
+        The template head (personality + capabilities) is shared by every jorb
+        with the same personality; the per-jorb sections are cached by jorb
+        and message version so unchanged jorbs are not re-rendered.
+        """
+        cache = get_section_cache()
+        jorb = self._jorb
 
-        # Replace capabilities reference
-        capabilities_reference = generate_capabilities_reference()
-        prompt = prompt.replace("{{CAPABILITIES_REFERENCE}}", capabilities_reference)
+        # Stable prefix: template head with personality and capabilities
+        personality_section = self._personality.format_for_prompt()
+        head, marker, tail = self._template.partition(JORB_SECTION_MARKER)
+        prefix = cache.get_or_render(
+            ("prefix", head, personality_section),
+            lambda: head.replace("{{PERSONALITY_SECTION}}", personality_section).replace(
+                "{{CAPABILITIES_REFERENCE}}", _get_capabilities_reference()
+            ),
+        )
+        prompt = marker + tail
 
         # Replace jorb context
-        jorb_context = json.dumps(_format_jorb_context(self._jorb), indent=2)
+        jorb_context = cache.get_or_render(
+            ("jorb_context", jorb_version(jorb)),
+            lambda: json.dumps(_format_jorb_context(jorb), indent=2),
+        )
         prompt = prompt.replace("{{JORB_CONTEXT}}", jorb_context)
 
         # Replace message history with special labeling for sean_direct messages
-        sean_direct_messages = []
-        if self._messages:
-            history_lines = []
-            for msg in self._messages[-50:]:  # Last 50 messages
-                formatted = _format_message_for_history(msg)
-                direction = "→" if msg.direction == "outbound" else "←"
-
-                # Special formatting for sean_direct messages
-                if _is_sean_direct_message(msg):
-                    history_lines.append(
-                        f"★ [GUIDANCE FROM PRINCIPAL - {formatted['timestamp'][:16]}] "
-                        f"Sean: {formatted['content'][:200]}"
-                    )
-                    sean_direct_messages.append(msg)
-                else:
-                    history_lines.append(
-                        f"{direction} [{formatted['timestamp'][:16]}] "
-                        f"{formatted['sender']}: {formatted['content'][:200]}"
-                    )
-            message_history = "\n".join(history_lines)
-        else:
-            message_history = "(No messages yet)"
+        recent = self._messages[-50:]
+        history_key = (
+            "history",
+            jorb.id,
+            JORB_HISTORY_TOKEN_BUDGET,
+            messages_version(recent),
+        )
+        message_history, has_sean_direct = cache.get_or_render(
+            history_key,
+            lambda: _format_message_history(recent, JORB_HISTORY_TOKEN_BUDGET),
+        )
         prompt = prompt.replace("{{MESSAGE_HISTORY}}", message_history)
 
-        # Replace script results history
-        script_results = getattr(self._jorb, "script_results", [])
-        if script_results:
-            script_results_lines = []
-            for i, result in enumerate(script_results[-10:]):  # Last 10 results
-                script_results_lines.append(f"Step {i + 1}:")
-                script = str(result.get("script", "N/A"))
-                success = bool(result.get("success", False))
-                payload = result.get("result", {})
-
-                script_results_lines.append(f"  Script: {script[:100]}...")
-                script_results_lines.append(f"  Success: {success}")
-
-                # Guardrail: always surface critical fields (status/id/error) even
-                # when payloads contain long strings (e.g. Android task goal) that
-                # would otherwise push `status` past the truncation window.
-                if isinstance(payload, dict):
-                    task_id = (
-                        payload.get("task_id")
-                        or payload.get("id")
-                        or payload.get("job_id")
-                        or payload.get("task")
-                    )
-                    status = payload.get("status") or payload.get("state")
-                    current_step = (
-                        payload.get("current_step")
-                        or payload.get("step")
-                        or payload.get("phase")
-                    )
-                    error = payload.get("error") or payload.get("failure_reason")
-
-                    if task_id:
-                        script_results_lines.append(f"  Task/ID: {str(task_id)[:64]}")
-                    if status:
-                        script_results_lines.append(f"  Status: {str(status)[:64]}")
-                    if current_step:
-                        script_results_lines.append(
-                            f"  Current step: {str(current_step)[:160]}"
-                        )
-                    if error:
-                        err_one_line = " ".join(str(error).split())
-                        if len(err_one_line) > 300:
-                            err_one_line = err_one_line[:300] + "..."
-                        script_results_lines.append(f"  Error: {err_one_line}")
-
-                    # Keep a compact JSON preview but avoid letting very long
-                    # fields drown out important keys.
-                    compact = dict(payload)
-                    if isinstance(compact.get("goal"), str) and len(compact["goal"]) > 180:
-                        compact["goal"] = compact["goal"][:180] + "..."
-                    if isinstance(compact.get("stdout"), str) and len(compact["stdout"]) > 500:
-                        compact["stdout"] = compact["stdout"][-500:]
-                    if isinstance(compact.get("stderr"), str) and len(compact["stderr"]) > 500:
-                        compact["stderr"] = compact["stderr"][-500:]
-
-                    preview = json.dumps(compact, ensure_ascii=False)[:400]
-                else:
-                    preview = json.dumps(payload, ensure_ascii=False)[:400]
-
-                script_results_lines.append(f"  Result: {preview}")
-                script_results_lines.append("")
-            script_results_text = "\n".join(script_results_lines)
-        else:
-            script_results_text = "(No scripts executed yet)"
+        # Replace script results history (bounded to 10 entries; cheap to render)
+        script_results_text = _format_script_results(getattr(jorb, "script_results", []))
         prompt = prompt.replace("{{SCRIPT_RESULTS}}", script_results_text)
 
         # Add learning instruction if there are sean_direct messages
-        if sean_direct_messages:
+        if has_sean_direct:
             learning_instruction = (
                 "\n## Learning from Principal's Direct Messages\n"
                 "Messages marked with ★ [GUIDANCE FROM PRINCIPAL] are direct messages "
@@ -620,13 +685,14 @@ class JorbSession:
         policy_text = _format_policy_context(self._policy)
         prompt = prompt.replace("{{POLICY}}", policy_text)
 
-        # Get relevant learnings
-        contact_subjects = [c.name or c.identifier for c in self._jorb.contacts]
-        learnings_text = self._progress_log.format_learnings_for_prompt(contact_subjects)
+        prompt = prefix + prompt
 
         # Add learnings to the prompt (after personality section)
-        if learnings_text and "No relevant learnings" not in learnings_text:
-            prompt = prompt.replace("## Learnings\n", f"{learnings_text}\n\n## Learnings\n")
+        if "## Learnings\n" in prompt:
+            contact_subjects = [c.name or c.identifier for c in jorb.contacts]
+            learnings_text = self._progress_log.format_learnings_for_prompt(contact_subjects)
+            if learnings_text and "No relevant learnings" not in learnings_text:
+                prompt = prompt.replace("## Learnings\n", f"{learnings_text}\n\n## Learnings\n")
 
         return prompt
 
@@ -663,6 +729,7 @@ class JorbSession:
             )
 
         # Build the system prompt with all context
+        build_started = time.perf_counter()
         system_prompt = self._build_system_prompt()
 
         # Build the user message (current event)
@@ -679,10 +746,9 @@ class JorbSession:
 
         # Replace the placeholder in template
         system_prompt = system_prompt.replace("{{CURRENT_EVENT}}", "See user message")
+        record_prompt_build("jorb_session", build_started, system_prompt, user_content)
 
         try:
-            client = openai.OpenAI(api_key=self._api_key)
-
             # Use personality's preferred model/temperature
             model = self._personality.model_preferences.preferred_model or DEFAULT_JORB_MODEL
             temperature = self._personality.model_preferences.temperature
@@ -698,7 +764,9 @@ class JorbSession:
                 self._personality.id,
             )
 
-            response = client.chat.completions.create(
+            response = await chat_completion(
+                openai.OpenAI,
+                self._api_key,
                 model=model,
                 messages=messages,
                 response_format={"type": "json_object"},
@@ -761,6 +829,7 @@ class JorbSession:
                 action=JorbAction(type="no_action"),
             )
 
+        build_started = time.perf_counter()
         system_prompt = self._build_system_prompt()
         system_prompt = system_prompt.replace("{{CURRENT_EVENT}}", "See user message")
 
@@ -774,10 +843,9 @@ class JorbSession:
             "schedule a wake.\n"
             "- Always include an up-to-date `summary` suitable for routing."
         )
+        record_prompt_build("jorb_session", build_started, system_prompt, user_message)
 
         try:
-            client = openai.OpenAI(api_key=self._api_key)
-
             model = self._personality.model_preferences.preferred_model or DEFAULT_JORB_MODEL
             temperature = self._personality.model_preferences.temperature
 
@@ -792,7 +860,9 @@ class JorbSession:
                 self._personality.id,
             )
 
-            response = client.chat.completions.create(
+            response = await chat_completion(
+                openai.OpenAI,
+                self._api_key,
                 model=model,
                 messages=messages,
                 response_format={"type": "json_object"},
@@ -934,6 +1004,7 @@ class JorbSession:
             )
 
         # Build the system prompt
+        build_started = time.perf_counter()
         system_prompt = self._build_system_prompt()
         system_prompt = system_prompt.replace("{{CURRENT_EVENT}}", "This is a new jorb - kickoff")
 
@@ -943,10 +1014,9 @@ class JorbSession:
             "Based on the plan and contacts, what should be the first action? "
             "Typically this means sending an initial message to start the task."
         )
+        record_prompt_build("jorb_session", build_started, system_prompt, user_message)
 
         try:
-            client = openai.OpenAI(api_key=self._api_key)
-
             model = self._personality.model_preferences.preferred_model or DEFAULT_JORB_MODEL
             temperature = self._personality.model_preferences.temperature
 
@@ -961,7 +1031,9 @@ class JorbSession:
                 self._personality.id,
             )
 
-            response = client.chat.completions.create(
+            response = await chat_completion(
+                openai.OpenAI,
+                self._api_key,
                 model=model,
                 messages=messages,
                 response_format={"type": "json_object"},
@@ -14,19 +14,26 @@ import logging
 import os
 import sqlite3
 import uuid
+import zlib
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any, Callable, Literal
 
+from services.change_feed import change_feed
 from services.file_store import (
+    append_jsonl,
     derive_json_storage_dir,
     ensure_directory,
-    newest_first,
     read_json_file,
+    read_jsonl,
+    read_jsonl_tail,
     to_thread,
     write_json_atomic,
+    write_jsonl_atomic,
 )
+from services.jorb_catalog import JorbCatalog
+from services.jorb_write_behind import JorbWriteBehind
 from services.task_classes import FREEFORM_TASK_CLASS, classify_task_class
 
 logger = logging.getLogger(__name__)
@@ -34,7 +41,15 @@ logger = logging.getLogger(__name__)
 # Legacy path hint retained for env/backwards compatibility. The actual JSON
 # store lives in `./data/jorbs/`.
 DEFAULT_DB_PATH = "./data/jorbs.db"
-STORE_SCHEMA_VERSION = 2
+# v3 moved messages, checkpoints and script results out of `jorb_<id>.json`
+# into append-only `jorb_<id>.<kind>.jsonl` logs beside the header record.
+STORE_SCHEMA_VERSION = 3
+# Number of most recent script results hydrated onto `Jorb.script_results`.
+SCRIPT_RESULT_WINDOW = 50
+# Jorbs hash onto one of these locks so unrelated jorbs rarely contend.
+LOCK_STRIPES = 64
+# Header updates within this window are coalesced into one write (0 = write-through).
+DEFAULT_WRITE_BEHIND_MS = 25
 
 JorbStatus = Literal["planning", "running", "paused", "complete", "failed", "cancelled"]
 Direction = Literal["inbound", "outbound"]
@@ -165,6 +180,28 @@ class Jorb:
             "failure_reason": self.outcome_failure_reason,
         }
 
+    def to_summary(self) -> dict[str, Any]:
+        """Convert to the summary dictionary used by list views and live updates."""
+        summary: dict[str, Any] = {
+            "jorb_id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "personality": self.personality,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "metrics": self.metrics,
+        }
+        if self.progress_summary:
+            summary["progress"] = self.progress_summary
+        if self.awaiting:
+            summary["awaiting"] = self.awaiting
+        if self.paused_reason:
+            summary["paused_reason"] = self.paused_reason
+        # Include outcome for completed/failed jorbs
+        if self.outcome:
+            summary["outcome"] = self.outcome
+        return summary
+
 
 @dataclass
 class JorbMessage:
@@ -241,6 +278,22 @@ def _jorb_to_payload(jorb: Jorb) -> dict[str, Any]:
     return payload
 
 
+def _jorb_to_header(jorb: Jorb) -> dict[str, Any]:
+    """Header payload for a v3 record; script results live in their own log."""
+    payload = asdict(jorb)
+    payload.pop("script_results", None)
+    return payload
+
+
+def _needs_log_migration(record: dict[str, Any]) -> bool:
+    header = record.get("jorb")
+    return (
+        "messages" in record
+        or "checkpoints" in record
+        or (isinstance(header, dict) and "script_results" in header)
+    )
+
+
 def _payload_to_jorb(payload: dict[str, Any]) -> Jorb:
     script_results = _parse_json_string(payload.get("script_results"), [])
     if not isinstance(script_results, list):
@@ -267,7 +320,7 @@ def _payload_to_jorb(payload: dict[str, Any]) -> Jorb:
         outcome_result=payload.get("outcome_result"),
         outcome_completed_at=payload.get("outcome_completed_at"),
         outcome_failure_reason=payload.get("outcome_failure_reason"),
-        script_results=script_results,
+        script_results=list(script_results),
         metadata_json=str(payload.get("metadata_json") or "{}"),
         wake_at=payload.get("wake_at"),
     )
@@ -312,17 +365,39 @@ class JorbStorage:
 
     Records are stored as durable JSON files so they can be inspected directly,
     replayed by agents, and migrated without a database runtime dependency.
+    Jorb headers are mirrored into a per-directory `JorbCatalog` so list and
+    aggregate queries are served from memory instead of re-reading every file.
+
+    Writes are serialized per jorb (striped locks), not per store, and header
+    updates go through a `JorbWriteBehind` buffer that coalesces bursts of
+    `update_jorb`/`increment_metrics` calls into one write.
     """
 
     _locks: dict[str, asyncio.Lock] = {}
+    _lock_stripes: dict[str, list[asyncio.Lock]] = {}
+    _catalogs: dict[str, JorbCatalog] = {}
+    _write_buffers: dict[str, JorbWriteBehind] = {}
+    _fsync_settings: dict[str, bool] = {}
 
-    def __init__(self, db_path: str | None = None):
+    def __init__(
+        self,
+        db_path: str | None = None,
+        write_behind_ms: float | None = None,
+        fsync: bool | None = None,
+    ):
         """
         Initialize the jorb storage service.
 
         Args:
             db_path: Legacy path hint. `.db`/`.json` suffixes are converted into a
                 directory-backed JSON store beside the hint path.
+            write_behind_ms: Coalescing window for header updates. Defaults to
+                `JORBS_WRITE_BEHIND_MS` (25ms); 0 writes every update through.
+            fsync: Whether writes are fsync'd before they count as durable.
+                Defaults to `JORBS_FSYNC` (true).
+
+        Durability settings are fixed by the first instance created for a data
+        directory, since all instances share its buffers and locks.
         """
         self._path_hint = db_path or os.getenv("JORBS_DB_PATH", DEFAULT_DB_PATH)
         self._legacy_path = Path(self._path_hint)
@@ -332,18 +407,177 @@ class JorbStorage:
         self._initialized = False
         lock_key = str(self._data_dir.resolve())
         if lock_key not in self._locks:
+            if write_behind_ms is None:
+                write_behind_ms = float(
+                    os.getenv("JORBS_WRITE_BEHIND_MS", str(DEFAULT_WRITE_BEHIND_MS))
+                )
+            if fsync is None:
+                fsync = os.getenv("JORBS_FSYNC", "true").lower() == "true"
+            # Store-wide lock, only taken to rebuild the catalog.
             self._locks[lock_key] = asyncio.Lock()
+            self._lock_stripes[lock_key] = [asyncio.Lock() for _ in range(LOCK_STRIPES)]
+            self._catalogs[lock_key] = JorbCatalog(self._data_dir)
+            self._write_buffers[lock_key] = JorbWriteBehind(write_behind_ms / 1000.0)
+            self._fsync_settings[lock_key] = fsync
         self._lock = self._locks[lock_key]
+        self._stripes = self._lock_stripes[lock_key]
+        self._catalog = self._catalogs[lock_key]
+        self._write_buffer = self._write_buffers[lock_key]
+        self._fsync = self._fsync_settings[lock_key]
+
+    def _jorb_lock(self, jorb_id: str) -> asyncio.Lock:
+        return self._stripes[zlib.crc32(jorb_id.encode("utf-8")) % len(self._stripes)]
+
+    @classmethod
+    async def flush_all(cls) -> int:
+        """Persist every buffered header update across all stores (call at shutdown)."""
+        written = 0
+        for buffer in list(cls._write_buffers.values()):
+            written += await buffer.flush()
+        if written:
+            logger.info("Flushed %d buffered jorb header writes", written)
+        return written
+
+    async def flush(self) -> int:
+        """Persist this store's buffered header updates now."""
+        return await self._write_buffer.flush()
 
     def _jorb_path(self, jorb_id: str) -> Path:
         return self._data_dir / f"{jorb_id}.json"
 
+    def _log_path(self, jorb_id: str, kind: str) -> Path:
+        return self._data_dir / f"{jorb_id}.{kind}.jsonl"
+
     async def _read_record(self, jorb_id: str) -> dict[str, Any] | None:
+        pending = self._write_buffer.pending(jorb_id)
+        if pending is not None:
+            return {"schema_version": STORE_SCHEMA_VERSION, "jorb": pending}
         payload = await to_thread(read_json_file, self._jorb_path(jorb_id), None)
         return payload if isinstance(payload, dict) else None
 
+    async def _write_in_store(
+        self,
+        func: Callable[[], None],
+        header: dict[str, Any] | None = None,
+    ) -> None:
+        """Run a blocking write in the data directory and keep the catalog in sync."""
+        catalog = self._catalog
+
+        def _write() -> tuple[int | None, int | None]:
+            token_before = catalog.stat_directory()
+            func()
+            return token_before, catalog.stat_directory()
+
+        token_before, token_after = await to_thread(_write)
+        catalog.record_write(header, token_before, token_after)
+
     async def _write_record(self, jorb_id: str, payload: dict[str, Any]) -> None:
-        await to_thread(write_json_atomic, self._jorb_path(jorb_id), payload)
+        """Write a full record. Caller must hold the jorb lock."""
+        path = self._jorb_path(jorb_id)
+        header = payload.get("jorb")
+        await self._write_in_store(
+            lambda: write_json_atomic(path, payload, fsync=self._fsync),
+            header if isinstance(header, dict) else None,
+        )
+        # The record on disk now supersedes any buffered header for this jorb.
+        # Dropping it only after the write keeps unlocked readers from seeing
+        # the older file while the write is in progress.
+        self._write_buffer.take(jorb_id)
+
+    async def _append_log(self, jorb_id: str, kind: str, entries: list[dict[str, Any]]) -> None:
+        path = self._log_path(jorb_id, kind)
+        await self._write_in_store(lambda: append_jsonl(path, entries, fsync=self._fsync))
+
+    async def _rewrite_log(self, jorb_id: str, kind: str, entries: list[dict[str, Any]]) -> None:
+        path = self._log_path(jorb_id, kind)
+        await self._write_in_store(lambda: write_jsonl_atomic(path, entries, fsync=self._fsync))
+
+    async def _store_header(self, jorb_id: str, header: dict[str, Any]) -> None:
+        """
+        Persist an updated header, buffering it when write-behind is enabled.
+
+        Caller must hold the jorb lock. Buffered headers are visible to reads
+        (and the catalog) immediately and reach disk within the window.
+        """
+        if not self._write_buffer.enabled:
+            await self._write_record(jorb_id, {"schema_version": STORE_SCHEMA_VERSION, "jorb": header})
+        else:
+            self._write_buffer.stage(jorb_id, header, self._flush_header)
+            self._catalog.put(header)
+        change_feed.publish("jorb.updated", lambda: {"jorb": _payload_to_jorb(header).to_summary()})
+
+    async def _flush_header(self, jorb_id: str) -> None:
+        async with self._jorb_lock(jorb_id):
+            # Nothing can be staged while we hold the lock, and the header stays
+            # buffered (visible to readers) until it is on disk.
+            header = self._write_buffer.pending(jorb_id)
+            if header is None:
+                return
+            await self._write_record(
+                jorb_id,
+                {"schema_version": STORE_SCHEMA_VERSION, "jorb": header},
+            )
+
+    async def _load_record(self, jorb_id: str, locked: bool = False) -> dict[str, Any] | None:
+        """
+        Read a jorb header record, migrating single-file records on first access.
+
+        Args:
+            jorb_id: The jorb ID
+            locked: True when the caller already holds the jorb lock
+        """
+        record = await self._read_record(jorb_id)
+        if record is None or not _needs_log_migration(record):
+            return record
+        if locked:
+            return await self._migrate_record(jorb_id, record)
+        async with self._jorb_lock(jorb_id):
+            record = await self._read_record(jorb_id)
+            if record is not None and _needs_log_migration(record):
+                record = await self._migrate_record(jorb_id, record)
+            return record
+
+    async def _migrate_record(self, jorb_id: str, record: dict[str, Any]) -> dict[str, Any]:
+        """
+        Move inline history out of a single-file record into append-only logs.
+
+        Logs are rewritten (not appended) before the header, so a crash part way
+        through simply repeats the migration on the next access.
+        """
+        header = dict(record.get("jorb") or {})
+        legacy_logs = {
+            "messages": record.get("messages"),
+            "checkpoints": record.get("checkpoints"),
+            "script_results": _parse_json_string(header.pop("script_results", None), None),
+        }
+        for kind, entries in legacy_logs.items():
+            if isinstance(entries, list) and entries:
+                await self._rewrite_log(
+                    jorb_id,
+                    kind,
+                    [entry for entry in entries if isinstance(entry, dict)],
+                )
+
+        migrated = {"schema_version": STORE_SCHEMA_VERSION, "jorb": header}
+        await self._write_record(jorb_id, migrated)
+        logger.info(
+            "Migrated jorb %s history into append-only logs (%d messages)",
+            jorb_id,
+            len(legacy_logs["messages"] or []),
+        )
+        return migrated
+
+    async def _refresh_catalog(self) -> JorbCatalog:
+        """Return the catalog, rebuilding it if it was never loaded or the directory changed."""
+        await self._ensure_initialized()
+        if self._catalog.is_stale():
+            async with self._lock:
+                if self._catalog.is_stale():
+                    self._catalog.begin_reload()
+                    headers, token = await to_thread(self._catalog.load_from_disk)
+                    # Buffered headers are newer than anything on disk.
+                    self._catalog.replace(headers + self._write_buffer.pending_headers(), token)
+        return self._catalog
 
     async def _ensure_initialized(self) -> None:
         """Initialize the JSON store and migrate legacy SQLite data if needed."""
@@ -501,12 +735,11 @@ class JorbStorage:
 
         record = {
             "schema_version": STORE_SCHEMA_VERSION,
-            "jorb": _jorb_to_payload(jorb),
-            "messages": [],
-            "checkpoints": [],
+            "jorb": _jorb_to_header(jorb),
         }
-        async with self._lock:
+        async with self._jorb_lock(jorb_id):
             await self._write_record(jorb_id, record)
+        change_feed.publish("jorb.created", lambda: {"jorb": jorb.to_summary()})
 
         logger.info("Created jorb %s: %s (personality: %s)", jorb.id, jorb.name, jorb.personality)
         return jorb
@@ -523,10 +756,16 @@ class JorbStorage:
         """
         await self._ensure_initialized()
 
-        record = await self._read_record(jorb_id)
+        record = await self._load_record(jorb_id)
         if record is None:
             return None
-        return _payload_to_jorb(record.get("jorb") or {})
+        jorb = _payload_to_jorb(record.get("jorb") or {})
+        jorb.script_results = await to_thread(
+            read_jsonl_tail,
+            self._log_path(jorb_id, "script_results"),
+            SCRIPT_RESULT_WINDOW,
+        )
+        return jorb
 
     async def list_jorbs(
         self,
@@ -544,19 +783,8 @@ class JorbStorage:
         Returns:
             List of Jorb objects sorted by updated_at descending
         """
-        await self._ensure_initialized()
-
-        records = []
-        for path in newest_first(self._data_dir.glob("jorb_*.json")):
-            payload = await to_thread(read_json_file, path, None)
-            if isinstance(payload, dict) and isinstance(payload.get("jorb"), dict):
-                records.append(_payload_to_jorb(payload["jorb"]))
-
-        if status_filter == "open":
-            records = [j for j in records if j.status in ("planning", "running", "paused")]
-        elif status_filter == "closed":
-            records = [j for j in records if j.status in ("complete", "failed", "cancelled")]
-
+        catalog = await self._refresh_catalog()
+        records = [_payload_to_jorb(header) for header in catalog.headers(status_filter)]
         records.sort(key=lambda j: j.updated_at, reverse=True)
         return records
 
@@ -611,15 +839,22 @@ class JorbStorage:
         await self._ensure_initialized()
         updates["updated_at"] = datetime.now(timezone.utc).isoformat()
 
-        async with self._lock:
-            record = await self._read_record(jorb_id)
+        async with self._jorb_lock(jorb_id):
+            record = await self._load_record(jorb_id, locked=True)
             if record is None or not isinstance(record.get("jorb"), dict):
                 return None
             jorb_payload = dict(record["jorb"])
             normalized_updates = dict(updates)
             if "script_results" in normalized_updates:
-                parsed = _parse_json_string(normalized_updates["script_results"], normalized_updates["script_results"])
-                normalized_updates["script_results"] = parsed if isinstance(parsed, list) else []
+                raw_results = normalized_updates.pop("script_results")
+                parsed = _parse_json_string(raw_results, raw_results)
+                await self._rewrite_log(
+                    jorb_id,
+                    "script_results",
+                    [entry for entry in parsed if isinstance(entry, dict)]
+                    if isinstance(parsed, list)
+                    else [],
+                )
             if "contacts_json" in normalized_updates:
                 raw_contacts = normalized_updates["contacts_json"]
                 if isinstance(raw_contacts, list):
@@ -630,9 +865,7 @@ class JorbStorage:
                     normalized_updates["metadata_json"] = json.dumps(raw_meta)
 
             jorb_payload.update(normalized_updates)
-            record["jorb"] = jorb_payload
-            record["schema_version"] = STORE_SCHEMA_VERSION
-            await self._write_record(jorb_id, record)
+            await self._store_header(jorb_id, jorb_payload)
 
         updated_jorb = await self.get_jorb(jorb_id)
         if updated_jorb:
@@ -659,20 +892,32 @@ class JorbStorage:
         Returns:
             List of due jorbs ordered by wake_at ascending
         """
-        await self._ensure_initialized()
-
         if now_iso is None:
             now_iso = datetime.now(timezone.utc).isoformat()
 
         limit = max(1, min(500, int(limit)))
 
-        jorbs = await self.list_jorbs(status_filter="open")
-        due = [
-            j for j in jorbs
-            if j.status == "running" and j.wake_at is not None and j.wake_at <= now_iso
-        ]
-        due.sort(key=lambda j: str(j.wake_at or ""))
-        return due[:limit]
+        catalog = await self._refresh_catalog()
+        return [_payload_to_jorb(header) for header in catalog.due(now_iso, limit)]
+
+    def next_wake_at(self) -> str | None:
+        """Earliest scheduled `wake_at` among running jorbs (from the in-memory schedule)."""
+        return self._catalog.scheduler.next_wake_at()
+
+    async def wait_for_due_jorbs(
+        self,
+        max_seconds: float,
+        exclude: set[str] | frozenset[str] = frozenset(),
+    ) -> None:
+        """
+        Sleep until the next running jorb is due to wake.
+
+        Returns early when `update_jorb` schedules an earlier wake, and after at
+        most `max_seconds` so writes from other processes are eventually seen.
+        Jorbs in `exclude` (already being processed) do not count as due.
+        """
+        await self._refresh_catalog()
+        await self._catalog.scheduler.wait(max_seconds, exclude)
 
     # Message tracking methods (frank_bot-00052)
 
@@ -696,14 +941,13 @@ class JorbStorage:
         # Ensure jorb_id matches
         message.jorb_id = jorb_id
 
-        async with self._lock:
-            record = await self._read_record(jorb_id)
+        async with self._jorb_lock(jorb_id):
+            record = await self._load_record(jorb_id, locked=True)
             if record is None:
                 raise ValueError(f"Jorb not found: {jorb_id}")
-            messages = list(record.get("messages") or [])
-            messages.append(_message_to_payload(message))
-            record["messages"] = messages
-            await self._write_record(jorb_id, record)
+            payload = _message_to_payload(message)
+            await self._append_log(jorb_id, "messages", [payload])
+        change_feed.publish("jorb.message", {"jorb_id": jorb_id, "message": payload})
 
         logger.debug("Added message %s to jorb %s", message.id, jorb_id)
         return message.id
@@ -714,27 +958,57 @@ class JorbStorage:
         limit: int = 50,
     ) -> list[JorbMessage]:
         """
-        Get messages for a jorb.
+        Get the most recent messages for a jorb.
+
+        Only the tail of the message log is read, so the cost depends on
+        `limit` rather than on the length of the conversation.
 
         Args:
             jorb_id: The jorb ID
             limit: Maximum number of messages to return
 
         Returns:
-            List of messages sorted by timestamp ascending (oldest first)
+            The last `limit` messages sorted by timestamp ascending (oldest first)
         """
         await self._ensure_initialized()
 
-        record = await self._read_record(jorb_id)
+        record = await self._load_record(jorb_id)
         if record is None:
             return []
-        messages = [
-            _payload_to_message(payload)
-            for payload in list(record.get("messages") or [])
-            if isinstance(payload, dict)
-        ]
+        payloads = await to_thread(read_jsonl_tail, self._log_path(jorb_id, "messages"), limit)
+        messages = [_payload_to_message(payload) for payload in payloads if isinstance(payload, dict)]
         messages.sort(key=lambda msg: msg.timestamp)
-        return messages[:limit]
+        return messages
+
+    async def get_message_page(
+        self,
+        jorb_id: str,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> list[JorbMessage]:
+        """
+        Get a page of messages counted from the start of the conversation.
+
+        Args:
+            jorb_id: The jorb ID
+            offset: Number of messages to skip from the oldest
+            limit: Maximum number of messages to return
+
+        Returns:
+            Messages in log order (oldest first)
+        """
+        await self._ensure_initialized()
+
+        record = await self._load_record(jorb_id)
+        if record is None:
+            return []
+        payloads = await to_thread(
+            read_jsonl,
+            self._log_path(jorb_id, "messages"),
+            max(0, offset),
+            max(0, limit),
+        )
+        return [_payload_to_message(payload) for payload in payloads if isinstance(payload, dict)]
 
     async def get_open_jorbs_with_messages(self) -> list[JorbWithMessages]:
         """
@@ -785,14 +1059,11 @@ class JorbStorage:
             token_count=token_count,
         )
 
-        async with self._lock:
-            record = await self._read_record(jorb_id)
+        async with self._jorb_lock(jorb_id):
+            record = await self._load_record(jorb_id, locked=True)
             if record is None:
                 raise ValueError(f"Jorb not found: {jorb_id}")
-            checkpoints = list(record.get("checkpoints") or [])
-            checkpoints.append(_checkpoint_to_payload(checkpoint))
-            record["checkpoints"] = checkpoints
-            await self._write_record(jorb_id, record)
+            await self._append_log(jorb_id, "checkpoints", [_checkpoint_to_payload(checkpoint)])
 
         # Increment context_resets counter
         await self.increment_metrics(jorb_id, context_resets=1)
@@ -812,12 +1083,13 @@ class JorbStorage:
         """
         await self._ensure_initialized()
 
-        record = await self._read_record(jorb_id)
+        record = await self._load_record(jorb_id)
         if record is None:
             return []
+        payloads = await to_thread(read_jsonl, self._log_path(jorb_id, "checkpoints"))
         checkpoints = [
             _payload_to_checkpoint(payload)
-            for payload in list(record.get("checkpoints") or [])
+            for payload in payloads
             if isinstance(payload, dict)
         ]
         checkpoints.sort(key=lambda ckpt: ckpt.timestamp)
@@ -847,8 +1119,8 @@ class JorbStorage:
         """
         await self._ensure_initialized()
 
-        async with self._lock:
-            record = await self._read_record(jorb_id)
+        async with self._jorb_lock(jorb_id):
+            record = await self._load_record(jorb_id, locked=True)
             if record is None or not isinstance(record.get("jorb"), dict):
                 return
             jorb_payload = dict(record["jorb"])
@@ -858,8 +1130,7 @@ class JorbStorage:
             jorb_payload["estimated_cost"] = float(jorb_payload.get("estimated_cost") or 0.0) + estimated_cost
             jorb_payload["context_resets"] = int(jorb_payload.get("context_resets") or 0) + context_resets
             jorb_payload["updated_at"] = datetime.now(timezone.utc).isoformat()
-            record["jorb"] = jorb_payload
-            await self._write_record(jorb_id, record)
+            await self._store_header(jorb_id, jorb_payload)
 
     async def set_outcome(
         self,
@@ -894,13 +1165,11 @@ class JorbStorage:
         Returns:
             Set of normalized contact identifiers (phone numbers, usernames, emails)
         """
-        await self._ensure_initialized()
-
-        contacts: set[str] = set()
-        for jorb in await self.list_jorbs(status_filter="all"):
-            for contact in jorb.contacts:
-                if contact.identifier:
-                    contacts.add(self._normalize_identifier(contact.identifier))
+        catalog = await self._refresh_catalog()
+        contacts = {
+            self._normalize_identifier(identifier)
+            for identifier in catalog.contact_identifiers()
+        }
 
         logger.debug("Found %d unique contacts across all jorbs", len(contacts))
         return contacts
@@ -1004,39 +1273,19 @@ class JorbStorage:
         Returns:
             Dict with totals for messages, tokens, cost, and counts by status
         """
-        await self._ensure_initialized()
-
-        jorbs = await self.list_jorbs(status_filter=status_filter)
-        by_status = {
-            "planning": 0,
-            "running": 0,
-            "paused": 0,
-            "complete": 0,
-            "failed": 0,
-            "cancelled": 0,
-        }
-        total_messages_in = 0
-        total_messages_out = 0
-        total_tokens = 0
-        total_cost = 0.0
-        total_context_resets = 0
-
-        for jorb in jorbs:
-            by_status[jorb.status] = by_status.get(jorb.status, 0) + 1
-            total_messages_in += jorb.messages_in
-            total_messages_out += jorb.messages_out
-            total_tokens += jorb.tokens_used
-            total_cost += jorb.estimated_cost
-            total_context_resets += jorb.context_resets
+        catalog = await self._refresh_catalog()
+        by_status, totals = catalog.aggregate(status_filter)
+        total_messages_in = int(totals["messages_in"])
+        total_messages_out = int(totals["messages_out"])
 
         return {
-            "total_jorbs": len(jorbs),
+            "total_jorbs": sum(by_status.values()),
             "total_messages_in": total_messages_in,
             "total_messages_out": total_messages_out,
             "total_messages": total_messages_in + total_messages_out,
-            "total_tokens": total_tokens,
-            "total_cost": round(total_cost, 6),
-            "total_context_resets": total_context_resets,
+            "total_tokens": int(totals["tokens_used"]),
+            "total_cost": round(totals["estimated_cost"], 6),
+            "total_context_resets": int(totals["context_resets"]),
             "by_status": by_status,
         }
 
@@ -1069,13 +1318,15 @@ class JorbStorage:
         if "timestamp" not in result_dict:
             result_dict["timestamp"] = datetime.now(timezone.utc).isoformat()
 
-        # Get current script results
-        jorb = await self.get_jorb(jorb_id)
-        if jorb is None:
-            return False
-
-        updated_results = list(jorb.script_results) + [result_dict]
-        await self.update_jorb(jorb_id, script_results=updated_results)
+        async with self._jorb_lock(jorb_id):
+            record = await self._load_record(jorb_id, locked=True)
+            if record is None or not isinstance(record.get("jorb"), dict):
+                return False
+            await self._append_log(jorb_id, "script_results", [result_dict])
+            # Script activity counts as jorb activity for stale detection.
+            jorb_payload = dict(record["jorb"])
+            jorb_payload["updated_at"] = datetime.now(timezone.utc).isoformat()
+            await self._store_header(jorb_id, jorb_payload)
 
         logger.debug("Added script result to jorb %s: %s", jorb_id, result_dict["script"])
         return True
@@ -1101,19 +1352,14 @@ class JorbStorage:
         """
         await self._ensure_initialized()
 
-        jorb = await self.get_jorb(jorb_id)
-        if jorb is None:
+        record = await self._load_record(jorb_id)
+        if record is None:
             raise ValueError(f"Jorb not found: {jorb_id}")
 
+        recent = await to_thread(read_jsonl_tail, self._log_path(jorb_id, "script_results"), limit)
+        recent.reverse()
         # Sort by timestamp descending (most recent first)
-        sorted_results = sorted(
-            jorb.script_results,
-            key=lambda x: x.get("timestamp", ""),
-            reverse=True,
-        )
-
-        # Return limited number of results
-        return sorted_results[:limit]
+        return sorted(recent, key=lambda x: x.get("timestamp", ""), reverse=True)
 
 
 __all__ = [
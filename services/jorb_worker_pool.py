@@ -0,0 +1,172 @@
+"""
+Bounded concurrency pool for the jorb worker loop.
+
+Due jorbs are processed as independent tasks so one slow LLM turn or Android
+poll no longer holds up every other jorb. The pool enforces:
+
+- Per-jorb exclusivity: a jorb with a task in flight is never dispatched again
+  until that task finishes.
+- Bounded parallelism: LLM turns (`process_jorb_event`) and the cheap
+  android/meta poll fast paths draw from separate semaphores, sized by
+  `JORB_WORKER_CONCURRENCY` and `JORB_WORKER_POLL_CONCURRENCY`.
+- Fairness: among due jorbs, the one served least recently goes first, so a
+  jorb that keeps rescheduling itself cannot starve the rest.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Iterable, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKER_CONCURRENCY = 4
+DEFAULT_WORKER_POLL_CONCURRENCY = 8
+
+# Service times older than this no longer affect ordering and are pruned.
+FAIRNESS_WINDOW_SECONDS = 3600
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, "") or default))
+    except ValueError:
+        logger.warning("Invalid %s=%r; using %d", name, os.getenv(name), default)
+        return default
+
+
+def worker_concurrency_from_env() -> tuple[int, int]:
+    """Return (llm_concurrency, poll_concurrency) from the environment."""
+    return (
+        _env_int("JORB_WORKER_CONCURRENCY", DEFAULT_WORKER_CONCURRENCY),
+        _env_int("JORB_WORKER_POLL_CONCURRENCY", DEFAULT_WORKER_POLL_CONCURRENCY),
+    )
+
+
+class JorbWorkerPool:
+    """In-flight jorb tasks for one worker loop."""
+
+    def __init__(self, llm_concurrency: int, poll_concurrency: int) -> None:
+        self.llm_concurrency = max(1, llm_concurrency)
+        self.poll_concurrency = max(1, poll_concurrency)
+        self._llm_slots = asyncio.Semaphore(self.llm_concurrency)
+        self._poll_slots = asyncio.Semaphore(self.poll_concurrency)
+        self._in_flight: dict[str, asyncio.Future[None]] = {}
+        self._last_served: dict[str, float] = {}
+        self.dispatched = 0
+        self.skipped_busy = 0
+
+    @property
+    def capacity(self) -> int:
+        """Most jorbs allowed in flight (poll tasks may go on to an LLM turn)."""
+        return self.llm_concurrency + self.poll_concurrency
+
+    @property
+    def in_flight_ids(self) -> frozenset[str]:
+        return frozenset(self._in_flight)
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    def is_busy(self, jorb_id: str) -> bool:
+        return jorb_id in self._in_flight
+
+    def llm_slot(self) -> asyncio.Semaphore:
+        return self._llm_slots
+
+    def poll_slot(self) -> asyncio.Semaphore:
+        return self._poll_slots
+
+    def select(self, due: Sequence[Any]) -> list[Any]:
+        """
+        Pick the due jorbs to dispatch now.
+
+        Skips jorbs already in flight, orders the rest least-recently-served
+        first (ties keep the due order, i.e. earliest `wake_at`), and stops at
+        the free capacity.
+        """
+        free = self.capacity - len(self._in_flight)
+        if free <= 0:
+            return []
+        ready = []
+        for position, jorb in enumerate(due):
+            if jorb.id in self._in_flight:
+                self.skipped_busy += 1
+                continue
+            ready.append((self._last_served.get(jorb.id, 0.0), position, jorb))
+        ready.sort(key=lambda item: (item[0], item[1]))
+        return [jorb for _, _, jorb in ready[:free]]
+
+    def dispatch(self, jorb_id: str, work: Callable[[], Awaitable[None]]) -> asyncio.Future[None]:
+        """Run `work()` as the single in-flight task for `jorb_id`."""
+        if jorb_id in self._in_flight:
+            raise RuntimeError(f"Jorb {jorb_id} is already being processed")
+        now = time.monotonic()
+        if len(self._last_served) > 1024:
+            self._last_served = {
+                key: served for key, served in self._last_served.items()
+                if now - served < FAIRNESS_WINDOW_SECONDS
+            }
+        self._last_served[jorb_id] = now
+        task = asyncio.ensure_future(work())
+        task.add_done_callback(lambda done: self._finished(jorb_id, done))
+        self._in_flight[jorb_id] = task
+        self.dispatched += 1
+        return task
+
+    def _finished(self, jorb_id: str, task: asyncio.Future) -> None:
+        if self._in_flight.get(jorb_id) is task:
+            del self._in_flight[jorb_id]
+
+    async def wait_any(self, others: Iterable[Awaitable[Any]] = ()) -> None:
+        """Return when any in-flight task finishes or any of `others` completes."""
+        waiters = [asyncio.ensure_future(other) for other in others]
+        tasks = set(self._in_flight.values())
+        if not tasks and not waiters:
+            return
+        try:
+            await asyncio.wait(tasks | set(waiters), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.cancel()
+            for waiter in waiters:
+                try:
+                    await waiter
+                except asyncio.CancelledError:
+                    pass
+                except Exception:
+                    logger.exception("Worker pool waiter failed")
+
+    async def drain(self) -> None:
+        """Wait for every in-flight task to finish."""
+        while self._in_flight:
+            await asyncio.gather(*list(self._in_flight.values()), return_exceptions=True)
+
+    async def cancel_all(self) -> None:
+        """Cancel every in-flight task and wait for them to unwind."""
+        tasks = list(self._in_flight.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_status(self) -> dict[str, Any]:
+        return {
+            "in_flight": sorted(self._in_flight),
+            "llm_concurrency": self.llm_concurrency,
+            "poll_concurrency": self.poll_concurrency,
+            "dispatched": self.dispatched,
+            "skipped_busy": self.skipped_busy,
+        }
+
+
+__all__ = [
+    "DEFAULT_WORKER_CONCURRENCY",
+    "DEFAULT_WORKER_POLL_CONCURRENCY",
+    "JorbWorkerPool",
+    "worker_concurrency_from_env",
+]
@@ -0,0 +1,106 @@
+"""
+Coalescing write-behind buffer for jorb header records.
+
+The background loop routinely issues several `update_jorb` calls in a row for
+the same jorb (status, then wake_at, then metrics). With write-behind enabled
+each call updates an in-memory copy of the header and the buffer persists the
+final state once per window, so a burst of N updates costs one (optionally
+fsync'd) file write instead of N.
+
+The window is `JORBS_WRITE_BEHIND_MS` (0 disables buffering and writes
+through); `JorbStorage.flush_all()` drains every buffer at shutdown.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+FlushCallback = Callable[[str], Awaitable[None]]
+
+
+class JorbWriteBehind:
+    """Pending header writes for one jorb data directory."""
+
+    def __init__(self, delay_seconds: float) -> None:
+        self._delay = max(0.0, delay_seconds)
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._timer_loop: asyncio.AbstractEventLoop | None = None
+        self._flush_callback: FlushCallback | None = None
+        self._flushing: asyncio.Task | None = None
+        self.coalesced_writes = 0
+        self.flushed_writes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._delay > 0
+
+    def pending(self, jorb_id: str) -> dict[str, Any] | None:
+        header = self._pending.get(jorb_id)
+        return dict(header) if header is not None else None
+
+    def pending_headers(self) -> list[dict[str, Any]]:
+        return [dict(header) for header in self._pending.values()]
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def stage(self, jorb_id: str, header: dict[str, Any], flush_callback: FlushCallback) -> None:
+        """Record the latest header for a jorb and make sure a flush is scheduled."""
+        if jorb_id in self._pending:
+            self.coalesced_writes += 1
+        self._pending[jorb_id] = dict(header)
+        self._flush_callback = flush_callback
+        self._schedule()
+
+    def take(self, jorb_id: str) -> dict[str, Any] | None:
+        return self._pending.pop(jorb_id, None)
+
+    def _schedule(self) -> None:
+        loop = asyncio.get_running_loop()
+        timer_alive = (
+            self._timer is not None
+            and not self._timer.cancelled()
+            and self._timer_loop is loop
+            and not loop.is_closed()
+        )
+        if timer_alive:
+            return
+        self._timer_loop = loop
+        self._timer = loop.call_later(self._delay, self._start_flush)
+
+    def _start_flush(self) -> None:
+        self._timer = None
+        if not self._pending:
+            return
+        self._flushing = asyncio.ensure_future(self.flush())
+
+    async def flush(self) -> int:
+        """Write every pending header now. Returns the number of jorbs written."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        callback = self._flush_callback
+        if callback is None:
+            return 0
+        written = 0
+        for jorb_id in list(self._pending):
+            if jorb_id not in self._pending:
+                continue
+            try:
+                await callback(jorb_id)
+            except Exception:
+                logger.exception("Failed to flush buffered jorb %s; will retry", jorb_id)
+                if self._pending:
+                    self._schedule()
+                break
+            written += 1
+        self.flushed_writes += written
+        return written
+
+
+__all__ = ["JorbWriteBehind"]
@@ -0,0 +1,158 @@
+"""
+Shared OpenAI chat-completion client.
+
+Every LLM call site (AgentRunner, Switchboard, JorbSession, AndroidPhoneRunner)
+goes through `chat_completion()` instead of building its own client, so:
+
+- One client per API key is reused and its HTTP connection pool (and TLS
+  sessions) survives across calls.
+- The blocking request runs in a worker thread, so the event loop (Telethon,
+  bot polling, webhooks) keeps running during the round trip.
+- Requests carry a timeout, transient failures (connection errors, 429s, 5xx)
+  are retried with jittered exponential backoff, and concurrent requests per
+  model are capped.
+
+Call sites pass their module-level `openai.OpenAI` as the client factory, which
+keeps `patch("services.<module>.openai")` working in tests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Callable
+
+from services.stats import stats
+
+try:
+    import openai
+except ImportError:
+    openai = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+OPENAI_TIMEOUT_SECONDS = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "120"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+OPENAI_MAX_CONCURRENCY_PER_MODEL = int(os.getenv("OPENAI_MAX_CONCURRENCY_PER_MODEL", "4"))
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_MAX = 8.0
+
+# Cached clients are keyed by (factory, api key); old keys are rare (rotation).
+MAX_CACHED_CLIENTS = 8
+
+ClientFactory = Callable[..., Any]
+
+
+def _retryable_errors() -> tuple[type[BaseException], ...]:
+    if openai is None:
+        return ()
+    return (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)
+
+
+def _backoff_seconds(attempt: int) -> float:
+    """Full-jitter exponential backoff for retry `attempt` (0-based)."""
+    return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * (2 ** attempt)))
+
+
+class LLMClientPool:
+    """Process-wide cache of OpenAI clients plus per-model concurrency limits."""
+
+    def __init__(
+        self,
+        timeout_seconds: float = OPENAI_TIMEOUT_SECONDS,
+        max_retries: int = OPENAI_MAX_RETRIES,
+        max_concurrency_per_model: int = OPENAI_MAX_CONCURRENCY_PER_MODEL,
+    ) -> None:
+        self._timeout = timeout_seconds
+        self._max_retries = max(0, max_retries)
+        self._max_concurrency = max(1, max_concurrency_per_model)
+        self._clients: dict[tuple[Any, str], Any] = {}
+        self._clients_lock = threading.Lock()
+        self._limits: dict[str, tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
+
+    def client(self, client_factory: ClientFactory, api_key: str) -> Any:
+        """Return the shared client for `api_key`, creating it on first use."""
+        key = (client_factory, api_key)
+        with self._clients_lock:
+            client = self._clients.get(key)
+            if client is None:
+                # Retries are handled here (with jitter), not inside the SDK.
+                client = client_factory(api_key=api_key, timeout=self._timeout, max_retries=0)
+                if len(self._clients) >= MAX_CACHED_CLIENTS:
+                    self._clients.pop(next(iter(self._clients)))
+                self._clients[key] = client
+            return client
+
+    def _model_limit(self, model: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        entry = self._limits.get(model)
+        if entry is None or entry[0] is not loop:
+            entry = (loop, asyncio.Semaphore(self._max_concurrency))
+            self._limits[model] = entry
+        return entry[1]
+
+    async def chat_completion(
+        self,
+        client_factory: ClientFactory,
+        api_key: str,
+        **request: Any,
+    ) -> Any:
+        """
+        Run `chat.completions.create(**request)` without blocking the event loop.
+
+        Raises whatever the SDK raises once retries are exhausted.
+        """
+        client = self.client(client_factory, api_key)
+        model = str(request.get("model") or "")
+        retryable = _retryable_errors()
+        openai_stats = stats.get_service_stats("openai")
+
+        async with self._model_limit(model):
+            attempt = 0
+            while True:
+                started = time.perf_counter()
+                try:
+                    response = await asyncio.to_thread(client.chat.completions.create, **request)
+                except Exception as exc:
+                    openai_stats.record_request(
+                        (time.perf_counter() - started) * 1000, success=False, error=str(exc)
+                    )
+                    if not retryable or not isinstance(exc, retryable) or attempt >= self._max_retries:
+                        raise
+                    delay = _backoff_seconds(attempt)
+                    attempt += 1
+                    logger.warning(
+                        "OpenAI %s request failed (%s); retry %d/%d in %.1fs",
+                        model, exc, attempt, self._max_retries, delay,
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                openai_stats.record_request((time.perf_counter() - started) * 1000, success=True)
+                return response
+
+
+_pool: LLMClientPool | None = None
+
+
+def get_llm_client_pool() -> LLMClientPool:
+    """Get the process-wide LLM client pool."""
+    global _pool
+    if _pool is None:
+        _pool = LLMClientPool()
+    return _pool
+
+
+async def chat_completion(client_factory: ClientFactory, api_key: str, **request: Any) -> Any:
+    """Shortcut for `get_llm_client_pool().chat_completion(...)`."""
+    return await get_llm_client_pool().chat_completion(client_factory, api_key, **request)
+
+
+__all__ = [
+    "LLMClientPool",
+    "chat_completion",
+    "get_llm_client_pool",
+]
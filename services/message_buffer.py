@@ -3,26 +3,50 @@ Message Buffer Service for debouncing incoming messages.
 
 Collects messages from the same sender/channel and combines them
 after a configurable debounce window expires.
+
+A buffer given a `wal_path` appends every message to a write-ahead log
+before accepting it and acknowledges it once its combined event has been
+handed to the flush callback; `start()` replays unacknowledged messages left
+by a previous process, so a deploy or crash inside the debounce window does
+not drop them. Deadlines for all senders are kept in one heap served by a
+single flusher task.
 """
 
 from __future__ import annotations
 
 import asyncio
+import heapq
 import logging
 import os
-from dataclasses import dataclass, field
+import time
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any, Callable, Coroutine, Literal
 
+from services.file_store import append_jsonl, read_jsonl, to_thread, write_jsonl_atomic
+
 logger = logging.getLogger(__name__)
 
 # Default debounce times (in seconds)
 DEFAULT_DEBOUNCE_TELEGRAM = 3
 DEFAULT_DEBOUNCE_SMS = 30
 
+# Longest `flush_all()` waits for flush callbacks before leaving them in the WAL.
+DEFAULT_FLUSH_ALL_TIMEOUT_SECONDS = 10.0
+
+# Rewrite the WAL with only unacknowledged messages after this many appends.
+WAL_COMPACT_EVERY = 1000
+
 Channel = Literal["telegram", "telegram_bot", "sms", "email"]
 
 
+def message_buffer_wal_path(name: str) -> Path:
+    """WAL location for a named buffer under DATA_DIR."""
+    data_dir = Path(os.getenv("DATA_DIR", "./data"))
+    return data_dir / "message_buffer" / f"{name}.jsonl"
+
+
 @dataclass
 class BufferedMessage:
     """A single buffered message."""
@@ -52,11 +76,12 @@ class BufferedEvent:
 
 @dataclass
 class BufferEntry:
-    """Internal buffer entry tracking messages and timer."""
+    """Internal buffer entry tracking messages and their flush deadline."""
 
     messages: list[BufferedMessage] = field(default_factory=list)
-    timer_task: asyncio.Task[None] | None = None
     first_message_time: str | None = None
+    seqs: list[int] = field(default_factory=list)  # WAL sequence numbers
+    due: float = 0.0  # Event loop time the entry flushes at
 
 
 def _get_buffer_key(sender: str, channel: Channel) -> str:
@@ -77,6 +102,8 @@ class MessageBuffer:
         on_flush: Callable[[BufferedEvent], Coroutine[Any, Any, None]] | None = None,
         debounce_telegram_seconds: int | None = None,
         debounce_sms_seconds: int | None = None,
+        wal_path: Path | None = None,
+        fsync: bool = True,
     ):
         """
         Initialize the message buffer.
@@ -85,6 +112,8 @@ class MessageBuffer:
             on_flush: Async callback called when buffer is flushed
             debounce_telegram_seconds: Debounce window for Telegram (default: DEBOUNCE_TELEGRAM_SECONDS env or 60)
             debounce_sms_seconds: Debounce window for SMS (default: DEBOUNCE_SMS_SECONDS env or 30)
+            wal_path: Write-ahead log file; without one the buffer is memory-only
+            fsync: fsync each WAL append (disable in tests)
         """
         self._on_flush = on_flush
         self._buffers: dict[str, BufferEntry] = {}
@@ -103,6 +132,26 @@ class MessageBuffer:
             "email": 30,  # Default for email, can be configured later
         }
 
+        self._wal_path = wal_path
+        self._fsync = fsync
+        # WAL add records not yet acknowledged, by sequence number.
+        self._unacked: dict[int, dict[str, Any]] = {}
+        self._wal_appends = 0
+        self._seq = 0
+        self._started = False
+
+        # (due, generation, key); stale items are skipped when popped.
+        self._deadlines: list[tuple[float, int, str]] = []
+        self._flushing: set[asyncio.Task[BufferedEvent | None]] = set()
+        self._flusher: asyncio.Task[None] | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._wal_lock: asyncio.Lock | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+        self.flushed = 0
+        self.replayed = 0
+        self.last_flush_all: dict[str, Any] | None = None
+
     def get_debounce_time(self, channel: Channel) -> int:
         """Get the debounce time for a channel."""
         return self._debounce_times.get(channel, 30)
@@ -114,6 +163,58 @@ class MessageBuffer:
         """Set the callback to be called when buffer is flushed."""
         self._on_flush = callback
 
+    async def start(self) -> int:
+        """
+        Replay unacknowledged messages from the WAL and start the flusher.
+
+        Replayed messages keep their original deadlines; ones already past
+        due flush right away. Returns the number of messages replayed.
+        """
+        self._bind_loop()
+        if self._started:
+            return 0
+        self._started = True
+        if self._wal_path is None:
+            return 0
+
+        async with self._wal_lock:
+            records = await to_thread(read_jsonl, self._wal_path)
+            replay = self._pending_from_wal(records)
+            if self._unacked:
+                await to_thread(
+                    write_jsonl_atomic,
+                    self._wal_path,
+                    [self._unacked[seq] for seq in sorted(self._unacked)],
+                    self._fsync,
+                )
+            else:
+                await to_thread(self._wal_path.unlink, missing_ok=True)
+            self._wal_appends = 0
+
+        now_wall = time.time()
+        now = self._loop.time()
+        for key, adds in replay.items():
+            channel = adds[0]["message"]["channel"]
+            remaining = adds[0]["at"] + self.get_debounce_time(channel) - now_wall
+            due = now + max(0.0, remaining)
+            entry = self._buffers.setdefault(key, BufferEntry(due=due))
+            # Older messages go ahead of anything buffered since this process started.
+            entry.messages[:0] = [BufferedMessage(**add["message"]) for add in adds]
+            entry.seqs[:0] = [add["seq"] for add in adds]
+            entry.first_message_time = entry.messages[0].timestamp
+            entry.due = min(entry.due, due)
+            self._schedule(key, entry, entry.seqs[0])
+            self.replayed += len(adds)
+
+        if self.replayed:
+            logger.info(
+                "Replayed %d buffered messages for %d senders from %s",
+                self.replayed,
+                len(replay),
+                self._wal_path,
+            )
+        return self.replayed
+
     async def buffer_message(
         self,
         channel: Channel,
@@ -127,8 +228,8 @@ class MessageBuffer:
         """
         Add a message to the buffer.
 
-        If this is the first message in a new window, starts a timer
-        that will flush the buffer after the debounce period.
+        If this is the first message in a new window, schedules a flush
+        after the debounce period. With a WAL the message is logged first.
 
         Args:
             channel: Message channel (telegram, telegram_bot, sms, email)
@@ -141,27 +242,52 @@ class MessageBuffer:
         Returns:
             True if this is the first message in the window, False if added to existing buffer
         """
+        self._bind_loop()
         if timestamp is None:
             timestamp = datetime.now(timezone.utc).isoformat()
 
         key = _get_buffer_key(sender, channel)
-        is_first = key not in self._buffers
+        message = BufferedMessage(
+            channel=channel,
+            sender=sender,
+            sender_name=sender_name,
+            content=content,
+            timestamp=timestamp,
+            metadata=metadata or {},
+            attachments=list(attachments or []),
+        )
+        # Nanosecond-based so numbers stay unique across restarts.
+        self._seq = seq = max(self._seq + 1, time.time_ns())
+
+        if self._wal_path is not None:
+            record = {
+                "op": "add",
+                "seq": seq,
+                "key": key,
+                "at": time.time(),
+                "message": asdict(message),
+            }
+            async with self._wal_lock:
+                self._unacked[seq] = record
+                try:
+                    await to_thread(append_jsonl, self._wal_path, [record], self._fsync)
+                except BaseException:
+                    self._unacked.pop(seq, None)
+                    raise
+                self._wal_appends += 1
 
+        is_first = key not in self._buffers
         if is_first:
-            self._buffers[key] = BufferEntry(first_message_time=timestamp)
+            entry = BufferEntry(
+                first_message_time=timestamp,
+                due=self._loop.time() + self.get_debounce_time(channel),
+            )
+            self._buffers[key] = entry
+            self._schedule(key, entry, seq)
 
         entry = self._buffers[key]
-        entry.messages.append(
-            BufferedMessage(
-                channel=channel,
-                sender=sender,
-                sender_name=sender_name,
-                content=content,
-                timestamp=timestamp,
-                metadata=metadata or {},
-                attachments=list(attachments or []),
-            )
-        )
+        entry.messages.append(message)
+        entry.seqs.append(seq)
 
         logger.debug(
             "Buffered message from %s/%s (count: %d, is_first: %s)",
@@ -171,30 +297,59 @@ class MessageBuffer:
             is_first,
         )
 
-        if is_first:
-            # Start the debounce timer
-            debounce_time = self.get_debounce_time(channel)
-            entry.timer_task = asyncio.create_task(
-                self._flush_after_delay(key, debounce_time)
-            )
-
         return is_first
 
-    async def _flush_after_delay(self, key: str, delay_seconds: int) -> None:
-        """Wait for debounce period then flush the buffer."""
-        try:
-            await asyncio.sleep(delay_seconds)
-            await self._do_flush(key)
-        except asyncio.CancelledError:
-            logger.debug("Flush timer cancelled for %s", key)
+    def _bind_loop(self) -> None:
+        """Create the flusher and loop-bound primitives for the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._flusher is not None and not self._flusher.done():
+            return
+        if self._loop is not loop:
+            self._wakeup = asyncio.Event()
+            self._wal_lock = asyncio.Lock()
+            self._flushing = set()
+            self._loop = loop
+        self._flusher = loop.create_task(self._run_flusher(), name="message-buffer-flusher")
+
+    def _schedule(self, key: str, entry: BufferEntry, generation: int) -> None:
+        heapq.heappush(self._deadlines, (entry.due, generation, key))
+        if self._wakeup is not None and self._deadlines[0][1] == generation:
+            self._wakeup.set()
+
+    async def _run_flusher(self) -> None:
+        """Flush entries as their deadlines pass, sleeping until the next one."""
+        assert self._wakeup is not None and self._loop is not None
+        wakeup = self._wakeup
+        while True:
+            wakeup.clear()
+            now = self._loop.time()
+            while self._deadlines and self._deadlines[0][0] <= now:
+                _, generation, key = heapq.heappop(self._deadlines)
+                entry = self._buffers.get(key)
+                if entry is None or not entry.seqs or entry.seqs[0] != generation:
+                    # Flushed manually (or replaced) since it was scheduled.
+                    continue
+                del self._buffers[key]
+                self._dispatch(entry)
+            timeout = self._deadlines[0][0] - now if self._deadlines else None
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
 
-    async def _do_flush(self, key: str) -> BufferedEvent | None:
-        """Flush a buffer and call the callback."""
-        if key not in self._buffers:
-            return None
+    def _dispatch(self, entry: BufferEntry) -> asyncio.Task[BufferedEvent | None]:
+        task = asyncio.create_task(self._deliver(entry))
+        self._flushing.add(task)
+        task.add_done_callback(self._on_delivered)
+        return task
 
-        entry = self._buffers.pop(key)
+    def _on_delivered(self, task: asyncio.Task[BufferedEvent | None]) -> None:
+        self._flushing.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Error flushing message buffer: %s", task.exception())
 
+    async def _deliver(self, entry: BufferEntry) -> BufferedEvent | None:
+        """Combine an entry's messages, call the callback, then acknowledge them."""
         if not entry.messages:
             return None
 
@@ -230,13 +385,62 @@ class MessageBuffer:
             except Exception as e:
                 logger.error("Error in flush callback: %s", e)
 
+        # A cancelled delivery skips this, leaving the messages to be replayed.
+        await self._ack(entry.seqs)
+        self.flushed += 1
         return event
 
+    async def _ack(self, seqs: list[int]) -> None:
+        if self._wal_path is None or not seqs:
+            return
+        async with self._wal_lock:
+            for seq in seqs:
+                self._unacked.pop(seq, None)
+            if not self._unacked:
+                await to_thread(self._wal_path.unlink, missing_ok=True)
+                self._wal_appends = 0
+            elif self._wal_appends >= WAL_COMPACT_EVERY:
+                await to_thread(
+                    write_jsonl_atomic,
+                    self._wal_path,
+                    [self._unacked[seq] for seq in sorted(self._unacked)],
+                    self._fsync,
+                )
+                self._wal_appends = 0
+            else:
+                await to_thread(
+                    append_jsonl, self._wal_path, [{"op": "ack", "seqs": seqs}], self._fsync
+                )
+                self._wal_appends += 1
+
+    def _pending_from_wal(self, records: list[Any]) -> dict[str, list[dict[str, Any]]]:
+        """Collect unacknowledged add records by key, oldest first."""
+        adds: dict[int, dict[str, Any]] = {}
+        acked: set[int] = set()
+        for record in records:
+            if not isinstance(record, dict):
+                continue
+            if record.get("op") == "add" and isinstance(record.get("message"), dict):
+                adds[int(record["seq"])] = record
+            elif record.get("op") == "ack":
+                acked.update(int(seq) for seq in record.get("seqs") or [])
+        # Messages buffered since this process started are already in memory.
+        known = {seq for entry in self._buffers.values() for seq in entry.seqs}
+        replay: dict[str, list[dict[str, Any]]] = {}
+        for seq in sorted(adds):
+            if seq in acked:
+                continue
+            self._unacked[seq] = adds[seq]
+            self._seq = max(self._seq, seq)
+            if seq not in known:
+                replay.setdefault(adds[seq]["key"], []).append(adds[seq])
+        return replay
+
     async def flush_buffer(self, sender: str, channel: Channel) -> BufferedEvent | None:
         """
         Immediately flush a specific buffer.
 
-        Cancels any pending timer and returns the combined messages.
+        Drops its scheduled deadline and returns the combined messages.
 
         Args:
             sender: Sender identifier
@@ -246,21 +450,10 @@ class MessageBuffer:
             BufferedEvent with combined messages, or None if buffer was empty
         """
         key = _get_buffer_key(sender, channel)
-
-        if key not in self._buffers:
+        entry = self._buffers.pop(key, None)
+        if entry is None:
             return None
-
-        entry = self._buffers[key]
-
-        # Cancel the timer if running
-        if entry.timer_task and not entry.timer_task.done():
-            entry.timer_task.cancel()
-            try:
-                await entry.timer_task
-            except asyncio.CancelledError:
-                pass
-
-        return await self._do_flush(key)
+        return await self._deliver(entry)
 
     def has_pending_messages(self, sender: str, channel: Channel) -> bool:
         """Check if there are pending messages for a sender/channel."""
@@ -274,34 +467,80 @@ class MessageBuffer:
             return 0
         return len(self._buffers[key].messages)
 
-    async def flush_all(self) -> list[BufferedEvent]:
+    def status(self) -> dict[str, Any]:
+        """Counters for status endpoints and shutdown logs."""
+        return {
+            "pending_senders": len(self._buffers),
+            "pending_messages": sum(len(entry.messages) for entry in self._buffers.values()),
+            "flushing": len(self._flushing),
+            "unacknowledged": len(self._unacked),
+            "flushed": self.flushed,
+            "replayed": self.replayed,
+            "wal_path": str(self._wal_path) if self._wal_path else None,
+            "last_flush_all": self.last_flush_all,
+        }
+
+    async def flush_all(
+        self,
+        timeout: float = DEFAULT_FLUSH_ALL_TIMEOUT_SECONDS,
+    ) -> list[BufferedEvent]:
         """
         Flush all pending buffers immediately.
 
-        Useful for shutdown or testing.
+        Useful for shutdown or testing. Waits up to `timeout` seconds for the
+        flush callbacks (including flushes already in progress); ones still
+        running are cancelled and, with a WAL, replayed on the next start.
+        The outcome is logged and kept in `last_flush_all`.
 
         Returns:
             List of all flushed events
         """
-        events = []
-        keys = list(self._buffers.keys())
-
-        for key in keys:
-            # Parse sender and channel from key
-            parts = key.split(":", 1)
-            if len(parts) == 2:
-                channel, sender = parts[0], parts[1]
-                event = await self.flush_buffer(sender, channel)  # type: ignore
-                if event:
-                    events.append(event)
+        started = time.monotonic()
+        entries = list(self._buffers.values())
+        self._buffers.clear()
+        tasks = [self._dispatch(entry) for entry in entries]
+        waiting = set(tasks) | self._flushing
+
+        abandoned: set[asyncio.Task[BufferedEvent | None]] = set()
+        if waiting:
+            _, abandoned = await asyncio.wait(waiting, timeout=timeout)
+            for task in abandoned:
+                task.cancel()
+            if abandoned:
+                await asyncio.gather(*abandoned, return_exceptions=True)
+
+        events = [
+            task.result()
+            for task in tasks
+            if task not in abandoned
+            and not task.cancelled()
+            and task.exception() is None
+            and task.result() is not None
+        ]
+        self.last_flush_all = {
+            "flushed": len(events),
+            "abandoned": len(abandoned),
+            "seconds": round(time.monotonic() - started, 3),
+        }
+        if abandoned:
+            logger.warning(
+                "Message buffer flush timed out after %.1fs: %d flushed, %d left%s",
+                timeout,
+                len(events),
+                len(abandoned),
+                " in the WAL for replay" if self._wal_path else " (dropped)",
+            )
+        elif events:
+            logger.info("Flushed %d message buffers", len(events))
 
         return events
 
     def clear(self) -> None:
         """Clear all buffers without flushing (for testing)."""
-        for entry in self._buffers.values():
-            if entry.timer_task and not entry.timer_task.done():
-                entry.timer_task.cancel()
+        if self._flusher and not self._flusher.done():
+            self._flusher.cancel()
+        self._flusher = None
+        self._deadlines.clear()
         self._buffers.clear()
 
 
@@ -309,4 +548,6 @@ __all__ = [
     "MessageBuffer",
     "BufferedEvent",
     "BufferedMessage",
+    "DEFAULT_FLUSH_ALL_TIMEOUT_SECONDS",
+    "message_buffer_wal_path",
 ]
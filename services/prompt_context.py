@@ -0,0 +1,181 @@
+"""
+Incremental, token-budgeted prompt building for jorb LLM calls.
+
+`JorbSession` and `AgentRunner` rebuild their prompts on every iteration. The
+helpers here let them reuse work between iterations:
+
+- `SectionCache` keeps rendered sections (the shared template head, per-jorb
+  JSON and message history) keyed by the jorb's version, so unchanged jorbs
+  are not re-rendered.
+- `estimate_tokens` / `fit_to_token_budget` trim conversation history to
+  `JORB_HISTORY_TOKEN_BUDGET` with a cheap local estimate (no tokenizer).
+- `encode_image_data_url` caches base64 data URLs for image attachments by
+  path, size and mtime.
+- `record_prompt_build` publishes build time and prompt size per call site as
+  `prompts` in `services/stats.py`.
+"""
+
+from __future__ import annotations
+
+import base64
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Sequence
+
+from services.stats import stats
+
+JORB_HISTORY_TOKEN_BUDGET = int(os.getenv("JORB_HISTORY_TOKEN_BUDGET", "6000"))
+JORB_PROMPT_SECTION_CACHE_SIZE = int(os.getenv("JORB_PROMPT_SECTION_CACHE_SIZE", "512"))
+
+# Encoded screenshots are large; keep only a handful around.
+IMAGE_CACHE_SIZE = 16
+
+
+def estimate_tokens(text: str | None) -> int:
+    """
+    Estimate the token count of `text` without a tokenizer.
+
+    Roughly four ASCII characters per token; non-ASCII characters (emoji, CJK)
+    are counted as a token each, which errs on the high side.
+    """
+    if not text:
+        return 0
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def fit_to_token_budget(lines: Sequence[str], budget: int) -> tuple[list[str], int]:
+    """
+    Keep the newest `lines` whose combined estimate fits in `budget` tokens.
+
+    Returns (kept_lines_oldest_first, dropped_count). The newest line is
+    always kept so the model never loses the latest turn.
+    """
+    kept: list[str] = []
+    used = 0
+    for line in reversed(lines):
+        cost = estimate_tokens(line) + 1  # newline
+        if kept and used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    kept.reverse()
+    return kept, len(lines) - len(kept)
+
+
+class SectionCache:
+    """LRU cache of rendered prompt sections."""
+
+    def __init__(self, max_entries: int = JORB_PROMPT_SECTION_CACHE_SIZE, stats_name: str = "prompt_sections"):
+        self._max_entries = max(0, max_entries)
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._stats = stats.get_cache_stats(stats_name)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_or_render(self, key: Hashable, render: Callable[[], Any]) -> Any:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self._stats.record_hit()
+            return self._entries[key]
+        self._stats.record_miss()
+        value = render()
+        if self._max_entries:
+            self._entries[key] = value
+            if len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._stats.record_eviction()
+        return value
+
+
+_section_cache = SectionCache()
+_image_cache = SectionCache(max_entries=IMAGE_CACHE_SIZE, stats_name="prompt_images")
+
+
+def get_section_cache() -> SectionCache:
+    """Process-wide cache of rendered jorb prompt sections."""
+    return _section_cache
+
+
+def jorb_version(jorb: Any) -> tuple:
+    """Cache key component that changes whenever a jorb's rendered fields do."""
+    return (
+        jorb.id,
+        getattr(jorb, "updated_at", ""),
+        getattr(jorb, "created_at", ""),
+        getattr(jorb, "name", ""),
+        getattr(jorb, "original_plan", ""),
+        getattr(jorb, "status", ""),
+        getattr(jorb, "progress_summary", None),
+        getattr(jorb, "awaiting", None),
+        getattr(jorb, "wake_at", None),
+        getattr(jorb, "metadata_json", None),
+        getattr(jorb, "contacts_json", None),
+    )
+
+
+def messages_version(messages: Sequence[Any]) -> tuple:
+    """
+    Cache key component for rendered messages.
+
+    Covers every rendered field; strings cache their hash, so this stays cheap
+    for long histories.
+    """
+    return tuple(
+        (m.id, m.timestamp, m.direction, m.channel, m.sender, m.sender_name, m.content)
+        for m in messages
+    )
+
+
+def encode_image_data_url(path: str, mime_type: str) -> str:
+    """
+    Return a `data:` URL for an image file, reusing the encoding while the
+    file is unchanged. Raises OSError if the file cannot be read.
+    """
+    st = os.stat(path)
+
+    def _encode() -> str:
+        with open(path, "rb") as f:
+            data = base64.b64encode(f.read()).decode("utf-8")
+        return f"data:{mime_type};base64,{data}"
+
+    return _image_cache.get_or_render((path, st.st_size, st.st_mtime_ns, mime_type), _encode)
+
+
+def record_prompt_build(source: str, started: float, *parts: Any) -> int:
+    """
+    Record how long a prompt took to build (since `time.perf_counter()` value
+    `started`) and its estimated size. Returns the token estimate.
+    """
+    build_ms = (time.perf_counter() - started) * 1000
+    tokens = 0
+    for part in parts:
+        if isinstance(part, str):
+            tokens += estimate_tokens(part)
+        elif isinstance(part, list):
+            # Multimodal content blocks: count text; images are billed separately.
+            tokens += sum(
+                estimate_tokens(block.get("text"))
+                for block in part
+                if isinstance(block, dict) and block.get("type") == "text"
+            )
+    stats.get_prompt_stats(source).record_build(build_ms, tokens)
+    return tokens
+
+
+__all__ = [
+    "JORB_HISTORY_TOKEN_BUDGET",
+    "SectionCache",
+    "encode_image_data_url",
+    "estimate_tokens",
+    "fit_to_token_budget",
+    "get_section_cache",
+    "jorb_version",
+    "messages_version",
+    "record_prompt_build",
+]
@@ -0,0 +1,194 @@
+"""
+Routing-decision cache for the switchboard.
+
+`Switchboard.route` falls back to an LLM call that carries the summary of every
+open jorb. Bursts of near-identical messages (and retries after a transient
+failure) would otherwise pay for the same decision again, so LLM decisions are
+cached under a digest of the normalized routing input:
+
+- sender, channel and message metadata,
+- a hash of the whitespace/case-normalized content,
+- the open-jorb snapshot version (a digest of the per-jorb switchboard
+  summaries, which changes whenever any jorb's status, contacts, summary or
+  last activity changes).
+
+Entries expire after `SWITCHBOARD_CACHE_TTL_SECONDS` and the least recently
+used entry is evicted beyond `SWITCHBOARD_CACHE_MAX_ENTRIES`. Concurrent
+identical lookups are single-flighted: the first caller makes the LLM call and
+the rest await its result. Counters are published as the `switchboard_routing`
+cache in `services/stats.py`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+
+from services.stats import stats
+
+SWITCHBOARD_CACHE_TTL_SECONDS = float(os.getenv("SWITCHBOARD_CACHE_TTL_SECONDS", "120"))
+SWITCHBOARD_CACHE_MAX_ENTRIES = int(os.getenv("SWITCHBOARD_CACHE_MAX_ENTRIES", "256"))
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+T = TypeVar("T")
+
+
+def _digest(payload: Any) -> str:
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def normalize_content(content: str | None) -> str:
+    """Collapse whitespace and case so trivially different texts share a key."""
+    return _WHITESPACE_RE.sub(" ", (content or "").strip()).casefold()
+
+
+def snapshot_version(jorb_summaries: list[dict[str, Any]]) -> str:
+    """Version of the open-jorb snapshot the LLM would see."""
+    return _digest(jorb_summaries)
+
+
+def routing_cache_key(
+    *,
+    channel: str,
+    sender: str,
+    sender_name: str | None,
+    content: str,
+    message_metadata: dict[str, Any] | None,
+    jorb_summaries: list[dict[str, Any]],
+    is_human_intervention: bool,
+) -> str:
+    """Digest of the normalized routing input (the timestamp is deliberately excluded)."""
+    content_hash = hashlib.sha256(normalize_content(content).encode("utf-8")).hexdigest()
+    return _digest({
+        "channel": channel,
+        "sender": sender,
+        "sender_name": sender_name,
+        "content": content_hash,
+        "metadata": message_metadata or {},
+        "snapshot": snapshot_version(jorb_summaries),
+        "human": is_human_intervention,
+    })
+
+
+class RoutingCache(Generic[T]):
+    """TTL + LRU cache with single-flight loading."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = SWITCHBOARD_CACHE_TTL_SECONDS,
+        max_entries: int = SWITCHBOARD_CACHE_MAX_ENTRIES,
+        stats_name: str = "switchboard_routing",
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max(0, max_entries)
+        self._entries: OrderedDict[str, tuple[float, T]] = OrderedDict()
+        self._in_flight: dict[str, asyncio.Future[T]] = {}
+        self._stats = stats.get_cache_stats(stats_name)
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl > 0 and self._max_entries > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get(self, key: str) -> T | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: T, ttl_seconds: float | None = None) -> None:
+        """Store `value`; `ttl_seconds` shortens (never extends) the cache TTL."""
+        ttl = self._ttl if ttl_seconds is None else min(ttl_seconds, self._ttl)
+        if not self.enabled or ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        evicted = 0
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            evicted += 1
+        if evicted:
+            self._stats.record_eviction(evicted)
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[tuple[T, bool]]],
+        tokens: Callable[[T], int] = lambda value: 0,
+        ttl: Callable[[T], float] | None = None,
+    ) -> tuple[T, bool]:
+        """
+        Return `(value, from_cache)` for `key`.
+
+        `loader` returns `(value, cacheable)`; only cacheable values are stored
+        (failed LLM calls are shared with concurrent waiters but not cached).
+        `tokens(value)` is the LLM spend a hit avoided, for the stats, and
+        `ttl(value)`, when given, is a per-value TTL (see `put`).
+        """
+        if not self.enabled:
+            value, _ = await loader()
+            return value, False
+
+        cached = self.get(key)
+        if cached is not None:
+            self._stats.record_hit(tokens(cached))
+            return cached, True
+
+        pending = self._in_flight.get(key)
+        if pending is not None and pending.get_loop() is asyncio.get_running_loop():
+            try:
+                value = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The caller that was loading it got cancelled; load it ourselves.
+                return await self.get_or_load(key, loader, tokens, ttl=ttl)
+            self._stats.record_dedup(tokens(value))
+            return value, True
+
+        self._stats.record_miss()
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value, cacheable = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Waiters re-raise; mark retrieved so an unobserved failure is not logged.
+            future.exception()
+            raise
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+        if cacheable:
+            self.put(key, value, ttl(value) if ttl else None)
+        future.set_result(value)
+        return value, False
+
+
+__all__ = [
+    "RoutingCache",
+    "normalize_content",
+    "routing_cache_key",
+    "snapshot_version",
+]
@@ -0,0 +1,334 @@
+"""
+Append-only manifest index for stored SMS/MMS messages.
+
+`SMSStorage` keeps one index per SMS directory so filtered listings and
+lookups by id never have to glob, stat and parse every message file. Entries
+are keyed by the stored file's path: message ids are only unique per second
+and phone number, while each file holds exactly one message. Each
+stored message appends one line to `data/sms/index.jsonl` with the fields the
+queries filter on; the in-memory index is built from that manifest the first
+time a process touches the store and then follows it by byte offset, so
+writes from other processes show up on the next query. A store that predates
+the manifest is scanned once to create it.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import os
+import threading
+from bisect import bisect_left, insort
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from services.file_store import append_jsonl, write_jsonl_atomic
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "index.jsonl"
+
+
+@dataclass(frozen=True, slots=True)
+class SMSIndexEntry:
+    """Queryable fields of one stored message plus its file path."""
+
+    id: str
+    timestamp: str
+    direction: str
+    localNumber: str
+    remoteNumber: str
+    contact: str | None
+    path: str  # Relative to the SMS directory.
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any], path: str) -> SMSIndexEntry | None:
+        """Build an entry from a stored message document."""
+        message_id = payload.get("id")
+        if not message_id:
+            return None
+        contact = payload.get("contact")
+        return cls(
+            id=str(message_id),
+            timestamp=str(payload.get("timestamp") or ""),
+            direction=str(payload.get("direction") or ""),
+            localNumber=str(payload.get("localNumber") or ""),
+            remoteNumber=str(payload.get("remoteNumber") or ""),
+            contact=contact.get("name") if isinstance(contact, dict) else None,
+            path=path,
+        )
+
+    @classmethod
+    def from_manifest(cls, payload: Any) -> SMSIndexEntry | None:
+        if not isinstance(payload, dict) or not payload.get("id") or not payload.get("path"):
+            return None
+        return cls(
+            id=payload["id"],
+            timestamp=payload.get("timestamp") or "",
+            direction=payload.get("direction") or "",
+            localNumber=payload.get("localNumber") or "",
+            remoteNumber=payload.get("remoteNumber") or "",
+            contact=payload.get("contact"),
+            path=payload["path"],
+        )
+
+    @property
+    def sort_key(self) -> tuple[str, str]:
+        return (self.timestamp, self.path)
+
+
+def _manifest_token(path: Path) -> tuple[int, int] | None:
+    """Return (inode, size) used to spot appends and rewrites of the manifest."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size)
+
+
+class SMSIndex:
+    """Message index for a single SMS data directory. Thread-safe."""
+
+    def __init__(self, sms_dir: Path) -> None:
+        self._sms_dir = sms_dir
+        self._manifest = sms_dir / MANIFEST_NAME
+        self._lock = threading.RLock()
+        self._by_path: dict[str, SMSIndexEntry] = {}
+        self._paths_by_id: dict[str, set[str]] = {}
+        # Sorted (timestamp, path) keys, globally and per remote number / contact.
+        self._all: list[tuple[str, str]] = []
+        self._by_remote: dict[str, list[tuple[str, str]]] = {}
+        self._by_contact: dict[str, list[tuple[str, str]]] = {}
+        self._inode: int | None = None
+        self._offset = 0
+        self._loaded = False
+
+    @property
+    def manifest_path(self) -> Path:
+        return self._manifest
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._by_path)
+
+    def record(self, payload: dict[str, Any], filepath: Path) -> None:
+        """Index a message document that was just written to `filepath`."""
+        entry = SMSIndexEntry.from_payload(payload, filepath.relative_to(self._sms_dir).as_posix())
+        if entry is None:
+            return
+        with self._lock:
+            # Load first so a legacy store is scanned before the manifest exists.
+            self._refresh()
+            if self._by_path.get(entry.path) == entry:
+                # The legacy scan already picked up the file we just wrote.
+                return
+            append_jsonl(self._manifest, [asdict(entry)])
+            # Our own line is re-read on the next refresh; applying it twice is a no-op.
+            self._apply(entry)
+
+    def get(self, message_id: str) -> SMSIndexEntry | None:
+        """Return the newest entry stored under `message_id`."""
+        with self._lock:
+            self._refresh()
+            paths = self._paths_by_id.get(message_id)
+            if not paths:
+                return None
+            return max((self._by_path[path] for path in paths), key=lambda e: e.sort_key)
+
+    def query(
+        self,
+        *,
+        local_number: str | None = None,
+        remote_number: str | None = None,
+        contact_name: str | None = None,
+        direction: str | None = None,
+        limit: int = 50,
+    ) -> list[SMSIndexEntry]:
+        """Return up to `limit` matching entries, newest first."""
+        if limit <= 0:
+            return []
+        contact_lower = contact_name.lower() if contact_name else None
+        results: list[SMSIndexEntry] = []
+        with self._lock:
+            self._refresh()
+            for key in self._candidates(remote_number, contact_lower):
+                entry = self._by_path[key[1]]
+                if local_number and entry.localNumber != local_number:
+                    continue
+                if remote_number and entry.remoteNumber != remote_number:
+                    continue
+                if contact_lower and (not entry.contact or contact_lower not in entry.contact.lower()):
+                    continue
+                if direction and entry.direction != direction:
+                    continue
+                results.append(entry)
+                if len(results) >= limit:
+                    break
+        return results
+
+    def discard(self, path: str) -> None:
+        """Forget the entry for a message file that has gone missing."""
+        with self._lock:
+            entry = self._by_path.get(path)
+            if entry is not None:
+                self._remove(entry)
+
+    def _candidates(
+        self,
+        remote_number: str | None,
+        contact_lower: str | None,
+    ) -> Iterator[tuple[str, str]]:
+        if remote_number:
+            return reversed(self._by_remote.get(remote_number, []))
+        if contact_lower:
+            # Contact filters are substring matches; merge the lists of every
+            # distinct contact name that matches.
+            lists = [
+                reversed(keys)
+                for name, keys in self._by_contact.items()
+                if contact_lower in name
+            ]
+            return heapq.merge(*lists, reverse=True)
+        return reversed(self._all)
+
+    def _refresh(self) -> None:
+        token = _manifest_token(self._manifest)
+        if token is None:
+            if not self._loaded or self._by_path:
+                self._rebuild()
+            return
+        inode, size = token
+        if not self._loaded or inode != self._inode or size < self._offset:
+            self._reset()
+            self._inode = inode
+        if size > self._offset:
+            self._read_manifest()
+        self._loaded = True
+
+    def _read_manifest(self) -> None:
+        entries: list[SMSIndexEntry] = []
+        with self._manifest.open("rb") as handle:
+            handle.seek(self._offset)
+            for raw in handle:
+                if not raw.endswith(b"\n"):
+                    # A line still being written; pick it up next time.
+                    break
+                self._offset += len(raw)
+                try:
+                    payload = json.loads(raw)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                entry = SMSIndexEntry.from_manifest(payload)
+                if entry is not None:
+                    entries.append(entry)
+        self._apply_many(entries)
+
+    def _rebuild(self) -> None:
+        """Scan message files into a fresh manifest (first run on a legacy store)."""
+        self._reset()
+        entries = list(self._scan())
+        self._apply_many(entries)
+        if entries:
+            write_jsonl_atomic(self._manifest, (asdict(entry) for entry in self._sorted_entries()))
+            token = _manifest_token(self._manifest)
+            if token is not None:
+                self._inode, self._offset = token
+            logger.info("Indexed %d stored SMS messages in %s", len(entries), self._manifest)
+        self._loaded = True
+
+    def _scan(self) -> Iterable[SMSIndexEntry]:
+        if not self._sms_dir.exists():
+            return
+        for dir_path in self._sms_dir.iterdir():
+            if not dir_path.is_dir():
+                continue
+            for json_file in dir_path.glob("*.json"):
+                try:
+                    with open(json_file, "r", encoding="utf-8") as f:
+                        payload = json.load(f)
+                except (OSError, ValueError) as exc:
+                    logger.warning("Failed to index message file %s: %s", json_file, exc)
+                    continue
+                if not isinstance(payload, dict):
+                    continue
+                entry = SMSIndexEntry.from_payload(
+                    payload, json_file.relative_to(self._sms_dir).as_posix()
+                )
+                if entry is not None:
+                    yield entry
+
+    def _sorted_entries(self) -> list[SMSIndexEntry]:
+        return [self._by_path[key[1]] for key in self._all]
+
+    def _reset(self) -> None:
+        self._by_path = {}
+        self._paths_by_id = {}
+        self._all = []
+        self._by_remote = {}
+        self._by_contact = {}
+        self._inode = None
+        self._offset = 0
+
+    def _apply_many(self, entries: list[SMSIndexEntry]) -> None:
+        if self._by_path:
+            for entry in entries:
+                self._apply(entry)
+            return
+        # Cold load: fill the maps, then sort each key list once. Messages
+        # sharing a filename overwrite each other on disk; the last one wins.
+        for entry in entries:
+            self._by_path[entry.path] = entry
+        for entry in self._by_path.values():
+            self._paths_by_id.setdefault(entry.id, set()).add(entry.path)
+            key = entry.sort_key
+            self._all.append(key)
+            self._by_remote.setdefault(entry.remoteNumber, []).append(key)
+            if entry.contact:
+                self._by_contact.setdefault(entry.contact.lower(), []).append(key)
+        self._all.sort()
+        for keys in self._by_remote.values():
+            keys.sort()
+        for keys in self._by_contact.values():
+            keys.sort()
+
+    def _apply(self, entry: SMSIndexEntry) -> None:
+        # Messages sharing a filename overwrite each other on disk.
+        previous = self._by_path.get(entry.path)
+        if previous == entry:
+            return
+        if previous is not None:
+            self._remove(previous)
+        self._by_path[entry.path] = entry
+        self._paths_by_id.setdefault(entry.id, set()).add(entry.path)
+        key = entry.sort_key
+        insort(self._all, key)
+        insort(self._by_remote.setdefault(entry.remoteNumber, []), key)
+        if entry.contact:
+            insort(self._by_contact.setdefault(entry.contact.lower(), []), key)
+
+    def _remove(self, entry: SMSIndexEntry) -> None:
+        self._by_path.pop(entry.path, None)
+        paths = self._paths_by_id.get(entry.id)
+        if paths is not None:
+            paths.discard(entry.path)
+            if not paths:
+                del self._paths_by_id[entry.id]
+        key = entry.sort_key
+        _remove_key(self._all, key)
+        _remove_key(self._by_remote.get(entry.remoteNumber), key)
+        if entry.contact:
+            _remove_key(self._by_contact.get(entry.contact.lower()), key)
+
+
+def _remove_key(keys: list[tuple[str, str]] | None, key: tuple[str, str]) -> None:
+    if not keys:
+        return
+    position = bisect_left(keys, key)
+    if position < len(keys) and keys[position] == key:
+        del keys[position]
+
+
+__all__ = ["SMSIndex", "SMSIndexEntry", "MANIFEST_NAME"]
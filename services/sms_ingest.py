@@ -0,0 +1,293 @@
+"""
+Durable spool and background ingest for inbound SMS webhooks.
+
+The Telnyx webhook writes each raw payload to `data/sms_inbox/` and answers
+right away; `SMSIngestQueue` workers then run the slow part (contact lookup,
+attachment downloads, storage, routing) off the request path. A record is
+only deleted once it has been ingested, so anything still spooled when the
+process stops is replayed by `start()` on the next boot. Records that share a
+key (the sender's number) are ingested in arrival order; a record that keeps
+failing is moved to `sms_inbox/failed/` after `MAX_INGEST_ATTEMPTS`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from services.file_store import read_json_file, to_thread, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INGEST_CONCURRENCY = 4
+MAX_INGEST_ATTEMPTS = 3
+
+# Delay before retrying a failed record, multiplied by the attempt number.
+RETRY_DELAY_SECONDS = 5.0
+
+# Longest `stop()` waits for in-flight records before leaving them spooled.
+DEFAULT_STOP_TIMEOUT_SECONDS = 10.0
+
+
+def ingest_concurrency_from_env() -> int:
+    try:
+        return max(1, int(os.getenv("SMS_INGEST_CONCURRENCY", "") or DEFAULT_INGEST_CONCURRENCY))
+    except ValueError:
+        logger.warning(
+            "Invalid SMS_INGEST_CONCURRENCY=%r; using %d",
+            os.getenv("SMS_INGEST_CONCURRENCY"),
+            DEFAULT_INGEST_CONCURRENCY,
+        )
+        return DEFAULT_INGEST_CONCURRENCY
+
+
+IngestHandler = Callable[[dict[str, Any]], Awaitable[Any]]
+
+
+class SMSIngestQueue:
+    """Spooled inbound messages and the workers that ingest them."""
+
+    def __init__(
+        self,
+        spool_dir: Path,
+        process: IngestHandler,
+        *,
+        concurrency: int | None = None,
+        fsync: bool = True,
+    ) -> None:
+        self._spool_dir = spool_dir
+        self._failed_dir = spool_dir / "failed"
+        self._process = process
+        self._concurrency = concurrency or ingest_concurrency_from_env()
+        self._fsync = fsync
+        self._queue: asyncio.Queue[tuple[str, str]] | None = None
+        self._workers: list[asyncio.Task] = []
+        # Per-key FIFO locks (asyncio.Lock wakes waiters in order) with refcounts.
+        self._key_locks: dict[str, tuple[asyncio.Lock, int]] = {}
+        self.processed = 0
+        self.retried = 0
+        self.failed = 0
+
+    @property
+    def spool_dir(self) -> Path:
+        return self._spool_dir
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def pending_ids(self) -> list[str]:
+        """Spooled record ids in arrival order."""
+        if not self._spool_dir.exists():
+            return []
+        return sorted(path.stem for path in self._spool_dir.glob("*.json"))
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "running": self.running,
+            "pending": len(self.pending_ids()),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "processed": self.processed,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+    async def enqueue(self, payload: dict[str, Any], *, key: str) -> str:
+        """Durably spool a raw payload and hand it to the workers."""
+        ingest_id = f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+        record = {
+            "id": ingest_id,
+            "key": key,
+            "spooled_at": datetime.now(timezone.utc).isoformat(),
+            "attempts": 0,
+            "payload": payload,
+        }
+        await to_thread(write_json_atomic, self._path(ingest_id), record, self._fsync)
+        if self._queue is not None:
+            self._queue.put_nowait((ingest_id, key))
+        return ingest_id
+
+    async def start(self) -> None:
+        """Start the workers, replaying anything left in the spool."""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        pending = await to_thread(self._load_pending_keys)
+        for ingest_id, key in pending:
+            self._queue.put_nowait((ingest_id, key))
+        if pending:
+            logger.info("Replaying %d spooled inbound SMS", len(pending))
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"sms-ingest-{i}")
+            for i in range(self._concurrency)
+        ]
+
+    async def stop(self, timeout: float = DEFAULT_STOP_TIMEOUT_SECONDS) -> int:
+        """
+        Let the workers drain for up to `timeout` seconds, then stop them.
+
+        Returns the number of records left in the spool for the next start.
+        """
+        if not self._workers or self._queue is None:
+            return len(self.pending_ids())
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("SMS ingest did not drain within %.1fs", timeout)
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        remaining = len(self.pending_ids())
+        if remaining:
+            logger.info("%d inbound SMS left spooled for the next start", remaining)
+        return remaining
+
+    async def process_pending(self) -> list[Any]:
+        """Ingest every spooled record inline, in order. Returns the handler results."""
+        results = []
+        for ingest_id, key in await to_thread(self._load_pending_keys):
+            async with self._key_lock(key):
+                outcome = await self._run(ingest_id)
+            if outcome is not None:
+                results.append(outcome)
+        return results
+
+    def _path(self, ingest_id: str) -> Path:
+        return self._spool_dir / f"{ingest_id}.json"
+
+    def _load_pending_keys(self) -> list[tuple[str, str]]:
+        pending = []
+        for ingest_id in self.pending_ids():
+            try:
+                record = read_json_file(self._path(ingest_id), None)
+            except (OSError, ValueError):
+                record = None
+            key = record.get("key") if isinstance(record, dict) else None
+            pending.append((ingest_id, str(key or "")))
+        return pending
+
+    def _key_lock(self, key: str) -> "_KeyLock":
+        return _KeyLock(self, key)
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            ingest_id, key = await queue.get()
+            try:
+                # Take the key lock before any other await so same-key records
+                # keep their queue order.
+                async with self._key_lock(key):
+                    await self._run(ingest_id)
+            except Exception:
+                logger.exception("Unexpected error ingesting SMS %s", ingest_id)
+            finally:
+                queue.task_done()
+
+    async def _run(self, ingest_id: str) -> Any:
+        path = self._path(ingest_id)
+        try:
+            record = await to_thread(read_json_file, path, None)
+        except (OSError, ValueError) as exc:
+            logger.error("Unreadable spooled SMS %s: %s", path, exc)
+            await to_thread(self._move_to_failed, path)
+            self.failed += 1
+            return None
+        if not isinstance(record, dict):
+            # Already ingested (e.g. replayed and queued twice).
+            return None
+        try:
+            result = await self._process(record)
+        except Exception as exc:
+            await self._record_failure(path, record, exc)
+            return None
+        await to_thread(path.unlink, missing_ok=True)
+        self.processed += 1
+        return result
+
+    async def _record_failure(self, path: Path, record: dict[str, Any], exc: Exception) -> None:
+        attempts = int(record.get("attempts") or 0) + 1
+        record["attempts"] = attempts
+        record["last_error"] = str(exc)
+        if attempts >= MAX_INGEST_ATTEMPTS:
+            logger.error(
+                "Giving up on inbound SMS %s after %d attempts: %s",
+                record.get("id"),
+                attempts,
+                exc,
+            )
+            await to_thread(write_json_atomic, path, record, self._fsync)
+            await to_thread(self._move_to_failed, path)
+            self.failed += 1
+            return
+        logger.warning(
+            "Ingest of inbound SMS %s failed (attempt %d): %s",
+            record.get("id"),
+            attempts,
+            exc,
+        )
+        await to_thread(write_json_atomic, path, record, self._fsync)
+        self.retried += 1
+        if self._queue is not None:
+            item = (str(record.get("id")), str(record.get("key") or ""))
+            asyncio.get_running_loop().call_later(
+                RETRY_DELAY_SECONDS * attempts,
+                self._requeue,
+                item,
+            )
+
+    def _requeue(self, item: tuple[str, str]) -> None:
+        if self._queue is not None:
+            self._queue.put_nowait(item)
+
+    def _move_to_failed(self, path: Path) -> None:
+        if not path.exists():
+            return
+        self._failed_dir.mkdir(parents=True, exist_ok=True)
+        os.replace(path, self._failed_dir / path.name)
+
+
+class _KeyLock:
+    """Async context manager for a refcounted per-key lock."""
+
+    def __init__(self, queue: SMSIngestQueue, key: str) -> None:
+        self._locks = queue._key_locks
+        self._key = key
+
+    async def __aenter__(self) -> None:
+        lock, users = self._locks.get(self._key, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._locks[self._key] = (lock, users + 1)
+        try:
+            await lock.acquire()
+        except BaseException:
+            self._drop()
+            raise
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self._locks[self._key][0].release()
+        self._drop()
+
+    def _drop(self) -> None:
+        lock, users = self._locks[self._key]
+        if users <= 1:
+            del self._locks[self._key]
+        else:
+            self._locks[self._key] = (lock, users - 1)
+
+
+__all__ = [
+    "SMSIngestQueue",
+    "DEFAULT_INGEST_CONCURRENCY",
+    "MAX_INGEST_ATTEMPTS",
+    "ingest_concurrency_from_env",
+]
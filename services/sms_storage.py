@@ -2,11 +2,13 @@
 SMS Storage Service for file-based message persistence.
 
 Stores SMS/MMS messages as JSON files in ./data/sms/{localNumber}/ directory.
-Handles MMS attachment download and storage.
+Handles MMS attachment download and storage. Listings and lookups by id go
+through the manifest index in `services.sms_index`.
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import mimetypes
@@ -19,15 +21,46 @@ from typing import Any, Literal
 import httpx
 from pydantic import BaseModel, Field
 
+from services.sms_index import SMSIndex, SMSIndexEntry
+
 logger = logging.getLogger(__name__)
 
 # Default timeout for attachment downloads (30 seconds)
 ATTACHMENT_DOWNLOAD_TIMEOUT = 30.0
 
+# Largest attachment we keep; bigger downloads are abandoned mid-stream.
+ATTACHMENT_MAX_BYTES = int(float(os.getenv("SMS_ATTACHMENT_MAX_MB", "25")) * 1024 * 1024)
+
+# Attachments of one message downloaded at once
+ATTACHMENT_DOWNLOAD_CONCURRENCY = 4
+
+ATTACHMENT_CHUNK_SIZE = 64 * 1024
+
 # Characters not allowed in filenames (Windows + Unix restrictions)
 INVALID_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*]')
 
 
+class AttachmentTooLargeError(Exception):
+    """Raised when an attachment exceeds `ATTACHMENT_MAX_BYTES`."""
+
+
+# One pooled client for attachment downloads, rebuilt if the event loop changes.
+_http_client: httpx.AsyncClient | None = None
+_http_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _attachment_client() -> httpx.AsyncClient:
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(
+            timeout=ATTACHMENT_DOWNLOAD_TIMEOUT,
+            follow_redirects=True,
+        )
+        _http_client_loop = loop
+    return _http_client
+
+
 class Contact(BaseModel):
     """Contact information from Google Contacts."""
 
@@ -134,6 +167,9 @@ class SMSStorage:
     Messages are stored as JSON files in ./data/sms/{localNumber}/ directory.
     """
 
+    # One index per SMS directory, shared by every SMSStorage instance.
+    _indexes: dict[str, SMSIndex] = {}
+
     def __init__(self, data_dir: str | None = None):
         """
         Initialize the SMS storage service.
@@ -143,6 +179,10 @@ class SMSStorage:
         """
         self._data_dir = Path(data_dir or os.getenv("DATA_DIR", "./data"))
         self._sms_dir = self._data_dir / "sms"
+        index_key = str(self._sms_dir.resolve())
+        if index_key not in self._indexes:
+            self._indexes[index_key] = SMSIndex(self._sms_dir)
+        self._index = self._indexes[index_key]
 
     def _get_message_dir(self, local_number: str) -> Path:
         """Get the directory for a specific local number."""
@@ -160,43 +200,108 @@ class SMSStorage:
         filepath: Path,
         *,
         timeout: float = ATTACHMENT_DOWNLOAD_TIMEOUT,
+        max_bytes: int | None = None,
     ) -> int:
         """
         Download a media attachment from Telnyx URL.
 
+        The body is streamed to a `.part` file that is renamed into place once
+        complete, so large MMS never sit in memory and a failed download
+        leaves nothing behind.
+
         Args:
             url: The attachment URL to download from
             filepath: Local path to save the file
             timeout: Request timeout in seconds
+            max_bytes: Size limit; defaults to ATTACHMENT_MAX_BYTES
 
         Returns:
             Size of downloaded file in bytes
 
         Raises:
             httpx.HTTPError: On download failure
+            AttachmentTooLargeError: If the attachment exceeds the size limit
         """
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-
-            # Write to file
-            filepath.parent.mkdir(parents=True, exist_ok=True)
-            with open(filepath, "wb") as f:
-                f.write(response.content)
-
-            size = len(response.content)
-            logger.info(
-                "Downloaded attachment (%d bytes) to %s",
-                size,
-                filepath,
+        limit = ATTACHMENT_MAX_BYTES if max_bytes is None else max_bytes
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        partial = filepath.with_name(filepath.name + ".part")
+        size = 0
+        try:
+            async with _attachment_client().stream("GET", url, timeout=timeout) as response:
+                response.raise_for_status()
+                declared = response.headers.get("content-length", "")
+                if declared.isdigit() and int(declared) > limit:
+                    raise AttachmentTooLargeError(
+                        f"Attachment is {declared} bytes (limit {limit})"
+                    )
+                with open(partial, "wb") as f:
+                    async for chunk in response.aiter_bytes(ATTACHMENT_CHUNK_SIZE):
+                        size += len(chunk)
+                        if size > limit:
+                            raise AttachmentTooLargeError(
+                                f"Attachment exceeds {limit} bytes"
+                            )
+                        f.write(chunk)
+            os.replace(partial, filepath)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+
+        logger.info(
+            "Downloaded attachment (%d bytes) to %s",
+            size,
+            filepath,
+        )
+        return size
+
+    async def _fetch_attachment(
+        self,
+        message: SMSMessage,
+        index: int,
+        attachment: Attachment,
+        message_dir: Path,
+        slots: asyncio.Semaphore,
+    ) -> Attachment:
+        """Download one attachment, returning its updated metadata."""
+        if not attachment.originalUrl:
+            # No URL to download, keep as-is
+            return attachment
+
+        # Generate local filename
+        local_filename = _generate_attachment_filename(
+            message,
+            index,
+            attachment.contentType,
+        )
+        try:
+            async with slots:
+                size = await self._download_attachment(
+                    attachment.originalUrl,
+                    message_dir / local_filename,
+                )
+        except (httpx.HTTPError, AttachmentTooLargeError, OSError) as exc:
+            logger.error(
+                "Failed to download attachment from %s: %s",
+                attachment.originalUrl,
+                exc,
             )
-            return size
+            # Keep original attachment info without download
+            return attachment
+
+        # Update attachment with local filename and actual size
+        return Attachment(
+            filename=local_filename,
+            contentType=attachment.contentType,
+            size=size,
+            originalUrl=attachment.originalUrl,
+        )
 
     async def store_message_async(self, message: SMSMessage) -> Path:
         """
         Store a message to disk, downloading any attachments first.
 
-        This is the async version that handles MMS attachments.
+        This is the async version that handles MMS attachments, which are
+        downloaded concurrently.
 
         Args:
             message: The SMSMessage to store
@@ -207,43 +312,13 @@ class SMSStorage:
         message_dir = self._get_message_dir(message.localNumber)
         self._ensure_dir(message_dir)
 
-        # Download attachments and update their filenames
-        updated_attachments = []
-        for i, attachment in enumerate(message.attachments, start=1):
-            if attachment.originalUrl:
-                # Generate local filename
-                local_filename = _generate_attachment_filename(
-                    message,
-                    i,
-                    attachment.contentType,
-                )
-                local_path = message_dir / local_filename
-
-                try:
-                    size = await self._download_attachment(
-                        attachment.originalUrl,
-                        local_path,
-                    )
-                    # Update attachment with local filename and actual size
-                    updated_attachments.append(
-                        Attachment(
-                            filename=local_filename,
-                            contentType=attachment.contentType,
-                            size=size,
-                            originalUrl=attachment.originalUrl,
-                        )
-                    )
-                except httpx.HTTPError as exc:
-                    logger.error(
-                        "Failed to download attachment from %s: %s",
-                        attachment.originalUrl,
-                        exc,
-                    )
-                    # Keep original attachment info without download
-                    updated_attachments.append(attachment)
-            else:
-                # No URL to download, keep as-is
-                updated_attachments.append(attachment)
+        slots = asyncio.Semaphore(ATTACHMENT_DOWNLOAD_CONCURRENCY)
+        updated_attachments = await asyncio.gather(
+            *(
+                self._fetch_attachment(message, i, attachment, message_dir, slots)
+                for i, attachment in enumerate(message.attachments, start=1)
+            )
+        )
 
         # Create updated message with downloaded attachments
         message_data = message.model_dump(mode="json")
@@ -255,6 +330,7 @@ class SMSStorage:
         # Write JSON with pretty formatting
         with open(filepath, "w", encoding="utf-8") as f:
             json.dump(message_data, f, indent=2, ensure_ascii=False)
+        self._index.record(message_data, filepath)
 
         logger.info(
             "Stored SMS message %s to %s",
@@ -280,8 +356,10 @@ class SMSStorage:
         filepath = message_dir / filename
 
         # Write JSON with pretty formatting
+        message_data = message.model_dump(mode="json")
         with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(message.model_dump(mode="json"), f, indent=2, ensure_ascii=False)
+            json.dump(message_data, f, indent=2, ensure_ascii=False)
+        self._index.record(message_data, filepath)
 
         logger.info(
             "Stored SMS message %s to %s",
@@ -296,76 +374,45 @@ class SMSStorage:
         remote_number: str | None = None,
         contact_name: str | None = None,
         limit: int = 50,
+        direction: Literal["inbound", "outbound"] | None = None,
     ) -> list[SMSMessage]:
         """
         Retrieve and filter stored messages.
 
+        Filters are answered from the index, so only the returned messages
+        are read from disk.
+
         Args:
             local_number: Filter by local (Telnyx) number
             remote_number: Filter by remote party's number
             contact_name: Filter by contact name (case-insensitive partial match)
             limit: Maximum number of messages to return
+            direction: Filter by 'inbound' or 'outbound'
 
         Returns:
             List of messages sorted by timestamp descending (most recent first)
         """
         messages: list[SMSMessage] = []
-
-        # Determine which directories to search
-        if local_number:
-            dirs_to_search = [self._get_message_dir(local_number)]
-        else:
-            # Search all local number directories
-            if not self._sms_dir.exists():
-                return []
-            dirs_to_search = [d for d in self._sms_dir.iterdir() if d.is_dir()]
-
-        # Collect all message files
-        message_files: list[tuple[Path, float]] = []
-        for dir_path in dirs_to_search:
-            if not dir_path.exists():
-                continue
-            for json_file in dir_path.glob("*.json"):
-                # Use modification time for initial sorting
-                mtime = json_file.stat().st_mtime
-                message_files.append((json_file, mtime))
-
-        # Sort by modification time descending for efficient limiting
-        message_files.sort(key=lambda x: x[1], reverse=True)
-
-        # Load and filter messages
-        contact_name_lower = contact_name.lower() if contact_name else None
-
-        for filepath, _ in message_files:
-            if len(messages) >= limit:
-                break
-
-            try:
-                with open(filepath, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                message = SMSMessage.model_validate(data)
-
-                # Apply filters
-                if remote_number and message.remoteNumber != remote_number:
+        while True:
+            entries = self._index.query(
+                local_number=local_number,
+                remote_number=remote_number,
+                contact_name=contact_name,
+                direction=direction,
+                limit=limit,
+            )
+            messages = []
+            missing = False
+            for entry in entries:
+                message = self._load_entry(entry)
+                if message is None:
+                    # Drop the stale entry and ask the index again.
+                    self._index.discard(entry.path)
+                    missing = True
                     continue
-                if contact_name_lower:
-                    if not message.contact:
-                        continue
-                    if contact_name_lower not in message.contact.name.lower():
-                        continue
-
                 messages.append(message)
-            except (json.JSONDecodeError, Exception) as exc:
-                logger.warning("Failed to load message from %s: %s", filepath, exc)
-                continue
-
-        # Sort by timestamp descending (most recent first)
-        messages.sort(
-            key=lambda m: m.timestamp,
-            reverse=True,
-        )
-
-        return messages[:limit]
+            if not missing:
+                return messages
 
     def get_message_by_id(self, message_id: str) -> SMSMessage | None:
         """
@@ -377,23 +424,28 @@ class SMSStorage:
         Returns:
             The message if found, None otherwise
         """
-        if not self._sms_dir.exists():
+        while True:
+            entry = self._index.get(message_id)
+            if entry is None:
+                return None
+            message = self._load_entry(entry)
+            if message is not None and message.id == message_id:
+                return message
+            # The file is gone or now holds another message; try older ones.
+            self._index.discard(entry.path)
+
+    def _load_entry(self, entry: SMSIndexEntry) -> SMSMessage | None:
+        filepath = self._sms_dir / entry.path
+        try:
+            with open(filepath, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return SMSMessage.model_validate(data)
+        except FileNotFoundError:
+            logger.warning("Indexed message %s is missing from %s", entry.id, filepath)
+            return None
+        except Exception as exc:
+            logger.warning("Failed to load message from %s: %s", filepath, exc)
             return None
-
-        # Search all directories for the message
-        for dir_path in self._sms_dir.iterdir():
-            if not dir_path.is_dir():
-                continue
-            for json_file in dir_path.glob("*.json"):
-                try:
-                    with open(json_file, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                    if data.get("id") == message_id:
-                        return SMSMessage.model_validate(data)
-                except (json.JSONDecodeError, Exception):
-                    continue
-
-        return None
 
     def get_message_filepath(self, message: SMSMessage) -> Path:
         """
@@ -413,6 +465,7 @@ class SMSStorage:
 
 
 __all__ = [
+    "AttachmentTooLargeError",
     "SMSStorage",
     "SMSMessage",
     "Contact",
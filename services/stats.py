@@ -119,6 +119,92 @@ class EndpointStats:
         }
 
 
+@dataclass
+class CacheStats:
+    """Hit/miss counters for an in-process cache (e.g. switchboard routing)."""
+
+    name: str
+    hits: int = 0
+    misses: int = 0
+    deduplicated: int = 0
+    evictions: int = 0
+    tokens_saved: int = 0
+
+    def record_hit(self, tokens_saved: int = 0) -> None:
+        self.hits += 1
+        self.tokens_saved += tokens_saved
+
+    def record_miss(self) -> None:
+        self.misses += 1
+
+    def record_dedup(self, tokens_saved: int = 0) -> None:
+        """A concurrent identical request shared an in-flight result."""
+        self.deduplicated += 1
+        self.tokens_saved += tokens_saved
+
+    def record_eviction(self, count: int = 1) -> None:
+        self.evictions += count
+
+    def to_dict(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses + self.deduplicated
+        return {
+            "cache": self.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "deduplicated": self.deduplicated,
+            "evictions": self.evictions,
+            "hit_rate": (
+                f"{((self.hits + self.deduplicated) / lookups * 100):.1f}%"
+                if lookups > 0
+                else "N/A"
+            ),
+            "tokens_saved": self.tokens_saved,
+        }
+
+
+@dataclass
+class PromptStats:
+    """Prompt build time and size for one LLM call site."""
+
+    name: str
+    builds: int = 0
+    total_build_ms: float = 0.0
+    max_build_ms: float = 0.0
+    total_tokens: int = 0
+    max_tokens: int = 0
+    last_tokens: int = 0
+    build_latencies: deque = field(default_factory=lambda: deque(maxlen=1000))
+
+    def record_build(self, build_ms: float, prompt_tokens: int) -> None:
+        self.builds += 1
+        self.total_build_ms += build_ms
+        self.max_build_ms = max(self.max_build_ms, build_ms)
+        self.build_latencies.append(build_ms)
+        self.total_tokens += prompt_tokens
+        self.max_tokens = max(self.max_tokens, prompt_tokens)
+        self.last_tokens = prompt_tokens
+
+    def to_dict(self) -> dict[str, Any]:
+        p95 = 0.0
+        if self.build_latencies:
+            ordered = sorted(self.build_latencies)
+            p95 = ordered[int(len(ordered) * 0.95)]
+        return {
+            "prompt": self.name,
+            "builds": self.builds,
+            "build_ms": {
+                "avg": round(self.total_build_ms / self.builds, 2) if self.builds else 0.0,
+                "p95": round(p95, 2),
+                "max": round(self.max_build_ms, 2),
+            },
+            "prompt_tokens": {
+                "avg": round(self.total_tokens / self.builds) if self.builds else 0,
+                "max": self.max_tokens,
+                "last": self.last_tokens,
+            },
+        }
+
+
 class StatsCollector:
     """Global stats collector singleton."""
     
@@ -140,6 +226,8 @@ class StatsCollector:
         self._start_time = datetime.now(timezone.utc)
         self._services: dict[str, ServiceStats] = {}
         self._endpoints: dict[str, EndpointStats] = {}
+        self._caches: dict[str, CacheStats] = {}
+        self._prompts: dict[str, PromptStats] = {}
         self._recent_errors: deque[dict[str, Any]] = deque(maxlen=50)
         self._lock = threading.Lock()
     
@@ -161,6 +249,20 @@ class StatsCollector:
                 self._endpoints[name] = EndpointStats(name=name)
             return self._endpoints[name]
     
+    def get_cache_stats(self, name: str) -> CacheStats:
+        """Get or create stats for a cache."""
+        with self._lock:
+            if name not in self._caches:
+                self._caches[name] = CacheStats(name=name)
+            return self._caches[name]
+
+    def get_prompt_stats(self, name: str) -> PromptStats:
+        """Get or create prompt-build stats for an LLM call site."""
+        with self._lock:
+            if name not in self._prompts:
+                self._prompts[name] = PromptStats(name=name)
+            return self._prompts[name]
+
     def record_error(self, service: str, error: str, context: dict[str, Any] | None = None) -> None:
         """Record an error for debugging."""
         with self._lock:
@@ -213,6 +315,14 @@ class StatsCollector:
                     name: stats.to_dict()
                     for name, stats in self._services.items()
                 },
+                "caches": {
+                    name: cache.to_dict()
+                    for name, cache in self._caches.items()
+                },
+                "prompts": {
+                    name: prompt.to_dict()
+                    for name, prompt in self._prompts.items()
+                },
                 "recent_errors": list(self._recent_errors),
             }
 
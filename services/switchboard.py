@@ -15,11 +15,13 @@ import json
 import logging
 import os
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from services.jorb_storage import Jorb, JorbWithMessages
+from services.llm_client import chat_completion
+from services.routing_cache import RoutingCache, routing_cache_key
 
 logger = logging.getLogger(__name__)
 
@@ -166,6 +168,7 @@ class Switchboard:
         settings = get_settings()
         self._api_key = openai_api_key or settings.openai_api_key
         self._system_prompt = _load_switchboard_prompt()
+        self._routing_cache: RoutingCache[RoutingDecision] = RoutingCache()
 
     @property
     def is_configured(self) -> bool:
@@ -337,10 +340,42 @@ class Switchboard:
             open_jorbs,
             message_metadata=message_metadata,
         )
+        cache_key = routing_cache_key(
+            channel=channel,
+            sender=sender,
+            sender_name=sender_name,
+            content=content,
+            message_metadata=message_metadata,
+            jorb_summaries=context["jorbs"],
+            is_human_intervention=is_human_intervention,
+        )
 
-        try:
-            client = openai.OpenAI(api_key=self._api_key)
+        decision, from_cache = await self._routing_cache.get_or_load(
+            cache_key,
+            lambda: self._route_with_llm(context, is_human_intervention),
+            tokens=lambda cached: cached.tokens_used,
+        )
+        if from_cache:
+            logger.info(
+                "Switchboard cache hit: message from %s routed to %s",
+                sender,
+                decision.jorb_id,
+            )
+            # No tokens were spent on this message.
+            return replace(decision, tokens_used=0)
+        return decision
+
+    async def _route_with_llm(
+        self,
+        context: dict[str, Any],
+        is_human_intervention: bool,
+    ) -> tuple[RoutingDecision, bool]:
+        """
+        Ask the switchboard LLM for a routing decision.
 
+        Returns (decision, cacheable); failed calls are not cacheable.
+        """
+        try:
             messages = [
                 {"role": "system", "content": self._system_prompt},
                 {"role": "user", "content": json.dumps(context, indent=2)},
@@ -351,7 +386,9 @@ class Switchboard:
                 len(context.get("jorbs", [])),
             )
 
-            response = client.chat.completions.create(
+            response = await chat_completion(
+                openai.OpenAI,
+                self._api_key,
                 model=SWITCHBOARD_MODEL,
                 messages=messages,
                 response_format={"type": "json_object"},
@@ -399,7 +436,7 @@ class Switchboard:
                 decision.reasoning[:50],
             )
 
-            return decision
+            return decision, True
 
         except Exception as e:
             logger.error("Switchboard routing failed: %s", e)
@@ -409,7 +446,7 @@ class Switchboard:
                 reasoning=f"Routing failed: {e}",
                 unknown_sender=True,
                 is_human_intervention=is_human_intervention,
-            )
+            ), False
 
     def _try_explicit_jorb_id_match(self, content: str, open_jorbs: list[JorbWithMessages]) -> str | None:
         """
@@ -4,11 +4,16 @@ Telegram Bot Service for notification messages and getUpdates long-polling.
 Uses the Telegram Bot API (via httpx) to send notifications and receive
 incoming messages via long-polling. This is separate from the Telethon
 user client (telegram_client.py).
+
+All Bot API calls share one keep-alive client per event loop (HTTP/2 when
+the `h2` package is installed), so sends and the poll loop reuse
+connections instead of handshaking with api.telegram.org on every call.
 """
 
 from __future__ import annotations
 
 import asyncio
+import importlib.util
 import logging
 import os
 import time
@@ -26,6 +31,56 @@ logger = logging.getLogger(__name__)
 
 TELEGRAM_BOT_API_BASE = "https://api.telegram.org"
 
+# Seconds Telegram holds a getUpdates call open waiting for new updates.
+LONG_POLL_TIMEOUT_SECONDS = 50
+
+DEFAULT_UPDATE_CONCURRENCY = 4
+
+# Longest `stop_polling()` waits for updates already being processed.
+STOP_DRAIN_TIMEOUT_SECONDS = 10.0
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_http_client: httpx.AsyncClient | None = None
+_http_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _bot_client() -> httpx.AsyncClient:
+    """Shared Bot API client for the running event loop."""
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(
+            timeout=30.0,
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=30.0),
+        )
+        _http_client_loop = loop
+    return _http_client
+
+
+async def close_bot_client() -> None:
+    """Close the shared Bot API client (at shutdown)."""
+    global _http_client, _http_client_loop
+    client, _http_client, _http_client_loop = _http_client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+def update_concurrency_from_env() -> int:
+    try:
+        return max(
+            1,
+            int(os.getenv("TELEGRAM_BOT_UPDATE_CONCURRENCY", "") or DEFAULT_UPDATE_CONCURRENCY),
+        )
+    except ValueError:
+        logger.warning(
+            "Invalid TELEGRAM_BOT_UPDATE_CONCURRENCY=%r; using %d",
+            os.getenv("TELEGRAM_BOT_UPDATE_CONCURRENCY"),
+            DEFAULT_UPDATE_CONCURRENCY,
+        )
+        return DEFAULT_UPDATE_CONCURRENCY
+
 
 @dataclass
 class NotificationResult:
@@ -118,28 +173,28 @@ class TelegramBot:
             )
 
             message_ids: list[int] = []
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                for chunk in chunked.chunks:
-                    payload: dict[str, Any] = {
-                        "chat_id": target_chat,
-                        "text": chunk,
-                    }
-                    # Telegram parse_mode is optional; omit when None to send plain text.
-                    if parse_mode:
-                        payload["parse_mode"] = parse_mode
-                    response = await client.post(url, json=payload)
-
-                    # Handle response per chunk; if any chunk fails, stop.
-                    if response.status_code != 200:
-                        raise RuntimeError(f"HTTP {response.status_code}: {response.text}")
-
-                    data = response.json()
-                    if not data.get("ok"):
-                        raise RuntimeError(str(data.get("description", "Unknown error")))
-
-                    msg_id = data.get("result", {}).get("message_id")
-                    if isinstance(msg_id, int):
-                        message_ids.append(msg_id)
+            client = _bot_client()
+            for chunk in chunked.chunks:
+                payload: dict[str, Any] = {
+                    "chat_id": target_chat,
+                    "text": chunk,
+                }
+                # Telegram parse_mode is optional; omit when None to send plain text.
+                if parse_mode:
+                    payload["parse_mode"] = parse_mode
+                response = await client.post(url, json=payload)
+
+                # Handle response per chunk; if any chunk fails, stop.
+                if response.status_code != 200:
+                    raise RuntimeError(f"HTTP {response.status_code}: {response.text}")
+
+                data = response.json()
+                if not data.get("ok"):
+                    raise RuntimeError(str(data.get("description", "Unknown error")))
+
+                msg_id = data.get("result", {}).get("message_id")
+                if isinstance(msg_id, int):
+                    message_ids.append(msg_id)
 
             elapsed_ms = (time.time() - start) * 1000
 
@@ -224,8 +279,7 @@ class TelegramBot:
             filename = os.path.basename(photo_path) or "photo.png"
             with open(photo_path, "rb") as f:
                 files = {"photo": (filename, f, "image/png")}
-                async with httpx.AsyncClient(timeout=60.0) as client:
-                    resp = await client.post(url, data=data, files=files)
+                resp = await _bot_client().post(url, data=data, files=files, timeout=60.0)
 
             elapsed_ms = (time.time() - start) * 1000
 
@@ -348,6 +402,8 @@ class TelegramBotListener:
 
     Uses getUpdates with long-polling to receive messages from the bot.
     Only processes messages from senders in the telegram_allowlist.
+    Updates from different chats are processed concurrently; updates from
+    the same chat are processed in the order Telegram delivered them.
     """
 
     def __init__(
@@ -374,6 +430,11 @@ class TelegramBotListener:
         self._running = False
         self._poll_task: asyncio.Task | None = None
         self._offset: int | None = None
+        self._update_concurrency = update_concurrency_from_env()
+        self._update_slots: asyncio.Semaphore | None = None
+        # Last dispatched update per chat, and every update still in flight.
+        self._chat_tails: dict[str, asyncio.Task[None]] = {}
+        self._update_tasks: set[asyncio.Task[None]] = set()
         # Diagnostics
         self._last_poll_at: str | None = None
         self._last_poll_error: str | None = None
@@ -390,8 +451,7 @@ class TelegramBotListener:
             raise ValueError("Bot token not configured")
 
         url = f"{TELEGRAM_BOT_API_BASE}/bot{self._token}/getFile"
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.get(url, params={"file_id": file_id})
+        resp = await _bot_client().get(url, params={"file_id": file_id})
 
         if resp.status_code != 200:
             raise RuntimeError(f"getFile HTTP {resp.status_code}")
@@ -413,8 +473,7 @@ class TelegramBotListener:
             raise ValueError("Bot token not configured")
 
         url = f"{TELEGRAM_BOT_API_BASE}/file/bot{self._token}/{remote_path}"
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            resp = await client.get(url)
+        resp = await _bot_client().get(url, timeout=60.0)
 
         if resp.status_code != 200:
             raise RuntimeError(f"file download HTTP {resp.status_code}")
@@ -525,6 +584,7 @@ class TelegramBotListener:
             "last_update_username": self._last_update_username,
             "last_update_chat_id": self._last_update_chat_id,
             "last_message_preview": self._last_message_preview,
+            "updates_in_flight": len(self._update_tasks),
         }
 
     async def start_polling(self) -> None:
@@ -551,7 +611,7 @@ class TelegramBotListener:
         logger.info("Telegram bot listener started polling")
 
     async def stop_polling(self) -> None:
-        """Stop the long-polling loop."""
+        """Stop the long-polling loop and let in-flight updates finish."""
         self._running = False
         if self._poll_task and not self._poll_task.done():
             self._poll_task.cancel()
@@ -560,21 +620,72 @@ class TelegramBotListener:
             except asyncio.CancelledError:
                 pass
         self._poll_task = None
+        await self._drain_updates()
         logger.info("Telegram bot listener stopped polling")
 
     async def _poll_loop(self) -> None:
-        """Main polling loop — calls getUpdates in a loop."""
+        """Main polling loop — long-polls getUpdates and dispatches each update."""
         while self._running:
             try:
                 updates = await self._get_updates()
                 for update in updates:
-                    await self._process_update(update)
+                    self._dispatch_update(update)
             except asyncio.CancelledError:
                 break
             except Exception as exc:
                 logger.error("Bot polling error: %s", exc)
                 # Back off on errors to avoid tight loops
                 await asyncio.sleep(5)
+        await self._drain_updates()
+
+    def _dispatch_update(self, update: dict[str, Any]) -> None:
+        """Process an update in the background, after earlier updates from its chat."""
+        if self._update_slots is None:
+            self._update_slots = asyncio.Semaphore(self._update_concurrency)
+        chat_key = _update_chat_key(update)
+        previous = self._chat_tails.get(chat_key)
+        task = asyncio.create_task(self._process_in_order(previous, update))
+        self._chat_tails[chat_key] = task
+        self._update_tasks.add(task)
+
+        def _done(finished: asyncio.Task[None]) -> None:
+            self._update_tasks.discard(finished)
+            if self._chat_tails.get(chat_key) is finished:
+                del self._chat_tails[chat_key]
+
+        task.add_done_callback(_done)
+
+    async def _process_in_order(
+        self,
+        previous: asyncio.Task[None] | None,
+        update: dict[str, Any],
+    ) -> None:
+        if previous is not None:
+            # Only the ordering matters here, not how the earlier update went.
+            await asyncio.wait([previous])
+        assert self._update_slots is not None
+        async with self._update_slots:
+            try:
+                await self._process_update(update)
+            except Exception as exc:
+                logger.exception(
+                    "Error processing bot update %s: %s", update.get("update_id"), exc
+                )
+
+    async def _drain_updates(self, timeout: float = STOP_DRAIN_TIMEOUT_SECONDS) -> None:
+        """Wait up to `timeout` seconds for in-flight updates, then cancel the rest."""
+        if not self._update_tasks:
+            return
+        _, pending = await asyncio.wait(set(self._update_tasks), timeout=timeout)
+        if pending:
+            logger.warning(
+                "Cancelling %d Telegram bot updates still in flight after %.1fs",
+                len(pending),
+                timeout,
+            )
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
 
     async def _ensure_polling_mode(self) -> None:
         """
@@ -603,8 +714,7 @@ class TelegramBotListener:
             raise ValueError("Bot token not configured")
 
         url = f"{TELEGRAM_BOT_API_BASE}/bot{self._token}/getWebhookInfo"
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.get(url)
+        resp = await _bot_client().get(url)
 
         if resp.status_code != 200:
             raise RuntimeError(f"getWebhookInfo HTTP {resp.status_code}")
@@ -625,8 +735,7 @@ class TelegramBotListener:
         params = {
             "drop_pending_updates": "true" if drop_pending_updates else "false",
         }
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.post(url, params=params)
+        resp = await _bot_client().post(url, params=params)
 
         if resp.status_code != 200:
             raise RuntimeError(f"deleteWebhook HTTP {resp.status_code}")
@@ -645,12 +754,16 @@ class TelegramBotListener:
         self._last_poll_at = datetime.now(timezone.utc).isoformat()
 
         url = f"{TELEGRAM_BOT_API_BASE}/bot{self._token}/getUpdates"
-        params: dict[str, Any] = {"timeout": 3}
+        params: dict[str, Any] = {"timeout": LONG_POLL_TIMEOUT_SECONDS}
         if self._offset is not None:
             params["offset"] = self._offset
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, params=params)
+        # Read timeout must outlast the time Telegram holds the request open.
+        response = await _bot_client().get(
+            url,
+            params=params,
+            timeout=httpx.Timeout(LONG_POLL_TIMEOUT_SECONDS + 15, connect=10.0),
+        )
 
         if response.status_code != 200:
             self._last_poll_error = f"http_{response.status_code}"
@@ -769,6 +882,16 @@ class TelegramBotListener:
             )
 
 
+def _update_chat_key(update: dict[str, Any]) -> str:
+    """Ordering key for an update: its chat id, if it carries a message."""
+    message = update.get("message")
+    if isinstance(message, dict):
+        chat = message.get("chat")
+        if isinstance(chat, dict) and chat.get("id") is not None:
+            return str(chat["id"])
+    return ""
+
+
 def _escape_html(text: str) -> str:
     """Escape HTML special characters for Telegram HTML parse mode."""
     return (
@@ -778,4 +901,10 @@ def _escape_html(text: str) -> str:
     )
 
 
-__all__ = ["TelegramBot", "TelegramBotListener", "NotificationResult"]
+__all__ = [
+    "TelegramBot",
+    "TelegramBotListener",
+    "NotificationResult",
+    "LONG_POLL_TIMEOUT_SECONDS",
+    "close_bot_client",
+]
@@ -23,7 +23,7 @@ from datetime import datetime, timezone
 
 from services.agent_runner import AgentRunner
 from services.incoming_events import create_incoming_event
-from services.message_buffer import BufferedEvent, MessageBuffer
+from services.message_buffer import BufferedEvent, MessageBuffer, message_buffer_wal_path
 from services.telegram_bot import TelegramBotListener
 
 logger = logging.getLogger(__name__)
@@ -295,7 +295,10 @@ def _get_message_buffer() -> MessageBuffer:
     global _message_buffer
 
     if _message_buffer is None:
-        _message_buffer = MessageBuffer(on_flush=_on_bot_message_flush)
+        _message_buffer = MessageBuffer(
+            on_flush=_on_bot_message_flush,
+            wal_path=message_buffer_wal_path("telegram_bot"),
+        )
 
     return _message_buffer
 
@@ -369,6 +372,8 @@ async def initialize_telegram_bot_router() -> bool:
         return False
 
     try:
+        # Replay messages buffered before the last shutdown/crash
+        await _get_message_buffer().start()
         await _listener.start_polling()
         _is_initialized = True
         _last_error = None
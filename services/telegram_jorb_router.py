@@ -16,7 +16,7 @@ from telethon.tl.types import User
 from services.agent_runner import AgentRunner
 from services.incoming_events import create_incoming_event
 from services.jorb_storage import JorbStorage
-from services.message_buffer import BufferedEvent, MessageBuffer
+from services.message_buffer import BufferedEvent, MessageBuffer, message_buffer_wal_path
 from services.telegram_client import DispatchContext, TelegramClientService
 
 logger = logging.getLogger(__name__)
@@ -82,7 +82,10 @@ def _get_message_buffer() -> MessageBuffer:
     global _message_buffer
 
     if _message_buffer is None:
-        _message_buffer = MessageBuffer(on_flush=_on_telegram_buffer_flush)
+        _message_buffer = MessageBuffer(
+            on_flush=_on_telegram_buffer_flush,
+            wal_path=message_buffer_wal_path("telegram"),
+        )
 
     return _message_buffer
 
@@ -236,6 +239,9 @@ async def initialize_telegram_jorb_router() -> bool:
         return False
 
     try:
+        # Replay messages buffered before the last shutdown/crash
+        await _get_message_buffer().start()
+
         # Connect to Telegram
         await _telegram_service.connect()
 
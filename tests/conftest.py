@@ -19,6 +19,36 @@ def disable_switchboard_mode(monkeypatch):
     monkeypatch.setenv("USE_SWITCHBOARD_MODE", "false")
 
 
+@pytest.fixture(autouse=True)
+def isolate_data_dir(tmp_path, monkeypatch):
+    """
+    Services default to files under ./data. Point every default at tmp_path so
+    test runs never write runtime state into the checkout; tests that need a
+    specific location still patch it themselves.
+    """
+    import services.android_audit as android_audit
+    import services.progress_log as progress_log
+
+    data_dir = tmp_path / "data"
+    monkeypatch.setenv("DATA_DIR", str(data_dir))
+    monkeypatch.setenv("JORBS_DB_PATH", str(data_dir / "jorbs"))
+    monkeypatch.setenv("PROGRESS_LOG_PATH", str(data_dir / "progress.json"))
+    monkeypatch.setattr(android_audit, "DEFAULT_AUDIT_LOG_PATH", str(data_dir / "android_audit.log"))
+    monkeypatch.setattr(progress_log, "DEFAULT_PROGRESS_PATH", str(data_dir / "progress.json"))
+    # Only patch the briefing state path if a test already pulled in the actions
+    # package; importing it here would drag its dependencies into every test.
+    jorbs_actions = sys.modules.get("actions.jorbs")
+    if jorbs_actions is not None:
+        monkeypatch.setattr(
+            jorbs_actions, "_BRIEFING_STATE_FILE", str(data_dir / "briefing_state.json")
+        )
+    android_audit.reset_audit_logger()
+    progress_log._progress_log = None
+    yield
+    android_audit.reset_audit_logger()
+    progress_log._progress_log = None
+
+
 @pytest.fixture(autouse=True)
 def reset_agent_runner_globals():
     """
@@ -30,6 +60,45 @@ def reset_agent_runner_globals():
     AgentRunner._GLOBAL_MESSAGE_COUNTS.clear()
 
 
+@pytest.fixture(autouse=True)
+def reset_jorb_storage_registries():
+    """
+    JorbStorage shares locks and write-behind buffers per data directory in
+    class globals. They belong to the test's event loop, so drop them between
+    tests; otherwise `JorbStorage.flush_all()` can end up waiting on a lock
+    held by a task from an already-closed loop.
+    """
+    yield
+    from services.jorb_storage import JorbStorage
+
+    for registry in (
+        JorbStorage._locks,
+        JorbStorage._lock_stripes,
+        JorbStorage._catalogs,
+        JorbStorage._write_buffers,
+        JorbStorage._fsync_settings,
+    ):
+        registry.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_sms_indexes():
+    """SMSStorage shares one index per SMS directory; temp dirs can be reused."""
+    yield
+    from services.sms_storage import SMSStorage
+
+    SMSStorage._indexes.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_contact_directory():
+    """The shared ContactDirectory snapshots under DATA_DIR; don't leak it across tests."""
+    yield
+    import services.contact_lookup as contact_lookup
+
+    contact_lookup._directory = None
+
+
 # Mock telethon if not installed to allow tests to run
 if "telethon" not in sys.modules:
     # Create mock telethon module
@@ -275,3 +275,83 @@ class TestGetAndroidAuditLogger:
         logger2 = get_android_audit_logger()
 
         assert logger1 is not logger2
+
+
+class TestAuditLogRotationAndStats:
+    """Tests for rotation, archives and the stats sidecar."""
+
+    def test_rotates_by_size_into_gzip_archives(self) -> None:
+        """A full live log is archived and compressed; stats still cover it."""
+        import gzip
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "audit.log")
+            logger = AndroidAuditLogger(log_path=log_path, max_bytes=600)
+
+            for i in range(12):
+                logger.log_action(action=f"action_{i}", tokens_used=10)
+            logger._rotation_thread.join(timeout=5)
+
+            archives = sorted(name for name in os.listdir(tmpdir) if name.startswith("audit.log."))
+            assert archives and all(name.endswith(".gz") for name in archives)
+            archived = []
+            for name in archives:
+                with gzip.open(os.path.join(tmpdir, name), "rt") as f:
+                    archived.extend(json.loads(line)["action"] for line in f)
+            with open(log_path) as f:
+                live = [json.loads(line)["action"] for line in f]
+            assert sorted(archived + live) == sorted(f"action_{i}" for i in range(12))
+            assert len(live) < 12
+
+            # Recent entries come from the live log only
+            assert [e["action"] for e in logger.get_recent_entries(limit=2)] == live[::-1][:2]
+            stats = logger.get_stats()
+            assert stats["total_actions"] == 12
+            assert stats["total_tokens_used"] == 120
+
+    def test_rotates_daily(self) -> None:
+        """The first write on a new UTC day starts a fresh log."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "audit.log")
+            logger = AndroidAuditLogger(log_path=log_path)
+
+            logger.log_action(action="yesterday")
+            logger._day = "2000-01-01"
+            logger.log_action(action="today")
+            logger._rotation_thread.join(timeout=5)
+
+            assert os.path.exists(os.path.join(tmpdir, "audit.log.2000-01-01.gz"))
+            assert [e["action"] for e in logger.get_recent_entries()] == ["today"]
+
+    def test_stats_persist_across_instances(self) -> None:
+        """Counters are reloaded from the sidecar, including entries it had not saved yet."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "audit.log")
+            first = AndroidAuditLogger(log_path=log_path)
+            first.log_action(action="tap", tokens_used=5)
+            first.close()
+            # Written after the sidecar was saved, as if the process then crashed
+            with patch("services.android_audit.STATS_FLUSH_INTERVAL_SECONDS", 3600):
+                second = AndroidAuditLogger(log_path=log_path)
+                second.log_action(action="tap", success=False, tokens_used=7)
+                second.log_action(action="swipe")
+
+                stats = AndroidAuditLogger(log_path=log_path).get_stats()
+
+            assert stats["total_actions"] == 3
+            assert stats["failed_actions"] == 1
+            assert stats["total_tokens_used"] == 12
+            assert stats["actions_by_type"] == {"tap": 2, "swipe": 1}
+            assert os.path.exists(os.path.join(tmpdir, "audit.stats.json"))
+
+    def test_filtered_recent_entries_stop_at_limit(self) -> None:
+        """Filtering walks backwards only until enough matches are found."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "audit.log")
+            logger = AndroidAuditLogger(log_path=log_path)
+            for i in range(50):
+                logger.log_action(action="tap" if i % 10 == 0 else "get_screen", parameters={"i": i})
+
+            entries = logger.get_recent_entries(limit=2, action_filter="tap")
+
+            assert [e["parameters"]["i"] for e in entries] == [40, 30]
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from services.android_client import PNG_SIGNATURE, ADBResult, AndroidClient
+from services.stats import stats
+
+SCREEN_XML = '<?xml version="1.0" encoding="UTF-8"?><hierarchy rotation="0"><node text="A"/></hierarchy>'
+
+
+def _client() -> AndroidClient:
+    return AndroidClient(host="192.0.2.10", port=5555, serial=None)
+
+
+@pytest.mark.asyncio
+async def test_get_screen_xml_streams_dump_and_strips_status_line() -> None:
+    client = _client()
+    client._run_adb = AsyncMock(
+        return_value=ADBResult(success=True, output=SCREEN_XML + "UI hierchary dumped to: /dev/tty\n")
+    )
+
+    result = await client.get_screen_xml()
+
+    assert result.success
+    assert result.output == SCREEN_XML
+    client._run_adb.assert_awaited_once_with("exec-out", "uiautomator", "dump", "/dev/tty")
+
+
+@pytest.mark.asyncio
+async def test_get_screen_xml_falls_back_to_single_shell_dump() -> None:
+    client = _client()
+    client._run_adb = AsyncMock(
+        side_effect=[
+            ADBResult(success=True, output="ERROR: null root node returned by UiTestAutomationBridge.\n"),
+            ADBResult(success=True, output=SCREEN_XML),
+        ]
+    )
+
+    result = await client.get_screen_xml()
+
+    assert result.output == SCREEN_XML
+    fallback = client._run_adb.await_args_list[1].args
+    assert fallback == (
+        "exec-out",
+        "uiautomator dump /sdcard/ui_dump.xml >/dev/null"
+        " && cat /sdcard/ui_dump.xml; rm -f /sdcard/ui_dump.xml",
+    )
+
+
+@pytest.mark.asyncio
+async def test_capture_screenshot_rejects_non_png_output() -> None:
+    client = _client()
+    client._run_adb = AsyncMock(return_value=ADBResult(success=True, output="", data=b"error: closed"))
+
+    result = await client.capture_screenshot()
+
+    assert not result.success
+    assert "PNG" in result.error
+
+
+@pytest.mark.asyncio
+async def test_capture_screen_runs_screenshot_and_xml_concurrently() -> None:
+    client = _client()
+    in_flight = 0
+    peak = 0
+
+    async def run_adb(*args, timeout=None, binary=False):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if binary:
+            return ADBResult(success=True, output="", data=PNG_SIGNATURE + b"pixels")
+        return ADBResult(success=True, output=SCREEN_XML)
+
+    client._run_adb = run_adb
+    capture_stats = stats.get_service_stats("android_screen_capture")
+    before = capture_stats.request_count
+
+    capture = await client.capture_screen()
+
+    assert peak == 2
+    assert capture.screenshot.data == PNG_SIGNATURE + b"pixels"
+    assert capture.xml.output == SCREEN_XML
+    assert capture.elapsed_ms > 0
+    assert capture_stats.request_count == before + 1
+
+
+@pytest.mark.asyncio
+async def test_take_screenshot_writes_streamed_bytes(tmp_path) -> None:
+    client = _client()
+    client._run_adb = AsyncMock(return_value=ADBResult(success=True, output="", data=PNG_SIGNATURE + b"x"))
+    path = tmp_path / "shot.png"
+
+    result = await client.take_screenshot(str(path))
+
+    assert result.success and result.output == str(path)
+    assert path.read_bytes() == PNG_SIGNATURE + b"x"
+    client._run_adb.assert_awaited_once_with("exec-out", "screencap", "-p", binary=True)
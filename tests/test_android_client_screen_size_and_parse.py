@@ -5,6 +5,7 @@ from unittest.mock import AsyncMock
 import pytest
 
 from services.android_client import AndroidClient, ADBResult
+from services.android_ui_tree import parse_ui_tree
 
 
 @pytest.mark.asyncio
@@ -30,3 +31,59 @@ def test_parse_ui_elements_handles_non_self_closing_nodes() -> None:
     assert els[0].text == "A"
     assert els[0].clickable is True
     assert els[0].bounds == (0, 0, 10, 10)
+
+
+def test_parse_ui_tree_indexes_elements_in_one_pass() -> None:
+    xml = (
+        '<?xml version="1.0" encoding="UTF-8"?><hierarchy rotation="0">'
+        '<node text="" package="com.android.settings" resource-id="" bounds="[0,0][1080,2400]">'
+        '<node text="Network &amp; internet" package="com.android.settings" clickable="false"'
+        ' resource-id="android:id/title" bounds="[0,100][1080,200]"/>'
+        '<node text="Network &amp; internet" content-desc="Open network" package="com.android.settings"'
+        ' clickable="true" resource-id="com.android.settings:id/row" bounds="[0,100][1080,200]"/>'
+        '<node text="Battery" package="com.google.android.apps.nexuslauncher" clickable="true"'
+        ' resource-id="com.android.settings:id/row" bounds="[0,300][1080,400]"/>'
+        "</node></hierarchy>"
+    )
+    tree = parse_ui_tree(xml)
+
+    assert len(tree) == 4
+    assert tree[1].text == "Network & internet"
+    assert tree.dominant_package == "com.android.settings"
+    assert tree.by_text("network & INTERNET") == [tree[1], tree[2]]
+    assert tree.by_content_desc("open network") == [tree[2]]
+    assert tree.by_resource_id("row") == [tree[2], tree[3]]
+    assert tree.by_package("com.google.android.apps.nexuslauncher") == [tree[3]]
+
+
+def test_find_element_on_tree_matches_linear_scan() -> None:
+    client = AndroidClient(host="192.0.2.10", port=5555, serial=None)
+    xml = "<hierarchy>" + "".join(
+        f'<node text="Item {i}" content-desc="desc {i % 3}" resource-id="app:id/item_{i % 4}"'
+        f' class="android.widget.{"Button" if i % 2 else "TextView"}" clickable="{str(i % 2 == 1).lower()}"'
+        f' bounds="[0,{i}][10,{i + 1}]"/>'
+        for i in range(40)
+    ) + "</hierarchy>"
+    tree = client.parse_ui_elements(xml)
+    plain = list(tree)
+    queries = [
+        {"text": "item 1"},
+        {"text": "Item 3", "clickable": False},
+        {"content_desc": "DESC 2", "resource_id": "item_1"},
+        {"resource_id": "item_3", "class_name": "Button", "clickable": True},
+        {"text": "missing"},
+        {"clickable": True},
+    ]
+
+    for query in queries:
+        # Repeat to exercise the per-query cache
+        for _ in range(2):
+            assert client.find_element(tree, **query) is client.find_element(plain, **query), query
+
+
+def test_malformed_xml_falls_back_to_regex_parser() -> None:
+    truncated = '<hierarchy><node text="A" clickable="true" bounds="[0,0][10,10]"/><node text="B" bou'
+    tree = parse_ui_tree(truncated)
+
+    assert [el.text for el in tree] == ["A"]
+    assert tree.find(text="a").bounds == (0, 0, 10, 10)
@@ -6,17 +6,18 @@ phone automation.
 """
 
 import base64
+import hashlib
 import os
 import sys
 import tempfile
 import time
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch, mock_open
+from unittest.mock import AsyncMock, MagicMock, patch
 
 # Import directly from the module to avoid triggering actions/__init__.py
 # which imports google auth and other heavy dependencies
 sys.path.insert(0, "/home/claudia/dev/frank_bot")
-from services.android_client import ADBResult, UIElement
+from services.android_client import ADBResult, ScreenCapture, UIElement
 
 
 # Sample XML that would come from uiautomator dump
@@ -53,6 +54,20 @@ mFocusedApp=ActivityRecord{abcdef u0 com.android.systemui/.keyguard.KeyguardView
 """
 
 
+def _with_capture(mock_client):
+    """Wire `capture_screen` to the mocked screenshot and XML results."""
+
+    async def capture_screen():
+        return ScreenCapture(
+            screenshot=await mock_client.capture_screenshot(),
+            xml=await mock_client.get_screen_xml(),
+            elapsed_ms=12.5,
+        )
+
+    mock_client.capture_screen = AsyncMock(side_effect=capture_screen)
+    return mock_client
+
+
 class TestGetScreenAction:
     """Tests for get_screen_action."""
 
@@ -65,7 +80,7 @@ class TestGetScreenAction:
 
         mock_client = MagicMock()
         mock_client.connect = AsyncMock(return_value=ADBResult(success=True, output="connected"))
-        mock_client.take_screenshot = AsyncMock(return_value=ADBResult(success=True, output="/tmp/screenshot.png"))
+        mock_client.capture_screenshot = AsyncMock(return_value=ADBResult(success=True, output="", data=mock_png_data))
         mock_client.get_screen_xml = AsyncMock(return_value=ADBResult(success=True, output=SAMPLE_UI_XML))
         mock_client.parse_ui_elements = MagicMock(return_value=[
             UIElement(
@@ -82,14 +97,13 @@ class TestGetScreenAction:
             )
         ])
 
-        with patch("actions.android_phone.get_android_client", return_value=mock_client):
-            with patch("builtins.open", mock_open(read_data=mock_png_data)):
-                from actions.android_phone import get_screen_action
+        with patch("actions.android_phone.get_android_client", return_value=_with_capture(mock_client)):
+            from actions.android_phone import get_screen_action
 
-                result = await get_screen_action({})
+            result = await get_screen_action({})
 
-                assert "screenshot_base64" in result
-                assert result["screenshot_base64"] == expected_base64
+            assert "screenshot_base64" in result
+            assert result["screenshot_base64"] == expected_base64
 
     @pytest.mark.asyncio
     async def test_returns_raw_xml(self) -> None:
@@ -98,18 +112,17 @@ class TestGetScreenAction:
 
         mock_client = MagicMock()
         mock_client.connect = AsyncMock(return_value=ADBResult(success=True, output="connected"))
-        mock_client.take_screenshot = AsyncMock(return_value=ADBResult(success=True, output="/tmp/screenshot.png"))
+        mock_client.capture_screenshot = AsyncMock(return_value=ADBResult(success=True, output="", data=mock_png_data))
         mock_client.get_screen_xml = AsyncMock(return_value=ADBResult(success=True, output=SAMPLE_UI_XML))
         mock_client.parse_ui_elements = MagicMock(return_value=[])
 
-        with patch("actions.android_phone.get_android_client", return_value=mock_client):
-            with patch("builtins.open", mock_open(read_data=mock_png_data)):
-                from actions.android_phone import get_screen_action
+        with patch("actions.android_phone.get_android_client", return_value=_with_capture(mock_client)):
+            from actions.android_phone import get_screen_action
 
-                result = await get_screen_action({})
+            result = await get_screen_action({})
 
-                assert "xml" in result
-                assert result["xml"] == SAMPLE_UI_XML
+            assert "xml" in result
+            assert result["xml"] == SAMPLE_UI_XML
 
     @pytest.mark.asyncio
     async def test_prefers_dumpsys_for_unlocked_screen_status(self) -> None:
@@ -120,8 +133,8 @@ class TestGetScreenAction:
         mock_client.connect = AsyncMock(
             return_value=ADBResult(success=True, output="connected")
         )
-        mock_client.take_screenshot = AsyncMock(
-            return_value=ADBResult(success=True, output="/tmp/screenshot.png")
+        mock_client.capture_screenshot = AsyncMock(
+            return_value=ADBResult(success=True, output="", data=mock_png_data)
         )
         mock_client.get_screen_xml = AsyncMock(
             return_value=ADBResult(success=True, output=SAMPLE_UI_XML)
@@ -148,12 +161,11 @@ class TestGetScreenAction:
 
         with patch(
             "actions.android_phone.get_android_client",
-            return_value=mock_client,
+            return_value=_with_capture(mock_client),
         ):
-            with patch("builtins.open", mock_open(read_data=mock_png_data)):
-                from actions.android_phone import get_screen_action
+            from actions.android_phone import get_screen_action
 
-                result = await get_screen_action({})
+            result = await get_screen_action({})
 
         assert result["screen_status"] == "unlocked"
         assert result["screen_status_source"] == "dumpsys_window"
@@ -169,8 +181,8 @@ class TestGetScreenAction:
         mock_client.connect = AsyncMock(
             return_value=ADBResult(success=True, output="connected")
         )
-        mock_client.take_screenshot = AsyncMock(
-            return_value=ADBResult(success=True, output="/tmp/screenshot.png")
+        mock_client.capture_screenshot = AsyncMock(
+            return_value=ADBResult(success=True, output="", data=mock_png_data)
         )
         mock_client.get_screen_xml = AsyncMock(
             return_value=ADBResult(success=True, output=SAMPLE_UI_XML)
@@ -182,12 +194,11 @@ class TestGetScreenAction:
 
         with patch(
             "actions.android_phone.get_android_client",
-            return_value=mock_client,
+            return_value=_with_capture(mock_client),
         ):
-            with patch("builtins.open", mock_open(read_data=mock_png_data)):
-                from actions.android_phone import get_screen_action
+            from actions.android_phone import get_screen_action
 
-                result = await get_screen_action({})
+            result = await get_screen_action({})
 
         assert result["screen_status"] == "lockscreen"
         assert result["lockscreen_detected"] is True
@@ -204,8 +215,8 @@ class TestGetScreenAction:
         mock_client.connect = AsyncMock(
             return_value=ADBResult(success=True, output="connected")
         )
-        mock_client.take_screenshot = AsyncMock(
-            return_value=ADBResult(success=True, output="/tmp/screenshot.png")
+        mock_client.capture_screenshot = AsyncMock(
+            return_value=ADBResult(success=True, output="", data=mock_png_data)
         )
         mock_client.get_screen_xml = AsyncMock(
             return_value=ADBResult(success=True, output=LOCKSCREEN_XML)
@@ -232,12 +243,11 @@ class TestGetScreenAction:
 
         with patch(
             "actions.android_phone.get_android_client",
-            return_value=mock_client,
+            return_value=_with_capture(mock_client),
         ):
-            with patch("builtins.open", mock_open(read_data=mock_png_data)):
-                from actions.android_phone import get_screen_action
+            from actions.android_phone import get_screen_action
 
-                result = await get_screen_action({})
+            result = await get_screen_action({})
 
         assert result["screen_status"] == "maybe_lockscreen"
         assert result["lockscreen_detected"] is True
@@ -278,29 +288,28 @@ class TestGetScreenAction:
 
         mock_client = MagicMock()
         mock_client.connect = AsyncMock(return_value=ADBResult(success=True, output="connected"))
-        mock_client.take_screenshot = AsyncMock(return_value=ADBResult(success=True, output="/tmp/screenshot.png"))
+        mock_client.capture_screenshot = AsyncMock(return_value=ADBResult(success=True, output="", data=mock_png_data))
         mock_client.get_screen_xml = AsyncMock(return_value=ADBResult(success=True, output=SAMPLE_UI_XML))
         mock_client.parse_ui_elements = MagicMock(return_value=mock_elements)
 
-        with patch("actions.android_phone.get_android_client", return_value=mock_client):
-            with patch("builtins.open", mock_open(read_data=mock_png_data)):
-                from actions.android_phone import get_screen_action
+        with patch("actions.android_phone.get_android_client", return_value=_with_capture(mock_client)):
+            from actions.android_phone import get_screen_action
 
-                result = await get_screen_action({})
+            result = await get_screen_action({})
 
-                assert "clickable_elements" in result
-                elements = result["clickable_elements"]
-                assert len(elements) == 2
+            assert "clickable_elements" in result
+            elements = result["clickable_elements"]
+            assert len(elements) == 2
 
-                # Check first element has all required fields
-                el = elements[0]
-                assert el["text"] == "Settings"
-                assert el["content_desc"] == "Open settings"
-                assert el["resource_id"] == "title"  # Should strip package prefix
-                assert el["center_x"] == 540  # (0 + 1080) // 2
-                assert el["center_y"] == 150  # (100 + 200) // 2
-                assert el["bounds"] == {"left": 0, "top": 100, "right": 1080, "bottom": 200}
-                assert el["clickable"] is True
+            # Check first element has all required fields
+            el = elements[0]
+            assert el["text"] == "Settings"
+            assert el["content_desc"] == "Open settings"
+            assert el["resource_id"] == "title"  # Should strip package prefix
+            assert el["center_x"] == 540  # (0 + 1080) // 2
+            assert el["center_y"] == 150  # (100 + 200) // 2
+            assert el["bounds"] == {"left": 0, "top": 100, "right": 1080, "bottom": 200}
+            assert el["clickable"] is True
 
     @pytest.mark.asyncio
     async def test_includes_non_clickable_elements_with_text(self) -> None:
@@ -324,19 +333,18 @@ class TestGetScreenAction:
 
         mock_client = MagicMock()
         mock_client.connect = AsyncMock(return_value=ADBResult(success=True, output="connected"))
-        mock_client.take_screenshot = AsyncMock(return_value=ADBResult(success=True, output="/tmp/screenshot.png"))
+        mock_client.capture_screenshot = AsyncMock(return_value=ADBResult(success=True, output="", data=mock_png_data))
         mock_client.get_screen_xml = AsyncMock(return_value=ADBResult(success=True, output="<xml/>"))
         mock_client.parse_ui_elements = MagicMock(return_value=mock_elements)
 
-        with patch("actions.android_phone.get_android_client", return_value=mock_client):
-            with patch("builtins.open", mock_open(read_data=mock_png_data)):
-                from actions.android_phone import get_screen_action
+        with patch("actions.android_phone.get_android_client", return_value=_with_capture(mock_client)):
+            from actions.android_phone import get_screen_action
 
-                result = await get_screen_action({})
+            result = await get_screen_action({})
 
-                # Should include non-clickable element because it has text
-                assert len(result["clickable_elements"]) == 1
-                assert result["clickable_elements"][0]["text"] == "Status: Online"
+            # Should include non-clickable element because it has text
+            assert len(result["clickable_elements"]) == 1
+            assert result["clickable_elements"][0]["text"] == "Status: Online"
 
     @pytest.mark.asyncio
     async def test_connection_failure_raises_error(self) -> None:
@@ -348,7 +356,7 @@ class TestGetScreenAction:
             error="Connection refused"
         ))
 
-        with patch("actions.android_phone.get_android_client", return_value=mock_client):
+        with patch("actions.android_phone.get_android_client", return_value=_with_capture(mock_client)):
             from actions.android_phone import get_screen_action
 
             with pytest.raises(ValueError) as exc_info:
@@ -361,13 +369,14 @@ class TestGetScreenAction:
         """Raises ValueError when screenshot capture fails."""
         mock_client = MagicMock()
         mock_client.connect = AsyncMock(return_value=ADBResult(success=True, output="connected"))
-        mock_client.take_screenshot = AsyncMock(return_value=ADBResult(
+        mock_client.capture_screenshot = AsyncMock(return_value=ADBResult(
             success=False,
             output="",
             error="Screen off"
         ))
+        mock_client.get_screen_xml = AsyncMock(return_value=ADBResult(success=True, output="<xml/>"))
 
-        with patch("actions.android_phone.get_android_client", return_value=mock_client):
+        with patch("actions.android_phone.get_android_client", return_value=_with_capture(mock_client)):
             from actions.android_phone import get_screen_action
 
             with pytest.raises(ValueError) as exc_info:
@@ -382,7 +391,7 @@ class TestGetScreenAction:
 
         mock_client = MagicMock()
         mock_client.connect = AsyncMock(return_value=ADBResult(success=True, output="connected"))
-        mock_client.take_screenshot = AsyncMock(return_value=ADBResult(success=True, output="/tmp/screenshot.png"))
+        mock_client.capture_screenshot = AsyncMock(return_value=ADBResult(success=True, output="", data=mock_png_data))
         mock_client.get_screen_xml = AsyncMock(return_value=ADBResult(
             success=False,
             output="",
@@ -394,17 +403,16 @@ class TestGetScreenAction:
             return_value=ADBResult(success=True, output=DUMPSYS_UNLOCKED)
         )
 
-        with patch("actions.android_phone.get_android_client", return_value=mock_client):
-            with patch("builtins.open", mock_open(read_data=mock_png_data)):
-                from actions.android_phone import get_screen_action
+        with patch("actions.android_phone.get_android_client", return_value=_with_capture(mock_client)):
+            from actions.android_phone import get_screen_action
 
-                result = await get_screen_action({})
+            result = await get_screen_action({})
 
-                assert result["xml"] == ""
-                assert result["xml_error"] == "uiautomator dump failed"
-                assert "screenshot_base64" in result
-                assert "unavailable" in result["message"]
-                assert result["screen_status"] == "unlocked"
+            assert result["xml"] == ""
+            assert result["xml_error"] == "uiautomator dump failed"
+            assert "screenshot_base64" in result
+            assert "unavailable" in result["message"]
+            assert result["screen_status"] == "unlocked"
 
     @pytest.mark.asyncio
     async def test_returns_element_count(self) -> None:
@@ -430,17 +438,16 @@ class TestGetScreenAction:
 
         mock_client = MagicMock()
         mock_client.connect = AsyncMock(return_value=ADBResult(success=True, output="connected"))
-        mock_client.take_screenshot = AsyncMock(return_value=ADBResult(success=True, output="/tmp/screenshot.png"))
+        mock_client.capture_screenshot = AsyncMock(return_value=ADBResult(success=True, output="", data=mock_png_data))
         mock_client.get_screen_xml = AsyncMock(return_value=ADBResult(success=True, output="<xml/>"))
         mock_client.parse_ui_elements = MagicMock(return_value=mock_elements)
 
-        with patch("actions.android_phone.get_android_client", return_value=mock_client):
-            with patch("builtins.open", mock_open(read_data=mock_png_data)):
-                from actions.android_phone import get_screen_action
+        with patch("actions.android_phone.get_android_client", return_value=_with_capture(mock_client)):
+            from actions.android_phone import get_screen_action
 
-                result = await get_screen_action({})
+            result = await get_screen_action({})
 
-                assert result["element_count"] == 5
+            assert result["element_count"] == 5
 
     @pytest.mark.asyncio
     async def test_already_connected_succeeds(self) -> None:
@@ -453,17 +460,16 @@ class TestGetScreenAction:
             success=False,
             output="already connected to 192.0.2.10:5555"
         ))
-        mock_client.take_screenshot = AsyncMock(return_value=ADBResult(success=True, output="/tmp/screenshot.png"))
+        mock_client.capture_screenshot = AsyncMock(return_value=ADBResult(success=True, output="", data=mock_png_data))
         mock_client.get_screen_xml = AsyncMock(return_value=ADBResult(success=True, output="<xml/>"))
         mock_client.parse_ui_elements = MagicMock(return_value=[])
 
-        with patch("actions.android_phone.get_android_client", return_value=mock_client):
-            with patch("builtins.open", mock_open(read_data=mock_png_data)):
-                from actions.android_phone import get_screen_action
+        with patch("actions.android_phone.get_android_client", return_value=_with_capture(mock_client)):
+            from actions.android_phone import get_screen_action
 
-                # Should not raise - "already connected" is acceptable
-                result = await get_screen_action({})
-                assert "screenshot_base64" in result
+            # Should not raise - "already connected" is acceptable
+            result = await get_screen_action({})
+            assert "screenshot_base64" in result
 
 
 class TestAndroidPhoneHealthAction:
@@ -1411,101 +1417,54 @@ class TestScreenshotNotification:
             mock_tg_service.send_photo.assert_not_called()
 
 
-class TestPersistStepScreenshots:
-    """Tests for _persist_step_screenshots helper."""
+class TestStepScreenshotWriter:
+    """Tests for _StepScreenshotWriter and _step_screenshot_paths."""
 
-    def test_saves_step_screenshots(self) -> None:
-        """Step screenshots are saved as {task_id}_step_{n}.png."""
-        from actions.android_phone import _persist_step_screenshots
-        from services.android_phone_runner import StepResult, PhoneAction
-
-        steps = [
-            StepResult(
-                step_number=1,
-                action=PhoneAction(action="tap", params={"x": 100, "y": 200}),
-                success=True,
-                screenshot_base64=MOCK_1X1_PNG_B64,
-            ),
-            StepResult(
-                step_number=2,
-                action=PhoneAction(action="tap", params={"x": 300, "y": 400}),
-                success=True,
-                screenshot_base64=MOCK_1X1_PNG_B64,
-            ),
-        ]
+    def test_writes_each_step_as_it_is_captured(self) -> None:
+        """Step screenshots are saved as {task_id}_step_{n}.png with 0o600 permissions."""
+        from actions.android_phone import _StepScreenshotWriter
 
         with tempfile.TemporaryDirectory() as tmpdir:
             with patch("actions.android_phone.SCREENSHOTS_DIR", tmpdir):
-                paths = _persist_step_screenshots("task_abc", steps)
-
-        assert len(paths) == 2
-        assert paths[0].endswith("task_abc_step_1.png")
-        assert paths[1].endswith("task_abc_step_2.png")
-
-    def test_skips_steps_without_screenshot(self) -> None:
-        """Steps without screenshot_base64 are skipped."""
-        from actions.android_phone import _persist_step_screenshots
+                writer = _StepScreenshotWriter("task_abc")
+                path1, sha1 = writer.write(1, MOCK_1X1_PNG_B64, "sig-a")
+                assert os.path.isfile(path1)
+                path2, sha2 = writer.write(2, MOCK_1X1_PNG_B64, "sig-b")
+
+            assert path1.endswith("task_abc_step_1.png")
+            assert path2.endswith("task_abc_step_2.png")
+            assert sha1 == sha2 == hashlib.sha256(base64.b64decode(MOCK_1X1_PNG_B64)).hexdigest()
+            assert os.stat(path1).st_mode & 0o777 == 0o600
+
+    def test_identical_consecutive_frames_are_deduplicated(self) -> None:
+        """A frame matching the previous step's signature and hash reuses its file."""
+        from actions.android_phone import _StepScreenshotWriter, _step_screenshot_paths
         from services.android_phone_runner import StepResult, PhoneAction
 
-        steps = [
-            StepResult(
-                step_number=1,
-                action=PhoneAction(action="tap"),
-                success=True,
-                screenshot_base64=MOCK_1X1_PNG_B64,
-            ),
-            StepResult(
-                step_number=2,
-                action=PhoneAction(action="tap"),
-                success=True,
-                screenshot_base64=None,
-            ),
-        ]
-
         with tempfile.TemporaryDirectory() as tmpdir:
             with patch("actions.android_phone.SCREENSHOTS_DIR", tmpdir):
-                paths = _persist_step_screenshots("task_skip", steps)
+                writer = _StepScreenshotWriter("task_dup")
+                paths = [
+                    writer.write(1, MOCK_1X1_PNG_B64, "sig-a")[0],
+                    writer.write(2, MOCK_1X1_PNG_B64, "sig-a")[0],
+                    writer.write(3, MOCK_1X1_PNG_B64, "sig-b")[0],
+                ]
 
-        assert len(paths) == 1
-        assert paths[0].endswith("task_skip_step_1.png")
-
-    def test_file_permissions_0o600(self) -> None:
-        """Step screenshots use 0o600 permissions."""
-        from actions.android_phone import _persist_step_screenshots
-        from services.android_phone_runner import StepResult, PhoneAction
+            assert paths[0] == paths[1]
+            assert sorted(os.listdir(tmpdir)) == ["task_dup_step_1.png", "task_dup_step_3.png"]
 
         steps = [
-            StepResult(
-                step_number=1,
-                action=PhoneAction(action="tap"),
-                success=True,
-                screenshot_base64=MOCK_1X1_PNG_B64,
-            ),
+            StepResult(step_number=i + 1, action=PhoneAction(action="tap"), success=True, screenshot_path=path)
+            for i, path in enumerate(paths)
         ]
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch("actions.android_phone.SCREENSHOTS_DIR", tmpdir):
-                paths = _persist_step_screenshots("task_perms", steps)
-
-            mode = os.stat(paths[0]).st_mode & 0o777
-            assert mode == 0o600
+        steps.append(StepResult(step_number=4, action=PhoneAction(action="tap"), success=True))
+        assert _step_screenshot_paths(steps) == [paths[0], paths[2]]
 
     def test_rejects_invalid_task_id(self) -> None:
         """Invalid task IDs are rejected."""
-        from actions.android_phone import _persist_step_screenshots
-        from services.android_phone_runner import StepResult, PhoneAction
-
-        steps = [
-            StepResult(
-                step_number=1,
-                action=PhoneAction(action="tap"),
-                success=True,
-                screenshot_base64=MOCK_1X1_PNG_B64,
-            ),
-        ]
+        from actions.android_phone import _StepScreenshotWriter
 
-        paths = _persist_step_screenshots("../../etc/passwd", steps)
-        assert paths == []
+        assert _StepScreenshotWriter("../../etc/passwd").write(1, MOCK_1X1_PNG_B64, "sig") == (None, None)
 
 
 class TestCleanupOldScreenshots:
@@ -1568,6 +1527,25 @@ class TestCleanupOldScreenshots:
             assert deleted == 0
             assert os.path.exists(txt_file)
 
+    def test_enforces_size_budget_oldest_first(self) -> None:
+        """Recent files are deleted oldest-first when the directory is over budget."""
+        from actions.android_phone import _cleanup_old_screenshots
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            now = time.time()
+            for i in range(4):
+                path = os.path.join(tmpdir, f"task_step_{i}.png")
+                with open(path, "wb") as f:
+                    f.write(b"x" * 100)
+                os.utime(path, (now - 100 + i, now - 100 + i))
+
+            with patch("actions.android_phone.SCREENSHOTS_DIR", tmpdir), \
+                 patch("actions.android_phone.SCREENSHOT_RETENTION_BYTES", 250):
+                deleted = _cleanup_old_screenshots()
+
+            assert deleted == 2
+            assert sorted(os.listdir(tmpdir)) == ["task_step_2.png", "task_step_3.png"]
+
     def test_returns_zero_when_no_directory(self) -> None:
         """Returns 0 when screenshots directory doesn't exist."""
         from actions.android_phone import _cleanup_old_screenshots
@@ -1593,33 +1571,35 @@ class TestStepScreenshotsInBackground:
         mock_client.wake_device = AsyncMock(return_value=ADBResult(success=True, output="awake"))
         mock_client.unlock_device = AsyncMock(return_value=ADBResult(success=True, output="unlocked"))
 
-        steps = [
-            StepResult(
-                step_number=1,
-                action=PhoneAction(action="tap", params={"x": 100, "y": 200}),
-                success=True,
-                screenshot_base64=MOCK_1X1_PNG_B64,
-            ),
-            StepResult(
-                step_number=2,
-                action=PhoneAction(action="done"),
+        async def run_task(**kwargs):
+            # The runner hands each captured frame to the writer as it goes.
+            writer = kwargs["screenshot_writer"]
+            steps = []
+            for step_number, action in ((1, PhoneAction(action="tap", params={"x": 100, "y": 200})),
+                                        (2, PhoneAction(action="done"))):
+                path, sha256 = writer.write(step_number, MOCK_1X1_PNG_B64, f"sig-{step_number}")
+                assert os.path.isfile(path)
+                steps.append(StepResult(
+                    step_number=step_number,
+                    action=action,
+                    success=True,
+                    screenshot_path=path,
+                    screenshot_sha256=sha256,
+                ))
+            return RunResult(
                 success=True,
-                screenshot_base64=MOCK_1X1_PNG_B64,
-            ),
-        ]
+                final_action="done",
+                steps_taken=2,
+                total_tokens_used=1000,
+                total_cost=0.02,
+                steps=steps,
+                final_screenshot_base64=MOCK_1X1_PNG_B64,
+                extracted_data={"result": "done"},
+            )
 
         mock_runner = MagicMock()
         mock_runner.is_configured = True
-        mock_runner.run_task = AsyncMock(return_value=RunResult(
-            success=True,
-            final_action="done",
-            steps_taken=2,
-            total_tokens_used=1000,
-            total_cost=0.02,
-            steps=steps,
-            final_screenshot_base64=MOCK_1X1_PNG_B64,
-            extracted_data={"result": "done"},
-        ))
+        mock_runner.run_task = AsyncMock(side_effect=run_task)
 
         task = AndroidTask(id="ts1", goal="test goal", status="pending")
         mock_storage = MagicMock(spec=AndroidTaskStorage)
@@ -355,6 +355,35 @@ class TestRunTask:
         assert result.steps_taken == 2
         assert result.total_tokens_used == 300
 
+    @pytest.mark.asyncio
+    async def test_screenshots_are_handed_to_writer_per_step(self) -> None:
+        """Each step's screenshot goes to the writer; steps keep only path and hash."""
+        runner = AndroidPhoneRunner(model="test", api_key="test", step_delay=0)
+        mock_screen = {
+            "screenshot_base64": "abc123",
+            "xml": "<hierarchy/>",
+            "clickable_elements": [],
+            "element_count": 0,
+        }
+        llm_responses = iter([
+            (PhoneAction(action="tap", params={"x": 1, "y": 2}), 10, 5),
+            (PhoneAction(action="done", done=True), 10, 5),
+        ])
+        writer = MagicMock()
+        writer.write.side_effect = lambda step, b64, sig: (f"/shots/step_{step}.png", f"hash{step}")
+
+        with patch.object(runner, "_capture_screen_state", return_value=mock_screen):
+            with patch.object(runner, "_call_llm", side_effect=lambda *a, **k: next(llm_responses)):
+                with patch.object(runner, "_execute_action", return_value=(True, None)):
+                    result = await runner.run_task("test task", screenshot_writer=writer)
+
+        assert [call.args[:2] for call in writer.write.call_args_list] == [(1, "abc123"), (2, "abc123")]
+        assert [(s.screenshot_path, s.screenshot_sha256) for s in result.steps] == [
+            ("/shots/step_1.png", "hash1"),
+            ("/shots/step_2.png", "hash2"),
+        ]
+        assert not hasattr(result.steps[0], "screenshot_base64")
+
     @pytest.mark.asyncio
     async def test_stops_at_max_steps(self) -> None:
         """Stops and reports failure at max steps."""
@@ -466,6 +495,84 @@ class TestRunTask:
         assert result.extracted_data["mode"] == "cooling"
 
 
+def _screen(label: str) -> dict:
+    return {
+        "screenshot_base64": None,
+        "xml": "<hierarchy/>",
+        "clickable_elements": [{"text": label, "center_x": 10, "center_y": 20, "clickable": True}],
+        "element_count": 1,
+    }
+
+
+class TestChangeDetection:
+    """Tests for screen settling and decision reuse."""
+
+    @pytest.mark.asyncio
+    async def test_reuses_wait_decision_while_screen_is_unchanged(self) -> None:
+        """A `wait` on an unchanged screen is repeated without calling the LLM."""
+        runner = AndroidPhoneRunner(model="test", api_key="test", step_delay=0, max_reused_decisions=2)
+        llm = AsyncMock(side_effect=[
+            (PhoneAction(action="wait", params={"seconds": 1}, reasoning="loading"), 100, 50),
+            (PhoneAction(action="done", done=True), 100, 50),
+        ])
+
+        with patch.object(runner, "_capture_screen_state", return_value=_screen("Loading")):
+            with patch.object(runner, "_call_llm", llm):
+                with patch.object(runner, "_execute_action", return_value=(True, None)) as execute:
+                    result = await runner.run_task("test task")
+
+        assert result.success is True
+        assert [s.reused_decision for s in result.steps] == [False, True, True, False]
+        assert [s.action.action for s in result.steps] == ["wait", "wait", "wait", "done"]
+        assert execute.await_count == 3
+        assert llm.await_count == 2
+        assert result.llm_calls == 2
+        assert result.llm_calls_avoided == 2
+        assert result.total_tokens_used == 300
+        assert result.metrics["llm_calls_avoided"] == 2
+
+    @pytest.mark.asyncio
+    async def test_changed_screen_or_unsafe_action_calls_llm(self) -> None:
+        """Taps are never repeated blindly, and a changed screen always gets a fresh decision."""
+        runner = AndroidPhoneRunner(
+            model="test", api_key="test", step_delay=0, settle_timeout=0, max_reused_decisions=1
+        )
+        screens = iter([_screen("A"), _screen("A"), _screen("B"), _screen("B"), _screen("B")])
+        llm = AsyncMock(side_effect=[
+            (PhoneAction(action="tap", params={"x": 10, "y": 20}), 10, 5),
+            (PhoneAction(action="wait", params={"seconds": 1}), 10, 5),
+            (PhoneAction(action="wait", params={"seconds": 1}), 10, 5),
+            (PhoneAction(action="done", done=True), 10, 5),
+        ])
+
+        with patch.object(runner, "_capture_screen_state", side_effect=lambda: next(screens)):
+            with patch.object(runner, "_call_llm", llm):
+                with patch.object(runner, "_execute_action", return_value=(True, None)):
+                    result = await runner.run_task("test task")
+
+        # A: tap -> A: taps aren't repeated -> B: changed -> B: reuse wait -> B: reuse limit hit
+        assert llm.await_count == 4
+        assert [s.reused_decision for s in result.steps] == [False, False, False, True, False]
+        assert result.llm_calls_avoided == 1
+
+    @pytest.mark.asyncio
+    async def test_waits_for_screen_to_settle_before_calling_llm(self) -> None:
+        """Captures repeat until two in a row match; the LLM sees the settled screen."""
+        runner = AndroidPhoneRunner(model="test", api_key="test", step_delay=0, settle_timeout=5)
+        captures = [_screen("Loading 1"), _screen("Loading 2"), _screen("Ready"), _screen("Ready")]
+        capture = AsyncMock(side_effect=captures)
+        llm = AsyncMock(return_value=(PhoneAction(action="done", done=True), 10, 5))
+
+        with patch.object(runner, "_capture_screen_state", capture):
+            with patch.object(runner, "_call_llm", llm):
+                result = await runner.run_task("test task")
+
+        assert result.success is True
+        assert capture.await_count == 4
+        assert llm.await_args.args[1] is captures[-1]
+        assert result.settle_wait_ms >= 0
+
+
 class TestBuildUserMessage:
     """Tests for user message building."""
 
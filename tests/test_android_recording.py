@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from services.android_client import PNG_SIGNATURE, ADBResult, AndroidClient
+from services.android_recording import AdbRecorder, AdbReplay, ReplayMismatch, load_recording
+
+SCREEN_XML = (
+    '<?xml version="1.0" encoding="UTF-8"?><hierarchy rotation="0">'
+    + "".join(
+        f'<node text="Item {i}" resource-id="com.example:id/item" class="android.widget.TextView" '
+        f'package="com.example" content-desc="" clickable="true" bounds="[0,{i * 100}][1080,{i * 100 + 100}]"/>'
+        for i in range(20)
+    )
+    + "</hierarchy>"
+)
+PNG = PNG_SIGNATURE + b"pixels" * 100
+
+
+def _recording_client(path: str, responses: dict[tuple[str, ...], ADBResult]) -> AndroidClient:
+    client = AndroidClient(serial="SERIAL1", persistent_shell=False, recorder=AdbRecorder(path, "SERIAL1"))
+
+    async def exec_adb(*args, timeout=None, binary=False):
+        return responses[args]
+
+    client._exec_adb = exec_adb
+    return client
+
+
+@pytest.mark.asyncio
+async def test_recorder_round_trips_commands_and_dedupes_blobs(tmp_path) -> None:
+    path = str(tmp_path / "rec.jsonl")
+    client = _recording_client(
+        path,
+        {
+            ("exec-out", "uiautomator", "dump", "/dev/tty"): ADBResult(success=True, output=SCREEN_XML, elapsed_ms=900),
+            ("exec-out", "screencap", "-p"): ADBResult(success=True, output="", data=PNG, elapsed_ms=350),
+            ("shell", "input", "tap", "1", "2"): ADBResult(success=False, output="", error="boom", elapsed_ms=5),
+        },
+    )
+
+    for _ in range(3):
+        await client.capture_screen()
+    await client.tap(1, 2)
+    client._recorder.close()
+
+    header, commands = load_recording(path)
+    assert header["serial"] == "SERIAL1"
+    assert len(commands) == 7
+    dump = next(c for c in commands if c.args[1] == "uiautomator")
+    assert dump.output == SCREEN_XML and dump.elapsed_ms == 900
+    shot = next(c for c in commands if c.args[1] == "screencap")
+    assert shot.binary and shot.data == PNG
+    assert commands[-1].args == ("shell", "input", "tap", "1", "2") and commands[-1].error == "boom"
+
+    # The XML and PNG are stored once however often they were captured
+    with open(path, encoding="utf-8") as f:
+        kinds = [json.loads(line)["kind"] for line in f]
+    assert kinds.count("blob") == 2
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+
+@pytest.mark.asyncio
+async def test_replay_serves_responses_in_order_then_repeats_the_last(tmp_path) -> None:
+    path = str(tmp_path / "rec.jsonl")
+    recorder = AdbRecorder(path, "SERIAL1")
+    for level in ("81", "80"):
+        recorder.record(("shell", "dumpsys", "battery"), ADBResult(success=True, output=f"level: {level}\n", elapsed_ms=40))
+    recorder.record(("shell", "input", "tap", "10", "20"), ADBResult(success=True, output=""))
+    recorder.record(("connect", "SERIAL1"), ADBResult(success=True, output="already connected"), global_cmd=True)
+    recorder.close()
+
+    client = AndroidClient(replay=AdbReplay.from_file(path, latency_scale=0))
+
+    assert client.device_serial == "SERIAL1"
+    assert [await client.get_battery_level() for _ in range(3)] == [81, 80, 80]
+    # Taps elsewhere on the screen fall back to the recorded tap
+    assert (await client.tap(500, 600)).success
+    assert (await client._run_adb_global("connect", "SERIAL1")).output == "already connected"
+    assert (await client._run_adb("shell", "getprop", "ro.build.date")).output == ""
+    assert client._replay.unmatched == [("shell", "getprop", "ro.build.date")]
+
+
+@pytest.mark.asyncio
+async def test_strict_replay_rejects_unrecorded_commands() -> None:
+    replay = AdbReplay([], strict=True)
+
+    with pytest.raises(ReplayMismatch):
+        await replay.run(("shell", "reboot"))
+
+
+@pytest.mark.asyncio
+async def test_get_screen_action_runs_against_a_replayed_device(tmp_path) -> None:
+    from actions.android_phone import get_screen_action
+
+    path = str(tmp_path / "rec.jsonl")
+    recorder = AdbRecorder(path, "SERIAL1")
+    recorder.record(("exec-out", "screencap", "-p"), ADBResult(success=True, output="", data=PNG), binary=True)
+    recorder.record(("exec-out", "uiautomator", "dump", "/dev/tty"), ADBResult(success=True, output=SCREEN_XML))
+    recorder.close()
+    client = AndroidClient(replay=AdbReplay.from_file(path, latency_scale=0))
+
+    with patch("actions.android_phone.get_android_client", return_value=client), patch(
+        "actions.android_phone.get_android_audit_logger"
+    ):
+        screen = await get_screen_action({})
+
+    assert screen["element_count"] == 20
+    assert screen["dominant_package"] == "com.example"
+    assert screen["clickable_elements"][0]["text"] == "Item 0"
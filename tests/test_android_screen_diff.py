@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import base64
+import random
+import struct
+import zlib
+
+from services.android_screen_diff import ScreenFingerprint, band_distance, png_band_hash
+
+WIDTH, HEIGHT = 40, 256
+
+
+def _png(pixels: list[bytearray]) -> bytes:
+    """Encode RGBA rows as a PNG, using the Up filter so rows depend on the row above."""
+    raw = bytearray()
+    previous = bytearray(len(pixels[0]))
+    for row in pixels:
+        raw.append(2)  # Up
+        raw.extend((a - b) & 0xFF for a, b in zip(row, previous))
+        previous = row
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", WIDTH, HEIGHT, 8, 6, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(bytes(raw)))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _screen(seed: int = 1) -> list[bytearray]:
+    rng = random.Random(seed)
+    return [bytearray(rng.randbytes(WIDTH * 4)) for _ in range(HEIGHT)]
+
+
+def _paint(rows: list[bytearray], top: int, bottom: int, value: int = 0) -> list[bytearray]:
+    painted = [bytearray(row) for row in rows]
+    for y in range(top, bottom):
+        painted[y][:] = bytes((value, value, value, 255)) * WIDTH
+    return painted
+
+
+def test_identical_frames_hash_identically() -> None:
+    assert png_band_hash(_png(_screen())) == png_band_hash(_png(_screen()))
+    assert len(png_band_hash(_png(_screen()))) == 64
+
+
+def test_small_change_only_touches_its_bands() -> None:
+    base = png_band_hash(_png(_screen()))
+    # An 8-row "clock" in the status bar
+    clock = png_band_hash(_png(_paint(_screen(), 0, 8)))
+    # A full-screen redraw
+    redrawn = png_band_hash(_png(_screen(seed=2)))
+
+    assert 1 <= band_distance(base, clock) <= 3
+    assert band_distance(base, redrawn) == 64
+
+
+def test_non_png_data_has_no_hash() -> None:
+    assert png_band_hash(b"error: device offline") is None
+    assert png_band_hash(b"\x89PNG\r\n\x1a\n" + b"\x00" * 8) is None
+
+
+def test_fingerprint_requires_same_structure_and_near_identical_image() -> None:
+    def b64(rows: list[bytearray]) -> str:
+        return base64.b64encode(_png(rows)).decode()
+
+    base = ScreenFingerprint.from_capture("sig", b64(_screen()))
+    assert base.image_hash is not None
+    assert base.matches(ScreenFingerprint.from_capture("sig", b64(_paint(_screen(), 0, 8))))
+    assert not base.matches(ScreenFingerprint.from_capture("sig", b64(_screen(seed=2))))
+    assert not base.matches(ScreenFingerprint.from_capture("other", b64(_screen())))
+    # Without screenshots only the structure is compared
+    assert ScreenFingerprint.from_capture("sig", None).matches(ScreenFingerprint("sig"))
+    assert not base.matches(ScreenFingerprint("sig"))
@@ -0,0 +1,109 @@
+"""
+Tests for the persistent ADB shell session.
+
+A local `sh` stands in for `adb shell`; the framing is the same.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import shutil
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from services.android_client import ADBResult, AndroidClient
+from services.android_shell import AdbShellSession, ShellSessionLost, ShellSessionUnavailable
+
+pytestmark = pytest.mark.skipif(shutil.which("sh") is None, reason="needs a POSIX shell")
+
+
+@pytest.fixture
+def session():
+    # Each test runs on its own loop; the shell exits with its stdin pipe.
+    return AdbShellSession(["sh"])
+
+
+class TestAdbShellSession:
+    """Tests for AdbShellSession."""
+
+    @pytest.mark.asyncio
+    async def test_commands_share_one_shell(self, session):
+        assert await session.run("echo hello", timeout=5) == (0, "hello\n")
+        assert await session.run("printf partial", timeout=5) == (0, "partial")
+        assert await session.run("echo oops >&2; (exit 3)", timeout=5) == (3, "oops\n")
+        # stdin is detached, so a command reading it can't eat the next command
+        assert await session.run("cat", timeout=5) == (0, "")
+
+        assert session.starts == 1
+        assert session.commands == 4
+
+    @pytest.mark.asyncio
+    async def test_shell_exiting_mid_command_is_reported_as_lost(self, session):
+        with pytest.raises(ShellSessionLost):
+            await session.run("exit 3", timeout=5)
+
+        assert await session.run("echo again", timeout=5) == (0, "again\n")
+        assert session.starts == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_commands_are_serialized(self, session):
+        results = await asyncio.gather(*(session.run(f"echo {i}", timeout=5) for i in range(10)))
+
+        assert [output for _, output in results] == [f"{i}\n" for i in range(10)]
+        assert session.starts == 1
+
+    @pytest.mark.asyncio
+    async def test_timeout_restarts_the_shell(self, session):
+        with pytest.raises(asyncio.TimeoutError):
+            await session.run("sleep 5", timeout=0.2)
+
+        assert not session.is_running
+        assert await session.run("echo back", timeout=5) == (0, "back\n")
+        assert session.starts == 2
+
+    @pytest.mark.asyncio
+    async def test_unreachable_shell_is_unavailable(self):
+        missing = AdbShellSession(["/nonexistent/adb", "shell"])
+        with pytest.raises(ShellSessionUnavailable):
+            await missing.run("echo hi", timeout=5)
+
+        dead = AdbShellSession(["false"])
+        with pytest.raises(ShellSessionUnavailable):
+            await dead.run("echo hi", timeout=5)
+        # Restart attempts back off instead of spawning on every command
+        with pytest.raises(ShellSessionUnavailable, match="recently failed"):
+            await dead.run("echo hi", timeout=5)
+
+
+class TestAndroidClientShellSession:
+    """AndroidClient routes `adb shell` commands through the session."""
+
+    @pytest.mark.asyncio
+    async def test_shell_commands_use_the_session(self):
+        client = AndroidClient(host="192.0.2.10", port=5555, persistent_shell=True)
+        client._shell = AdbShellSession(["sh"])
+        try:
+            assert await client.check_connection()
+            result = await client._run_adb("shell", "echo", "a", "b")
+            failed = await client._run_adb("shell", "ls", "/nonexistent-path")
+        finally:
+            await client._shell.close()
+
+        assert result.success and result.output == "a b\n"
+        assert not failed.success and "nonexistent-path" in failed.error
+        assert client._shell.starts == 1
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_one_shot_adb(self):
+        client = AndroidClient(host="192.0.2.10", port=5555, persistent_shell=True)
+        client._shell.run = AsyncMock(side_effect=ShellSessionUnavailable("offline"))
+
+        proc = AsyncMock()
+        proc.communicate.return_value = (b"ping\n", b"")
+        proc.returncode = 0
+        with patch("asyncio.create_subprocess_exec", AsyncMock(return_value=proc)) as spawn:
+            result = await client._run_adb("shell", "echo", "ping")
+
+        assert result == ADBResult(success=True, output="ping\n", elapsed_ms=result.elapsed_ms)
+        assert spawn.await_args.args == ("adb", "-s", "192.0.2.10:5555", "shell", "echo", "ping")
@@ -425,6 +425,171 @@ class TestErrorHandling:
         # No crash error set (the loop exited normally via _running=False)
         assert background_service._crash_error is None
 
+    @pytest.mark.asyncio
+    async def test_worker_loop_sleeps_on_wake_schedule_when_idle(
+        self, background_service, mock_storage
+    ):
+        """With nothing due the worker blocks on the wake schedule instead of polling."""
+        import asyncio as _asyncio
+
+        background_service._running = True
+        background_service._shutdown_event = _asyncio.Event()
+
+        mock_storage.list_due_jorbs = AsyncMock(return_value=[])
+        mock_storage.next_wake_at = MagicMock(return_value="2026-01-01T00:05:00+00:00")
+
+        async def mock_wait(max_seconds, exclude=frozenset()):
+            background_service._running = False
+
+        mock_storage.wait_for_due_jorbs = AsyncMock(side_effect=mock_wait)
+
+        mock_runner = MagicMock()
+        mock_runner.is_configured = True
+
+        with patch(
+            "services.background_loop.AgentRunner",
+            return_value=mock_runner,
+        ):
+            await background_service._worker_loop_inner()
+
+        assert mock_storage.list_due_jorbs.await_count == 1
+        mock_storage.wait_for_due_jorbs.assert_awaited_once()
+        assert background_service.get_status()["worker_next_wake_at"] == "2026-01-01T00:05:00+00:00"
+
+    @pytest.mark.asyncio
+    async def test_worker_loop_processes_due_jorbs_concurrently(
+        self, mock_storage, mock_email_service, mock_context_reset_service
+    ):
+        """Due jorbs run side by side, each at most once at a time, within the LLM limit."""
+        import asyncio as _asyncio
+
+        service = BackgroundLoopService(
+            storage=mock_storage,
+            email_service=mock_email_service,
+            context_reset_service=mock_context_reset_service,
+            worker_concurrency=2,
+            worker_poll_concurrency=2,
+        )
+        service._running = True
+        service._shutdown_event = _asyncio.Event()
+
+        jorbs = []
+        for index in range(3):
+            jorb = MagicMock()
+            jorb.id = f"jorb_{index}"
+            jorb.awaiting = None
+            jorbs.append(jorb)
+
+        release = _asyncio.Event()
+        active: list[str] = []
+        peak = 0
+        processed: list[str] = []
+
+        async def mock_process(jorb, event=None):
+            nonlocal peak
+            assert jorb.id not in active, "jorb processed twice at once"
+            active.append(jorb.id)
+            peak = max(peak, len(active))
+            await release.wait()
+            active.remove(jorb.id)
+            processed.append(jorb.id)
+
+        list_calls = 0
+
+        async def mock_list_due(limit=25):
+            nonlocal list_calls
+            list_calls += 1
+            if list_calls >= 3:
+                # Everything is in flight; the same jorbs are still "due".
+                release.set()
+            if list_calls >= 4:
+                service._running = False
+                return []
+            return list(jorbs)
+
+        mock_storage.list_due_jorbs = mock_list_due
+        mock_storage.update_jorb = AsyncMock()
+        mock_storage.next_wake_at = MagicMock(return_value=None)
+        mock_storage.wait_for_due_jorbs = AsyncMock()
+
+        mock_runner = MagicMock()
+        mock_runner.is_configured = True
+        mock_runner.process_jorb_event = AsyncMock(side_effect=mock_process)
+
+        with patch(
+            "services.background_loop.AgentRunner",
+            return_value=mock_runner,
+        ):
+            await _asyncio.wait_for(service._worker_loop_inner(), timeout=5)
+
+        assert sorted(processed) == ["jorb_0", "jorb_1", "jorb_2"]
+        assert peak == 2
+        assert mock_storage.update_jorb.await_count == 3
+        status = service.get_status()["worker_pool"]
+        assert status["dispatched"] == 3
+        assert status["skipped_busy"] >= 3
+        assert status["in_flight"] == []
+
+    @pytest.mark.asyncio
+    async def test_finished_task_llm_turn_runs_outside_poll_slot(
+        self, mock_storage, mock_email_service, mock_context_reset_service
+    ):
+        """A jorb whose awaited task finished gets its LLM turn after releasing the poll slot."""
+        import asyncio as _asyncio
+
+        service = BackgroundLoopService(
+            storage=mock_storage,
+            email_service=mock_email_service,
+            context_reset_service=mock_context_reset_service,
+            worker_concurrency=1,
+            worker_poll_concurrency=1,
+        )
+        service._running = True
+        service._shutdown_event = _asyncio.Event()
+
+        jorb = MagicMock()
+        jorb.id = "jorb_meta"
+        jorb.awaiting = "meta_task:job_1"
+        jorb.metadata = {}
+        refreshed = MagicMock()
+        refreshed.id = jorb.id
+        refreshed.awaiting = None
+
+        poll_slot_held: list[bool] = []
+
+        async def mock_process(jorb, event=None):
+            poll_slot_held.append(service._worker_pool.poll_slot().locked())
+            service._running = False
+
+        list_calls = 0
+
+        async def mock_list_due(limit=25):
+            nonlocal list_calls
+            list_calls += 1
+            return [jorb] if list_calls == 1 else []
+
+        mock_storage.list_due_jorbs = mock_list_due
+        mock_storage.update_jorb = AsyncMock()
+        mock_storage.add_script_result = AsyncMock()
+        mock_storage.get_jorb = AsyncMock(return_value=refreshed)
+        mock_storage.next_wake_at = MagicMock(return_value=None)
+        mock_storage.wait_for_due_jorbs = AsyncMock()
+
+        mock_runner = MagicMock()
+        mock_runner.is_configured = True
+        mock_runner.process_jorb_event = AsyncMock(side_effect=mock_process)
+
+        with (
+            patch("services.background_loop.AgentRunner", return_value=mock_runner),
+            patch("meta.jobs.get_job", return_value=None),
+            patch("meta.jobs.read_job_output", return_value={"size": 0, "text": ""}),
+        ):
+            await _asyncio.wait_for(service._worker_loop_inner(), timeout=5)
+
+        assert poll_slot_held == [False]
+        mock_runner.process_jorb_event.assert_awaited_once_with(refreshed, event=None)
+        mock_storage.update_jorb.assert_any_await(jorb.id, awaiting=None, wake_at=None)
+
     @pytest.mark.asyncio
     async def test_worker_loop_crash_sets_crash_error(
         self, background_service, caplog
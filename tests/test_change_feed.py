@@ -0,0 +1,118 @@
+"""
+Tests for the dashboard change feed and the storage layers that publish to it.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+
+from services.change_feed import RESYNC, SUBSCRIBER_QUEUE_SIZE, ChangeFeed, change_feed
+from services.jorb_storage import JorbMessage, JorbStorage
+
+
+async def test_subscribers_receive_events_and_idle_payloads_are_not_built() -> None:
+    feed = ChangeFeed()
+    built = []
+    feed.publish("job.updated", lambda: built.append(1) or {})
+    assert built == []
+
+    subscription, backlog = feed.subscribe()
+    feed.publish("job.updated", {"job": {"job_id": "j1", "status": "running"}})
+    thread = threading.Thread(target=feed.publish, args=("job.updated", {"job": {"job_id": "j1", "status": "completed"}}))
+    thread.start()
+    thread.join()
+
+    first = await subscription.get(1)
+    second = await subscription.get(1)
+    assert backlog == []
+    assert [first.data["job"]["status"], second.data["job"]["status"]] == ["running", "completed"]
+    assert second.seq == first.seq + 1
+    feed.unsubscribe(subscription)
+    assert not feed.active
+
+
+async def test_reconnect_replays_buffered_events_or_asks_for_resync() -> None:
+    feed = ChangeFeed(buffer_size=3)
+    subscription, _ = feed.subscribe()
+    for i in range(5):
+        feed.publish("jorb.updated", {"jorb": {"jorb_id": f"j{i}"}})
+    feed.unsubscribe(subscription)
+
+    _, backlog = feed.subscribe(f"{feed.epoch}-3")
+    assert [event.data["jorb"]["jorb_id"] for event in backlog] == ["j3", "j4"]
+    assert feed.subscribe(feed.last_id)[1] == []
+
+    # Fell out of the buffer, or a different server instance
+    assert [event.kind for event in feed.subscribe(f"{feed.epoch}-1")[1]] == [RESYNC]
+    assert [event.kind for event in feed.subscribe("0ldep0ch-4")[1]] == [RESYNC]
+
+
+async def test_events_published_with_nobody_listening_force_a_resync() -> None:
+    feed = ChangeFeed()
+    subscription, _ = feed.subscribe()
+    feed.publish("jorb.updated", {})
+    last_seen = (await subscription.get(1)).id
+    feed.unsubscribe(subscription)
+
+    feed.publish("jorb.updated", {})
+
+    assert [event.kind for event in feed.subscribe(last_seen)[1]] == [RESYNC]
+
+
+async def test_slow_subscriber_gets_a_single_resync() -> None:
+    feed = ChangeFeed()
+    subscription, _ = feed.subscribe()
+    for _ in range(SUBSCRIBER_QUEUE_SIZE + 5):
+        feed.publish("jorb.updated", {})
+
+    events = []
+    while (event := await subscription.get(0.01)) is not None:
+        events.append(event)
+
+    assert events[0].kind == RESYNC
+    assert len(events) < 10
+    assert subscription.dropped > SUBSCRIBER_QUEUE_SIZE
+
+
+async def test_stream_formats_server_sent_events() -> None:
+    feed = ChangeFeed()
+    stream = feed.stream(heartbeat_seconds=0.01)
+
+    assert await stream.__anext__() == "retry: 3000\n\n"
+    assert await stream.__anext__() == ": keep-alive\n\n"
+    feed.publish("job.updated", {"job": {"job_id": "j1"}})
+    frame = await stream.__anext__()
+    await stream.aclose()
+
+    lines = frame.strip().split("\n")
+    assert lines[0] == f"id: {feed.epoch}-1"
+    assert lines[1] == "event: job.updated"
+    assert json.loads(lines[2].removeprefix("data: ")) == {"job": {"job_id": "j1"}}
+    assert not feed.active
+
+
+async def test_jorb_storage_publishes_jorb_and_message_changes(tmp_path) -> None:
+    storage = JorbStorage(db_path=str(tmp_path / "jorbs.db"), write_behind_ms=0)
+    subscription, _ = change_feed.subscribe()
+    try:
+        jorb = await storage.create_jorb(name="Book dinner", plan="Find a table for two")
+        await storage.update_jorb(jorb.id, status="running", progress_summary="Calling")
+        await storage.add_message(
+            jorb.id,
+            JorbMessage(id="", jorb_id=jorb.id, timestamp="", direction="outbound", channel="sms", content="Hi"),
+        )
+
+        events = []
+        while (event := await subscription.get(0.05)) is not None:
+            events.append(event)
+    finally:
+        change_feed.unsubscribe(subscription)
+
+    assert [event.kind for event in events] == ["jorb.created", "jorb.updated", "jorb.message"]
+    assert events[0].data["jorb"]["status"] == "planning"
+    # Updates carry the same shape as list_jorbs entries
+    assert events[1].data["jorb"] == (await storage.get_jorb(jorb.id)).to_summary()
+    assert events[1].data["jorb"]["progress"] == "Calling"
+    assert events[2].data["jorb_id"] == jorb.id
+    assert events[2].data["message"]["content"] == "Hi"
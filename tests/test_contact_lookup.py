@@ -1,11 +1,14 @@
 """Unit tests for contact lookup service."""
 
+import json
 from unittest.mock import MagicMock
 
 import pytest
+from googleapiclient.errors import HttpError
 
 from services.contact_lookup import (
     Contact,
+    ContactDirectory,
     ContactLookup,
     _extract_digits,
     _normalize_phone,
@@ -350,6 +353,160 @@ class TestContactLookup:
         assert mock_service.list_contacts.call_count == 2
 
 
+def _person(resource_name: str, name: str, *phones: str, deleted: bool = False) -> dict:
+    person = {
+        "resourceName": resource_name,
+        "names": [{"displayName": name}],
+        "phoneNumbers": [{"value": phone} for phone in phones],
+    }
+    if deleted:
+        person["metadata"] = {"deleted": True}
+    return person
+
+
+def _expired_sync_token_error() -> HttpError:
+    """What people.connections.list returns for a sync token older than 7 days."""
+    content = json.dumps({
+        "error": {
+            "code": 400,
+            "message": "Sync token is expired. Clear local cache and retry call without the sync token.",
+            "status": "FAILED_PRECONDITION",
+            "details": [
+                {
+                    "@type": "type.googleapis.com/google.rpc.ErrorInfo",
+                    "reason": "EXPIRED_SYNC_TOKEN",
+                    "domain": "people.googleapis.com",
+                }
+            ],
+        }
+    }).encode()
+    return HttpError(MagicMock(status=400, reason="Bad Request"), content)
+
+class TestContactDirectory:
+    """Tests for the shared phone-number index."""
+
+    def test_indexes_us_variants_both_ways(self):
+        """10- and 11-digit forms of a US number find the same contact."""
+        mock_service = MagicMock()
+        mock_service.list_contacts.return_value = {
+            "connections": [
+                _person("people/c1", "Mom", "(555) 123-4567"),
+                _person("people/c2", "Dad", "+1 555 999 0000"),
+            ],
+            "nextPageToken": None,
+        }
+        directory = ContactDirectory(mock_service)
+
+        assert directory.lookup("+15551234567").name == "Mom"
+        assert directory.lookup("5559990000").name == "Dad"
+        assert directory.lookup("+44 5551234567") is None
+        assert mock_service.list_contacts.call_count == 1
+
+    def test_incremental_sync_applies_changes_and_deletions(self):
+        """A sync token fetches only changes; deleted contacts drop out."""
+        mock_service = MagicMock()
+        mock_service.list_contacts.side_effect = [
+            {
+                "connections": [
+                    _person("people/c1", "Mom", "+15551234567"),
+                    _person("people/c2", "Dad", "+15559990000"),
+                ],
+                "nextPageToken": None,
+                "nextSyncToken": "sync-1",
+            },
+            {
+                "connections": [
+                    _person("people/c1", "Mother", "+15551234567", "+15550001111"),
+                    _person("people/c2", "", deleted=True),
+                ],
+                "nextPageToken": None,
+                "nextSyncToken": "sync-2",
+            },
+        ]
+        directory = ContactDirectory(mock_service)
+        directory.refresh()
+        directory.refresh()
+
+        second_call = mock_service.list_contacts.call_args_list[1].kwargs
+        assert second_call["sync_token"] == "sync-1"
+        assert directory.lookup("+15551234567").name == "Mother"
+        assert directory.lookup("+15550001111").name == "Mother"
+        assert directory.lookup("+15559990000") is None
+        assert directory.status()["incremental"] is True
+
+    def test_expired_sync_token_falls_back_to_full_sync(self):
+        """The People API's 400 EXPIRED_SYNC_TOKEN triggers a full resync."""
+        mock_service = MagicMock()
+        mock_service.list_contacts.side_effect = [
+            {
+                "connections": [_person("people/c1", "Mom", "+15551234567")],
+                "nextSyncToken": "sync-1",
+            },
+            _expired_sync_token_error(),
+            {
+                "connections": [_person("people/c2", "Dad", "+15559990000")],
+                "nextSyncToken": "sync-2",
+            },
+        ]
+        directory = ContactDirectory(mock_service)
+        directory.refresh()
+        directory.refresh()
+
+        assert mock_service.list_contacts.call_args_list[2].kwargs["sync_token"] is None
+        assert directory.lookup("+15551234567") is None
+        assert directory.lookup("+15559990000").name == "Dad"
+
+    def test_failed_resync_does_not_keep_the_expired_token(self):
+        """If the full resync also fails, the next refresh still starts from scratch."""
+        mock_service = MagicMock()
+        mock_service.list_contacts.side_effect = [
+            {
+                "connections": [_person("people/c1", "Mom", "+15551234567")],
+                "nextSyncToken": "sync-1",
+            },
+            _expired_sync_token_error(),
+            RuntimeError("network down"),
+            {
+                "connections": [_person("people/c1", "Mom", "+15551234567")],
+                "nextSyncToken": "sync-2",
+            },
+        ]
+        directory = ContactDirectory(mock_service)
+        directory.refresh()
+        directory.refresh()
+        directory.refresh()
+
+        assert mock_service.list_contacts.call_args_list[3].kwargs["sync_token"] is None
+        assert directory.status()["incremental"] is True
+
+    def test_snapshot_serves_cold_start_without_network(self, tmp_path):
+        """A saved snapshot answers lookups before any call to Google."""
+        snapshot = tmp_path / "contacts_index.json"
+        first_service = MagicMock()
+        first_service.list_contacts.return_value = {
+            "connections": [_person("people/c1", "Mom", "+15551234567")],
+            "nextSyncToken": "sync-1",
+        }
+        ContactDirectory(first_service, snapshot_path=snapshot).refresh()
+        assert json.loads(snapshot.read_text())["sync_token"] == "sync-1"
+
+        cold_service = MagicMock()
+        directory = ContactDirectory(cold_service, snapshot_path=snapshot)
+
+        assert directory.lookup("5551234567").name == "Mom"
+        cold_service.list_contacts.assert_not_called()
+
+        cold_service.list_contacts.return_value = {"connections": [], "nextSyncToken": "sync-2"}
+        directory.refresh()
+        assert cold_service.list_contacts.call_args.kwargs["sync_token"] == "sync-1"
+
+    def test_lookups_share_the_process_directory(self, monkeypatch, tmp_path):
+        """ContactLookup instances without a service share one directory."""
+        monkeypatch.setenv("DATA_DIR", str(tmp_path))
+
+        assert ContactLookup()._directory is ContactLookup()._directory
+
+
 class TestContact:
     """Tests for Contact dataclass."""
 
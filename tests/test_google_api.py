@@ -0,0 +1,109 @@
+"""
+Tests for the shared Google API credentials, discovery cache and services.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from google.oauth2.credentials import Credentials
+
+import services.google_api as google_api
+import services.google_contacts as google_contacts
+from services.contact_lookup import ContactLookup
+from services.google_api import GoogleApiClient, get_credentials
+
+SCOPES = ("https://www.googleapis.com/auth/contacts",)
+
+
+def _write_token(path, *, expires_in: float, refresh_token: str = "refresh") -> str:
+    expiry = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
+    data = {
+        "token": "access",
+        "client_id": "client",
+        "client_secret": "secret",
+        "refresh_token": refresh_token,
+        "scopes": list(SCOPES),
+        "expiry": expiry.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+def _fake_refresh(creds: Credentials, request) -> None:
+    creds.token = "refreshed"
+    creds.expiry = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=1)
+
+
+@pytest.fixture(autouse=True)
+def fresh_google_state(tmp_path, monkeypatch):
+    google_api.reset_google_api_state()
+    token_file = _write_token(tmp_path / "token.json", expires_in=3600)
+    monkeypatch.setattr(google_api, "get_settings", lambda: SimpleNamespace(google_token_file=token_file))
+    yield token_file
+    google_api.reset_google_api_state()
+
+
+def test_credentials_are_loaded_once_and_reloaded_when_the_file_changes(fresh_google_state) -> None:
+    first = get_credentials(SCOPES)
+    assert get_credentials(list(SCOPES)) is first
+
+    os.utime(fresh_google_state, (0, 0))
+    assert get_credentials(SCOPES) is not first
+
+
+def test_credentials_are_refreshed_once_before_they_expire(tmp_path) -> None:
+    token_file = _write_token(tmp_path / "soon.json", expires_in=60)
+
+    with patch.object(Credentials, "refresh", autospec=True, side_effect=_fake_refresh) as refresh:
+        threads = [threading.Thread(target=get_credentials, args=(SCOPES,), kwargs={"token_file": token_file}) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        creds = get_credentials(SCOPES, token_file=token_file)
+
+    assert refresh.call_count == 1
+    assert creds.token == "refreshed"
+
+
+def test_unusable_credentials_raise(tmp_path) -> None:
+    with pytest.raises(FileNotFoundError):
+        get_credentials(SCOPES, token_file=str(tmp_path / "missing.json"))
+
+    expired = _write_token(tmp_path / "expired.json", expires_in=-60, refresh_token="")
+    with pytest.raises(RuntimeError, match="Invalid Google Contacts credentials"):
+        get_credentials(SCOPES, token_file=expired, label="Google Contacts")
+
+
+def test_services_are_thread_local_and_share_one_discovery_document() -> None:
+    client = GoogleApiClient("people", "v1", SCOPES)
+    real_get_static_doc = google_api.discovery_cache.get_static_doc
+
+    with patch.object(google_api.discovery_cache, "get_static_doc", side_effect=real_get_static_doc) as get_doc:
+        main = client.service()
+        assert client.service() is main
+        other = []
+        thread = threading.Thread(target=lambda: other.append(client.service()))
+        thread.start()
+        thread.join()
+
+    assert other[0] is not main
+    assert get_doc.call_count == 1
+    assert hasattr(main, "people")
+
+
+def test_contact_lookup_uses_the_shared_contacts_service(monkeypatch) -> None:
+    monkeypatch.setattr(google_contacts, "_contacts_service", None)
+    monkeypatch.setattr(google_contacts, "get_settings", lambda: SimpleNamespace(google_contacts_scopes=SCOPES))
+
+    shared = google_contacts.get_contacts_service()
+
+    assert google_contacts.get_contacts_service() is shared
+    assert ContactLookup()._get_service() is shared
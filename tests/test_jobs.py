@@ -9,6 +9,7 @@ import pytest
 
 from meta.jobs import (
     Job,
+    JobOutputWriter,
     JobStatus,
     create_job,
     generate_job_filename,
@@ -16,6 +17,7 @@ from meta.jobs import (
     get_job,
     job_to_summary_dict,
     list_jobs,
+    read_job_output,
     update_job,
 )
 
@@ -462,3 +464,32 @@ class TestJobToSummaryDict:
         assert "stderr" not in summary
         assert "result" not in summary
         assert "params" not in summary
+
+
+class TestJobOutput:
+    """Tests for streamed sidecar output logs."""
+
+    def test_writer_appends_and_reader_tails(self, tmp_path):
+        """Output written while running can be tailed and followed by offset."""
+        job_id = "2024-01-15T10-30-00Z-test-run"
+
+        with JobOutputWriter(job_id, tmp_path) as output:
+            output.write("stdout", "line 1\n")
+            output.write("stderr", "warn\n")
+            first = read_job_output(job_id, "stdout", jobs_dir=tmp_path)
+            output.write("stdout", "line 2\n")
+
+        assert first == {"text": "line 1\n", "offset": 0, "next_offset": 7, "size": 7}
+        follow = read_job_output(job_id, "stdout", offset=first["next_offset"], jobs_dir=tmp_path)
+        assert follow["text"] == "line 2\n"
+        assert read_job_output(job_id, "stdout", max_bytes=3, jobs_dir=tmp_path)["text"] == " 2\n"
+        assert read_job_output(job_id, "stderr", jobs_dir=tmp_path)["text"] == "warn\n"
+        # Sidecar logs don't show up as jobs
+        assert list_jobs(tmp_path) == []
+
+    def test_missing_output_and_invalid_stream(self, tmp_path):
+        """Missing logs read as empty; unknown streams are rejected."""
+        assert read_job_output("missing", jobs_dir=tmp_path)["size"] == 0
+
+        with pytest.raises(ValueError, match="Invalid stream"):
+            read_job_output("missing", "stdin", jobs_dir=tmp_path)
@@ -0,0 +1,99 @@
+"""
+Tests for the wake-time scheduler that drives the background worker.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+from services.jorb_scheduler import JorbWakeScheduler
+from services.jorb_storage import JorbStorage
+
+
+def _iso(seconds_from_now: float) -> str:
+    return (datetime.now(timezone.utc) + timedelta(seconds=seconds_from_now)).isoformat()
+
+
+class TestJorbWakeScheduler:
+    """Tests for JorbWakeScheduler."""
+
+    def test_due_returns_earliest_first_without_unscheduling(self):
+        scheduler = JorbWakeScheduler()
+        scheduler.update("jorb_b", "running", "2026-01-01T00:00:02+00:00")
+        scheduler.update("jorb_a", "running", "2026-01-01T00:00:01+00:00")
+        scheduler.update("jorb_c", "running", "2099-01-01T00:00:00+00:00")
+
+        now = "2026-06-01T00:00:00+00:00"
+        assert scheduler.due(now, limit=10) == ["jorb_a", "jorb_b"]
+        assert scheduler.due(now, limit=1) == ["jorb_a"]
+        assert scheduler.next_wake_at() == "2026-01-01T00:00:01+00:00"
+
+    def test_rescheduling_and_status_changes_supersede_old_entries(self):
+        scheduler = JorbWakeScheduler()
+        scheduler.update("jorb_a", "running", "2026-01-01T00:00:01+00:00")
+        scheduler.update("jorb_a", "running", "2099-01-01T00:00:00+00:00")
+        scheduler.update("jorb_b", "running", "2026-01-01T00:00:02+00:00")
+        scheduler.update("jorb_b", "paused", "2026-01-01T00:00:02+00:00")
+
+        assert scheduler.due("2026-06-01T00:00:00+00:00", limit=10) == []
+        assert scheduler.next_wake_at() == "2099-01-01T00:00:00+00:00"
+        assert len(scheduler) == 1
+
+    async def test_wait_returns_when_earlier_wake_is_scheduled(self):
+        scheduler = JorbWakeScheduler()
+        scheduler.update("jorb_later", "running", _iso(30))
+
+        waiter = asyncio.create_task(scheduler.wait(max_seconds=30))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        scheduler.update("jorb_now", "running", _iso(0))
+        await asyncio.wait_for(waiter, timeout=1)
+
+    async def test_wait_sleeps_until_next_wake(self):
+        scheduler = JorbWakeScheduler()
+        scheduler.update("jorb_soon", "running", _iso(0.05))
+
+        started = time.monotonic()
+        await scheduler.wait(max_seconds=5)
+        elapsed = time.monotonic() - started
+
+        assert 0.03 <= elapsed < 1
+
+    async def test_wait_ignores_excluded_jorbs(self):
+        scheduler = JorbWakeScheduler()
+        scheduler.update("jorb_busy", "running", _iso(-1))
+        scheduler.update("jorb_soon", "running", _iso(0.05))
+
+        assert scheduler.next_wake_excluding({"jorb_busy"}) == scheduler._scheduled["jorb_soon"]
+        started = time.monotonic()
+        await scheduler.wait(max_seconds=5, exclude={"jorb_busy"})
+        elapsed = time.monotonic() - started
+
+        assert 0.03 <= elapsed < 1
+        assert scheduler.next_wake_at() == scheduler._scheduled["jorb_busy"]
+
+
+class TestStorageWakeScheduling:
+    """update_jorb(wake_at=...) feeds the scheduler used by list_due_jorbs."""
+
+    async def test_update_jorb_wakes_waiting_worker(self, tmp_path):
+        storage = JorbStorage(db_path=str(tmp_path / "jorbs"))
+        jorb = await storage.create_jorb(name="Wake", plan="Plan")
+        await storage.update_jorb(jorb.id, status="running")
+
+        waiter = asyncio.create_task(storage.wait_for_due_jorbs(max_seconds=30))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        started = time.monotonic()
+        await storage.update_jorb(jorb.id, wake_at=_iso(0))
+        await asyncio.wait_for(waiter, timeout=1)
+
+        assert time.monotonic() - started < 0.5
+        assert [j.id for j in await storage.list_due_jorbs()] == [jorb.id]
+        assert storage.next_wake_at() is not None
+
+        await storage.update_jorb(jorb.id, wake_at=None)
+        assert await storage.list_due_jorbs() == []
+        assert storage.next_wake_at() is None
@@ -2,19 +2,24 @@
 Unit tests for JorbStorage service.
 """
 
+import asyncio
 import os
 import tempfile
 from datetime import datetime, timezone
 
 import pytest
 
+import services.jorb_catalog as jorb_catalog
+from services.file_store import read_json_file, write_json_atomic
 from services.jorb_storage import (
+    STORE_SCHEMA_VERSION,
     Jorb,
     JorbCheckpoint,
     JorbContact,
     JorbMessage,
     JorbStorage,
     JorbWithMessages,
+    _jorb_to_payload,
 )
 
 
@@ -756,3 +761,314 @@ class TestScriptResults:
         assert results[0]["result"]["users"][0]["name"] == "Alice"
         assert results[0]["result"]["count"] == 2
         assert results[0]["result"]["nested"]["deep"]["value"] == "data"
+
+
+class TestJorbCatalog:
+    """Tests for the in-memory jorb header catalog."""
+
+    async def test_catalog_shared_across_instances(self, temp_db_path):
+        """A second storage instance on the same directory sees writes immediately."""
+        first = JorbStorage(db_path=temp_db_path)
+        second = JorbStorage(db_path=temp_db_path)
+
+        jorb = await first.create_jorb(name="Shared", plan="Plan")
+        await first.update_jorb(jorb.id, status="running")
+
+        listed = await second.list_jorbs(status_filter="open")
+        assert [j.id for j in listed] == [jorb.id]
+        assert listed[0].status == "running"
+
+    async def test_list_jorbs_does_not_reread_files(self, storage, monkeypatch):
+        """Once the catalog is warm, listing does not open jorb records."""
+        jorb = await storage.create_jorb(name="Warm", plan="Plan")
+        await storage.list_jorbs()
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("catalog should not touch disk")
+
+        monkeypatch.setattr(jorb_catalog, "read_json_file", _fail)
+        jorbs = await storage.list_jorbs(status_filter="all")
+        assert [j.id for j in jorbs] == [jorb.id]
+
+    async def test_external_write_triggers_rebuild(self, storage):
+        """Records written by another process are picked up on the next read."""
+        jorb = await storage.create_jorb(name="Local", plan="Plan")
+        await storage.list_jorbs()
+
+        external = Jorb(id="jorb_external", name="External", status="running", original_plan="Plan")
+        write_json_atomic(
+            storage._jorb_path(external.id),
+            {
+                "schema_version": STORE_SCHEMA_VERSION,
+                "jorb": _jorb_to_payload(external),
+                "messages": [],
+                "checkpoints": [],
+            },
+        )
+
+        ids = {j.id for j in await storage.list_jorbs(status_filter="all")}
+        assert ids == {jorb.id, "jorb_external"}
+
+    async def test_list_due_jorbs_uses_wake_at(self, storage):
+        """Only running jorbs with a past wake_at are due, oldest first."""
+        later = await storage.create_jorb(name="Later", plan="Plan")
+        sooner = await storage.create_jorb(name="Sooner", plan="Plan")
+        future = await storage.create_jorb(name="Future", plan="Plan")
+        paused = await storage.create_jorb(name="Paused", plan="Plan")
+
+        await storage.update_jorb(later.id, status="running", wake_at="2026-01-01T00:00:02+00:00")
+        await storage.update_jorb(sooner.id, status="running", wake_at="2026-01-01T00:00:01+00:00")
+        await storage.update_jorb(future.id, status="running", wake_at="2099-01-01T00:00:00+00:00")
+        await storage.update_jorb(paused.id, status="paused", wake_at="2026-01-01T00:00:00+00:00")
+
+        due = await storage.list_due_jorbs(now_iso="2026-06-01T00:00:00+00:00")
+        assert [j.id for j in due] == [sooner.id, later.id]
+
+    async def test_aggregate_metrics_track_updates(self, storage):
+        """Running totals follow status changes and metric increments."""
+        first = await storage.create_jorb(name="First", plan="Plan")
+        second = await storage.create_jorb(name="Second", plan="Plan")
+        await storage.increment_metrics(first.id, messages_in=2, tokens_used=100, estimated_cost=0.5)
+        await storage.increment_metrics(second.id, messages_out=3, tokens_used=50)
+        await storage.update_jorb(second.id, status="complete")
+
+        all_metrics = await storage.get_aggregate_metrics(status_filter="all")
+        assert all_metrics["total_jorbs"] == 2
+        assert all_metrics["total_messages"] == 5
+        assert all_metrics["total_tokens"] == 150
+        assert all_metrics["total_cost"] == 0.5
+        assert all_metrics["by_status"]["planning"] == 1
+        assert all_metrics["by_status"]["complete"] == 1
+
+        open_metrics = await storage.get_aggregate_metrics(status_filter="open")
+        assert open_metrics["total_jorbs"] == 1
+        assert open_metrics["total_tokens"] == 100
+        assert open_metrics["by_status"]["complete"] == 0
+
+
+class TestJorbMessageLogs:
+    """Tests for the append-only message, checkpoint and script result logs."""
+
+    async def _add(self, storage, jorb_id, content, timestamp=None):
+        await storage.add_message(
+            jorb_id,
+            JorbMessage(
+                id="",
+                jorb_id=jorb_id,
+                timestamp=timestamp or datetime.now(timezone.utc).isoformat(),
+                direction="inbound",
+                channel="sms",
+                content=content,
+            ),
+        )
+
+    async def test_add_message_appends_without_rewriting_header(self, storage):
+        """Messages go to the JSONL log; the header record stays small."""
+        jorb = await storage.create_jorb(name="Test", plan="Plan")
+        header_before = storage._jorb_path(jorb.id).read_text()
+
+        await self._add(storage, jorb.id, "hello")
+
+        assert storage._jorb_path(jorb.id).read_text() == header_before
+        log_lines = storage._log_path(jorb.id, "messages").read_text().splitlines()
+        assert len(log_lines) == 1
+        assert "hello" in log_lines[0]
+
+    async def test_get_messages_returns_most_recent_tail(self, storage):
+        """A limit returns the newest messages in chronological order."""
+        jorb = await storage.create_jorb(name="Test", plan="Plan")
+        for i in range(10):
+            await self._add(storage, jorb.id, f"Message {i}", f"2026-01-30T10:{i:02d}:00Z")
+
+        messages = await storage.get_messages(jorb.id, limit=3)
+
+        assert [m.content for m in messages] == ["Message 7", "Message 8", "Message 9"]
+
+    async def test_get_message_page_counts_from_oldest(self, storage):
+        """Pages are offset from the start of the conversation."""
+        jorb = await storage.create_jorb(name="Test", plan="Plan")
+        for i in range(10):
+            await self._add(storage, jorb.id, f"Message {i}", f"2026-01-30T10:{i:02d}:00Z")
+
+        page = await storage.get_message_page(jorb.id, offset=4, limit=2)
+
+        assert [m.content for m in page] == ["Message 4", "Message 5"]
+
+    async def test_torn_trailing_line_is_skipped_and_repaired(self, storage):
+        """A partial line left by a crash does not break reads or later appends."""
+        jorb = await storage.create_jorb(name="Test", plan="Plan")
+        await self._add(storage, jorb.id, "before crash")
+        with storage._log_path(jorb.id, "messages").open("a", encoding="utf-8") as handle:
+            handle.write('{"id": "msg_torn", "content": "hal')
+
+        await self._add(storage, jorb.id, "after crash")
+
+        messages = await storage.get_messages(jorb.id)
+        assert [m.content for m in messages] == ["before crash", "after crash"]
+
+    async def test_legacy_single_file_record_is_migrated(self, storage):
+        """Inline history from schema v2 records moves into logs on first access."""
+        legacy = Jorb(id="jorb_legacy1", name="Legacy", status="running", original_plan="Plan")
+        header = _jorb_to_payload(legacy)
+        header["script_results"] = [
+            {"script": "old.py", "result": "ok", "success": True, "timestamp": "2026-01-01T00:00:00+00:00"}
+        ]
+        write_json_atomic(
+            storage._jorb_path(legacy.id),
+            {
+                "schema_version": 2,
+                "jorb": header,
+                "messages": [
+                    {
+                        "id": "msg_old",
+                        "jorb_id": legacy.id,
+                        "timestamp": "2026-01-01T00:00:00+00:00",
+                        "direction": "inbound",
+                        "channel": "sms",
+                        "content": "legacy hello",
+                    }
+                ],
+                "checkpoints": [
+                    {
+                        "id": "ckpt_old",
+                        "jorb_id": legacy.id,
+                        "timestamp": "2026-01-01T00:00:00+00:00",
+                        "summary": "legacy checkpoint",
+                    }
+                ],
+            },
+        )
+
+        messages = await storage.get_messages(legacy.id)
+        await self._add(storage, legacy.id, "new hello")
+
+        assert [m.content for m in messages] == ["legacy hello"]
+        assert [m.content for m in await storage.get_messages(legacy.id)] == [
+            "legacy hello",
+            "new hello",
+        ]
+        assert [c.summary for c in await storage.get_checkpoints(legacy.id)] == ["legacy checkpoint"]
+        jorb = await storage.get_jorb(legacy.id)
+        assert [r["script"] for r in jorb.script_results] == ["old.py"]
+
+        record = storage._jorb_path(legacy.id).read_text()
+        assert "legacy hello" not in record
+        assert f'"schema_version": {STORE_SCHEMA_VERSION}' in record
+
+    async def test_update_jorb_replaces_script_results_log(self, storage):
+        """Passing script_results to update_jorb rewrites the whole log."""
+        jorb = await storage.create_jorb(name="Test", plan="Plan")
+        await storage.add_script_result(jorb.id, {"script": "a.py", "result": 1, "success": True})
+
+        await storage.update_jorb(
+            jorb.id,
+            script_results=[{"script": "b.py", "result": 2, "success": True}],
+        )
+
+        refreshed = await storage.get_jorb(jorb.id)
+        assert [r["script"] for r in refreshed.script_results] == ["b.py"]
+
+
+class TestJorbWriteBehind:
+    """Tests for per-jorb locking and coalesced header writes."""
+
+    @pytest.fixture
+    def buffered_storage(self, tmp_path):
+        return JorbStorage(db_path=str(tmp_path / "jorbs"), write_behind_ms=10_000, fsync=False)
+
+    async def test_back_to_back_updates_coalesce_into_one_write(self, buffered_storage, monkeypatch):
+        """Several update_jorb calls for one jorb produce a single file write."""
+        jorb = await buffered_storage.create_jorb(name="Burst", plan="Plan")
+        writes: list[str] = []
+        original_write = buffered_storage._write_record
+
+        async def _counting_write(jorb_id, payload):
+            writes.append(jorb_id)
+            await original_write(jorb_id, payload)
+
+        monkeypatch.setattr(buffered_storage, "_write_record", _counting_write)
+
+        await buffered_storage.update_jorb(jorb.id, status="running")
+        await buffered_storage.update_jorb(jorb.id, wake_at="2026-01-01T00:00:00+00:00")
+        await buffered_storage.increment_metrics(jorb.id, tokens_used=10)
+        assert writes == []
+
+        # Reads and listings see the buffered state before it reaches disk.
+        current = await buffered_storage.get_jorb(jorb.id)
+        assert current.status == "running"
+        assert current.tokens_used == 10
+        assert [j.id for j in await buffered_storage.list_due_jorbs()] == [jorb.id]
+
+        assert await buffered_storage.flush() == 1
+        assert writes == [jorb.id]
+
+    async def test_flush_all_persists_buffered_headers(self, buffered_storage, tmp_path):
+        """After flush_all a fresh process would read the final state from disk."""
+        jorb = await buffered_storage.create_jorb(name="Durable", plan="Plan")
+        await buffered_storage.update_jorb(jorb.id, status="paused", paused_reason="waiting")
+
+        await JorbStorage.flush_all()
+
+        on_disk = read_json_file(buffered_storage._jorb_path(jorb.id))
+        assert on_disk["jorb"]["status"] == "paused"
+        assert on_disk["jorb"]["paused_reason"] == "waiting"
+
+    async def test_reads_see_buffered_header_while_it_flushes(self, buffered_storage, monkeypatch):
+        """An in-progress flush never exposes the older record on disk."""
+        jorb = await buffered_storage.create_jorb(name="Flushing", plan="Plan")
+        await buffered_storage.update_jorb(jorb.id, status="running")
+
+        release = asyncio.Event()
+        original_write_in_store = buffered_storage._write_in_store
+
+        async def _stalled_write(func, header=None):
+            await release.wait()
+            await original_write_in_store(func, header)
+
+        monkeypatch.setattr(buffered_storage, "_write_in_store", _stalled_write)
+        flush = asyncio.create_task(buffered_storage.flush())
+        await asyncio.sleep(0.01)
+
+        assert not flush.done()
+        assert (await buffered_storage.get_jorb(jorb.id)).status == "running"
+
+        release.set()
+        assert await flush == 1
+        assert read_json_file(buffered_storage._jorb_path(jorb.id))["jorb"]["status"] == "running"
+        assert len(buffered_storage._write_buffer) == 0
+
+    async def test_write_through_when_window_is_zero(self, tmp_path):
+        """write_behind_ms=0 keeps every update synchronous."""
+        storage = JorbStorage(db_path=str(tmp_path / "sync_jorbs"), write_behind_ms=0, fsync=True)
+        jorb = await storage.create_jorb(name="Sync", plan="Plan")
+        await storage.update_jorb(jorb.id, status="running")
+
+        on_disk = read_json_file(storage._jorb_path(jorb.id))
+        assert on_disk["jorb"]["status"] == "running"
+
+    async def test_slow_write_does_not_block_other_jorbs(self, tmp_path, monkeypatch):
+        """A stalled write for one jorb leaves other jorbs free to update."""
+        storage = JorbStorage(db_path=str(tmp_path / "striped"), write_behind_ms=0, fsync=False)
+        slow = await storage.create_jorb(name="Slow", plan="Plan")
+        fast = await storage.create_jorb(name="Fast", plan="Plan")
+        while storage._jorb_lock(fast.id) is storage._jorb_lock(slow.id):
+            fast = await storage.create_jorb(name="Fast", plan="Plan")
+
+        release = asyncio.Event()
+        original_write = storage._write_record
+
+        async def _maybe_stall(jorb_id, payload):
+            if jorb_id == slow.id:
+                await release.wait()
+            await original_write(jorb_id, payload)
+
+        monkeypatch.setattr(storage, "_write_record", _maybe_stall)
+
+        slow_update = asyncio.create_task(storage.update_jorb(slow.id, status="running"))
+        await asyncio.sleep(0)
+        updated = await asyncio.wait_for(storage.update_jorb(fast.id, status="running"), timeout=1)
+        assert updated.status == "running"
+        assert not slow_update.done()
+
+        release.set()
+        assert (await slow_update).status == "running"
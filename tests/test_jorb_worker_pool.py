@@ -0,0 +1,80 @@
+"""
+Tests for the bounded worker pool used by the background loop.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from services.jorb_worker_pool import JorbWorkerPool, worker_concurrency_from_env
+
+
+def _jorb(jorb_id: str) -> SimpleNamespace:
+    return SimpleNamespace(id=jorb_id)
+
+
+class TestJorbWorkerPool:
+    """Tests for JorbWorkerPool."""
+
+    async def test_select_skips_in_flight_jorbs(self):
+        pool = JorbWorkerPool(llm_concurrency=2, poll_concurrency=2)
+        release = asyncio.Event()
+        pool.dispatch("jorb_a", release.wait)
+
+        selected = pool.select([_jorb("jorb_a"), _jorb("jorb_b")])
+
+        assert [jorb.id for jorb in selected] == ["jorb_b"]
+        assert pool.skipped_busy == 1
+        with pytest.raises(RuntimeError):
+            pool.dispatch("jorb_a", release.wait)
+
+        release.set()
+        await pool.drain()
+        assert len(pool) == 0
+
+    async def test_select_prefers_least_recently_served(self):
+        pool = JorbWorkerPool(llm_concurrency=1, poll_concurrency=1)
+        for jorb_id in ("jorb_chatty", "jorb_quiet"):
+            pool.dispatch(jorb_id, lambda: asyncio.sleep(0))
+        await pool.drain()
+        pool.dispatch("jorb_chatty", lambda: asyncio.sleep(0))
+        await pool.drain()
+
+        due = [_jorb("jorb_chatty"), _jorb("jorb_quiet"), _jorb("jorb_new")]
+        assert [jorb.id for jorb in pool.select(due)] == ["jorb_new", "jorb_quiet"]
+
+    async def test_select_respects_capacity(self):
+        pool = JorbWorkerPool(llm_concurrency=1, poll_concurrency=1)
+        release = asyncio.Event()
+        pool.dispatch("jorb_a", release.wait)
+
+        selected = pool.select([_jorb("jorb_b"), _jorb("jorb_c")])
+
+        assert [jorb.id for jorb in selected] == ["jorb_b"]
+        pool.dispatch("jorb_b", release.wait)
+        assert pool.select([_jorb("jorb_c")]) == []
+
+        await pool.cancel_all()
+        assert len(pool) == 0
+
+    async def test_wait_any_returns_when_a_task_finishes(self):
+        pool = JorbWorkerPool(llm_concurrency=2, poll_concurrency=2)
+        release = asyncio.Event()
+        pool.dispatch("jorb_slow", lambda: asyncio.sleep(30))
+        pool.dispatch("jorb_fast", release.wait)
+
+        waiter = asyncio.create_task(pool.wait_any([asyncio.sleep(30)]))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        release.set()
+        await asyncio.wait_for(waiter, timeout=1)
+        assert pool.in_flight_ids == frozenset({"jorb_slow"})
+        await pool.cancel_all()
+
+    def test_concurrency_from_env(self, monkeypatch):
+        monkeypatch.setenv("JORB_WORKER_CONCURRENCY", "3")
+        monkeypatch.setenv("JORB_WORKER_POLL_CONCURRENCY", "nope")
+
+        assert worker_concurrency_from_env() == (3, 8)
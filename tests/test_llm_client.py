@@ -0,0 +1,115 @@
+"""
+Tests for the shared OpenAI chat-completion client.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import httpx
+import openai
+import pytest
+
+from services.llm_client import LLMClientPool
+
+
+def _factory(create):
+    client = MagicMock()
+    client.chat.completions.create.side_effect = create
+    return MagicMock(return_value=client), client
+
+
+class TestLLMClientPool:
+    """Tests for LLMClientPool."""
+
+    async def test_event_loop_keeps_running_during_completion(self):
+        release = threading.Event()
+
+        def slow_create(**kwargs):
+            release.wait(timeout=5)
+            return "done"
+
+        factory, _ = _factory(slow_create)
+        pool = LLMClientPool()
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while not release.is_set():
+                ticks += 1
+                if ticks >= 5:
+                    release.set()
+                await asyncio.sleep(0.01)
+
+        result, _ = await asyncio.wait_for(
+            asyncio.gather(pool.chat_completion(factory, "key", model="m"), ticker()),
+            timeout=5,
+        )
+
+        assert result == "done"
+        assert ticks >= 5
+
+    async def test_client_is_reused_per_api_key(self):
+        factory, client = _factory(lambda **kwargs: "ok")
+        pool = LLMClientPool(timeout_seconds=12)
+
+        await pool.chat_completion(factory, "key", model="m")
+        await pool.chat_completion(factory, "key", model="m")
+        await pool.chat_completion(factory, "other-key", model="m")
+
+        assert factory.call_count == 2
+        assert factory.call_args_list[0].kwargs == {"api_key": "key", "timeout": 12, "max_retries": 0}
+        assert client.chat.completions.create.call_count == 3
+
+    async def test_transient_errors_are_retried(self):
+        request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+        attempts = 0
+
+        def flaky_create(**kwargs):
+            nonlocal attempts
+            attempts += 1
+            if attempts < 3:
+                raise openai.APIConnectionError(request=request)
+            return "ok"
+
+        factory, _ = _factory(flaky_create)
+        pool = LLMClientPool(max_retries=2)
+
+        with patch("services.llm_client._backoff_seconds", return_value=0):
+            assert await pool.chat_completion(factory, "key", model="m") == "ok"
+        assert attempts == 3
+
+    async def test_non_transient_errors_are_not_retried(self):
+        factory, client = _factory(MagicMock(side_effect=ValueError("bad request")))
+        pool = LLMClientPool(max_retries=3)
+
+        with pytest.raises(ValueError):
+            await pool.chat_completion(factory, "key", model="m")
+        assert client.chat.completions.create.call_count == 1
+
+    async def test_concurrency_is_capped_per_model(self):
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def create(**kwargs):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return kwargs["model"]
+
+        factory, _ = _factory(create)
+        pool = LLMClientPool(max_concurrency_per_model=2)
+
+        results = await asyncio.gather(
+            *(pool.chat_completion(factory, "key", model="m") for _ in range(6))
+        )
+
+        assert results == ["m"] * 6
+        assert peak == 2
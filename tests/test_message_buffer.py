@@ -316,3 +316,102 @@ class TestClear:
 
         assert buffer.has_pending_messages("@user1", "telegram") is False
         assert buffer.has_pending_messages("+15551234567", "sms") is False
+
+
+class TestWriteAheadLog:
+    """Tests for WAL-backed buffers surviving a restart."""
+
+    def _buffer(self, wal_path, on_flush=None, debounce=30):
+        return MessageBuffer(
+            on_flush=on_flush,
+            debounce_telegram_seconds=debounce,
+            debounce_sms_seconds=debounce,
+            wal_path=wal_path,
+            fsync=False,
+        )
+
+    async def test_unflushed_messages_are_replayed_on_start(self, tmp_path):
+        """Messages pending when the process died come back on start."""
+        wal_path = tmp_path / "sms.jsonl"
+        crashed = self._buffer(wal_path)
+        await crashed.buffer_message(channel="sms", sender="+15551234567", content="First")
+        await crashed.buffer_message(channel="sms", sender="+15551234567", content="Second")
+        crashed.clear()
+
+        restarted = self._buffer(wal_path)
+        assert await restarted.start() == 2
+        assert restarted.get_pending_count("+15551234567", "sms") == 2
+
+        event = await restarted.flush_buffer("+15551234567", "sms")
+        assert event is not None
+        assert event.content == "First\nSecond"
+        assert not wal_path.exists()
+
+    async def test_flushed_messages_are_not_replayed(self, tmp_path):
+        """Acknowledged messages are not replayed."""
+        wal_path = tmp_path / "sms.jsonl"
+        buffer = self._buffer(wal_path)
+        await buffer.buffer_message(channel="sms", sender="+1555", content="Done")
+        await buffer.buffer_message(channel="sms", sender="+1666", content="Pending")
+        await buffer.flush_buffer("+1555", "sms")
+        buffer.clear()
+
+        restarted = self._buffer(wal_path)
+        assert await restarted.start() == 1
+        assert restarted.has_pending_messages("+1555", "sms") is False
+        assert restarted.has_pending_messages("+1666", "sms") is True
+
+    async def test_replayed_messages_past_due_flush_right_away(self, tmp_path):
+        """Replay keeps the original deadline rather than restarting the window."""
+        wal_path = tmp_path / "telegram.jsonl"
+        crashed = self._buffer(wal_path, debounce=1)
+        await crashed.buffer_message(channel="telegram", sender="@user", content="Hello")
+        crashed.clear()
+        await asyncio.sleep(1.1)
+
+        flushed_events: list[BufferedEvent] = []
+
+        async def on_flush(event: BufferedEvent) -> None:
+            flushed_events.append(event)
+
+        restarted = self._buffer(wal_path, on_flush=on_flush, debounce=1)
+        await restarted.start()
+        await asyncio.sleep(0.1)
+
+        assert [event.content for event in flushed_events] == ["Hello"]
+        assert not wal_path.exists()
+
+    async def test_flush_all_is_bounded(self, tmp_path):
+        """flush_all gives up on slow callbacks and leaves their messages in the WAL."""
+        wal_path = tmp_path / "sms.jsonl"
+        hang = asyncio.Event()
+
+        async def on_flush(event: BufferedEvent) -> None:
+            await hang.wait()
+
+        buffer = self._buffer(wal_path, on_flush=on_flush)
+        await buffer.buffer_message(channel="sms", sender="+1555", content="Stuck")
+
+        assert await buffer.flush_all(timeout=0.05) == []
+        assert buffer.last_flush_all["abandoned"] == 1
+        buffer.clear()
+
+        restarted = self._buffer(wal_path)
+        assert await restarted.start() == 1
+
+    async def test_many_senders_share_one_flusher(self, buffer):
+        """Deadlines for every sender are served by a single task."""
+        flushed_events: list[BufferedEvent] = []
+
+        async def on_flush(event: BufferedEvent) -> None:
+            flushed_events.append(event)
+
+        buffer.set_flush_callback(on_flush)
+        tasks_before = len(asyncio.all_tasks())
+        for i in range(200):
+            await buffer.buffer_message(channel="sms", sender=f"+1555{i:07d}", content="Hi")
+
+        assert len(asyncio.all_tasks()) - tasks_before <= 1
+
+        await asyncio.sleep(1.2)
+        assert len(flushed_events) == 200
@@ -397,6 +397,54 @@ def main(frank, **kwargs):
         assert "Hello from script" in data["stdout"]
 
 
+class TestTaskOutput:
+    """Tests for GET /frank/script/task/output endpoint."""
+
+    def test_task_output_not_found(self, client, tmp_data_dirs):
+        """Test tailing a non-existent task."""
+        response = client.get(
+            "/frank/script/task/output",
+            params={"task_id": "nonexistent-job"},
+        )
+
+        assert response.status_code == 400
+        assert "not found" in response.json()["detail"].lower()
+
+    def test_task_output_tails_and_follows(self, client, tmp_data_dirs):
+        """Test tailing output streamed by a task."""
+        start_response = client.post(
+            "/frank/script/task/start",
+            json={
+                "slug": "chatty",
+                "code": "def main(frank):\n    for i in range(3):\n        print('line', i)\n",
+            },
+        )
+        task_id = start_response.json()["task_id"]
+
+        deadline = time.time() + 10
+        while time.time() < deadline:
+            status = client.get("/frank/script/task/status", params={"task_id": task_id}).json()
+            if status["status"] == "completed":
+                break
+            time.sleep(0.1)
+
+        response = client.get(
+            "/frank/script/task/output",
+            params={"task_id": task_id, "max_bytes": 7},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["stream"] == "stdout"
+        assert data["text"] == "line 2\n"
+
+        response = client.get(
+            "/frank/script/task/output",
+            params={"task_id": task_id, "offset": 0},
+        )
+        assert response.json()["text"] == "line 0\nline 1\nline 2\n"
+        assert response.json()["next_offset"] == response.json()["size"]
+
+
 class TestApiKeyAuth:
     """Tests for API key authentication on meta endpoints."""
 
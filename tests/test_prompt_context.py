@@ -0,0 +1,144 @@
+"""
+Tests for incremental, token-budgeted prompt building.
+"""
+
+from __future__ import annotations
+
+import os
+from unittest.mock import patch
+
+from services.jorb_session import JorbSession
+from services.jorb_storage import Jorb, JorbMessage
+from services.prompt_context import (
+    SectionCache,
+    encode_image_data_url,
+    estimate_tokens,
+    fit_to_token_budget,
+    record_prompt_build,
+)
+from services.stats import stats
+
+
+def _jorb(jorb_id: str = "jorb_prompt", updated_at: str = "2026-03-01T00:00:00+00:00") -> Jorb:
+    return Jorb(
+        id=jorb_id,
+        name="Prompt test",
+        status="running",
+        original_plan="Book a table",
+        updated_at=updated_at,
+    )
+
+
+def _messages(count: int, jorb_id: str = "jorb_prompt") -> list[JorbMessage]:
+    return [
+        JorbMessage(
+            id=f"msg_{i}",
+            jorb_id=jorb_id,
+            timestamp=f"2026-03-01T00:{i:02d}:00+00:00",
+            direction="inbound",
+            channel="sms",
+            sender="+15550001111",
+            content=f"Message number {i} " + "x" * 150,
+        )
+        for i in range(count)
+    ]
+
+
+class TestTokenBudget:
+    """Tests for estimate_tokens and fit_to_token_budget."""
+
+    def test_estimate_tokens(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcd" * 10) == 10
+        # Non-ASCII characters count as a token each
+        assert estimate_tokens("héllo") == 2
+
+    def test_fit_keeps_newest_lines(self):
+        lines = [f"line {i} " + "y" * 36 for i in range(10)]  # ~11 tokens each
+
+        kept, dropped = fit_to_token_budget(lines, 40)
+
+        assert kept == lines[-3:]
+        assert dropped == 7
+
+    def test_newest_line_is_kept_even_over_budget(self):
+        kept, dropped = fit_to_token_budget(["z" * 400], 5)
+        assert kept == ["z" * 400]
+        assert dropped == 0
+
+
+class TestSectionCache:
+    """Tests for SectionCache."""
+
+    def test_renders_once_per_key_and_evicts_lru(self):
+        cache = SectionCache(max_entries=2, stats_name="test_sections")
+        renders = []
+
+        def render(value):
+            renders.append(value)
+            return value.upper()
+
+        assert cache.get_or_render("a", lambda: render("a")) == "A"
+        assert cache.get_or_render("a", lambda: render("a")) == "A"
+        cache.get_or_render("b", lambda: render("b"))
+        cache.get_or_render("c", lambda: render("c"))
+        cache.get_or_render("a", lambda: render("a"))
+
+        assert renders == ["a", "b", "c", "a"]
+        assert stats.get_cache_stats("test_sections").evictions == 2
+
+    def test_image_data_url_is_reencoded_when_file_changes(self, tmp_path):
+        path = tmp_path / "shot.png"
+        path.write_bytes(b"first")
+
+        first = encode_image_data_url(str(path), "image/png")
+        assert encode_image_data_url(str(path), "image/png") == first
+
+        path.write_bytes(b"second!")
+        os.utime(path, ns=(0, 0))
+        assert encode_image_data_url(str(path), "image/png") != first
+
+
+class TestJorbSessionPrompt:
+    """JorbSession reuses cached sections and trims history to the budget."""
+
+    def test_rebuild_reuses_sections_and_tracks_new_messages(self):
+        messages = _messages(3)
+        session = JorbSession(jorb=_jorb(), messages=messages, policy={})
+        section_stats = stats.get_cache_stats("prompt_sections")
+
+        first = session._build_system_prompt()
+        hits_before = section_stats.hits
+        assert session._build_system_prompt() == first
+        assert section_stats.hits >= hits_before + 3  # prefix, jorb context, history
+
+        messages.append(_messages(4)[-1])
+        updated = session._build_system_prompt()
+        assert "Message number 3" in updated
+        assert "Message number 3" not in first
+
+    def test_prefix_is_shared_across_jorbs(self):
+        prompt_a = JorbSession(jorb=_jorb("jorb_a"), messages=[], policy={})._build_system_prompt()
+        prompt_b = JorbSession(jorb=_jorb("jorb_b"), messages=[], policy={})._build_system_prompt()
+
+        prefix_a = prompt_a[: prompt_a.index("## Your Jorb")]
+        assert len(prefix_a) > 1000
+        assert prompt_b.startswith(prefix_a)
+
+    def test_history_is_trimmed_to_token_budget(self):
+        session = JorbSession(jorb=_jorb("jorb_budget"), messages=_messages(40, "jorb_budget"), policy={})
+
+        with patch("services.jorb_session.JORB_HISTORY_TOKEN_BUDGET", 500):
+            prompt = session._build_system_prompt()
+
+        assert "earlier messages omitted)" in prompt
+        assert "Message number 39" in prompt
+        assert "Message number 0 " not in prompt
+
+
+def test_record_prompt_build_publishes_stats():
+    record_prompt_build("test_prompt_source", 0.0, "abcd" * 25, [{"type": "text", "text": "abcd"}])
+
+    prompt_stats = stats.get_all_stats()["prompts"]["test_prompt_source"]
+    assert prompt_stats["builds"] == 1
+    assert prompt_stats["prompt_tokens"]["last"] == 26
@@ -0,0 +1,210 @@
+"""
+Tests for the switchboard routing-decision cache.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from services.jorb_storage import Jorb, JorbWithMessages
+from services.routing_cache import RoutingCache, routing_cache_key
+from services.stats import stats
+from services.switchboard import Switchboard
+
+
+def _key(content: str = "Hello there", summaries=None, sender: str = "@alice") -> str:
+    return routing_cache_key(
+        channel="telegram",
+        sender=sender,
+        sender_name=None,
+        content=content,
+        message_metadata=None,
+        jorb_summaries=summaries or [{"id": "jorb_1", "last_activity": "t1"}],
+        is_human_intervention=False,
+    )
+
+
+def _mock_response(jorb_id: str | None = "jorb_aaaaaaaa") -> MagicMock:
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = json.dumps({
+        "routing": {"jorb_id": jorb_id, "confidence": "medium", "reasoning": "Looks related"},
+        "signals": {},
+    })
+    response.usage = MagicMock(prompt_tokens=400, completion_tokens=20)
+    return response
+
+
+def _open_jorb(updated_at: str = "2026-01-01T00:00:00+00:00") -> JorbWithMessages:
+    jorb = Jorb(
+        id="jorb_aaaaaaaa",
+        name="Dentist",
+        status="running",
+        original_plan="Book a dentist appointment",
+        updated_at=updated_at,
+    )
+    return JorbWithMessages(jorb=jorb, messages=[])
+
+
+class TestRoutingCacheKey:
+    """The key ignores cosmetic differences but tracks the jorb snapshot."""
+
+    def test_normalized_content_shares_a_key(self):
+        assert _key("Hello   there") == _key("  hello there ")
+        assert _key("Hello there") != _key("Goodbye")
+        assert _key(sender="@bob") != _key()
+
+    def test_snapshot_change_changes_the_key(self):
+        assert _key(summaries=[{"id": "jorb_1", "last_activity": "t2"}]) != _key()
+
+
+class TestRoutingCache:
+    """Tests for RoutingCache."""
+
+    async def test_hits_expire_after_ttl(self):
+        cache: RoutingCache[str] = RoutingCache(ttl_seconds=0.05, max_entries=8, stats_name="test_ttl")
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            return f"value-{calls}", True
+
+        assert await cache.get_or_load("k", loader) == ("value-1", False)
+        assert await cache.get_or_load("k", loader) == ("value-1", True)
+        await asyncio.sleep(0.06)
+        assert await cache.get_or_load("k", loader) == ("value-2", False)
+
+    async def test_lru_eviction(self):
+        cache: RoutingCache[str] = RoutingCache(ttl_seconds=60, max_entries=2, stats_name="test_lru")
+        cache.put("a", "A")
+        cache.put("b", "B")
+        assert cache.get("a") == "A"  # "b" is now least recently used
+        cache.put("c", "C")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "A"
+        assert cache.get("c") == "C"
+        assert stats.get_cache_stats("test_lru").evictions == 1
+
+    async def test_concurrent_identical_requests_are_single_flighted(self):
+        cache: RoutingCache[str] = RoutingCache(ttl_seconds=60, max_entries=8, stats_name="test_dedup")
+        release = asyncio.Event()
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "decision", True
+
+        waiters = [asyncio.create_task(cache.get_or_load("k", loader)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert calls == 1
+        assert sorted(results) == [("decision", False), ("decision", True), ("decision", True)]
+        assert stats.get_cache_stats("test_dedup").deduplicated == 2
+
+    async def test_waiter_takes_over_a_cancelled_load_with_its_ttl(self):
+        cache: RoutingCache[str] = RoutingCache(ttl_seconds=60, max_entries=8, stats_name="test_takeover")
+        started = asyncio.Event()
+
+        async def stuck_loader():
+            started.set()
+            await asyncio.Event().wait()
+            return "never", True
+
+        async def loader():
+            return "rejected", True
+
+        leader = asyncio.create_task(cache.get_or_load("k", stuck_loader))
+        await started.wait()
+        waiter = asyncio.create_task(cache.get_or_load("k", loader, ttl=lambda value: 0.05))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        assert await waiter == ("rejected", False)
+        assert cache.get("k") == "rejected"
+        # The waiter's short per-value TTL applies, not the cache-wide 60s.
+        await asyncio.sleep(0.06)
+        assert cache.get("k") is None
+
+    async def test_uncacheable_results_are_not_stored(self):
+        cache: RoutingCache[str] = RoutingCache(ttl_seconds=60, max_entries=8, stats_name="test_fail")
+
+        async def failing_loader():
+            return "failed", False
+
+        await cache.get_or_load("k", failing_loader)
+        assert cache.get("k") is None
+
+
+class TestSwitchboardRoutingCache:
+    """Switchboard.route reuses LLM decisions for identical inputs."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_message_is_served_from_cache(self):
+        cache_stats = stats.get_cache_stats("switchboard_routing")
+        hits_before = cache_stats.hits
+        saved_before = cache_stats.tokens_saved
+        open_jorbs = [_open_jorb()]
+
+        with patch("services.switchboard.openai") as mock_openai:
+            mock_client = MagicMock()
+            mock_client.chat.completions.create.return_value = _mock_response()
+            mock_openai.OpenAI.return_value = mock_client
+
+            switchboard = Switchboard(openai_api_key="test-key")
+            route = lambda content: switchboard.route(  # noqa: E731
+                channel="sms",
+                sender="+15550001111",
+                sender_name=None,
+                content=content,
+                timestamp=datetime.now(timezone.utc).isoformat(),
+                open_jorbs=open_jorbs,
+            )
+            first = await route("Is Tuesday OK?")
+            second = await route("is tuesday  ok?")
+
+            assert mock_client.chat.completions.create.call_count == 1
+            assert first.jorb_id == second.jorb_id == "jorb_aaaaaaaa"
+            assert first.tokens_used == 420
+            assert second.tokens_used == 0
+            assert cache_stats.hits == hits_before + 1
+            assert cache_stats.tokens_saved == saved_before + 420
+
+            # Any change to the open jorbs invalidates the cached decision.
+            open_jorbs[0] = _open_jorb(updated_at="2026-01-01T00:05:00+00:00")
+            await route("Is Tuesday OK?")
+            assert mock_client.chat.completions.create.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_routing_is_retried(self):
+        with patch("services.switchboard.openai") as mock_openai:
+            mock_client = MagicMock()
+            mock_client.chat.completions.create.side_effect = [
+                RuntimeError("connection reset"),
+                _mock_response(),
+            ]
+            mock_openai.OpenAI.return_value = mock_client
+
+            switchboard = Switchboard(openai_api_key="test-key")
+            kwargs = dict(
+                channel="sms",
+                sender="+15550002222",
+                sender_name=None,
+                content="Following up",
+                timestamp=datetime.now(timezone.utc).isoformat(),
+                open_jorbs=[_open_jorb()],
+            )
+            failed = await switchboard.route(**kwargs)
+            retried = await switchboard.route(**kwargs)
+
+        assert failed.jorb_id is None
+        assert failed.reasoning.startswith("Routing failed")
+        assert retried.jorb_id == "jorb_aaaaaaaa"
@@ -0,0 +1,147 @@
+"""
+Tests for the process-isolated script pool.
+"""
+
+from __future__ import annotations
+
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from meta.script_pool import MODE_MAIN, MODE_SNIPPET, ScriptPool
+
+
+@pytest.fixture
+def pool():
+    pool = ScriptPool(size=1, max_runs_per_worker=3, memory_limit_mb=0, cpu_limit_seconds=0)
+    yield pool
+    pool.shutdown()
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+class TestScriptPool:
+    """Tests for ScriptPool."""
+
+    def test_runaway_script_is_killed_on_timeout(self, pool):
+        code = "def main(frank):\n    while True:\n        pass\n"
+        pid_outcome = pool.run(MODE_SNIPPET, "__import__('os').getpid()", timeout_seconds=10)
+        worker_pid = pid_outcome.value
+
+        outcome = pool.run(MODE_MAIN, code, timeout_seconds=0.5)
+
+        assert outcome.timed_out
+        assert "timed out" in outcome.error
+        assert not _pid_alive(worker_pid)
+        # A replacement worker keeps serving scripts.
+        after = pool.run(MODE_SNIPPET, "__import__('os').getpid()", timeout_seconds=10)
+        assert after.ok and after.value != worker_pid
+        assert pool.get_status()["killed"] == 1
+
+    def test_waiting_for_a_busy_pool_is_bounded_by_the_timeout(self, pool):
+        long_job = "def main(frank):\n    __import__('time').sleep(2)\n    return 'done'\n"
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            job = executor.submit(pool.run, MODE_MAIN, long_job, timeout_seconds=10)
+            time.sleep(0.3)
+
+            started = time.monotonic()
+            outcome = pool.run(MODE_SNIPPET, "1 + 1", timeout_seconds=0.3)
+
+            assert time.monotonic() - started < 1.5
+            assert outcome.timed_out
+            assert "waiting for a free script worker" in outcome.error
+            assert job.result().value == "done"
+        # Nothing was killed; the worker is free again.
+        assert pool.get_status()["killed"] == 0
+        assert pool.run(MODE_SNIPPET, "1 + 1", timeout_seconds=10).value == 2
+
+    def test_workers_are_recycled_after_max_runs(self, pool):
+        pids = [pool.run(MODE_SNIPPET, "__import__('os').getpid()", timeout_seconds=10).value for _ in range(4)]
+
+        assert len(set(pids[:3])) == 1
+        assert pids[3] != pids[0]
+        assert pool.get_status()["recycled"] == 1
+
+    def test_frank_calls_run_in_the_server_process(self, pool):
+        mock_api = MagicMock()
+        mock_api.time.now.return_value = {"pid": os.getpid()}
+        mock_api.calendar.events.side_effect = RuntimeError("API unavailable")
+
+        with patch("meta.api.FrankAPI", return_value=mock_api):
+            ok = pool.run(MODE_SNIPPET, "frank.time.now()", timeout_seconds=10)
+            failed = pool.run(MODE_SNIPPET, "frank.calendar.events(day='x')", timeout_seconds=10)
+            private = pool.run(MODE_SNIPPET, "frank.calendar._client()", timeout_seconds=10)
+
+        assert ok.value == {"pid": os.getpid()}
+        assert (failed.error_type, failed.error) == ("RuntimeError", "API unavailable")
+        assert private.error_type == "AttributeError"
+
+    def test_output_is_captured_per_run(self, pool):
+        code = "import sys\n\ndef main(frank, name):\n    print('hi', name)\n    print('warn', file=sys.stderr)\n    return name\n"
+
+        outcome = pool.run(MODE_MAIN, code, {"name": "sam"}, timeout_seconds=10)
+
+        assert outcome.ok and outcome.value == "sam"
+        assert outcome.stdout == "hi sam\n"
+        assert outcome.stderr == "warn\n"
+
+    def test_output_is_streamed_while_running(self, pool):
+        code = (
+            "import sys, time\n\n"
+            "def main(frank):\n"
+            "    print('started')\n"
+            "    time.sleep(0.5)\n"
+            "    print('partial', end='', file=sys.stderr)\n"
+            "    return 1\n"
+        )
+        chunks = []
+
+        def on_output(stream, text):
+            chunks.append((time.monotonic(), stream, text))
+
+        outcome = pool.run(MODE_MAIN, code, timeout_seconds=10, on_output=on_output)
+        finished = time.monotonic()
+
+        assert [(stream, text) for _, stream, text in chunks] == [("stdout", "started\n"), ("stderr", "partial")]
+        assert finished - chunks[0][0] >= 0.4
+        assert outcome.stdout == "started\n"
+
+    def test_unpicklable_results_fall_back_to_repr(self, pool):
+        outcome = pool.run(MODE_SNIPPET, "(lambda: 1)", timeout_seconds=10)
+
+        assert outcome.ok
+        assert outcome.value.startswith("<function <lambda>")
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGXCPU"), reason="needs POSIX resource limits")
+class TestScriptPoolLimits:
+    """Resource limits applied inside workers."""
+
+    def test_memory_limit_raises_memory_error(self):
+        pool = ScriptPool(size=1, memory_limit_mb=256, cpu_limit_seconds=0)
+        try:
+            outcome = pool.run(MODE_SNIPPET, "b'x' * (512 * 1024 * 1024)", timeout_seconds=10)
+        finally:
+            pool.shutdown()
+
+        assert outcome.error_type == "MemoryError"
+
+    def test_cpu_limit_kills_worker(self):
+        pool = ScriptPool(size=1, memory_limit_mb=0, cpu_limit_seconds=1)
+        try:
+            outcome = pool.run(MODE_SNIPPET, "while True: pass", timeout_seconds=20)
+        finally:
+            pool.shutdown()
+
+        assert not outcome.ok and not outcome.timed_out
+        assert "CPU limit" in outcome.error
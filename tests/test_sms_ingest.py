@@ -0,0 +1,114 @@
+"""
+Tests for the durable inbound SMS ingest queue.
+"""
+
+import asyncio
+import json
+
+from services.sms_ingest import MAX_INGEST_ATTEMPTS, SMSIngestQueue
+
+
+class TestSMSIngestQueue:
+    """Tests for SMSIngestQueue."""
+
+    async def test_enqueue_spools_until_processed(self, tmp_path):
+        seen = []
+
+        async def process(record):
+            seen.append(record["payload"]["n"])
+            return record["payload"]["n"]
+
+        queue = SMSIngestQueue(tmp_path, process, concurrency=2, fsync=False)
+        first = await queue.enqueue({"n": 1}, key="+1555")
+        await queue.enqueue({"n": 2}, key="+1666")
+
+        assert queue.pending_ids()[0] == first
+        record = json.loads((tmp_path / f"{first}.json").read_text())
+        assert record["key"] == "+1555"
+        assert record["attempts"] == 0
+
+        assert await queue.process_pending() == [1, 2]
+        assert seen == [1, 2]
+        assert queue.pending_ids() == []
+        assert queue.processed == 2
+
+    async def test_start_replays_spool_left_by_previous_run(self, tmp_path):
+        async def never(record):
+            raise AssertionError("not started yet")
+
+        await SMSIngestQueue(tmp_path, never, fsync=False).enqueue({"n": 1}, key="+1555")
+
+        done = asyncio.Event()
+        seen = []
+
+        async def process(record):
+            seen.append(record["payload"]["n"])
+            done.set()
+
+        queue = SMSIngestQueue(tmp_path, process, concurrency=1, fsync=False)
+        await queue.start()
+        await asyncio.wait_for(done.wait(), 1)
+        assert await queue.stop(timeout=1) == 0
+
+        assert seen == [1]
+        assert queue.pending_ids() == []
+
+    async def test_same_sender_keeps_order_while_others_overlap(self, tmp_path):
+        release_slow = asyncio.Event()
+        order = []
+
+        async def process(record):
+            payload = record["payload"]
+            if payload["slow"]:
+                await release_slow.wait()
+            order.append(payload["n"])
+
+        queue = SMSIngestQueue(tmp_path, process, concurrency=3, fsync=False)
+        await queue.start()
+        await queue.enqueue({"n": 1, "slow": True}, key="+1555")
+        await queue.enqueue({"n": 2, "slow": False}, key="+1555")
+        await queue.enqueue({"n": 3, "slow": False}, key="+1666")
+
+        for _ in range(50):
+            if order:
+                break
+            await asyncio.sleep(0.01)
+        # The other sender is not held up; the same sender waits its turn.
+        assert order == [3]
+
+        release_slow.set()
+        assert await queue.stop(timeout=1) == 0
+        assert order == [3, 1, 2]
+
+    async def test_failures_are_retried_then_moved_aside(self, tmp_path):
+        async def process(record):
+            raise RuntimeError("storage down")
+
+        queue = SMSIngestQueue(tmp_path, process, fsync=False)
+        ingest_id = await queue.enqueue({"n": 1}, key="+1555")
+
+        for attempt in range(1, MAX_INGEST_ATTEMPTS):
+            assert await queue.process_pending() == []
+            record = json.loads((tmp_path / f"{ingest_id}.json").read_text())
+            assert record["attempts"] == attempt
+            assert record["last_error"] == "storage down"
+
+        await queue.process_pending()
+
+        assert queue.pending_ids() == []
+        assert (tmp_path / "failed" / f"{ingest_id}.json").exists()
+        assert queue.failed == 1
+
+    async def test_stop_is_bounded_and_leaves_work_spooled(self, tmp_path):
+        hang = asyncio.Event()
+
+        async def process(record):
+            await hang.wait()
+
+        queue = SMSIngestQueue(tmp_path, process, concurrency=1, fsync=False)
+        await queue.start()
+        await queue.enqueue({"n": 1}, key="+1555")
+        await queue.enqueue({"n": 2}, key="+1555")
+
+        assert await queue.stop(timeout=0.05) == 2
+        assert not queue.running
@@ -3,12 +3,13 @@
 import json
 import tempfile
 from pathlib import Path
-from unittest.mock import AsyncMock, patch, MagicMock
+from unittest.mock import patch
 
 import httpx
 import pytest
 
 from services.sms_storage import (
+    AttachmentTooLargeError,
     Attachment,
     Contact,
     SMSMessage,
@@ -439,6 +440,142 @@ class TestSMSStorageGetMessageById:
             assert result is None
 
 
+def _sms(index: int, **overrides) -> SMSMessage:
+    fields = dict(
+        id=f"sms_{index}_+15551234567",
+        timestamp=f"2026-01-29T18:{index:02d}:00Z",
+        direction="inbound",
+        localNumber="+12148170664",
+        remoteNumber="+15551234567",
+        content=f"Message {index}",
+    )
+    fields.update(overrides)
+    return SMSMessage(**fields)
+
+
+class TestSMSStorageIndex:
+    """Tests for the manifest index behind listings and id lookups."""
+
+    def test_store_appends_manifest_line(self):
+        """Each stored message adds one manifest line."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = SMSStorage(data_dir=tmpdir)
+            storage.store_message(_sms(1, contact=Contact(name="Mom")))
+            storage.store_message(_sms(2))
+
+            lines = (Path(tmpdir) / "sms" / "index.jsonl").read_text().splitlines()
+
+            assert [json.loads(line)["id"] for line in lines] == [
+                "sms_1_+15551234567",
+                "sms_2_+15551234567",
+            ]
+            assert json.loads(lines[0])["contact"] == "Mom"
+            assert json.loads(lines[0])["path"] == "12148170664/2026-01-29T18-01-00Z-Mom.json"
+
+    def test_filter_by_direction(self):
+        """Direction is filtered in the index before the limit applies."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = SMSStorage(data_dir=tmpdir)
+            storage.store_message(_sms(1, direction="outbound"))
+            for i in range(2, 10):
+                storage.store_message(_sms(i))
+
+            messages = storage.get_recent_messages(direction="outbound", limit=1)
+
+            assert [m.content for m in messages] == ["Message 1"]
+
+    def test_lookup_does_not_parse_unmatched_files(self):
+        """A selective query only reads the files it returns."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = SMSStorage(data_dir=tmpdir)
+            for i in range(1, 20):
+                storage.store_message(_sms(i))
+            storage.store_message(_sms(30, remoteNumber="+15559999999"))
+
+            with patch("services.sms_storage.SMSMessage.model_validate", wraps=SMSMessage.model_validate) as validate:
+                messages = storage.get_recent_messages(remote_number="+15559999999")
+                found = storage.get_message_by_id("sms_5_+15551234567")
+
+            assert [m.content for m in messages] == ["Message 30"]
+            assert found is not None and found.content == "Message 5"
+            assert validate.call_count == 2
+
+    def test_legacy_store_is_indexed_on_first_use(self):
+        """Message files written before the manifest existed are scanned once."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = SMSStorage(data_dir=tmpdir)
+            storage.store_message(_sms(1))
+            storage.store_message(_sms(2))
+            (Path(tmpdir) / "sms" / "index.jsonl").unlink()
+            SMSStorage._indexes.clear()
+
+            storage = SMSStorage(data_dir=tmpdir)
+            storage.store_message(_sms(3))
+
+            assert [m.content for m in storage.get_recent_messages()] == [
+                "Message 3",
+                "Message 2",
+                "Message 1",
+            ]
+            lines = (Path(tmpdir) / "sms" / "index.jsonl").read_text().splitlines()
+            assert len(lines) == 3
+
+    def test_sees_writes_from_other_processes(self):
+        """Manifest lines appended by another process show up on the next query."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = SMSStorage(data_dir=tmpdir)
+            storage.store_message(_sms(1))
+            assert len(storage.get_recent_messages()) == 1
+
+            # Simulate another process with its own index.
+            other_index = SMSStorage._indexes.pop(str((Path(tmpdir) / "sms").resolve()))
+            other = SMSStorage(data_dir=tmpdir)
+            other.store_message(_sms(2))
+            SMSStorage._indexes[str((Path(tmpdir) / "sms").resolve())] = other_index
+
+            assert [m.content for m in storage.get_recent_messages()] == ["Message 2", "Message 1"]
+            assert storage.get_message_by_id("sms_2_+15551234567") is not None
+
+    def test_missing_file_is_skipped(self):
+        """Entries whose file was deleted are dropped and the limit is still filled."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = SMSStorage(data_dir=tmpdir)
+            for i in range(1, 4):
+                storage.store_message(_sms(i))
+            storage.get_message_filepath(_sms(3)).unlink()
+
+            messages = storage.get_recent_messages(limit=2)
+
+            assert [m.content for m in messages] == ["Message 2", "Message 1"]
+            assert storage.get_message_by_id("sms_3_+15551234567") is None
+
+    def test_overwritten_file_replaces_entry(self):
+        """Messages that share a filename keep only the last one indexed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = SMSStorage(data_dir=tmpdir)
+            storage.store_message(_sms(1, id="first"))
+            storage.store_message(_sms(1, id="second", content="Replaced"))
+
+            messages = storage.get_recent_messages()
+
+            assert [m.id for m in messages] == ["second"]
+            assert storage.get_message_by_id("first") is None
+
+    def test_messages_sharing_an_id_are_all_indexed(self):
+        """Ids are only unique per second, so entries are keyed by file path."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = SMSStorage(data_dir=tmpdir)
+            storage.store_message(_sms(1, id="same", content="To Mom", contact=Contact(name="Mom")))
+            storage.store_message(_sms(1, id="same", content="To Dad", contact=Contact(name="Dad")))
+
+            messages = storage.get_recent_messages()
+
+            assert sorted(m.content for m in messages) == ["To Dad", "To Mom"]
+            assert storage.get_message_by_id("same") is not None
+            lines = (Path(tmpdir) / "sms" / "index.jsonl").read_text().splitlines()
+            assert len(lines) == 2
+
+
 class TestSMSStorageGetMessageFilepath:
     """Tests for getting expected message filepath."""
 
@@ -519,6 +656,15 @@ class TestGenerateAttachmentFilename:
         assert filename.endswith("-attachment-1.mp4")
 
 
+def _mock_downloads(handler):
+    """Route attachment downloads through an httpx.MockTransport handler."""
+    transport = httpx.MockTransport(handler)
+    return patch(
+        "services.sms_storage._attachment_client",
+        lambda: httpx.AsyncClient(transport=transport),
+    )
+
+
 class TestSMSStorageDownloadAttachment:
     """Tests for attachment download functionality."""
 
@@ -529,13 +675,7 @@ class TestSMSStorageDownloadAttachment:
             storage = SMSStorage(data_dir=tmpdir)
             filepath = Path(tmpdir) / "test.jpg"
 
-            with patch("services.sms_storage.httpx.AsyncClient") as mock_client:
-                mock_response = MagicMock()
-                mock_response.content = b"fake image content"
-                mock_response.raise_for_status = MagicMock()
-                mock_client.return_value.__aenter__.return_value.get = AsyncMock(
-                    return_value=mock_response
-                )
+            with _mock_downloads(lambda request: httpx.Response(200, content=b"fake image content")):
 
                 size = await storage._download_attachment(
                     "https://example.com/image.jpg",
@@ -553,13 +693,7 @@ class TestSMSStorageDownloadAttachment:
             storage = SMSStorage(data_dir=tmpdir)
             filepath = Path(tmpdir) / "nested" / "dir" / "test.jpg"
 
-            with patch("services.sms_storage.httpx.AsyncClient") as mock_client:
-                mock_response = MagicMock()
-                mock_response.content = b"data"
-                mock_response.raise_for_status = MagicMock()
-                mock_client.return_value.__aenter__.return_value.get = AsyncMock(
-                    return_value=mock_response
-                )
+            with _mock_downloads(lambda request: httpx.Response(200, content=b"data")):
 
                 await storage._download_attachment(
                     "https://example.com/image.jpg",
@@ -575,14 +709,7 @@ class TestSMSStorageDownloadAttachment:
             storage = SMSStorage(data_dir=tmpdir)
             filepath = Path(tmpdir) / "test.jpg"
 
-            with patch("services.sms_storage.httpx.AsyncClient") as mock_client:
-                mock_client.return_value.__aenter__.return_value.get = AsyncMock(
-                    side_effect=httpx.HTTPStatusError(
-                        "404 Not Found",
-                        request=MagicMock(),
-                        response=MagicMock(),
-                    )
-                )
+            with _mock_downloads(lambda request: httpx.Response(404)):
 
                 with pytest.raises(httpx.HTTPStatusError):
                     await storage._download_attachment(
@@ -591,6 +718,46 @@ class TestSMSStorageDownloadAttachment:
                     )
 
 
+    @pytest.mark.asyncio
+    async def test_download_rejects_declared_oversize(self):
+        """A Content-Length over the limit is refused before reading the body."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = SMSStorage(data_dir=tmpdir)
+            filepath = Path(tmpdir) / "big.jpg"
+
+            with _mock_downloads(lambda request: httpx.Response(200, content=b"x" * 100)):
+                with pytest.raises(AttachmentTooLargeError):
+                    await storage._download_attachment(
+                        "https://example.com/big.jpg",
+                        filepath,
+                        max_bytes=10,
+                    )
+
+            assert not filepath.exists()
+            assert list(Path(tmpdir).iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_download_aborts_streamed_oversize(self):
+        """A body without Content-Length is cut off once it passes the limit."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = SMSStorage(data_dir=tmpdir)
+            filepath = Path(tmpdir) / "big.jpg"
+
+            async def chunks():
+                for _ in range(10):
+                    yield b"x" * 8
+
+            with _mock_downloads(lambda request: httpx.Response(200, content=chunks())):
+                with pytest.raises(AttachmentTooLargeError):
+                    await storage._download_attachment(
+                        "https://example.com/big.jpg",
+                        filepath,
+                        max_bytes=20,
+                    )
+
+            assert list(Path(tmpdir).iterdir()) == []
+
+
 class TestSMSStorageStoreMessageAsync:
     """Tests for async message storage with attachments."""
 
@@ -638,13 +805,7 @@ class TestSMSStorageStoreMessageAsync:
                 ],
             )
 
-            with patch("services.sms_storage.httpx.AsyncClient") as mock_client:
-                mock_response = MagicMock()
-                mock_response.content = b"fake image data 12345"
-                mock_response.raise_for_status = MagicMock()
-                mock_client.return_value.__aenter__.return_value.get = AsyncMock(
-                    return_value=mock_response
-                )
+            with _mock_downloads(lambda request: httpx.Response(200, content=b"fake image data 12345")):
 
                 filepath = await storage.store_message_async(msg)
 
@@ -686,14 +847,7 @@ class TestSMSStorageStoreMessageAsync:
                 ],
             )
 
-            with patch("services.sms_storage.httpx.AsyncClient") as mock_client:
-                mock_client.return_value.__aenter__.return_value.get = AsyncMock(
-                    side_effect=httpx.HTTPStatusError(
-                        "404",
-                        request=MagicMock(),
-                        response=MagicMock(),
-                    )
-                )
+            with _mock_downloads(lambda request: httpx.Response(404)):
 
                 filepath = await storage.store_message_async(msg)
 
@@ -736,13 +890,7 @@ class TestSMSStorageStoreMessageAsync:
                 ],
             )
 
-            with patch("services.sms_storage.httpx.AsyncClient") as mock_client:
-                mock_response = MagicMock()
-                mock_response.content = b"image data"
-                mock_response.raise_for_status = MagicMock()
-                mock_client.return_value.__aenter__.return_value.get = AsyncMock(
-                    return_value=mock_response
-                )
+            with _mock_downloads(lambda request: httpx.Response(200, content=b"image data")):
 
                 filepath = await storage.store_message_async(msg)
 
@@ -1,24 +1,57 @@
 """Unit tests for SMS webhook handler."""
 
+import asyncio
 import json
 import tempfile
 from datetime import datetime, timezone
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 from starlette.testclient import TestClient
 from starlette.applications import Starlette
 from starlette.routing import Route
 
+import server.sms_webhook as sms_webhook
 from server.sms_webhook import (
     _generate_message_id,
     _parse_telnyx_payload,
+    get_sms_ingest_queue,
     sms_webhook_handler,
 )
 from services.contact_lookup import Contact
 
 
+@pytest.fixture(autouse=True)
+def reset_ingest_queue():
+    """The ingest queue and SMS buffer WAL live under DATA_DIR, which each test patches."""
+    sms_webhook._sms_ingest_queue = None
+    sms_webhook._sms_message_buffer = None
+    yield
+    sms_webhook._sms_ingest_queue = None
+    sms_webhook._sms_message_buffer = None
+
+
+def _mock_downloads(body: bytes):
+    """Serve every attachment download from an in-memory transport."""
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+    return patch(
+        "services.sms_storage._attachment_client",
+        lambda: httpx.AsyncClient(transport=transport),
+    )
+
+
+def _post_and_ingest(client, payload) -> dict:
+    """POST the webhook, then run the background ingest for what it spooled."""
+    response = client.post("/webhook/sms", json=payload)
+    assert response.status_code == 200
+    assert response.json()["status"] == "accepted"
+    results = asyncio.run(get_sms_ingest_queue().process_pending())
+    assert len(results) == 1
+    return results[0]
+
+
 class TestGenerateMessageId:
     """Tests for message ID generation."""
 
@@ -194,14 +227,57 @@ class TestSmsWebhookHandler:
                     mock_lookup.lookup.return_value = None
                     mock_lookup_cls.return_value = mock_lookup
 
-                    response = client.post("/webhook/sms", json=payload)
+                    data = _post_and_ingest(client, payload)
 
-        assert response.status_code == 200
-        data = response.json()
         assert data["status"] == "processed"
         assert data["message_id"].startswith("sms_")
         assert data["contact"] is None
 
+    def test_spool_moves_out_of_the_sms_message_tree(self):
+        """A spool left under data/sms/inbox is moved where the message index won't scan it."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            legacy = Path(tmpdir) / "sms" / "inbox"
+            legacy.mkdir(parents=True)
+            (legacy / "0001-abcd.json").write_text('{"id": "0001-abcd", "key": "+1555"}')
+
+            with patch.dict("os.environ", {"DATA_DIR": tmpdir}):
+                queue = get_sms_ingest_queue()
+
+            assert queue.spool_dir == Path(tmpdir) / "sms_inbox"
+            assert queue.pending_ids() == ["0001-abcd"]
+            assert not legacy.exists()
+
+    def test_acknowledges_before_ingest(self, client):
+        """The webhook only spools the payload; lookup and storage run later."""
+        payload = {
+            "data": {
+                "event_type": "message.received",
+                "payload": {
+                    "direction": "inbound",
+                    "from": {"phone_number": "+15551234567"},
+                    "to": [{"phone_number": "+12148170664"}],
+                    "text": "Hello",
+                    "media": [],
+                },
+            },
+        }
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.dict("os.environ", {"DATA_DIR": tmpdir}):
+                with patch("server.sms_webhook.ContactLookup") as mock_lookup_cls:
+                    response = client.post("/webhook/sms", json=payload)
+
+                    mock_lookup_cls.assert_not_called()
+                    spooled = list((Path(tmpdir) / "sms_inbox").glob("*.json"))
+                    assert len(spooled) == 1
+                    record = json.loads(spooled[0].read_text())
+                    assert not (Path(tmpdir) / "sms" / "12148170664").exists()
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "accepted", "ingest_id": record["id"]}
+        assert record["key"] == "+15551234567"
+        assert record["payload"] == payload
+
     def test_processes_message_with_contact(self, client):
         """Inbound message resolves contact."""
         payload = {
@@ -227,10 +303,8 @@ class TestSmsWebhookHandler:
                     )
                     mock_lookup_cls.return_value = mock_lookup
 
-                    response = client.post("/webhook/sms", json=payload)
+                    data = _post_and_ingest(client, payload)
 
-        assert response.status_code == 200
-        data = response.json()
         assert data["status"] == "processed"
         assert data["contact"] == "Mom"
 
@@ -286,10 +360,8 @@ class TestSmsWebhookHandler:
                     mock_lookup.lookup.side_effect = Exception("API error")
                     mock_lookup_cls.return_value = mock_lookup
 
-                    response = client.post("/webhook/sms", json=payload)
+                    data = _post_and_ingest(client, payload)
 
-        assert response.status_code == 200
-        data = response.json()
         assert data["status"] == "processed"
         assert data["contact"] is None
 
@@ -322,18 +394,10 @@ class TestSmsWebhookHandler:
                     mock_lookup_cls.return_value = mock_lookup
 
                     # Mock the attachment download
-                    with patch("services.sms_storage.httpx.AsyncClient") as mock_client:
-                        mock_response = MagicMock()
-                        mock_response.content = b"fake image"
-                        mock_response.raise_for_status = MagicMock()
-                        mock_client.return_value.__aenter__.return_value.get = AsyncMock(
-                            return_value=mock_response
-                        )
+                    with _mock_downloads(b"fake image"):
 
-                        response = client.post("/webhook/sms", json=payload)
+                        data = _post_and_ingest(client, payload)
 
-        assert response.status_code == 200
-        data = response.json()
         assert data["status"] == "processed"
 
 
@@ -380,13 +444,11 @@ class TestSmsWebhookComplianceHandling:
                         mock_sms.send_sms.return_value = MagicMock(success=True)
                         mock_sms_cls.return_value = mock_sms
 
-                        response = client.post("/webhook/sms", json=payload)
+                        data = _post_and_ingest(client, payload)
 
                         # Verify opt-out SMS was sent
                         mock_sms.send_sms.assert_called_once()
 
-        assert response.status_code == 200
-        data = response.json()
         assert data["status"] == "processed"
         assert data["compliance"] is True
         assert data["compliance_type"] == "opt_out"
@@ -419,10 +481,8 @@ class TestSmsWebhookComplianceHandling:
                         mock_sms.send_sms.return_value = MagicMock(success=True)
                         mock_sms_cls.return_value = mock_sms
 
-                        response = client.post("/webhook/sms", json=payload)
+                        data = _post_and_ingest(client, payload)
 
-        assert response.status_code == 200
-        data = response.json()
         assert data["compliance"] is True
         assert data["compliance_type"] == "help"
 
@@ -454,10 +514,8 @@ class TestSmsWebhookComplianceHandling:
                         mock_sms.send_sms.return_value = MagicMock(success=True)
                         mock_sms_cls.return_value = mock_sms
 
-                        response = client.post("/webhook/sms", json=payload)
+                        data = _post_and_ingest(client, payload)
 
-        assert response.status_code == 200
-        data = response.json()
         assert data["compliance"] is True
         assert data["compliance_type"] == "opt_in"
 
@@ -491,13 +549,11 @@ class TestSmsWebhookComplianceHandling:
                         mock_sms = MagicMock()
                         mock_sms_cls.return_value = mock_sms
 
-                        response = client.post("/webhook/sms", json=payload)
+                        data = _post_and_ingest(client, payload)
 
                         # Verify NO compliance SMS was sent
                         mock_sms.send_sms.assert_not_called()
 
-        assert response.status_code == 200
-        data = response.json()
         assert data["status"] == "processed"
         assert data["contact"] == "Mom"
         # Should NOT have compliance flag
@@ -549,7 +605,7 @@ class TestSmsWebhookTelegramNotification:
                         )
                         mock_bot_cls.return_value = mock_bot
 
-                        response = client.post("/webhook/sms", json=payload)
+                        data = _post_and_ingest(client, payload)
 
                         # Verify Telegram notification was sent
                         mock_bot.notify_unknown_sms.assert_called_once_with(
@@ -558,8 +614,6 @@ class TestSmsWebhookTelegramNotification:
                             attachment_count=0,
                         )
 
-        assert response.status_code == 200
-        data = response.json()
         assert data["telegram_notified"] is True
 
     def test_no_telegram_notification_for_known_contacts(self, client):
@@ -591,13 +645,11 @@ class TestSmsWebhookTelegramNotification:
                         mock_bot = MagicMock()
                         mock_bot_cls.return_value = mock_bot
 
-                        response = client.post("/webhook/sms", json=payload)
+                        data = _post_and_ingest(client, payload)
 
                         # Verify Telegram notification was NOT sent
                         mock_bot.notify_unknown_sms.assert_not_called()
 
-        assert response.status_code == 200
-        data = response.json()
         assert "telegram_notified" not in data
 
     def test_no_telegram_notification_for_compliance_messages(self, client):
@@ -632,13 +684,11 @@ class TestSmsWebhookTelegramNotification:
                             mock_bot = MagicMock()
                             mock_bot_cls.return_value = mock_bot
 
-                            response = client.post("/webhook/sms", json=payload)
+                            data = _post_and_ingest(client, payload)
 
                             # Verify Telegram notification was NOT sent for compliance
                             mock_bot.notify_unknown_sms.assert_not_called()
 
-        assert response.status_code == 200
-        data = response.json()
         assert data["compliance"] is True
         assert "telegram_notified" not in data
 
@@ -673,11 +723,9 @@ class TestSmsWebhookTelegramNotification:
                         )
                         mock_bot_cls.return_value = mock_bot
 
-                        response = client.post("/webhook/sms", json=payload)
+                        data = _post_and_ingest(client, payload)
 
         # Webhook should still succeed even if Telegram fails
-        assert response.status_code == 200
-        data = response.json()
         assert data["status"] == "processed"
         # telegram_notified should be absent since notification failed
         assert "telegram_notified" not in data
@@ -716,15 +764,9 @@ class TestSmsWebhookTelegramNotification:
                         mock_bot_cls.return_value = mock_bot
 
                         # Mock attachment downloads
-                        with patch("services.sms_storage.httpx.AsyncClient") as mock_client:
-                            mock_response = MagicMock()
-                            mock_response.content = b"fake image"
-                            mock_response.raise_for_status = MagicMock()
-                            mock_client.return_value.__aenter__.return_value.get = AsyncMock(
-                                return_value=mock_response
-                            )
+                        with _mock_downloads(b"fake image"):
 
-                            response = client.post("/webhook/sms", json=payload)
+                            data = _post_and_ingest(client, payload)
 
                         # Verify attachment count was passed
                         mock_bot.notify_unknown_sms.assert_called_once_with(
@@ -733,7 +775,7 @@ class TestSmsWebhookTelegramNotification:
                             attachment_count=2,
                         )
 
-        assert response.status_code == 200
+        assert data["status"] == "processed"
 
 
 class TestSmsWebhookJorbRouting:
@@ -781,7 +823,7 @@ class TestSmsWebhookJorbRouting:
                         mock_buffer.buffer_message = AsyncMock(return_value=True)
                         mock_buffer_fn.return_value = mock_buffer
 
-                        response = client.post("/webhook/sms", json=payload)
+                        data = _post_and_ingest(client, payload)
 
                         # Verify message was buffered
                         mock_buffer.buffer_message.assert_called_once()
@@ -790,8 +832,6 @@ class TestSmsWebhookJorbRouting:
                         assert call_kwargs["sender"] == "+15551234567"
                         assert call_kwargs["sender_name"] == "Mom"
 
-        assert response.status_code == 200
-        data = response.json()
         assert data["jorb_routed"] is True
 
     def test_routes_jorb_participant_to_buffer(self, client):
@@ -824,13 +864,11 @@ class TestSmsWebhookJorbRouting:
                             mock_buffer.buffer_message = AsyncMock(return_value=True)
                             mock_buffer_fn.return_value = mock_buffer
 
-                            response = client.post("/webhook/sms", json=payload)
+                            data = _post_and_ingest(client, payload)
 
                             # Verify message was buffered
                             mock_buffer.buffer_message.assert_called_once()
 
-        assert response.status_code == 200
-        data = response.json()
         assert data["jorb_routed"] is True
         assert "telegram_notified" not in data  # No notification for jorb participants
 
@@ -872,13 +910,11 @@ class TestSmsWebhookJorbRouting:
                                 )
                                 mock_bot_cls.return_value = mock_bot
 
-                                response = client.post("/webhook/sms", json=payload)
+                                data = _post_and_ingest(client, payload)
 
                                 # Buffer should NOT be called
                                 mock_buffer.buffer_message.assert_not_called()
 
-        assert response.status_code == 200
-        data = response.json()
         assert "jorb_routed" not in data
         assert data["telegram_notified"] is True
 
@@ -914,13 +950,11 @@ class TestSmsWebhookJorbRouting:
                             mock_sms.send_sms.return_value = MagicMock(success=True)
                             mock_sms_cls.return_value = mock_sms
 
-                            response = client.post("/webhook/sms", json=payload)
+                            data = _post_and_ingest(client, payload)
 
                             # Buffer should NOT be called for compliance messages
                             mock_buffer.buffer_message.assert_not_called()
 
-        assert response.status_code == 200
-        data = response.json()
         assert data["compliance"] is True
         assert "jorb_routed" not in data
 
@@ -6,6 +6,7 @@ Tests verify session validation logic with mocked Stytch API.
 
 from __future__ import annotations
 
+from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -14,6 +15,7 @@ from starlette.responses import JSONResponse
 
 from server.stytch_middleware import (
     StytchSessionValidator,
+    get_session_validator,
     require_stytch_session,
 )
 
@@ -61,7 +63,7 @@ class TestStytchSessionValidator:
         with patch("server.stytch_middleware.httpx.AsyncClient") as MockClient:
             mock_client = AsyncMock()
             mock_client.post = AsyncMock(return_value=mock_response)
-            MockClient.return_value.__aenter__.return_value = mock_client
+            MockClient.return_value = mock_client
 
             result = await validator.validate_session("valid-token")
 
@@ -85,7 +87,7 @@ class TestStytchSessionValidator:
         with patch("server.stytch_middleware.httpx.AsyncClient") as MockClient:
             mock_client = AsyncMock()
             mock_client.post = AsyncMock(return_value=mock_response)
-            MockClient.return_value.__aenter__.return_value = mock_client
+            MockClient.return_value = mock_client
 
             result = await validator.validate_session("invalid-token")
 
@@ -106,13 +108,97 @@ class TestStytchSessionValidator:
             mock_client.post = AsyncMock(
                 side_effect=httpx.RequestError("Connection failed")
             )
-            MockClient.return_value.__aenter__.return_value = mock_client
+            MockClient.return_value = mock_client
 
             result = await validator.validate_session("some-token")
 
             assert result is None
 
 
+def _authenticate_response(status_code: int, expires_at: str | None = None) -> MagicMock:
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = "error"
+    response.json.return_value = {
+        "session": {"session_id": "session-1", "expires_at": expires_at},
+        "member": {"email_address": "sean@contrived.com"},
+    }
+    return response
+
+
+class TestStytchSessionCache:
+    """Validated sessions are cached by token hash."""
+
+    @pytest.mark.asyncio
+    async def test_valid_session_is_reused_over_one_pooled_client(self) -> None:
+        validator = StytchSessionValidator("project-test-abc", "secret")
+        expires = (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat()
+
+        with patch("server.stytch_middleware.httpx.AsyncClient") as MockClient:
+            mock_client = MagicMock(is_closed=False)
+            mock_client.post = AsyncMock(return_value=_authenticate_response(200, expires))
+            MockClient.return_value = mock_client
+
+            first = await validator.validate_session("token")
+            first["session_id"] = "mutated"
+            second = await validator.validate_session("token")
+
+        assert second["session_id"] == "session-1"
+        assert mock_client.post.await_count == 1
+        assert MockClient.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_session_is_not_cached(self) -> None:
+        validator = StytchSessionValidator("project-test-abc", "secret")
+
+        with patch("server.stytch_middleware.httpx.AsyncClient") as MockClient:
+            mock_client = MagicMock(is_closed=False)
+            mock_client.post = AsyncMock(return_value=_authenticate_response(200, "2020-01-01T00:00:00Z"))
+            MockClient.return_value = mock_client
+
+            for _ in range(2):
+                assert await validator.validate_session("token") is not None
+
+        assert mock_client.post.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_only_definitive_rejections_are_negatively_cached(self) -> None:
+        validator = StytchSessionValidator("project-test-abc", "secret")
+
+        with patch("server.stytch_middleware.httpx.AsyncClient") as MockClient:
+            mock_client = MagicMock(is_closed=False)
+            mock_client.post = AsyncMock(
+                side_effect=[_authenticate_response(503), _authenticate_response(503), _authenticate_response(401)]
+            )
+            MockClient.return_value = mock_client
+
+            results = [await validator.validate_session("bad-token") for _ in range(4)]
+
+        assert results == [None] * 4
+        # Two 503s retried, then the 401 is remembered.
+        assert mock_client.post.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_cache_is_bounded(self) -> None:
+        validator = StytchSessionValidator("project-test-abc", "secret", cache_size=2)
+        expires = (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat()
+
+        with patch("server.stytch_middleware.httpx.AsyncClient") as MockClient:
+            mock_client = MagicMock(is_closed=False)
+            mock_client.post = AsyncMock(return_value=_authenticate_response(200, expires))
+            MockClient.return_value = mock_client
+
+            for token in ("a", "b", "c", "a"):
+                await validator.validate_session(token)
+
+        assert len(validator._sessions) == 2
+        assert mock_client.post.await_count == 4
+
+    def test_validators_are_shared_per_project(self) -> None:
+        assert get_session_validator("project-test-x", "s") is get_session_validator("project-test-x", "s")
+        assert get_session_validator("project-test-x", "s") is not get_session_validator("project-test-y", "s")
+
+
 class TestRequireStytchSession:
     """Tests for require_stytch_session decorator."""
 
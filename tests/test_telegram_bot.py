@@ -8,7 +8,9 @@ import httpx
 from services.telegram_bot import (
     NotificationResult,
     TelegramBot,
+    _bot_client,
     _escape_html,
+    close_bot_client,
 )
 
 
@@ -41,6 +43,21 @@ class TestEscapeHtml:
         assert result == "Hello, World!"
 
 
+class TestBotClient:
+    """Tests for the shared Bot API client."""
+
+    @pytest.mark.asyncio
+    async def test_client_is_reused_until_closed(self):
+        """Calls on one event loop share a keep-alive client."""
+        client = _bot_client()
+        assert _bot_client() is client
+
+        await close_bot_client()
+        assert client.is_closed
+        assert _bot_client() is not client
+        await close_bot_client()
+
+
 class TestTelegramBotIsConfigured:
     """Tests for TelegramBot.is_configured."""
 
@@ -73,14 +90,14 @@ class TestTelegramBotSendNotification:
         """Notification is sent successfully."""
         bot = TelegramBot(token="test-token", chat_id="12345")
 
-        with patch("services.telegram_bot.httpx.AsyncClient") as mock_client:
+        with patch("services.telegram_bot._bot_client") as mock_client:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.json.return_value = {
                 "ok": True,
                 "result": {"message_id": 789},
             }
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
+            mock_client.return_value.post = AsyncMock(
                 return_value=mock_response
             )
 
@@ -115,12 +132,12 @@ class TestTelegramBotSendNotification:
         """Can override default chat_id."""
         bot = TelegramBot(token="test-token", chat_id="default-id")
 
-        with patch("services.telegram_bot.httpx.AsyncClient") as mock_client:
+        with patch("services.telegram_bot._bot_client") as mock_client:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.json.return_value = {"ok": True, "result": {"message_id": 1}}
             mock_post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value.post = mock_post
+            mock_client.return_value.post = mock_post
 
             await bot.send_notification("Test", chat_id="override-id")
 
@@ -133,14 +150,14 @@ class TestTelegramBotSendNotification:
         """Error returned for API error response."""
         bot = TelegramBot(token="test-token", chat_id="12345")
 
-        with patch("services.telegram_bot.httpx.AsyncClient") as mock_client:
+        with patch("services.telegram_bot._bot_client") as mock_client:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.json.return_value = {
                 "ok": False,
                 "description": "Bad Request: chat not found",
             }
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
+            mock_client.return_value.post = AsyncMock(
                 return_value=mock_response
             )
 
@@ -154,11 +171,11 @@ class TestTelegramBotSendNotification:
         """Error returned for HTTP error."""
         bot = TelegramBot(token="test-token", chat_id="12345")
 
-        with patch("services.telegram_bot.httpx.AsyncClient") as mock_client:
+        with patch("services.telegram_bot._bot_client") as mock_client:
             mock_response = MagicMock()
             mock_response.status_code = 401
             mock_response.text = "Unauthorized"
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
+            mock_client.return_value.post = AsyncMock(
                 return_value=mock_response
             )
 
@@ -172,8 +189,8 @@ class TestTelegramBotSendNotification:
         """Error returned on timeout."""
         bot = TelegramBot(token="test-token", chat_id="12345")
 
-        with patch("services.telegram_bot.httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
+        with patch("services.telegram_bot._bot_client") as mock_client:
+            mock_client.return_value.post = AsyncMock(
                 side_effect=httpx.TimeoutException("Connection timeout")
             )
 
@@ -191,12 +208,12 @@ class TestTelegramBotNotifyUnknownSms:
         """Notification is formatted correctly."""
         bot = TelegramBot(token="test-token", chat_id="12345")
 
-        with patch("services.telegram_bot.httpx.AsyncClient") as mock_client:
+        with patch("services.telegram_bot._bot_client") as mock_client:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.json.return_value = {"ok": True, "result": {"message_id": 1}}
             mock_post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value.post = mock_post
+            mock_client.return_value.post = mock_post
 
             await bot.notify_unknown_sms(
                 from_number="+15551234567",
@@ -216,12 +233,12 @@ class TestTelegramBotNotifyUnknownSms:
         """Attachment count is shown when present."""
         bot = TelegramBot(token="test-token", chat_id="12345")
 
-        with patch("services.telegram_bot.httpx.AsyncClient") as mock_client:
+        with patch("services.telegram_bot._bot_client") as mock_client:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.json.return_value = {"ok": True, "result": {"message_id": 1}}
             mock_post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value.post = mock_post
+            mock_client.return_value.post = mock_post
 
             await bot.notify_unknown_sms(
                 from_number="+15551234567",
@@ -239,12 +256,12 @@ class TestTelegramBotNotifyUnknownSms:
         """Long messages are truncated."""
         bot = TelegramBot(token="test-token", chat_id="12345")
 
-        with patch("services.telegram_bot.httpx.AsyncClient") as mock_client:
+        with patch("services.telegram_bot._bot_client") as mock_client:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.json.return_value = {"ok": True, "result": {"message_id": 1}}
             mock_post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value.post = mock_post
+            mock_client.return_value.post = mock_post
 
             long_message = "A" * 1000
 
@@ -266,12 +283,12 @@ class TestTelegramBotNotifyUnknownSms:
         """HTML in message is escaped."""
         bot = TelegramBot(token="test-token", chat_id="12345")
 
-        with patch("services.telegram_bot.httpx.AsyncClient") as mock_client:
+        with patch("services.telegram_bot._bot_client") as mock_client:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.json.return_value = {"ok": True, "result": {"message_id": 1}}
             mock_post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value.post = mock_post
+            mock_client.return_value.post = mock_post
 
             await bot.notify_unknown_sms(
                 from_number="+15551234567",
@@ -294,12 +311,12 @@ class TestTelegramBotNotifySpam:
         """Spam notification is formatted correctly."""
         bot = TelegramBot(token="test-token", chat_id="12345")
 
-        with patch("services.telegram_bot.httpx.AsyncClient") as mock_client:
+        with patch("services.telegram_bot._bot_client") as mock_client:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.json.return_value = {"ok": True, "result": {"message_id": 1}}
             mock_post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value.post = mock_post
+            mock_client.return_value.post = mock_post
 
             await bot.notify_spam(
                 from_number="+15551234567",
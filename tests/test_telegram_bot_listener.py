@@ -9,7 +9,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from services.telegram_bot import TelegramBotListener
+from services.telegram_bot import LONG_POLL_TIMEOUT_SECONDS, TelegramBotListener
 
 
 class TestTelegramBotListenerInit:
@@ -88,11 +88,10 @@ class TestTelegramBotListenerGetUpdates:
             ],
         }
 
-        with patch("services.telegram_bot.httpx.AsyncClient") as mock_client:
+        with patch("services.telegram_bot._bot_client") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.get.return_value = mock_response
-            mock_client.return_value.__aenter__ = AsyncMock(return_value=mock_instance)
-            mock_client.return_value.__aexit__ = AsyncMock(return_value=False)
+            mock_client.return_value = mock_instance
 
             updates = await listener._get_updates()
             assert len(updates) == 2
@@ -109,17 +108,36 @@ class TestTelegramBotListenerGetUpdates:
         mock_response.status_code = 200
         mock_response.json.return_value = {"ok": True, "result": []}
 
-        with patch("services.telegram_bot.httpx.AsyncClient") as mock_client:
+        with patch("services.telegram_bot._bot_client") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.get.return_value = mock_response
-            mock_client.return_value.__aenter__ = AsyncMock(return_value=mock_instance)
-            mock_client.return_value.__aexit__ = AsyncMock(return_value=False)
+            mock_client.return_value = mock_instance
 
             await listener._get_updates()
             # Verify offset was passed
             call_kwargs = mock_instance.get.call_args
             assert call_kwargs[1]["params"]["offset"] == 50
 
+    @pytest.mark.asyncio
+    async def test_get_updates_long_polls(self) -> None:
+        callback = AsyncMock()
+        listener = TelegramBotListener(on_message=callback, token="test-token")
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"ok": True, "result": []}
+
+        with patch("services.telegram_bot._bot_client") as mock_client:
+            mock_instance = AsyncMock()
+            mock_instance.get.return_value = mock_response
+            mock_client.return_value = mock_instance
+
+            await listener._get_updates()
+            call_kwargs = mock_instance.get.call_args[1]
+            assert call_kwargs["params"]["timeout"] == LONG_POLL_TIMEOUT_SECONDS
+            # The HTTP read timeout outlasts the time Telegram holds the poll open.
+            assert call_kwargs["timeout"].read > LONG_POLL_TIMEOUT_SECONDS
+
     @pytest.mark.asyncio
     async def test_get_updates_http_error(self) -> None:
         callback = AsyncMock()
@@ -129,11 +147,10 @@ class TestTelegramBotListenerGetUpdates:
         mock_response.status_code = 500
         mock_response.text = "Internal Server Error"
 
-        with patch("services.telegram_bot.httpx.AsyncClient") as mock_client:
+        with patch("services.telegram_bot._bot_client") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.get.return_value = mock_response
-            mock_client.return_value.__aenter__ = AsyncMock(return_value=mock_instance)
-            mock_client.return_value.__aexit__ = AsyncMock(return_value=False)
+            mock_client.return_value = mock_instance
 
             updates = await listener._get_updates()
             assert updates == []
@@ -367,6 +384,50 @@ class TestTelegramBotListenerPollLoop:
             [],
         )
 
+    @pytest.mark.asyncio
+    async def test_poll_loop_orders_per_chat_and_overlaps_chats(self) -> None:
+        release_slow = asyncio.Event()
+        order: list[str] = []
+
+        async def callback(text, username, chat_id, sender_name, attachments):
+            if text == "slow":
+                await release_slow.wait()
+            order.append(f"{chat_id}:{text}")
+
+        listener = TelegramBotListener(on_message=callback, token="test-token")
+
+        def _update(update_id: int, chat_id: int, text: str) -> dict:
+            return {
+                "update_id": update_id,
+                "message": {
+                    "text": text,
+                    "from": {"username": "SeanReardon", "first_name": "Sean"},
+                    "chat": {"id": chat_id},
+                },
+            }
+
+        async def fake_get_updates():
+            if listener._offset is None:
+                listener._offset = 4
+                return [_update(1, 42, "slow"), _update(2, 42, "after"), _update(3, 7, "other")]
+            # Stop once the other chat has gone through while chat 42 is held up.
+            while not order:
+                await asyncio.sleep(0.01)
+            listener._running = False
+            release_slow.set()
+            return []
+
+        with patch.object(listener, "_get_updates", side_effect=fake_get_updates):
+            with patch(
+                "services.telegram_allowlist.is_allowed_username",
+                return_value=True,
+            ):
+                listener._running = True
+                await listener._poll_loop()
+
+        assert order == ["7:other", "42:slow", "42:after"]
+        assert listener.get_status()["updates_in_flight"] == 0
+
     @pytest.mark.asyncio
     async def test_poll_loop_handles_errors(self) -> None:
         callback = AsyncMock()
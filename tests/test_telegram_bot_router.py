@@ -435,8 +435,9 @@ class TestLifecycle:
     """Tests for initialization and shutdown."""
 
     @pytest.mark.asyncio
-    async def test_initialize_starts_polling(self):
+    async def test_initialize_starts_polling(self, tmp_path, monkeypatch):
         """initialize_telegram_bot_router starts the listener polling."""
+        monkeypatch.setenv("DATA_DIR", str(tmp_path))
         mock_listener = MagicMock()
         mock_listener.is_configured = True
         mock_listener.start_polling = AsyncMock()
@@ -448,6 +449,7 @@ class TestLifecycle:
             import services.telegram_bot_router as mod
             mod._is_initialized = False
             mod._listener = None
+            mod._message_buffer = None
 
             result = await initialize_telegram_bot_router()
 
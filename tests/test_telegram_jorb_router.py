@@ -236,8 +236,9 @@ class TestHandleTelegramMessage:
 class TestRouterInitialization:
     """Tests for router initialization and shutdown."""
 
-    async def test_initialize_success(self):
+    async def test_initialize_success(self, tmp_path, monkeypatch):
         """Successful initialization returns True."""
+        monkeypatch.setenv("DATA_DIR", str(tmp_path))
         with patch("services.telegram_jorb_router.TelegramClientService") as mock_service_cls:
             mock_service = MagicMock()
             mock_service.is_configured = True
@@ -250,6 +251,7 @@ class TestRouterInitialization:
             import services.telegram_jorb_router as router
             router._is_initialized = False
             router._telegram_service = None
+            router._message_buffer = None
 
             result = await initialize_telegram_jorb_router()
             assert result is True
@@ -310,17 +310,20 @@ export class JobsCard extends LitElement {
   @state() private _jobDetails: Map<string, Job> = new Map();
   @state() private _loadingDetails: Set<string> = new Set();
   @state() private _statusFilter: StatusFilter = 'all';
-  @state() private _autoRefresh = false;
-  private _refreshInterval: number | null = null;
+  @state() private _live = true;
+  private _unsubscribe: (() => void) | null = null;
 
   connectedCallback() {
     super.connectedCallback();
     this._fetchJobs();
+    if (this._live) {
+      this._startLiveUpdates();
+    }
   }
 
   disconnectedCallback() {
     super.disconnectedCallback();
-    this._stopAutoRefresh();
+    this._stopLiveUpdates();
   }
 
   private async _fetchJobs() {
@@ -373,35 +376,48 @@ export class JobsCard extends LitElement {
     this._fetchJobs();
   }
 
-  private _handleAutoRefreshChange(e: Event) {
+  private _handleLiveChange(e: Event) {
     const checkbox = e.target as HTMLInputElement;
-    this._autoRefresh = checkbox.checked;
+    this._live = checkbox.checked;
 
-    if (this._autoRefresh) {
-      this._startAutoRefresh();
+    if (this._live) {
+      // Catch up on anything that changed while paused
+      this._fetchJobs();
+      this._startLiveUpdates();
     } else {
-      this._stopAutoRefresh();
+      this._stopLiveUpdates();
     }
   }
 
-  private _startAutoRefresh() {
-    this._stopAutoRefresh();
-    this._refreshInterval = window.setInterval(() => {
-      this._fetchJobs();
-      // Also refresh expanded job details if it's running
-      if (this._expandedJobId) {
-        const job = this._jobs.find(j => j.job_id === this._expandedJobId);
-        if (job && (job.status === 'running' || job.status === 'pending')) {
-          this._loadJobDetails(this._expandedJobId);
-        }
+  private _startLiveUpdates() {
+    this._stopLiveUpdates();
+    this._unsubscribe = api.subscribeToChanges((change) => {
+      if (change.kind === 'job.updated') {
+        this._upsertJob(change.data.job);
+      } else if (change.kind === 'resync') {
+        this._fetchJobs();
       }
-    }, 5000); // Refresh every 5 seconds
+    });
   }
 
-  private _stopAutoRefresh() {
-    if (this._refreshInterval !== null) {
-      window.clearInterval(this._refreshInterval);
-      this._refreshInterval = null;
+  private _stopLiveUpdates() {
+    if (this._unsubscribe) {
+      this._unsubscribe();
+      this._unsubscribe = null;
+    }
+  }
+
+  private _upsertJob(job: JobSummary) {
+    const previous = this._jobs.find((j) => j.job_id === job.job_id);
+    const others = this._jobs.filter((j) => j.job_id !== job.job_id);
+    const matches = this._statusFilter === 'all' || job.status === this._statusFilter;
+    this._jobs = matches
+      ? [job, ...others].sort((a, b) => (b.started_at ?? '').localeCompare(a.started_at ?? ''))
+      : others;
+
+    // Reload an expanded job's output when its status changes
+    if (this._expandedJobId === job.job_id && previous?.status !== job.status) {
+      this._loadJobDetails(job.job_id);
     }
   }
 
@@ -585,10 +601,10 @@ export class JobsCard extends LitElement {
             <label class="auto-refresh">
               <input
                 type="checkbox"
-                ?checked=${this._autoRefresh}
-                @change=${this._handleAutoRefreshChange}
+                ?checked=${this._live}
+                @change=${this._handleLiveChange}
               />
-              Auto-refresh
+              Live
             </label>
             <button
               class="button button-secondary button-icon"
@@ -526,12 +526,37 @@ export class JorbThreadView extends LitElement {
   private _offset = 0;
   private _limit = 50;
   private _messagesContainer: HTMLElement | null = null;
+  private _unsubscribe: (() => void) | null = null;
 
   connectedCallback() {
     super.connectedCallback();
     if (this.jorbId) {
       this._fetchJorb();
     }
+    this._unsubscribe = api.subscribeToChanges((change) => this._applyChange(change));
+  }
+
+  disconnectedCallback() {
+    super.disconnectedCallback();
+    if (this._unsubscribe) {
+      this._unsubscribe();
+      this._unsubscribe = null;
+    }
+  }
+
+  private _applyChange(change: api.DashboardChange) {
+    if (!this._jorb) return;
+    if (change.kind === 'jorb.message' && change.data.jorb_id === this.jorbId) {
+      const message = change.data.message;
+      if (!this._messages.some((m) => m.id === message.id)) {
+        this._messages = [...this._messages, message];
+      }
+    } else if (change.kind === 'jorb.updated' && change.data.jorb.jorb_id === this.jorbId) {
+      const { status, updated_at, metrics, outcome } = change.data.jorb;
+      this._jorb = { ...this._jorb, status, updated_at, metrics, outcome };
+    } else if (change.kind === 'resync') {
+      this._refresh();
+    }
   }
 
   updated(changedProperties: Map<string, unknown>) {
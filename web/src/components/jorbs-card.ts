@@ -482,20 +482,23 @@ export class JorbsCard extends LitElement {
   @state() private _jorbMessages: Map<string, JorbMessage[]> = new Map();
   @state() private _loadingMessages: Set<string> = new Set();
   @state() private _statusFilter: StatusFilter = 'open';
-  @state() private _autoRefresh = false;
+  @state() private _live = true;
   @state() private _approvalInput: Map<string, string> = new Map();
   @state() private _cancelInput: Map<string, string> = new Map();
   @state() private _actionInProgress: Set<string> = new Set();
-  private _refreshInterval: number | null = null;
+  private _unsubscribe: (() => void) | null = null;
 
   connectedCallback() {
     super.connectedCallback();
     this._fetchJorbs();
+    if (this._live) {
+      this._startLiveUpdates();
+    }
   }
 
   disconnectedCallback() {
     super.disconnectedCallback();
-    this._stopAutoRefresh();
+    this._stopLiveUpdates();
   }
 
   private async _fetchJorbs() {
@@ -547,29 +550,66 @@ export class JorbsCard extends LitElement {
     this._fetchJorbs();
   }
 
-  private _handleAutoRefreshChange(e: Event) {
+  private _handleLiveChange(e: Event) {
     const checkbox = e.target as HTMLInputElement;
-    this._autoRefresh = checkbox.checked;
+    this._live = checkbox.checked;
 
-    if (this._autoRefresh) {
-      this._startAutoRefresh();
+    if (this._live) {
+      // Catch up on anything that changed while paused
+      this._fetchJorbs();
+      this._startLiveUpdates();
     } else {
-      this._stopAutoRefresh();
+      this._stopLiveUpdates();
     }
   }
 
-  private _startAutoRefresh() {
-    this._stopAutoRefresh();
-    this._refreshInterval = window.setInterval(() => {
-      this._fetchJorbs();
-    }, 10000); // Refresh every 10 seconds
+  private _startLiveUpdates() {
+    this._stopLiveUpdates();
+    this._unsubscribe = api.subscribeToChanges((change) => this._applyChange(change));
+  }
+
+  private _stopLiveUpdates() {
+    if (this._unsubscribe) {
+      this._unsubscribe();
+      this._unsubscribe = null;
+    }
+  }
+
+  private _applyChange(change: api.DashboardChange) {
+    switch (change.kind) {
+      case 'jorb.created':
+      case 'jorb.updated':
+        this._upsertJorb(change.data.jorb);
+        break;
+      case 'jorb.message':
+        this._appendMessage(change.data.jorb_id, change.data.message);
+        break;
+      case 'resync':
+        this._fetchJorbs();
+        break;
+    }
+  }
+
+  private _matchesFilter(status: JorbStatus): boolean {
+    if (this._statusFilter === 'all') return true;
+    const open = status === 'planning' || status === 'running' || status === 'paused';
+    return this._statusFilter === 'open' ? open : !open;
   }
 
-  private _stopAutoRefresh() {
-    if (this._refreshInterval !== null) {
-      window.clearInterval(this._refreshInterval);
-      this._refreshInterval = null;
+  private _upsertJorb(jorb: Jorb) {
+    const others = this._jorbs.filter((j) => j.jorb_id !== jorb.jorb_id);
+    if (!this._matchesFilter(jorb.status)) {
+      this._jorbs = others;
+      return;
     }
+    this._jorbs = [jorb, ...others].sort((a, b) => b.updated_at.localeCompare(a.updated_at));
+  }
+
+  private _appendMessage(jorbId: string, message: JorbMessage) {
+    const messages = this._jorbMessages.get(jorbId);
+    // The card shows the first page of the conversation; only extend it while it is short.
+    if (!messages || messages.length >= 10 || messages.some((m) => m.id === message.id)) return;
+    this._jorbMessages = new Map([...this._jorbMessages, [jorbId, [...messages, message]]]);
   }
 
   private async _handleApprove(jorbId: string) {
@@ -948,10 +988,10 @@ export class JorbsCard extends LitElement {
             <label class="auto-refresh">
               <input
                 type="checkbox"
-                ?checked=${this._autoRefresh}
-                @change=${this._handleAutoRefreshChange}
+                ?checked=${this._live}
+                @change=${this._handleLiveChange}
               />
-              Auto-refresh
+              Live
             </label>
             <button
               class="button button-secondary button-icon"
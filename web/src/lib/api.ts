@@ -701,3 +701,138 @@ export interface SystemStatusResponse {
 export async function getSystemStatus(): Promise<SystemStatusResponse> {
   return request<SystemStatusResponse>('/system/status');
 }
+
+// Live updates (server-sent events)
+
+export interface AndroidTaskSummary {
+  id: string;
+  goal: string;
+  status: 'pending' | 'running' | 'completed' | 'failed' | 'cancelled';
+  app: string | null;
+  task_class: string;
+  created_at: string;
+  steps_taken: number;
+  estimated_cost: number;
+  current_step: string | null;
+}
+
+export type DashboardChange =
+  | { kind: 'jorb.created' | 'jorb.updated'; id: string; data: { jorb: Jorb } }
+  | { kind: 'jorb.message'; id: string; data: { jorb_id: string; message: JorbMessage } }
+  | { kind: 'job.updated'; id: string; data: { job: JobSummary } }
+  | { kind: 'android_task.updated'; id: string; data: { task: AndroidTaskSummary } }
+  | { kind: 'resync'; id: string; data: Record<string, never> };
+
+export type DashboardChangeListener = (change: DashboardChange) => void;
+
+const changeListeners = new Set<DashboardChangeListener>();
+let changeStream: AbortController | null = null;
+let lastChangeId: string | null = null;
+
+/**
+ * Subscribe to dashboard changes (jorbs, messages, jobs, Android tasks).
+ *
+ * All subscribers share one `/dashboard/events` stream, which reconnects
+ * with `Last-Event-ID` so missed changes are replayed. A `resync` change
+ * means some were lost and the listener should re-fetch its data.
+ * Returns an unsubscribe function.
+ */
+export function subscribeToChanges(listener: DashboardChangeListener): () => void {
+  changeListeners.add(listener);
+  if (!changeStream) {
+    void runChangeStream();
+  }
+  return () => {
+    changeListeners.delete(listener);
+    if (changeListeners.size === 0 && changeStream) {
+      changeStream.abort();
+      changeStream = null;
+    }
+  };
+}
+
+async function runChangeStream(): Promise<void> {
+  const controller = new AbortController();
+  changeStream = controller;
+  let retryMs = 3000;
+
+  while (!controller.signal.aborted) {
+    try {
+      const headers: Record<string, string> = { Accept: 'text/event-stream' };
+      if (sessionToken) headers['Authorization'] = `Bearer ${sessionToken}`;
+      if (lastChangeId) headers['Last-Event-ID'] = lastChangeId;
+
+      const response = await fetch(`${apiBase}/dashboard/events`, {
+        headers,
+        credentials: 'include',
+        signal: controller.signal,
+      });
+      if (response.status === 401 || response.status === 403) {
+        // Not signed in; cards keep their manual refresh.
+        break;
+      }
+      if (!response.ok || !response.body) {
+        throw new Error(`Event stream error ${response.status}`);
+      }
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      for (;;) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        let end: number;
+        while ((end = buffer.indexOf('\n\n')) >= 0) {
+          retryMs = dispatchChangeFrame(buffer.slice(0, end)) ?? retryMs;
+          buffer = buffer.slice(end + 2);
+        }
+      }
+    } catch (err) {
+      if (controller.signal.aborted) break;
+      console.warn('Dashboard event stream disconnected:', err);
+    }
+    if (!controller.signal.aborted) {
+      await new Promise((resolve) => setTimeout(resolve, retryMs));
+    }
+  }
+
+  if (changeStream === controller) {
+    changeStream = null;
+  }
+}
+
+/**
+ * Parse one SSE frame and notify listeners. Returns a new retry delay if the
+ * frame set one.
+ */
+function dispatchChangeFrame(frame: string): number | null {
+  let id: string | null = null;
+  let kind = 'message';
+  let data = '';
+  let retry: number | null = null;
+
+  for (const line of frame.split('\n')) {
+    if (line.startsWith(':')) continue; // keep-alive comment
+    const sep = line.indexOf(':');
+    const field = sep >= 0 ? line.slice(0, sep) : line;
+    const value = sep >= 0 ? line.slice(sep + 1).replace(/^ /, '') : '';
+    if (field === 'id') id = value;
+    else if (field === 'event') kind = value;
+    else if (field === 'data') data += value;
+    else if (field === 'retry' && /^\d+$/.test(value)) retry = Number(value);
+  }
+
+  if (id !== null) lastChangeId = id;
+  if (!data) return retry;
+
+  const change = { kind, id: id ?? '', data: JSON.parse(data) } as DashboardChange;
+  for (const listener of changeListeners) {
+    try {
+      listener(change);
+    } catch (err) {
+      console.error('Dashboard change listener failed:', err);
+    }
+  }
+  return retry;
+}